@@ -2,6 +2,21 @@
 """
 공통 모듈 패키지
 - paths: 클라이언트별 경로 관리
+- forecast_profile: Prophet 예측 프로파일 (point / intervals / components)
+- fit_budget: 예측 fit/단계 시간 예산 및 대체 예측
+- drift_gate: 전일 예측 재사용 게이트
+- forecast_store: 통합 long format 예측 저장소 (기존 CSV 뷰 제공)
+- data_type: merged_data 차원 조합(Type1~Type7) 벡터 분류
+- dimension_cube: 차원 테이블 OLAP 큐브 (일/주/월 rollup 조회)
+- daily_aggregates: 날짜 파티션 단위 증분 일별 집계 테이블 (바뀐 날짜만 재집계)
+- time_window: 정렬된 날짜 인덱스 기반 최근 N일 윈도우 조회 (filter_by_days 공통 구현)
+- record_builder: KPI DataFrame → JSON 인사이트 레코드 선언형 변환 (iterrows 대체)
+- normalization: 성별/연령/기기/기기플랫폼 통합 매핑 및 유효 플래그 (범주 단위 정규화)
+- rules_engine: 세그먼트 지표 테이블 기반 선언형 인사이트 규칙 (벡터 마스크 평가 + 규칙별 타이밍)
+- ga4_rollup: GA4 그룹핑 세트별 일 단위 rollup (수집 시 생성, 퍼널/참여도 단계 입력)
+- rolling_window: 누적합 기반 (window, lag) 구간 평균/합계 비교 커널 (이탈/트렌드 분석 공통)
+- periods: 퍼널/참여도 멀티기간 윈도우 설정 (전체/180일/90일/30일)
+- json_io: 공통 JSON 직렬화 (NaN/Inf → null, numpy/pandas 직접 처리, pretty/compact, orjson 선택 사용)
 """
 
 from .paths import ClientPaths, get_client_config, parse_client_arg, PROJECT_ROOT
@@ -0,0 +1,324 @@
+"""
+일별 집계 테이블 증분 관리 (Daily Aggregates)
+
+원본 데이터(merged_data.csv / raw_data.csv)를 날짜 파티션 단위로 관리하며,
+새로 수집된 데이터와 저장된 날짜별 서명(행 수 + 행 해시 합)을 비교해 바뀐 날짜만 다시 집계합니다.
+
+- 소스(source): 'merged' (type/merged_data.csv, 날짜 컬럼 '일') / 'raw' (raw/raw_data.csv, 날짜 컬럼 '일 구분')
+- 테이블: 전체 일별 합계(overall) + 차원별 일별 합계 (유형구분, Type1 브랜드/상품, 세그먼트 등)
+- 저장: {type|raw}/aggregates/manifest.json + 테이블 파일 (pyarrow 없으면 .pkl)
+- sync()는 바뀐/추가/삭제된 날짜만 재집계해 테이블에 반영합니다.
+  원본 파일 식별값(크기, 수정 시각)이 마지막 동기화와 같으면 비교 자체를 생략합니다.
+- fetch_sheets_multi.py / fetch_google_sheets.py가 수집 직후 sync_file()로 갱신하고,
+  이후 단계는 groupby 대신 overall() / daily() / segments()로 유지 중인 집계를 읽습니다.
+
+사용법:
+    from scripts.common.daily_aggregates import DailyAggregates
+
+    aggregates = DailyAggregates.for_source(paths, 'merged').sync(df, source_file=input_file)
+    daily_data = aggregates.overall()                                        # 일별 합계
+    daily_brand = aggregates.daily('type1_brand', {'data_type': TYPE1, '브랜드명': brand})
+    segments = DailyAggregates.for_source(paths, 'raw').segments('brand')  # {브랜드: 일별 DataFrame}
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.paths import ClientPaths, LEGACY_DATA_DIR
+from scripts.common.data_type import DATA_TYPE_COLUMN, classify_data_type
+from scripts.common.dimension_cube import file_signature
+
+# Parquet 가용성 체크 (없으면 pickle 테이블 사용)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+METRICS = ['비용', '노출', '클릭', '전환수', '전환값']
+
+# 소스별 위치/날짜 컬럼/차원 테이블 정의
+SOURCES: Dict[str, Dict[str, Any]] = {
+    'merged': {
+        'subdir': 'type',
+        'file': 'merged_data.csv',
+        'date_column': '일',
+        'dimensions': {
+            'category': ['유형구분'],
+            'type1_category': [DATA_TYPE_COLUMN, '유형구분'],
+            'type1_brand': [DATA_TYPE_COLUMN, '브랜드명'],
+            'type1_product': [DATA_TYPE_COLUMN, '상품명'],
+        },
+    },
+    'raw': {
+        'subdir': 'raw',
+        'file': 'raw_data.csv',
+        'date_column': '일 구분',
+        'dimensions': {
+            'brand': ['브랜드명'],
+            'channel': ['유형구분'],
+            'product': ['상품명'],
+            'promotion': ['프로모션'],
+        },
+    },
+}
+
+AGGREGATES_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+OVERALL = 'overall'
+
+# 행 해시를 두 구간으로 나눠 합산 (int64 합계가 넘치지 않도록 40비트씩 사용)
+_HASH_BITS = np.uint64((1 << 40) - 1)
+_HASH_SHIFT = np.uint64(24)
+
+
+def read_source_file(source: str, file_path: Path) -> pd.DataFrame:
+    """소스 CSV를 분석 단계와 같은 규칙으로 읽기 (날짜 변환, 수치형 변환)"""
+    spec = SOURCES[source]
+    date_column = spec['date_column']
+    if source == 'merged':
+        df = pd.read_csv(file_path, thousands=',', low_memory=False)
+    else:
+        df = pd.read_csv(file_path, encoding='utf-8')
+        df.columns = df.columns.str.strip()
+    df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
+    df = df.dropna(subset=[date_column])
+    for column in METRICS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0)
+    return df
+
+
+def sync_file(source: str, file_path: Path) -> Dict[str, Any]:
+    """
+    수집 직후 소스 파일로 일별 집계 동기화 (집계는 소스 파일 옆 aggregates/에 저장)
+
+    Returns:
+        sync 결과 요약 (changed/removed 날짜 수, 전체 재생성 여부)
+    """
+    file_path = Path(file_path)
+    aggregates = DailyAggregates(file_path.parent / 'aggregates', source)
+    aggregates.sync(read_source_file(source, file_path), source_file=file_path)
+    return aggregates.last_sync
+
+
+class DailyAggregates:
+    """날짜 파티션 단위로 증분 관리되는 일별 집계 테이블"""
+
+    def __init__(self, root: Path, source: str):
+        """
+        Args:
+            root: 저장 디렉토리 (예: data/{client}/type/aggregates)
+            source: 'merged' 또는 'raw'
+        """
+        self.root = Path(root)
+        self.source = source
+        self.spec = SOURCES[source]
+        self.date_column = self.spec['date_column']
+        self.manifest_file = self.root / MANIFEST_NAME
+        self.manifest: Dict[str, Any] = {}
+        self.last_sync: Dict[str, Any] = {}
+        self._tables: Dict[str, pd.DataFrame] = {}
+
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = {}
+            if self.manifest.get('version') != AGGREGATES_VERSION:
+                self.manifest = {}
+
+    @classmethod
+    def for_source(cls, paths: Optional[ClientPaths], source: str) -> 'DailyAggregates':
+        """클라이언트 모드면 data/{client}/{type|raw}/aggregates, 레거시 모드면 data/{type|raw}/aggregates"""
+        subdir = SOURCES[source]['subdir']
+        base = getattr(paths, subdir) if paths else LEGACY_DATA_DIR / subdir
+        return cls(base / 'aggregates', source)
+
+    # ===== 동기화 =====
+
+    def _schema(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """df에서 만들 수 있는 테이블 구성 (차원 컬럼이 없으면 해당 테이블 제외)"""
+        available = set(df.columns) | {DATA_TYPE_COLUMN}
+        return {
+            'metrics': [m for m in METRICS if m in df.columns],
+            'dimensions': {name: columns for name, columns in self.spec['dimensions'].items()
+                           if set(columns).issubset(available)},
+        }
+
+    def _normalize(self, df: pd.DataFrame, schema: Dict[str, Any]) -> pd.DataFrame:
+        """날짜 + 차원 + 지표 컬럼만 남긴 집계용 프레임 (data_type이 없으면 분류)"""
+        dim_columns = list(dict.fromkeys(c for columns in schema['dimensions'].values() for c in columns))
+        frame = pd.DataFrame({self.date_column: df[self.date_column]}, index=df.index)
+        for column in dim_columns:
+            if column == DATA_TYPE_COLUMN and column not in df.columns:
+                values = classify_data_type(df)
+            else:
+                values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = pd.Series(np.asarray(values, dtype=object), index=df.index)
+            frame[column] = values
+        for column in schema['metrics']:
+            frame[column] = df[column]
+        return frame.dropna(subset=[self.date_column])
+
+    def _date_signatures(self, frame: pd.DataFrame) -> Dict[str, List[int]]:
+        """날짜별 서명: [행 수, 행 해시 하위 40비트 합, 상위 40비트 합]"""
+        row_hash = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        parts = pd.DataFrame({
+            'low': (row_hash & _HASH_BITS).astype(np.int64),
+            'high': (row_hash >> _HASH_SHIFT).astype(np.int64),
+        })
+        grouped = parts.groupby(frame[self.date_column].dt.normalize().to_numpy(), sort=True).agg(
+            rows=('low', 'size'), low=('low', 'sum'), high=('high', 'sum'))
+        keys = pd.DatetimeIndex(grouped.index).strftime('%Y-%m-%d')
+        return {key: [int(r), int(lo), int(hi)]
+                for key, r, lo, hi in zip(keys, grouped['rows'], grouped['low'], grouped['high'])}
+
+    def _aggregate(self, frame: pd.DataFrame, columns: List[str], metrics: List[str]) -> pd.DataFrame:
+        """날짜 × 차원 합계 (날짜 오름차순, 같은 날짜 안에서는 원본 등장 순서)"""
+        daily = frame.groupby([self.date_column] + columns, sort=False)[metrics].sum().reset_index()
+        return daily.sort_values(self.date_column, kind='mergesort').reset_index(drop=True)
+
+    def sync(self, df: pd.DataFrame, source_file: Optional[Path] = None) -> 'DailyAggregates':
+        """
+        df와 저장된 집계를 날짜 파티션 단위로 비교해 바뀐 날짜만 재집계
+
+        Args:
+            df: 분석 단계에서 읽은 원본 DataFrame (날짜/지표 변환 완료)
+            source_file: df를 읽은 파일 (식별값이 마지막 동기화와 같으면 비교 생략)
+
+        Returns:
+            self (체이닝용). 결과 요약은 last_sync에 기록됩니다.
+        """
+        started = time.time()
+        file_sig = file_signature(source_file) if source_file else None
+        schema = self._schema(df)
+        table_names = [OVERALL] + list(schema['dimensions'])
+        stored_ok = (self.manifest.get('schema') == schema
+                     and all((self.root / self.manifest.get('tables', {}).get(name, '')).is_file()
+                             for name in table_names))
+
+        if stored_ok and file_sig is not None and self.manifest.get('source_file') == file_sig:
+            self.last_sync = {'changed': 0, 'removed': 0, 'rebuilt': False, 'skipped': True}
+            return self
+
+        frame = self._normalize(df, schema)
+        signatures = self._date_signatures(frame)
+        stored = self.manifest.get('signatures', {}) if stored_ok else {}
+
+        changed = [d for d, sig in signatures.items() if stored.get(d) != sig]
+        removed = [d for d in stored if d not in signatures]
+        rebuilt = not stored_ok
+
+        if changed or removed or rebuilt:
+            touched = pd.to_datetime(changed + removed)
+            delta = frame[frame[self.date_column].dt.normalize().isin(pd.to_datetime(changed))]
+            metrics = schema['metrics']
+            dtypes = {self.date_column: frame[self.date_column].dtype,
+                      **{m: frame[m].dtype for m in metrics}}
+
+            for name in table_names:
+                columns = [] if name == OVERALL else schema['dimensions'][name]
+                fresh = self._aggregate(delta, columns, metrics)
+                if not rebuilt:
+                    table = self._read_table(name)
+                    table = table[~table[self.date_column].dt.normalize().isin(touched)]
+                    fresh = pd.concat([table, fresh], ignore_index=True) \
+                        .sort_values(self.date_column, kind='mergesort').reset_index(drop=True)
+                self._write_table(name, fresh.astype(dtypes))
+
+            self.manifest['signatures'] = signatures
+
+        self.manifest.update({
+            'version': AGGREGATES_VERSION,
+            'source': self.source,
+            'schema': schema,
+            'source_file': file_sig if file_sig is not None else
+            (self.manifest.get('source_file') if not (changed or removed) else None),
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        })
+        self._save_manifest()
+
+        self.last_sync = {'changed': len(changed), 'removed': len(removed), 'rebuilt': rebuilt,
+                          'skipped': False, 'seconds': round(time.time() - started, 3)}
+        return self
+
+    # ===== 저장/로드 =====
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+    def _write_table(self, name: str, table: pd.DataFrame) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        file_name = f"{name}.{'parquet' if PARQUET_AVAILABLE else 'pkl'}"
+        file_path = self.root / file_name
+        if PARQUET_AVAILABLE:
+            table.to_parquet(file_path, index=False)
+        else:
+            table.to_pickle(file_path)
+        self.manifest.setdefault('tables', {})[name] = file_name
+        self._tables[name] = table
+
+    def _read_table(self, name: str) -> pd.DataFrame:
+        if name not in self._tables:
+            file_path = self.root / self.manifest['tables'][name]
+            if file_path.suffix == '.parquet':
+                self._tables[name] = pd.read_parquet(file_path)
+            else:
+                self._tables[name] = pd.read_pickle(file_path)
+        return self._tables[name]
+
+    # ===== 조회 =====
+
+    def has(self, dimension: str) -> bool:
+        return dimension in self.manifest.get('tables', {})
+
+    def overall(self) -> pd.DataFrame:
+        """전체 일별 합계 (날짜 + 지표, 날짜 오름차순) - df.groupby(날짜)[지표].sum()과 동일"""
+        return self._read_table(OVERALL).copy()
+
+    def by(self, dimension: str) -> pd.DataFrame:
+        """차원별 일별 합계 전체 (날짜 + 차원 컬럼 + 지표)"""
+        return self._read_table(dimension).copy()
+
+    def daily(self, dimension: str, values: Dict[str, Any]) -> pd.DataFrame:
+        """
+        차원 값 하나의 일별 합계 (날짜 + 지표, 날짜 오름차순)
+
+        Args:
+            dimension: 차원 테이블 이름 (예: 'type1_brand')
+            values: {차원 컬럼: 값} (예: {'data_type': TYPE1, '브랜드명': '브랜드A'})
+        """
+        table = self._read_table(dimension)
+        mask = np.ones(len(table), dtype=bool)
+        for column, value in values.items():
+            mask &= (table[column] == value).to_numpy()
+        metrics = self.manifest['schema']['metrics']
+        return table.loc[mask, [self.date_column] + metrics].reset_index(drop=True)
+
+    def segments(self, dimension: str) -> Dict[Any, pd.DataFrame]:
+        """
+        단일 컬럼 차원의 값별 일별 합계
+
+        Returns:
+            {값: 일별 DataFrame(날짜 + 지표)} - 값 순서는 처음 등장한 날짜(같은 날짜면 원본 행) 순서로,
+            원본이 날짜순으로 정렬돼 있으면 원본 등장 순서와 같습니다.
+        """
+        if not self.has(dimension):
+            return {}
+        table = self._read_table(dimension)
+        column = self.manifest['schema']['dimensions'][dimension][0]
+        metrics = self.manifest['schema']['metrics']
+        return {
+            value: daily[[self.date_column] + metrics].reset_index(drop=True)
+            for value, daily in table.groupby(column, sort=False)
+        }
@@ -0,0 +1,130 @@
+"""
+데이터 타입 분류 모듈
+
+merged_data의 각 행이 어떤 차원 조합(캠페인/광고세트/연령/성별/기기유형/플랫폼/기기플랫폼)으로
+집계된 행인지 분류합니다.
+
+- 7개 차원 컬럼의 값 존재 여부('-'가 아님)를 비트마스크로 인코딩 (행 단위 apply 없이 벡터 연산)
+- 비트마스크 → Type1~Type7 / Other_미분류 조회 테이블로 매핑
+- 결과는 categorical 컬럼(data_type)으로 반환
+- fetch_sheets_multi.py가 수집 시점에 merged_data.csv에 data_type 컬럼을 기록하므로
+  이후 단계는 ensure_data_type()으로 저장된 값을 그대로 사용 (재계산 없음)
+
+사용법:
+    from scripts.common.data_type import ensure_data_type, TYPE1
+
+    df = ensure_data_type(df)
+    type1_data = df[df['data_type'] == TYPE1]
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 존재 여부 판정 컬럼 (비트 순서: 첫 컬럼이 최상위 비트)
+PRESENCE_COLUMNS = ['캠페인이름', '광고세트', '연령', '성별', '기기유형', '플랫폼', '기기플랫폼']
+MISSING_VALUE = '-'
+DATA_TYPE_COLUMN = 'data_type'
+
+TYPE1 = 'Type1_캠페인+광고세트'
+TYPE2 = 'Type2_광고세트+연령+성별'
+TYPE3 = 'Type3_광고세트+연령'
+TYPE4 = 'Type4_광고세트+성별'
+TYPE5 = 'Type5_광고세트+기기유형'
+TYPE6 = 'Type6_광고세트+플랫폼'
+TYPE7 = 'Type7_광고세트+기기플랫폼'
+OTHER = 'Other_미분류'
+
+DATA_TYPES = [TYPE1, TYPE2, TYPE3, TYPE4, TYPE5, TYPE6, TYPE7, OTHER]
+
+
+def _mask(*columns: str) -> int:
+    """존재하는 컬럼 조합 → 비트마스크"""
+    bits = 0
+    for column in columns:
+        bits |= 1 << (len(PRESENCE_COLUMNS) - 1 - PRESENCE_COLUMNS.index(column))
+    return bits
+
+
+# 비트마스크 → 데이터 타입 (이외 조합은 모두 Other_미분류)
+TYPE_BY_MASK: Dict[int, str] = {
+    _mask('캠페인이름', '광고세트'): TYPE1,
+    _mask('광고세트', '연령', '성별'): TYPE2,
+    _mask('광고세트', '연령'): TYPE3,
+    _mask('광고세트', '성별'): TYPE4,
+    _mask('광고세트', '기기유형'): TYPE5,
+    _mask('광고세트', '플랫폼'): TYPE6,
+    _mask('광고세트', '기기플랫폼'): TYPE7,
+}
+
+# 전체 마스크(2^7) 조회 테이블: 값은 DATA_TYPES 내 코드
+_CODE_LOOKUP = np.full(1 << len(PRESENCE_COLUMNS), DATA_TYPES.index(OTHER), dtype=np.int8)
+for _bits, _label in TYPE_BY_MASK.items():
+    _CODE_LOOKUP[_bits] = DATA_TYPES.index(_label)
+
+
+def presence_mask(df: pd.DataFrame) -> np.ndarray:
+    """
+    차원 컬럼 존재 여부 비트마스크 계산
+
+    값이 '-'가 아니면 존재로 판단합니다 (결측값도 존재로 간주 - 기존 분류 규칙과 동일).
+    컬럼이 없으면 해당 차원은 존재하지 않는 것으로 처리합니다.
+    """
+    mask = np.zeros(len(df), dtype=np.uint8)
+    for column in PRESENCE_COLUMNS:
+        mask <<= 1
+        if column in df.columns:
+            mask |= df[column].ne(MISSING_VALUE).to_numpy(dtype=np.uint8)
+    return mask
+
+
+def classify_data_type(df: pd.DataFrame) -> pd.Series:
+    """
+    데이터 타입 분류 (벡터 연산)
+
+    Returns:
+        df와 같은 인덱스의 categorical Series (카테고리 순서: DATA_TYPES)
+    """
+    codes = _CODE_LOOKUP[presence_mask(df)]
+    categories = pd.Categorical.from_codes(codes, categories=DATA_TYPES)
+    return pd.Series(categories, index=df.index, name=DATA_TYPE_COLUMN)
+
+
+def ensure_data_type(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    data_type 컬럼 보장
+
+    수집 시점에 기록된 data_type 컬럼이 있으면 categorical로 변환만 하고,
+    없거나(이전 버전 merged_data) 알 수 없는 값이 있으면 다시 분류합니다.
+    """
+    if DATA_TYPE_COLUMN in df.columns:
+        stored = pd.Categorical(df[DATA_TYPE_COLUMN], categories=DATA_TYPES)
+        if not pd.isna(stored).any():
+            df[DATA_TYPE_COLUMN] = stored
+            return df
+
+    df[DATA_TYPE_COLUMN] = classify_data_type(df)
+    return df
+
+
+def align_rows(header: List[str], rows: List[List[str]]) -> List[List[str]]:
+    """
+    행 길이를 헤더 길이에 맞춤 (짧은 행은 빈 값으로 채우고, 긴 행은 헤더 밖 셀을 잘라냄)
+
+    시트마다 열 수가 다를 수 있으므로(ragged rows) 분류/data_type 추가 전에 호출합니다.
+    """
+    width = len(header)
+    return [row[:width] if len(row) >= width else row + [''] * (width - len(row)) for row in rows]
+
+
+def classify_rows(header: List[str], rows: List[List[str]]) -> List[str]:
+    """
+    CSV 행 목록(헤더 + 값 리스트)의 데이터 타입 분류
+
+    fetch_sheets_multi.py처럼 pandas DataFrame 없이 행 리스트로 데이터를 다루는 곳에서 사용합니다.
+    행 길이가 헤더와 달라도 align_rows()로 맞춘 뒤 분류합니다.
+    """
+    rows = align_rows(header, rows)
+    frame = pd.DataFrame(rows, columns=header) if rows else pd.DataFrame(columns=header)
+    return classify_data_type(frame).astype(str).tolist()
@@ -0,0 +1,265 @@
+"""
+차원 데이터 OLAP 큐브 (Dimension Cube)
+
+dimension_type*.csv(Type1~Type7) 테이블을 측정값(비용/노출/클릭/전환수/전환값) ×
+차원(날짜 단위, 유형구분, 캠페인, 광고세트, 브랜드, 상품, 프로모션, 연령, 성별, 기기, 플랫폼)
+큐브로 1회 집계하고, 자주 쓰는 차원 조합은 일/주/월/전체 단위 rollup으로 미리 계산해 둡니다.
+
+- 뷰(view): type1 ~ type7 (각 dimension_type*.csv)
+- 시간 단위(grain): 'day'(일) / 'week'(주) / 'month'(월) / 'all'(기간 전체)
+- 기본 큐보이드: 뷰의 모든 차원 × 일 단위
+- query()는 요청한 차원/시간 단위/기간을 포함하는 가장 작은 큐보이드에서 재집계합니다.
+- multi_analysis_dimension_detail.py가 차원 테이블 저장 직후 큐브를 생성해 type/dimension_cube.pkl로 저장하며,
+  원본 CSV가 바뀐 경우(파일 크기/수정 시각 불일치) load_or_build()가 다시 생성합니다.
+
+사용법:
+    from scripts.common.dimension_cube import DimensionCube
+
+    cube = DimensionCube.load_or_build(cube_path, dimension_frames, dimension_files)
+    start = cube.start_for_days('type1', 30)                  # 최근 30일 (filter_by_days와 동일 기준)
+    brand = cube.query('type1', ['브랜드명'], start=start)     # 브랜드별 합계
+    weekly = cube.query('type1', ['브랜드명', '주'])            # 브랜드 × 주
+    traffic = cube.query('type4', ['성별_통합'], where={'유형구분_통합': '트래픽'})
+"""
+
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# 측정값
+MEASURES = ['비용', '노출', '클릭', '전환수', '전환값']
+
+# 시간 단위별 날짜 컬럼 ('all'은 날짜 컬럼 없음)
+GRAIN_COLUMNS = {'day': ['월', '주', '일'], 'week': ['주'], 'month': ['월'], 'all': []}
+# 시간 단위별 대표 날짜 컬럼
+GRAIN_KEYS = {'day': '일', 'week': '주', 'month': '월'}
+DATE_COLUMNS = ('월', '주', '일')
+
+# 큐브 차원 (뷰별로 테이블에 있는 컬럼만 사용)
+DIMENSIONS = [
+    '유형구분', '유형구분_통합', '캠페인이름', '광고세트', '타겟팅', '브랜드명', '상품명', '프로모션',
+    '연령', '연령_통합', '성별', '성별_통합', '기기유형', '기기유형_통합', '플랫폼', '기기플랫폼', '기기플랫폼_통합',
+]
+
+# 사전 집계 rollup (뷰별 차원 조합, 각 조합을 day/week/month/all 단위로 생성)
+ROLLUPS: Dict[str, List[Tuple[str, ...]]] = {
+    'type1': [
+        (), ('유형구분',), ('브랜드명',), ('상품명',), ('프로모션',),
+        ('캠페인이름', '광고세트', '유형구분'),
+    ],
+    'type2': [(), ('연령_통합', '성별_통합'), ('광고세트', '연령_통합', '성별_통합', '유형구분_통합')],
+    'type3': [(), ('연령_통합',), ('연령_통합', '유형구분_통합')],
+    'type4': [(), ('성별_통합',), ('성별_통합', '유형구분_통합')],
+    'type5': [(), ('기기유형_통합', '유형구분_통합')],
+    'type6': [(), ('플랫폼', '유형구분_통합')],
+    'type7': [(), ('기기플랫폼_통합', '유형구분_통합')],
+}
+
+CUBE_VERSION = 1
+
+
+def file_signature(path: Path) -> Optional[List[int]]:
+    """원본 파일 식별값 (크기, 수정 시각 ns). 파일이 없으면 None"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class DimensionCube:
+    """뷰별 큐보이드 집합 및 조회 API"""
+
+    def __init__(self, cuboids: Dict[Tuple[str, str, Tuple[str, ...]], pd.DataFrame],
+                 date_ranges: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]],
+                 sources: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            cuboids: {(view, grain, dims): 집계 DataFrame}
+            date_ranges: {view: (최소 일자, 최대 일자)}
+            sources: {view: 원본 파일 식별값} (재생성 판단용)
+        """
+        self.cuboids = cuboids
+        self.date_ranges = date_ranges
+        self.sources = sources or {}
+
+    # ===== 생성 =====
+
+    @classmethod
+    def build(cls, frames: Dict[str, pd.DataFrame], sources: Optional[Dict[str, Any]] = None) -> 'DimensionCube':
+        """
+        차원 테이블로 큐브 생성
+
+        Args:
+            frames: {view: dimension_type*.csv DataFrame} (월/주/일 + 차원 + 측정값 컬럼 필요)
+            sources: {view: 원본 파일 식별값}
+        """
+        cuboids = {}
+        date_ranges = {}
+
+        for view, frame in frames.items():
+            if frame is None or len(frame) == 0 or not set(GRAIN_COLUMNS['day']).issubset(frame.columns):
+                continue
+
+            dims = tuple(d for d in DIMENSIONS if d in frame.columns)
+            measures = [m for m in MEASURES if m in frame.columns]
+            base = frame[GRAIN_COLUMNS['day'] + list(dims) + measures].copy()
+            base['일'] = pd.to_datetime(base['일'])
+            base = cls._aggregate(base, GRAIN_COLUMNS['day'] + list(dims), measures)
+            cuboids[(view, 'day', dims)] = base
+            date_ranges[view] = (base['일'].min(), base['일'].max())
+
+            for rollup in ROLLUPS.get(view, [()]):
+                if not set(rollup).issubset(dims):
+                    continue
+                day = cls._aggregate(base, GRAIN_COLUMNS['day'] + list(rollup), measures)
+                cuboids[(view, 'day', rollup)] = day
+                cuboids[(view, 'week', rollup)] = cls._aggregate(day, GRAIN_COLUMNS['week'] + list(rollup), measures)
+                month = cls._aggregate(day, GRAIN_COLUMNS['month'] + list(rollup), measures)
+                cuboids[(view, 'month', rollup)] = month
+                cuboids[(view, 'all', rollup)] = cls._aggregate(month, list(rollup), measures)
+
+        return cls(cuboids, date_ranges, sources)
+
+    @staticmethod
+    def _aggregate(frame: pd.DataFrame, keys: List[str], measures: List[str], dropna: bool = False) -> pd.DataFrame:
+        """keys 기준 합계 (keys가 없으면 1행 합계)"""
+        if not keys:
+            return frame[measures].sum().to_frame().T.astype(frame[measures].dtypes.to_dict())
+        return frame.groupby(keys, sort=True, dropna=dropna)[measures].sum().reset_index()
+
+    # ===== 저장/로드 =====
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': CUBE_VERSION,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'cuboids': self.cuboids,
+            'date_ranges': self.date_ranges,
+            'sources': self.sources,
+        }
+        with open(path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['DimensionCube']:
+        """저장된 큐브 로드 (없거나 버전이 다르면 None)"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if payload.get('version') != CUBE_VERSION:
+            return None
+        return cls(payload['cuboids'], payload['date_ranges'], payload.get('sources'))
+
+    @classmethod
+    def load_or_build(cls, path: Path, frames: Dict[str, pd.DataFrame],
+                      files: Dict[str, Path]) -> 'DimensionCube':
+        """
+        저장된 큐브가 원본 파일과 일치하면 로드, 아니면 frames로 생성
+
+        Args:
+            path: 큐브 파일 경로
+            frames: {view: 차원 테이블} (재생성 시 사용)
+            files: {view: 차원 테이블 CSV 경로}
+        """
+        sources = {view: file_signature(file_path) for view, file_path in files.items()
+                   if view in frames}
+        cube = cls.load(path)
+        if cube is not None and cube.sources == sources:
+            return cube
+        return cls.build(frames, sources)
+
+    # ===== 조회 =====
+
+    @property
+    def views(self) -> List[str]:
+        return list(self.date_ranges)
+
+    def has(self, view: str) -> bool:
+        return view in self.date_ranges
+
+    def start_for_days(self, view: str, days: int) -> Optional[pd.Timestamp]:
+        """최근 N일 시작일 (뷰의 최대 일자 - N일, filter_by_days와 동일 기준). days <= 0이면 None"""
+        if days <= 0 or view not in self.date_ranges:
+            return None
+        return self.date_ranges[view][1] - pd.Timedelta(days=days)
+
+    def _select(self, view: str, needed: Iterable[str], date_columns: Iterable[str],
+                date_filter: bool) -> pd.DataFrame:
+        """요청을 제공할 수 있는 가장 작은 큐보이드 선택 (일자 범위 조회는 일 단위 큐보이드만 사용)"""
+        needed = set(needed)
+        date_columns = set(date_columns)
+        candidates = [
+            frame for (v, g, dims), frame in self.cuboids.items()
+            if v == view and needed.issubset(dims) and date_columns.issubset(GRAIN_COLUMNS[g])
+            and (g == 'day' or not date_filter)
+        ]
+        if not candidates:
+            raise KeyError(f"큐브에 없는 조회: view={view}, dims={sorted(needed | date_columns)}")
+        return min(candidates, key=len)
+
+    def query(self, view: str, dims: Sequence[str] = (), grain: Optional[str] = None,
+              start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None,
+              where: Optional[Dict[str, Any]] = None, dropna: bool = True) -> pd.DataFrame:
+        """
+        슬라이스 조회
+
+        Args:
+            view: 'type1' ~ 'type7'
+            dims: 그룹 차원. 날짜 컬럼(월/주/일)을 포함하면 해당 위치에 날짜 키가 들어갑니다.
+                  (예: ['브랜드명', '주'] → 브랜드 × 주)
+            grain: 'day' / 'week' / 'month' / 'all'. dims에 날짜 컬럼이 없을 때 맨 앞에 추가할 날짜 단위
+                   (None이면 'all')
+            start, end: 일자 범위 (포함)
+            where: {차원: 값 또는 값 목록} 필터
+            dropna: 결측 차원값 제외 (pandas groupby 기본 동작과 동일)
+
+        Returns:
+            키 컬럼 + 측정값 컬럼 DataFrame (키 기준 정렬)
+        """
+        where = where or {}
+        keys = list(dims)
+        if grain not in (None, 'all') and GRAIN_KEYS[grain] not in keys:
+            keys = [GRAIN_KEYS[grain]] + keys
+
+        date_columns = [k for k in keys if k in DATE_COLUMNS]
+        plain_dims = [k for k in keys if k not in DATE_COLUMNS]
+        date_filter = start is not None or end is not None
+        frame = self._select(view, plain_dims + list(where), date_columns, date_filter)
+
+        mask = pd.Series(True, index=frame.index)
+        if start is not None:
+            mask &= frame['일'] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= frame['일'] <= pd.Timestamp(end)
+        for column, value in where.items():
+            if isinstance(value, (list, tuple, set)):
+                mask &= frame[column].isin(list(value))
+            else:
+                mask &= frame[column] == value
+        if not mask.all():
+            frame = frame[mask]
+
+        measures = [m for m in MEASURES if m in frame.columns]
+        return self._aggregate(frame, keys, measures, dropna=dropna)
+
+    def summary(self) -> Dict[str, Any]:
+        """큐보이드 수/행 수 요약"""
+        return {
+            view: {
+                'cuboids': sum(1 for (v, _, _) in self.cuboids if v == view),
+                'base_rows': max(len(f) for (v, _, _), f in self.cuboids.items() if v == view),
+            }
+            for view in self.views
+        }
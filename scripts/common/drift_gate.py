@@ -0,0 +1,267 @@
+"""
+예측 재사용 게이트 (Drift Gate)
+
+전일 예측을 캐시해 두고, 새로 들어온 실제값이 이전 예측과 허용 오차 이내이며
+캐시된 모델이 N일 이내에 학습된 경우 재학습 대신 이전 예측을 앞으로 이동(roll forward)해 재사용합니다.
+
+재학습 조건 (하나라도 해당하면 refit):
+- no_cache:         캐시된 예측 없음
+- stale:            캐시 모델 학습 후 max_age_days 초과
+- history_revised:  이전 학습 구간 끝부분(최근 28일) 실제값이 수정됨
+- drift:            신규 실제값 WAPE가 허용 오차 초과, 또는 예측구간(있는 경우) 이탈
+- horizon_exceeded: 신규 실제값 일수가 캐시 예측 기간 이상
+
+예측구간 이탈 판단은 yhat_lower/yhat_upper가 캐시된 경우에만 적용됩니다.
+현재 게이트를 쓰는 두 단계(segment_processor, multi_analysis_prophet_forecast)는 POINT 프로파일
+(yhat만 생성)로 학습하므로 drift 판단은 WAPE 기준만 사용합니다.
+
+dates/values에는 모델 학습에 실제로 쓴 시리즈(예: y > 0 필터 후)를 전달해야 합니다.
+캐시 예측은 학습 마지막 날 다음날부터 시작해야 하며(store에서 확인, 어긋나면 캐시하지 않음),
+따라서 입력이 바뀌지 않았으면 재사용 결과는 재학습 결과와 동일합니다.
+
+시리즈별 판단 결과는 forecast/drift_gate_{stage}.csv에 기록됩니다.
+
+사용법:
+    from scripts.common.drift_gate import DriftGate
+
+    gate = DriftGate.for_stage(paths.forecast, 'segment_processor', training_days=365, output_days=30)
+    reused = gate.reuse(key, prophet_df['ds'], prophet_df['y'], periods=30)
+    if reused is None:
+        forecast = ...  # 재학습 (prophet_df)
+        gate.store(key, forecast, prophet_df['ds'], prophet_df['y'])
+    gate.save()
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.paths import load_clients_config
+
+# 기본 설정
+DEFAULT_TOLERANCE = 0.15       # 신규 실제값 WAPE 허용 오차
+DEFAULT_MAX_AGE_DAYS = 7       # 캐시 모델 최대 사용 일수
+HISTORY_CHECK_DAYS = 28        # 학습 구간 수정 여부 확인 기간
+HISTORY_TOLERANCE = 0.01       # 학습 구간 합계 허용 변화율
+
+
+def load_gate_settings(tolerance: Optional[float] = None,
+                       max_age_days: Optional[int] = None) -> Dict[str, Any]:
+    """게이트 설정 조회 (명령줄 인자 > clients.json defaults.forecast > 기본값)"""
+    try:
+        forecast_config = load_clients_config().get('defaults', {}).get('forecast', {})
+    except (FileNotFoundError, ValueError):
+        forecast_config = {}
+
+    return {
+        'tolerance': tolerance if tolerance is not None
+        else forecast_config.get('driftTolerance', DEFAULT_TOLERANCE),
+        'max_age_days': max_age_days if max_age_days is not None
+        else forecast_config.get('driftMaxAgeDays', DEFAULT_MAX_AGE_DAYS),
+    }
+
+
+def _to_date_str(value) -> str:
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class DriftGate:
+    """시리즈별 예측 재사용 여부 판단 및 예측 캐시 관리"""
+
+    def __init__(self, cache_file: Path, log_file: Optional[Path] = None,
+                 tolerance: float = DEFAULT_TOLERANCE, max_age_days: int = DEFAULT_MAX_AGE_DAYS,
+                 enabled: bool = True):
+        """
+        Args:
+            cache_file: 예측 캐시 JSON 경로
+            log_file: 시리즈별 판단 기록 CSV 경로
+            tolerance: 신규 실제값 WAPE 허용 오차
+            max_age_days: 캐시 모델 최대 사용 일수
+            enabled: False면 항상 재학습 (캐시는 갱신)
+        """
+        self.cache_file = Path(cache_file)
+        self.log_file = Path(log_file) if log_file else None
+        self.tolerance = tolerance
+        self.max_age_days = max_age_days
+        self.enabled = enabled
+        self.decisions: List[Dict[str, Any]] = []
+        self.cache: Dict[str, Dict[str, Any]] = {}
+
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError):
+                self.cache = {}
+
+    @classmethod
+    def for_stage(cls, forecast_dir: Path, stage: str, training_days: int, output_days: int,
+                  enabled: bool = True, **settings) -> 'DriftGate':
+        """단계/학습 기간별 캐시 파일로 게이트 생성"""
+        forecast_dir = Path(forecast_dir)
+        cache_name = f"{stage}_d{training_days}_o{output_days}"
+        return cls(
+            cache_file=forecast_dir / '.forecast_cache' / f'{cache_name}.json',
+            log_file=forecast_dir / f'drift_gate_{cache_name}.csv',
+            enabled=enabled,
+            **load_gate_settings(**settings)
+        )
+
+    def _log(self, key: str, decision: str, reason: str, **detail) -> None:
+        self.decisions.append({'key': key, 'decision': decision, 'reason': reason, **detail})
+
+    def reuse(self, key: str, dates: pd.Series, values: pd.Series, periods: int) -> Optional[pd.DataFrame]:
+        """
+        이전 예측 재사용 판단
+
+        Args:
+            key: 시리즈 식별자 (예: 'brand|브랜드A|비용')
+            dates: 실제 데이터 날짜
+            values: 실제 데이터 값
+            periods: 필요한 예측 기간 (일)
+
+        Returns:
+            재사용 가능하면 앞으로 이동된 예측 (ds, yhat[, yhat_lower, yhat_upper]), 아니면 None
+        """
+        if not self.enabled:
+            self._log(key, 'refit', 'disabled')
+            return None
+
+        entry = self.cache.get(key)
+        if entry is None:
+            self._log(key, 'refit', 'no_cache')
+            return None
+
+        actual = pd.Series(np.asarray(values, dtype=float), index=pd.to_datetime(dates)).groupby(level=0).sum()
+        train_end = actual.index.max()
+        cached_end = pd.Timestamp(entry['train_end'])
+        fitted_end = pd.Timestamp(entry['fitted_train_end'])
+        age_days = (train_end - fitted_end).days
+
+        if train_end < cached_end or age_days > self.max_age_days:
+            self._log(key, 'refit', 'stale', age_days=age_days)
+            return None
+
+        # 학습 구간 끝부분 실제값이 수정되었는지 확인
+        history = actual[(actual.index > cached_end - pd.Timedelta(days=HISTORY_CHECK_DAYS))
+                         & (actual.index <= cached_end)]
+        cached_sum = entry['history_sum']
+        if abs(history.sum() - cached_sum) > HISTORY_TOLERANCE * max(abs(cached_sum), 1.0):
+            self._log(key, 'refit', 'history_revised', age_days=age_days)
+            return None
+
+        cached = pd.DataFrame(entry['forecast'])
+        cached['ds'] = pd.to_datetime(cached['ds'])
+        cached = cached.set_index('ds')
+
+        new_actual = actual[actual.index > cached_end]
+        if len(new_actual) >= len(cached):
+            self._log(key, 'refit', 'horizon_exceeded', age_days=age_days)
+            return None
+
+        # 신규 실제값과 이전 예측 비교
+        wape = 0.0
+        coverage = None
+        if len(new_actual) > 0:
+            expected = cached['yhat'].reindex(new_actual.index).fillna(0)
+            wape = float(np.abs(new_actual - expected).sum() / max(expected.abs().sum(), 1e-9))
+            if new_actual.abs().sum() == 0 and expected.abs().sum() == 0:
+                wape = 0.0
+            if 'yhat_lower' in cached.columns:
+                lower = cached['yhat_lower'].reindex(new_actual.index)
+                upper = cached['yhat_upper'].reindex(new_actual.index)
+                coverage = float(((new_actual >= lower) & (new_actual <= upper)).mean())
+
+        if wape > self.tolerance or (coverage is not None and coverage < 1.0):
+            self._log(key, 'refit', 'drift', age_days=age_days, wape=round(wape, 4), coverage=coverage)
+            return None
+
+        rolled = self._roll_forward(cached, train_end, periods)
+        self._log(key, 'reuse', 'within_tolerance', age_days=age_days, wape=round(wape, 4),
+                  coverage=coverage, new_days=len(new_actual))
+
+        # 재사용한 예측을 새 기준일로 캐시 (학습 시점은 유지)
+        self._put(key, rolled, train_end, actual, fitted_train_end=fitted_end)
+        return rolled
+
+    @staticmethod
+    def _roll_forward(cached: pd.DataFrame, train_end: pd.Timestamp, periods: int) -> pd.DataFrame:
+        """이전 예측을 train_end 다음날부터 periods일로 이동 (부족한 뒷부분은 7일 전 값으로 채움)"""
+        target = pd.date_range(start=train_end + pd.Timedelta(days=1), periods=periods, freq='D')
+        rolled = cached.reindex(target)
+
+        for i, date in enumerate(target):
+            if rolled.loc[date].isna().any():
+                source = date - pd.Timedelta(days=7)
+                if source in rolled.index and not rolled.loc[source].isna().any():
+                    rolled.loc[date] = rolled.loc[source]
+                elif source in cached.index:
+                    rolled.loc[date] = cached.loc[source]
+                elif i > 0:
+                    rolled.loc[date] = rolled.iloc[i - 1]
+                else:
+                    rolled.loc[date] = cached.iloc[-1]
+
+        return rolled.rename_axis('ds').reset_index()
+
+    def _put(self, key: str, forecast: pd.DataFrame, train_end: pd.Timestamp, actual: pd.Series,
+             fitted_train_end: pd.Timestamp) -> None:
+        history = actual[(actual.index > train_end - pd.Timedelta(days=HISTORY_CHECK_DAYS))
+                         & (actual.index <= train_end)]
+        columns = [c for c in ['yhat', 'yhat_lower', 'yhat_upper'] if c in forecast.columns]
+        self.cache[key] = {
+            'train_end': _to_date_str(train_end),
+            'fitted_train_end': _to_date_str(fitted_train_end),
+            'history_sum': float(history.sum()),
+            'forecast': {
+                'ds': [_to_date_str(d) for d in forecast['ds']],
+                **{c: [float(v) for v in forecast[c]] for c in columns},
+            },
+        }
+
+    def store(self, key: str, forecast: pd.DataFrame, dates: pd.Series, values: pd.Series) -> None:
+        """
+        재학습한 예측 캐시 (forecast: ds, yhat[, yhat_lower, yhat_upper])
+
+        dates/values는 학습에 쓴 시리즈여야 합니다. 예측 시작일이 학습 마지막 날 다음날이 아니면
+        재사용 시 예측이 밀리므로 캐시하지 않습니다 (다음 실행에서 재학습).
+        """
+        actual = pd.Series(np.asarray(values, dtype=float), index=pd.to_datetime(dates)).groupby(level=0).sum()
+        train_end = actual.index.max()
+        forecast_start = pd.Timestamp(forecast['ds'].iloc[0])
+        if forecast_start != train_end + pd.Timedelta(days=1):
+            print(f"   ⚠️ 예측 캐시 생략 ({key}): 예측 시작일 {_to_date_str(forecast_start)}이 "
+                  f"학습 마지막 날 {_to_date_str(train_end)} 다음날이 아님")
+            self.cache.pop(key, None)
+            return
+        self._put(key, forecast, train_end, actual, fitted_train_end=train_end)
+
+    def save(self) -> None:
+        """캐시 및 판단 기록 저장"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False)
+
+        if self.log_file and self.decisions:
+            log_df = pd.DataFrame(self.decisions)
+            log_df.insert(0, 'run_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            log_df.to_csv(self.log_file, index=False, encoding='utf-8')
+
+    def print_summary(self) -> None:
+        """재사용/재학습 요약 출력"""
+        if not self.decisions:
+            return
+        log_df = pd.DataFrame(self.decisions)
+        reused = int((log_df['decision'] == 'reuse').sum())
+        reasons = log_df[log_df['decision'] == 'refit']['reason'].value_counts().to_dict()
+
+        print(f"\n[예측 재사용 게이트] 재사용 {reused}건 / 재학습 {len(log_df) - reused}건 "
+              f"(허용 오차 {self.tolerance:.0%}, 최대 {self.max_age_days}일)")
+        if reasons:
+            print("  재학습 사유: " + ", ".join(f"{k} {v}건" for k, v in reasons.items()))
+        if self.log_file:
+            print(f"  시리즈별 기록: {self.log_file}")
@@ -0,0 +1,262 @@
+"""
+예측 학습 시간 예산(Time Budget) 모듈
+
+Prophet 학습 1건(fit)과 예측 단계(stage) 전체에 wall-clock 예산을 둡니다.
+- fit은 별도 워커 프로세스에서 실행되며, 예산을 넘기면 워커를 강제 종료합니다.
+- 종료된 fit은 가중 이동평균(weighted MA) 예측으로 대체되고 model='timeout_fallback'으로 표시됩니다.
+- 단계 예산이 소진되면 이후 fit은 Prophet을 건너뛰고 바로 대체 예측을 사용합니다.
+
+설정 우선순위: 명령줄 인자 > clients.json defaults.forecast > 기본값
+
+사용법:
+    from scripts.common.fit_budget import FitBudget, TIMEOUT_FALLBACK_MODEL
+
+    budget = FitBudget('segment_processor', fit_seconds=120, stage_seconds=1800)
+    forecast = budget.forecast(prophet_df, POINT, periods=30, label='brand', **prophet_kwargs)
+    if forecast is None:
+        forecast = weighted_ma_forecast(values, last_date, periods=30)
+    budget.close()
+    budget.print_report()
+"""
+
+import multiprocessing
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.paths import load_clients_config
+
+# 대체 예측 모델명
+TIMEOUT_FALLBACK_MODEL = 'timeout_fallback'
+
+# 기본 예산 (초)
+DEFAULT_FIT_TIMEOUT_SEC = 120
+DEFAULT_STAGE_TIMEOUT_SEC = 1800
+
+
+class FitTimeout(Exception):
+    """fit이 시간 예산을 초과한 경우"""
+
+
+def load_budget_settings(fit_seconds: Optional[float] = None,
+                         stage_seconds: Optional[float] = None) -> Dict[str, Optional[float]]:
+    """
+    예산 설정 조회 (명령줄 인자 > clients.json defaults.forecast > 기본값)
+
+    0 이하의 값은 해당 예산 비활성화를 의미합니다.
+    """
+    try:
+        forecast_config = load_clients_config().get('defaults', {}).get('forecast', {})
+    except (FileNotFoundError, ValueError):
+        forecast_config = {}
+
+    if fit_seconds is None:
+        fit_seconds = forecast_config.get('fitTimeoutSec', DEFAULT_FIT_TIMEOUT_SEC)
+    if stage_seconds is None:
+        stage_seconds = forecast_config.get('stageTimeoutSec', DEFAULT_STAGE_TIMEOUT_SEC)
+
+    return {
+        'fit_seconds': fit_seconds if fit_seconds and fit_seconds > 0 else None,
+        'stage_seconds': stage_seconds if stage_seconds and stage_seconds > 0 else None,
+    }
+
+
+def weighted_ma_forecast(values, last_date, periods: int, window: int = 14) -> pd.Series:
+    """가중 이동평균 예측 (최근 window일, 최근 데이터에 더 높은 가중치)"""
+    recent = np.asarray(values, dtype=float)[-window:]
+    if len(recent) == 0:
+        weighted_avg = 0.0
+    else:
+        weights = np.arange(1, len(recent) + 1)
+        weighted_avg = np.average(recent, weights=weights)
+
+    forecast_dates = pd.date_range(
+        start=pd.Timestamp(last_date) + timedelta(days=1),
+        periods=periods,
+        freq='D'
+    )
+    return pd.Series([max(0, weighted_avg)] * periods, index=forecast_dates)
+
+
+def _worker_loop(conn) -> None:
+    """워커 프로세스: (함수, 인자)를 받아 실행하고 결과를 반환"""
+    from scripts.common import forecast_profile
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        func, args, kwargs = task
+        try:
+            result = func(*args, **kwargs)
+            conn.send((True, result, forecast_profile.export_profile_stats(reset=True)))
+        except Exception as e:
+            conn.send((False, e, forecast_profile.export_profile_stats(reset=True)))
+
+
+class _Worker:
+    """시간 초과 시 강제 종료 가능한 단일 워커 프로세스"""
+
+    def __init__(self):
+        self._process = None
+        self._conn = None
+
+    def _start(self) -> None:
+        ctx = multiprocessing.get_context()
+        parent_conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+    def call(self, func, args: tuple, kwargs: dict, timeout: float) -> Any:
+        """워커에서 func 실행. timeout 초과 시 워커를 종료하고 FitTimeout 발생"""
+        from scripts.common.forecast_profile import merge_profile_stats
+
+        if self._process is None or not self._process.is_alive():
+            self._start()
+
+        self._conn.send((func, args, kwargs))
+        if not self._conn.poll(timeout):
+            self.kill()
+            raise FitTimeout(f"{timeout:.0f}초 초과")
+
+        ok, payload, stats = self._conn.recv()
+        merge_profile_stats(stats)
+        if not ok:
+            raise payload
+        return payload
+
+    def kill(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(5)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+                self._process.join(5)
+            except (BrokenPipeError, OSError):
+                pass
+        self.kill()
+
+
+class FitBudget:
+    """fit/단계 시간 예산 관리 및 단계별 리포트"""
+
+    def __init__(self, stage: str, fit_seconds: Optional[float] = DEFAULT_FIT_TIMEOUT_SEC,
+                 stage_seconds: Optional[float] = DEFAULT_STAGE_TIMEOUT_SEC):
+        """
+        Args:
+            stage: 단계 이름 (리포트 표시용)
+            fit_seconds: fit 1건 예산 (None이면 제한 없음 - 현재 프로세스에서 실행)
+            stage_seconds: 단계 전체 예산 (None이면 제한 없음)
+        """
+        self.stage = stage
+        self.fit_seconds = fit_seconds
+        self.stage_seconds = stage_seconds
+        self.started_at = time.perf_counter()
+        self._worker = _Worker() if fit_seconds else None
+        # {label: {'fits', 'timeouts', 'skipped', 'seconds', 'max_seconds'}}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def remaining(self) -> Optional[float]:
+        """단계 예산 잔여 시간 (초)"""
+        if not self.stage_seconds:
+            return None
+        return self.stage_seconds - (time.perf_counter() - self.started_at)
+
+    def _label_stats(self, label: str) -> Dict[str, float]:
+        return self.stats.setdefault(label, {
+            'fits': 0, 'timeouts': 0, 'skipped': 0, 'seconds': 0.0, 'max_seconds': 0.0
+        })
+
+    def run(self, func, *args, label: str = 'default', **kwargs) -> Optional[Any]:
+        """
+        예산 내에서 func 실행
+
+        Returns:
+            func 결과. fit 예산 초과 또는 단계 예산 소진 시 None (대체 예측 필요)
+        """
+        stats = self._label_stats(label)
+        remaining = self.remaining()
+
+        if remaining is not None and remaining <= 0:
+            stats['skipped'] += 1
+            return None
+
+        timeout = self.fit_seconds
+        if remaining is not None:
+            timeout = min(timeout, remaining) if timeout else remaining
+
+        start = time.perf_counter()
+        try:
+            if self._worker is None and self.fit_seconds is None and remaining is None:
+                return func(*args, **kwargs)
+            if self._worker is None:
+                self._worker = _Worker()
+            return self._worker.call(func, args, kwargs, timeout)
+        except FitTimeout:
+            stats['timeouts'] += 1
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            stats['fits'] += 1
+            stats['seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+
+    def forecast(self, prophet_df: pd.DataFrame, profile, periods: int,
+                 label: str = 'default', **prophet_kwargs) -> Optional[pd.DataFrame]:
+        """예산 내에서 Prophet 학습 + 예측. 초과 시 None"""
+        from scripts.common.forecast_profile import fit_and_predict
+
+        return self.run(fit_and_predict, prophet_df, profile, periods, label=label, **prophet_kwargs)
+
+    def close(self) -> None:
+        """워커 프로세스 종료"""
+        if self._worker is not None:
+            self._worker.close()
+
+    def get_report(self) -> Dict[str, Any]:
+        """단계 리포트 (구간별 fit 수, 예산 초과 수, 소요 시간)"""
+        return {
+            'stage': self.stage,
+            'fit_budget_sec': self.fit_seconds,
+            'stage_budget_sec': self.stage_seconds,
+            'elapsed_sec': round(time.perf_counter() - self.started_at, 2),
+            'sections': {
+                label: {
+                    'fits': int(s['fits']),
+                    'timeouts': int(s['timeouts']),
+                    'skipped': int(s['skipped']),
+                    'seconds': round(s['seconds'], 2),
+                    'max_seconds': round(s['max_seconds'], 2),
+                }
+                for label, s in self.stats.items()
+            },
+        }
+
+    def print_report(self) -> None:
+        """단계 리포트 출력"""
+        report = self.get_report()
+        fit_budget = f"{self.fit_seconds:.0f}초" if self.fit_seconds else '없음'
+        stage_budget = f"{self.stage_seconds:.0f}초" if self.stage_seconds else '없음'
+
+        print(f"\n[시간 예산 리포트 - {self.stage}]")
+        print(f"  예산: fit {fit_budget}, 단계 {stage_budget} / 경과 {report['elapsed_sec']:.1f}초")
+        for label, s in report['sections'].items():
+            print(f"  - {label}: fit {s['fits']}건, 예산 초과 {s['timeouts']}건, "
+                  f"단계 예산 소진으로 생략 {s['skipped']}건 "
+                  f"(합계 {s['seconds']:.1f}초, 최장 {s['max_seconds']:.1f}초)")
@@ -0,0 +1,213 @@
+"""
+Prophet 예측 프로파일 모듈
+
+예측 결과를 사용하는 쪽(consumer)이 실제로 필요한 출력만 계산하도록
+Prophet 모델 생성과 predict 호출을 구성합니다.
+
+프로파일:
+- point:      yhat만 사용 → 불확실성 시뮬레이션 생략, 미래 구간만 예측
+- intervals:  yhat_lower/yhat_upper까지 사용 → 불확실성 시뮬레이션, 미래 구간만 예측
+- components: 학습 구간 포함 전체 결과 사용 (추세/계절성 성분, in-sample 진단)
+
+predict 시간은 프로파일별로 누적됩니다. 절감 시간 추정(프로파일마다 최초 1회 기존 방식 =
+전체 이력 + 불확실성 시뮬레이션으로 한 번 더 예측)은 비용이 커서 기본 비활성이며,
+--profile-report 인자 또는 환경변수 FORECAST_PROFILE_REPORT=1로만 켭니다.
+환경변수는 fit 워커/하위 프로세스에도 상속됩니다 (측정 시간은 fit 예산에 포함되므로 운영 실행에는 사용 금지).
+
+사용법:
+    from scripts.common.forecast_profile import POINT, build_prophet, predict_with_profile
+
+    if args.profile_report:
+        enable_profile_calibration()   # 첫 predict 이전, 워커 생성 이전에 호출
+
+    model = build_prophet(POINT, weekly_seasonality=True, changepoint_prior_scale=0.05)
+    model.fit(prophet_df)
+    forecast = predict_with_profile(model, POINT, periods=30)   # ds, yhat (30행)
+
+    print_profile_report()
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# Prophet 기본 불확실성 샘플 수
+DEFAULT_UNCERTAINTY_SAMPLES = 1000
+
+# 절감 시간 추정(기준 시간 측정) 활성화 환경변수
+CALIBRATION_ENV = 'FORECAST_PROFILE_REPORT'
+
+
+@dataclass(frozen=True)
+class ForecastProfile:
+    """예측 출력 프로파일"""
+    name: str
+    uncertainty_samples: int
+    include_history: bool
+    columns: Optional[Tuple[str, ...]] = None  # None이면 전체 컬럼 유지
+
+    @property
+    def has_intervals(self) -> bool:
+        return self.uncertainty_samples > 0
+
+
+POINT = ForecastProfile('point', 0, False, ('ds', 'yhat'))
+INTERVALS = ForecastProfile('intervals', DEFAULT_UNCERTAINTY_SAMPLES, False,
+                            ('ds', 'yhat', 'yhat_lower', 'yhat_upper'))
+COMPONENTS = ForecastProfile('components', DEFAULT_UNCERTAINTY_SAMPLES, True)
+
+PROFILES = {p.name: p for p in (POINT, INTERVALS, COMPONENTS)}
+
+# 프로파일별 predict 통계
+# {name: {'calls', 'predict_sec', 'baseline_sec', 'sample_sec'}}
+_STATS: Dict[str, Dict[str, float]] = {}
+# 기준 시간 측정을 마친 프로파일 (통계 초기화와 무관하게 프로세스당 1회)
+_CALIBRATED = set()
+
+
+def enable_profile_calibration() -> None:
+    """기준 시간 측정 활성화 (이후 생성되는 워커/하위 프로세스에도 환경변수로 전달)"""
+    os.environ[CALIBRATION_ENV] = '1'
+
+
+def calibration_enabled() -> bool:
+    """기준 시간 측정 활성화 여부"""
+    return os.environ.get(CALIBRATION_ENV, '') not in ('', '0')
+
+
+def get_profile(name: str) -> ForecastProfile:
+    """이름으로 프로파일 조회"""
+    if name not in PROFILES:
+        raise ValueError(f"알 수 없는 예측 프로파일: {name} (가능: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def build_prophet(profile: ForecastProfile, **prophet_kwargs):
+    """프로파일에 맞게 불확실성 샘플 수를 설정한 Prophet 모델 생성"""
+    from prophet import Prophet
+
+    prophet_kwargs.setdefault('uncertainty_samples', profile.uncertainty_samples)
+    return Prophet(**prophet_kwargs)
+
+
+def _baseline_predict_seconds(model, periods: int) -> float:
+    """기존 방식(전체 이력 + 불확실성 시뮬레이션) predict 소요 시간 측정"""
+    original_samples = model.uncertainty_samples
+    model.uncertainty_samples = DEFAULT_UNCERTAINTY_SAMPLES
+    try:
+        start = time.perf_counter()
+        model.predict(model.make_future_dataframe(periods=periods))
+        return time.perf_counter() - start
+    finally:
+        model.uncertainty_samples = original_samples
+
+
+def predict_with_profile(model, profile: ForecastProfile, periods: int) -> pd.DataFrame:
+    """
+    프로파일에 필요한 범위/컬럼만 예측
+
+    Args:
+        model: 학습된 Prophet 모델 (build_prophet으로 생성 권장)
+        profile: 예측 프로파일
+        periods: 예측 기간 (일)
+
+    Returns:
+        include_history=False면 미래 periods행, True면 학습 구간 + periods행
+    """
+    future = model.make_future_dataframe(periods=periods, include_history=profile.include_history)
+
+    start = time.perf_counter()
+    forecast = model.predict(future)
+    elapsed = time.perf_counter() - start
+
+    stats = _STATS.setdefault(profile.name, {
+        'calls': 0, 'predict_sec': 0.0, 'baseline_sec': 0.0, 'sample_sec': 0.0
+    })
+    stats['calls'] += 1
+    stats['predict_sec'] += elapsed
+
+    # 최초 1회 기준 시간 측정 (opt-in, components는 기존 방식과 동일하므로 추가 predict 없음)
+    if calibration_enabled() and profile.name not in _CALIBRATED:
+        _CALIBRATED.add(profile.name)
+        if profile.include_history and profile.has_intervals:
+            stats['baseline_sec'] = elapsed
+        else:
+            stats['baseline_sec'] = _baseline_predict_seconds(model, periods)
+        stats['sample_sec'] = elapsed
+
+    if profile.columns:
+        forecast = forecast[[c for c in profile.columns if c in forecast.columns]]
+
+    return forecast.reset_index(drop=True)
+
+
+def fit_and_predict(prophet_df: pd.DataFrame, profile: ForecastProfile, periods: int,
+                    **prophet_kwargs) -> pd.DataFrame:
+    """Prophet 학습 + 프로파일 예측 (워커 프로세스에서 호출 가능한 모듈 수준 함수)"""
+    model = build_prophet(profile, **prophet_kwargs)
+    model.fit(prophet_df)
+    return predict_with_profile(model, profile, periods)
+
+
+def export_profile_stats(reset: bool = False) -> Dict[str, Dict[str, float]]:
+    """프로파일 통계 원본 반환 (워커 → 부모 프로세스 전달용)"""
+    snapshot = {name: dict(stats) for name, stats in _STATS.items()}
+    if reset:
+        _STATS.clear()
+    return snapshot
+
+
+def merge_profile_stats(snapshot: Dict[str, Dict[str, float]]) -> None:
+    """워커 프로세스에서 측정한 프로파일 통계를 현재 프로세스에 병합"""
+    for name, other in snapshot.items():
+        stats = _STATS.get(name)
+        if stats is None:
+            _STATS[name] = dict(other)
+            continue
+        stats['calls'] += other['calls']
+        stats['predict_sec'] += other['predict_sec']
+        if stats['sample_sec'] <= 0:
+            stats['baseline_sec'] = other['baseline_sec']
+            stats['sample_sec'] = other['sample_sec']
+
+
+def get_profile_report() -> Dict[str, Dict[str, float]]:
+    """
+    프로파일별 predict 시간 및 추정 절감 시간
+
+    Returns:
+        {profile_name: {'calls', 'predict_sec', 'estimated_baseline_sec', 'saved_sec'}}
+        (기준 시간을 측정하지 않았으면 'calls', 'predict_sec'만 포함)
+    """
+    report = {}
+    for name, stats in _STATS.items():
+        row = {'calls': int(stats['calls']), 'predict_sec': round(stats['predict_sec'], 3)}
+        # 최초 호출에서 측정한 기준/실제 비율로 전체 호출의 기준 시간 추정 (측정한 경우만)
+        if stats['sample_sec'] > 0:
+            estimated_baseline = stats['predict_sec'] * stats['baseline_sec'] / stats['sample_sec']
+            row['estimated_baseline_sec'] = round(estimated_baseline, 3)
+            row['saved_sec'] = round(max(0.0, estimated_baseline - stats['predict_sec']), 3)
+        report[name] = row
+    return report
+
+
+def print_profile_report(title: str = '예측 프로파일 리포트') -> None:
+    """프로파일별 predict 시간/절감 시간 출력"""
+    report = get_profile_report()
+    if not report:
+        return
+
+    print(f"\n[{title}]")
+    for name, row in report.items():
+        line = f"  - {name}: predict {row['calls']}회, {row['predict_sec']:.2f}초"
+        if 'saved_sec' in row:
+            line += f" (기존 방식 추정 {row['estimated_baseline_sec']:.2f}초, 절감 {row['saved_sec']:.2f}초)"
+        print(line)
+
+
+def reset_profile_stats() -> None:
+    """프로파일 통계 초기화"""
+    _STATS.clear()
@@ -0,0 +1,324 @@
+"""
+통합 예측 저장소 (Forecast Store)
+
+Prophet/글로벌/세그먼트/일별 예측 결과를 하나의 long format 테이블로 관리합니다.
+- 키: (source, dimension, key, date, type, model) + 지표 컬럼 (비용, 노출, 클릭, 전환수, 전환값, ROAS, CPA, CPC)
+- 저장: forecast/store/source={source}/dimension={dimension}.parquet (pyarrow 없으면 .pkl)
+- 조회(get_forecast)는 요청한 차원의 파티션만 1회 읽어 캐시합니다 (원본 행 순서/dtype 유지).
+- 같은 차원이 여러 단계에 있으면(brand: prophet/segment, promotion: segment/global) source를 지정해야 합니다
+  (생략 시 ValueError - 서로 다른 단계의 예측이 섞이지 않도록).
+- manifest.json에 파티션별 기존 CSV 레이아웃을 기록해 기존 CSV(prophet_forecast_by_*.csv,
+  segment_*.csv, predictions_daily.csv)를 그대로 재현하는 뷰(view)를 제공합니다 (CSV 재생성/JSON 내보내기용).
+- 기존 CSV 출력은 clients.json defaults.forecast.legacyCsv(기본 true)로 끌 수 있습니다.
+
+사용법:
+    from scripts.common.forecast_store import ForecastStore, publish_forecast
+
+    # 저장 (기존 to_csv 대체)
+    publish_forecast(df, ForecastStore.for_paths(paths), 'prophet', 'brand',
+                     key_columns=['브랜드명'], legacy_path=paths.type / 'prophet_forecast_by_brand.csv')
+
+    # 조회 (필요한 파티션만 로드, 통합 컬럼: date, 비용, 전환값, ...)
+    store = ForecastStore.for_paths(paths)
+    brand_forecast = store.get_forecast('brand', key='브랜드A', kind='forecast', source='prophet')
+    category_actual = store.get_forecast('category', kind='actual', source='prophet')
+    legacy_df = store.view('brand', source='prophet')   # prophet_forecast_by_brand.csv와 동일
+
+    # 기존 CSV 재생성
+    python scripts/common/forecast_store.py --client clientA
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# 직접 실행 시 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.common.paths import ClientPaths, LEGACY_DATA_DIR, load_clients_config
+
+# Parquet 가용성 체크 (없으면 pickle 파티션 사용)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# 통합 테이블 키 컬럼
+KEY_COLUMNS = ['source', 'dimension', 'key', 'date', 'type', 'model']
+# 통합 테이블 지표 컬럼 (기존 CSV: 예측_{지표} 또는 {지표}_예측)
+VALUE_COLUMNS = ['비용', '노출', '클릭', '전환수', '전환값', 'ROAS', 'CPA', 'CPC']
+# 단일 키가 없는 파티션(전체 합계)의 key 값
+TOTAL_KEY = '전체'
+# 다중 키 컬럼 결합 구분자
+KEY_SEPARATOR = '|'
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def legacy_csv_enabled() -> bool:
+    """기존 CSV 출력 여부 (clients.json defaults.forecast.legacyCsv, 기본 True)"""
+    try:
+        forecast_config = load_clients_config().get('defaults', {}).get('forecast', {})
+    except (FileNotFoundError, ValueError):
+        forecast_config = {}
+    return bool(forecast_config.get('legacyCsv', True))
+
+
+def _value_rename(columns: List[str]) -> Dict[str, str]:
+    """기존 CSV 지표 컬럼명 → 통합 지표 컬럼명"""
+    rename = {}
+    for value in VALUE_COLUMNS:
+        for legacy in (f'예측_{value}', f'{value}_예측'):
+            if legacy in columns:
+                rename[legacy] = value
+    return rename
+
+
+class ForecastStore:
+    """파티션 단위 예측 저장소 및 조회 API"""
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: 저장소 디렉토리 (예: data/{client}/forecast/store)
+        """
+        self.root = Path(root)
+        self.manifest_file = self.root / MANIFEST_NAME
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self._parts: Dict[str, pd.DataFrame] = {}
+
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = {}
+
+    @classmethod
+    def for_paths(cls, paths: Optional[ClientPaths]) -> 'ForecastStore':
+        """클라이언트 모드면 data/{client}/forecast/store, 레거시 모드면 data/forecast/store"""
+        return cls(paths.forecast_store if paths else LEGACY_DATA_DIR / 'forecast' / 'store')
+
+    @staticmethod
+    def _partition_id(source: str, dimension: str) -> str:
+        return f'{source}/{dimension}'
+
+    def partitions(self, dimension: Optional[str] = None, source: Optional[str] = None) -> List[str]:
+        """조건에 맞는 파티션 ID 목록"""
+        return [pid for pid, meta in self.manifest.items()
+                if (dimension is None or meta['dimension'] == dimension)
+                and (source is None or meta['source'] == source)]
+
+    def has(self, dimension: str, source: Optional[str] = None) -> bool:
+        return bool(self.partitions(dimension, source))
+
+    def _dimension_partitions(self, dimension: str, source: Optional[str]) -> List[str]:
+        """조회 대상 파티션 (source 생략 시 차원이 한 단계에만 있어야 함)"""
+        pids = self.partitions(dimension, source)
+        if source is None and len(pids) > 1:
+            sources = ', '.join(self.manifest[pid]['source'] for pid in pids)
+            raise ValueError(f"'{dimension}' 차원이 여러 단계에 있습니다 ({sources}) - source를 지정하세요")
+        return pids
+
+    # ===== 저장 =====
+
+    def write(self, frame: pd.DataFrame, source: str, dimension: str,
+              key_columns: Optional[List[str]] = None, date_column: str = '일자',
+              default_model: Optional[str] = None, legacy_path: Optional[Path] = None,
+              encoding: str = 'utf-8-sig') -> pd.DataFrame:
+        """
+        기존 CSV 형식의 DataFrame을 통합 형식으로 변환해 파티션 저장
+
+        Args:
+            frame: 기존 CSV와 동일한 컬럼의 DataFrame
+            source: 생성 단계 (prophet, global, segment, marketing)
+            dimension: 차원 이름 (overall, brand, age_gender, ...)
+            key_columns: 차원 키 컬럼 (None이면 전체 합계)
+            date_column: 날짜 컬럼명
+            default_model: model 컬럼이 없을 때 forecast 행에 사용할 모델명
+            legacy_path: 기존 CSV 경로 (뷰 재생성용)
+            encoding: 기존 CSV 인코딩
+
+        Returns:
+            통합 형식 파티션 DataFrame
+        """
+        key_columns = list(key_columns or [])
+        rename = _value_rename(list(frame.columns))
+
+        part = frame.rename(columns={**rename, date_column: 'date'})
+        if key_columns:
+            part['key'] = part[key_columns].astype(str).agg(KEY_SEPARATOR.join, axis=1)
+        else:
+            part['key'] = TOTAL_KEY
+        part['source'] = source
+        part['dimension'] = dimension
+        part['date'] = pd.to_datetime(part['date'])
+        if 'model' not in part.columns:
+            part['model'] = (part['type'] == 'actual').map({True: 'actual', False: default_model or source})
+
+        # 원본 행 순서 (뷰 재현용)
+        part['row'] = range(len(part))
+
+        ordered = KEY_COLUMNS + key_columns
+        part = part[ordered + [c for c in part.columns if c not in ordered]].reset_index(drop=True)
+
+        file_name = f"dimension={dimension}.{'parquet' if PARQUET_AVAILABLE else 'pkl'}"
+        file_path = self.root / f'source={source}' / file_name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if PARQUET_AVAILABLE:
+            part.to_parquet(file_path, index=False)
+        else:
+            part.to_pickle(file_path)
+
+        self.manifest[self._partition_id(source, dimension)] = {
+            'source': source,
+            'dimension': dimension,
+            'file': str(file_path.relative_to(self.root)),
+            'key_columns': key_columns,
+            'rows': len(part),
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'legacy': {
+                'path': str(legacy_path) if legacy_path else None,
+                'columns': list(frame.columns),
+                'date_column': date_column,
+                'rename': rename,
+                'dtypes': {c: str(t) for c, t in frame.dtypes.items() if c != date_column},
+                'encoding': encoding,
+            },
+        }
+        self._save_manifest()
+        self._parts.pop(self._partition_id(source, dimension), None)
+        return part
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+    # ===== 조회 =====
+
+    def _partition(self, pid: str) -> Optional[pd.DataFrame]:
+        """파티션 1회 로드 → key 인덱스 (원본 행 순서 유지, 파일 없으면 None)"""
+        if pid not in self._parts:
+            file_path = self.root / self.manifest[pid]['file']
+            if not file_path.exists():
+                return None
+            if file_path.suffix == '.parquet':
+                part = pd.read_parquet(file_path)
+            else:
+                part = pd.read_pickle(file_path)
+            self._parts[pid] = part.set_index('key', drop=False)
+        return self._parts[pid]
+
+    def load(self) -> pd.DataFrame:
+        """전체 파티션 결합 테이블 (파티션 간 컬럼 차이로 dtype이 바뀔 수 있음, 조회는 get_forecast 사용)"""
+        parts = [part for part in map(self._partition, self.manifest) if part is not None]
+        if not parts:
+            return pd.DataFrame(columns=KEY_COLUMNS + VALUE_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    def get_forecast(self, dimension: str, key: Optional[str] = None, kind: str = 'forecast',
+                     source: Optional[str] = None) -> pd.DataFrame:
+        """
+        통합 형식 예측 조회
+
+        Args:
+            dimension: 차원 이름
+            key: 차원 키 (다중 키는 '|'로 결합, None이면 전체 키)
+            kind: 'forecast', 'actual', 'all'
+            source: 생성 단계 (None이면 차원이 있는 유일한 단계)
+
+        Returns:
+            통합 형식 DataFrame (파티션 원본 행 순서, 없으면 빈 DataFrame)
+
+        Raises:
+            ValueError: source 없이 여러 단계에 있는 차원을 조회한 경우
+        """
+        picked = []
+        for pid in self._dimension_partitions(dimension, source):
+            part = self._partition(pid)
+            if part is None:
+                continue
+            if key is None:
+                picked.append(part)
+            elif key in part.index:
+                picked.append(part.loc[[key]])
+        if not picked:
+            return pd.DataFrame(columns=KEY_COLUMNS + VALUE_COLUMNS)
+
+        result = pd.concat(picked) if len(picked) > 1 else picked[0]
+        if kind != 'all':
+            result = result[result['type'] == kind]
+        return result.reset_index(drop=True)
+
+    def view(self, dimension: str, source: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """파티션을 기존 CSV와 동일한 컬럼/형식으로 변환 (없으면 None, 여러 단계면 source 필요)"""
+        pids = self._dimension_partitions(dimension, source)
+        if not pids:
+            return None
+        meta = self.manifest[pids[0]]
+        legacy = meta['legacy']
+
+        part = self.get_forecast(dimension, kind='all', source=meta['source'])
+        restore = {v: k for k, v in legacy['rename'].items()}
+        restore['date'] = legacy['date_column']
+        part = part.rename(columns=restore)
+        part[legacy['date_column']] = part[legacy['date_column']].dt.strftime('%Y-%m-%d')
+        part = part[legacy['columns']].reset_index(drop=True)
+        # 저장 과정의 dtype 변화 복원 (이전 버전 파티션 호환)
+        for col, dtype in legacy.get('dtypes', {}).items():
+            if str(part[col].dtype) != dtype:
+                part[col] = part[col].astype(dtype)
+        return part
+
+    def export_legacy(self, dimension: Optional[str] = None, source: Optional[str] = None) -> List[Path]:
+        """기존 CSV 재생성"""
+        written = []
+        for pid in self.partitions(dimension, source):
+            meta = self.manifest[pid]
+            legacy_path = meta['legacy'].get('path')
+            if not legacy_path:
+                continue
+            df = self.view(meta['dimension'], meta['source'])
+            Path(legacy_path).parent.mkdir(parents=True, exist_ok=True)
+            df.to_csv(legacy_path, index=False, encoding=meta['legacy']['encoding'])
+            written.append(Path(legacy_path))
+        return written
+
+
+def publish_forecast(frame: pd.DataFrame, store: ForecastStore, source: str, dimension: str,
+                     key_columns: Optional[List[str]] = None, legacy_path: Optional[Path] = None,
+                     date_column: str = '일자', default_model: Optional[str] = None,
+                     encoding: str = 'utf-8-sig', write_legacy: Optional[bool] = None) -> None:
+    """
+    예측 결과를 통합 저장소에 저장하고, 설정에 따라 기존 CSV도 저장
+
+    write_legacy가 None이면 clients.json defaults.forecast.legacyCsv를 따릅니다.
+    """
+    store.write(frame, source, dimension, key_columns=key_columns, date_column=date_column,
+                default_model=default_model, legacy_path=legacy_path, encoding=encoding)
+
+    if write_legacy is None:
+        write_legacy = legacy_csv_enabled()
+    if write_legacy and legacy_path is not None:
+        frame.to_csv(legacy_path, index=False, encoding=encoding)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='통합 예측 저장소 → 기존 CSV 재생성')
+    parser.add_argument('--client', type=str, default=None, help='클라이언트 ID (멀티클라이언트 모드)')
+    parser.add_argument('--dimension', type=str, default=None, help='차원 이름 (기본 전체)')
+    parser.add_argument('--source', type=str, default=None, help='생성 단계 (기본 전체)')
+    args = parser.parse_args()
+
+    store = ForecastStore.for_paths(ClientPaths(args.client) if args.client else None)
+    print(f"저장소: {store.root} (파티션 {len(store.manifest)}개)")
+    for path in store.export_legacy(args.dimension, args.source):
+        print(f"  ✓ {path}")
@@ -0,0 +1,297 @@
+"""
+GA4 일별 rollup 큐브 (GA4 Rollup)
+
+GA4_data.csv(channel × category × funnel × Day × Session source/medium/campaign × Event name)를
+퍼널/참여도 단계가 쓰는 그룹핑 세트별 일 단위 합계로 1회 집계해 저장합니다.
+원시 행은 트래픽에 비례해 늘어나지만 rollup은 일수 × 채널(캠페인) 수에만 비례합니다.
+
+- 키 컬럼은 1회만 범주 코드로 변환(factorize)하고, 그룹핑 세트마다 코드 조합(정수 키)으로 합계
+- 모든 그룹핑 세트에 Day가 포함되므로 최근 N일 윈도우는 rollup 행 필터 후 재집계로 계산
+  (정수 지표는 원본 합계와 동일, 실수 지표는 합산 순서 차이로 마지막 자리가 다를 수 있음)
+- 결측 키도 하나의 값으로 보존 (이후 groupby가 원본과 같은 기준으로 제외)
+- 저장: GA4/rollup/manifest.json + 테이블 파일 (pyarrow 없으면 .pkl)
+- fetch_ga4_sheets.py가 수집 직후 build_rollup_file()로 생성하고,
+  퍼널/참여도 단계는 load_or_build()로 읽습니다 (원본 파일 식별값이 다르면 다시 생성)
+
+그룹핑 세트:
+- day_funnel: Day (+ week) × funnel → Total users, New users, Event count, Event value, Sessions, 원본 행 수
+- channel_day_funnel: channel × Day × funnel → Total users, Event value
+- campaign_day_funnel: Session campaign × Day × funnel → Total users, Event value
+- channel_day_engagement: channel × Day → Sessions, Engaged sessions, Total users, New users, 세션 시간 합계
+- channel_day_category: channel × Day → 첫 category (원본 행 순서 기준)
+
+사용법:
+    from scripts.common.ga4_rollup import GA4Rollup
+
+    rollup = GA4Rollup.load_or_build(paths.ga4_data)
+    recent = rollup.window(30)                                   # 최근 30일 (last_days와 동일 기준)
+    daily = recent.table('day_funnel').groupby(['Day', 'funnel'])[['Total users']].sum()
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.common.dimension_cube import file_signature
+
+# Parquet 가용성 체크 (없으면 pickle 테이블 사용)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+ROLLUP_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# 파생 지표: 세션 시간 합계 (Average session duration × Sessions, 세션 가중 평균의 분자)
+SESSION_DURATION_TOTAL = 'Session duration total'
+# day_funnel의 원본 행 수 컬럼
+ROW_COUNT = 'rows'
+
+# 그룹핑 세트: {이름: (키 컬럼, 지표 컬럼)} - 원본에 없는 키/지표는 제외
+GROUPING_SETS: Dict[str, Any] = {
+    'day_funnel': (['Day', 'week', 'funnel'],
+                   ['Total users', 'New users', 'Event count', 'Event value', 'Sessions', ROW_COUNT]),
+    'channel_day_funnel': (['channel', 'Day', 'funnel'], ['Total users', 'Event value']),
+    'campaign_day_funnel': (['Session campaign', 'Day', 'funnel'], ['Total users', 'Event value']),
+    'channel_day_engagement': (['channel', 'Day'],
+                               ['Sessions', 'Engaged sessions', 'Total users', 'New users', SESSION_DURATION_TOTAL]),
+}
+CATEGORY_TABLE = 'channel_day_category'
+
+
+def read_ga4_file(ga4_file: Path) -> pd.DataFrame:
+    """GA4_data.csv 로드 (퍼널 단계와 같은 규칙: Day/week 날짜 변환)"""
+    df = pd.read_csv(ga4_file, encoding='utf-8-sig')
+    df['Day'] = pd.to_datetime(df['Day'])
+    if 'week' in df.columns:
+        df['week'] = pd.to_datetime(df['week'])
+    return df
+
+
+def build_rollup_file(ga4_file: Path) -> Dict[str, Any]:
+    """
+    수집 직후 GA4_data.csv로 rollup 생성 (GA4/rollup/에 저장)
+
+    Returns:
+        생성 결과 요약 (원본 행 수, 테이블별 행 수, 소요 시간)
+    """
+    started = time.time()
+    ga4_file = Path(ga4_file)
+    df = read_ga4_file(ga4_file)
+    rollup = GA4Rollup.build(df, source=file_signature(ga4_file))
+    rollup.save(default_root(ga4_file))
+    return {
+        'source_rows': len(df),
+        'tables': {name: len(table) for name, table in rollup.tables.items()},
+        'seconds': round(time.time() - started, 3),
+    }
+
+
+def default_root(ga4_file: Path) -> Path:
+    """GA4_data.csv 옆 rollup 디렉토리"""
+    return Path(ga4_file).parent / 'rollup'
+
+
+class GA4Rollup:
+    """GA4 그룹핑 세트별 일 단위 합계 테이블"""
+
+    def __init__(self, tables: Dict[str, pd.DataFrame], source: Optional[List[int]] = None):
+        """
+        Args:
+            tables: {그룹핑 세트 이름: 집계 DataFrame}
+            source: 원본 파일 식별값 (재생성 판단용)
+        """
+        self.tables = tables
+        self.source = source
+
+    # ===== 생성 =====
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, source: Optional[List[int]] = None) -> 'GA4Rollup':
+        """
+        GA4 원본으로 rollup 생성 (키 컬럼 범주 코드 1회 계산 → 그룹핑 세트별 정수 키 합계)
+
+        Args:
+            df: read_ga4_file()로 읽은 GA4 DataFrame (Day는 datetime)
+            source: 원본 파일 식별값
+        """
+        frame = df
+        if 'Average session duration' in df.columns and 'Sessions' in df.columns:
+            frame = df.assign(**{SESSION_DURATION_TOTAL: df['Average session duration'] * df['Sessions']})
+        frame = frame.assign(**{ROW_COUNT: np.ones(len(frame), dtype=np.int64)})
+
+        key_columns = list(dict.fromkeys(k for keys, _ in GROUPING_SETS.values() for k in keys))
+        key_columns += [c for c in ('category',) if c not in key_columns]
+        codes: Dict[str, np.ndarray] = {}
+        uniques: Dict[str, Any] = {}
+        for column in key_columns:
+            if column in frame.columns:
+                codes[column], uniques[column] = pd.factorize(frame[column], use_na_sentinel=False)
+
+        tables = {}
+        for name, (keys, measures) in GROUPING_SETS.items():
+            keys = [k for k in keys if k in codes]
+            measures = [m for m in measures if m in frame.columns]
+            if 'Day' not in keys or not measures:
+                continue
+            tables[name] = cls._aggregate(frame, keys, measures, codes, uniques)
+
+        if 'channel' in codes and 'category' in codes:
+            tables[CATEGORY_TABLE] = cls._first_category(frame, codes, uniques)
+
+        return cls(tables, source)
+
+    @staticmethod
+    def _group_codes(keys: List[str], codes: Dict[str, np.ndarray], uniques: Dict[str, Any]) -> np.ndarray:
+        """키 컬럼 코드 조합 → 단일 정수 키"""
+        combined = np.zeros(len(codes[keys[0]]), dtype=np.int64)
+        for key in keys:
+            combined = combined * len(uniques[key]) + codes[key]
+        return combined
+
+    @classmethod
+    def _decode(cls, group_keys: np.ndarray, keys: List[str], uniques: Dict[str, Any]) -> Dict[str, Any]:
+        """단일 정수 키 → 키 컬럼 값"""
+        columns = {}
+        remainder = group_keys
+        for key in reversed(keys):
+            size = len(uniques[key])
+            columns[key] = uniques[key].take(remainder % size)
+            remainder = remainder // size
+        return {key: columns[key] for key in keys}
+
+    @classmethod
+    def _aggregate(cls, frame: pd.DataFrame, keys: List[str], measures: List[str],
+                   codes: Dict[str, np.ndarray], uniques: Dict[str, Any]) -> pd.DataFrame:
+        """그룹핑 세트 합계 (키 정렬)"""
+        group_keys = cls._group_codes(keys, codes, uniques)
+        sums = frame[measures].groupby(group_keys, sort=False).sum()
+        table = pd.DataFrame(cls._decode(sums.index.to_numpy(), keys, uniques))
+        for measure in measures:
+            table[measure] = sums[measure].to_numpy()
+        return table.sort_values(keys, kind='mergesort', na_position='last').reset_index(drop=True)
+
+    @classmethod
+    def _first_category(cls, frame: pd.DataFrame, codes: Dict[str, np.ndarray],
+                        uniques: Dict[str, Any]) -> pd.DataFrame:
+        """channel × Day별 첫 category와 그 원본 행 위치 (category 결측 행 제외)"""
+        valid = ~pd.isna(frame['category']).to_numpy()
+        positions = np.flatnonzero(valid)
+        group_keys = cls._group_codes(['channel', 'Day'], codes, uniques)[valid]
+        first = pd.Series(positions).groupby(group_keys, sort=False).min()
+        table = pd.DataFrame(cls._decode(first.index.to_numpy(), ['channel', 'Day'], uniques))
+        table['category'] = frame['category'].to_numpy()[first.to_numpy()]
+        table['first_row'] = first.to_numpy()
+        return table.sort_values('first_row', kind='mergesort').reset_index(drop=True)
+
+    # ===== 저장/로드 =====
+
+    def save(self, root: Path) -> Path:
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        files = {}
+        for name, table in self.tables.items():
+            file_name = f"{name}.{'parquet' if PARQUET_AVAILABLE else 'pkl'}"
+            if PARQUET_AVAILABLE:
+                table.to_parquet(root / file_name, index=False)
+            else:
+                table.to_pickle(root / file_name)
+            files[name] = file_name
+        manifest = {
+            'version': ROLLUP_VERSION,
+            'source_file': self.source,
+            'tables': files,
+            'rows': {name: len(table) for name, table in self.tables.items()},
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        with open(root / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return root
+
+    @classmethod
+    def load(cls, root: Path) -> Optional['GA4Rollup']:
+        """저장된 rollup 로드 (없거나 버전이 다르거나 테이블 파일이 없으면 None)"""
+        manifest_file = Path(root) / MANIFEST_NAME
+        if not manifest_file.exists():
+            return None
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != ROLLUP_VERSION:
+                return None
+            tables = {}
+            for name, file_name in manifest.get('tables', {}).items():
+                file_path = Path(root) / file_name
+                if file_path.suffix == '.parquet':
+                    tables[name] = pd.read_parquet(file_path)
+                else:
+                    tables[name] = pd.read_pickle(file_path)
+        except (OSError, ValueError, ImportError, EOFError, AttributeError):
+            return None
+        return cls(tables, manifest.get('source_file'))
+
+    @classmethod
+    def load_or_build(cls, ga4_file: Path, root: Optional[Path] = None) -> 'GA4Rollup':
+        """
+        저장된 rollup이 원본 파일과 일치하면 로드, 아니면 원본으로 다시 생성해 저장
+
+        Args:
+            ga4_file: GA4_data.csv 경로
+            root: rollup 디렉토리 (None이면 GA4_data.csv 옆 rollup/)
+        """
+        root = Path(root) if root else default_root(ga4_file)
+        source = file_signature(ga4_file)
+        rollup = cls.load(root)
+        if rollup is not None and rollup.source == source:
+            return rollup
+        rollup = cls.build(read_ga4_file(ga4_file), source=source)
+        try:
+            rollup.save(root)
+        except OSError as e:
+            print(f"   ⚠️ GA4 rollup 저장 실패 (메모리 rollup 사용): {e}")
+        return rollup
+
+    # ===== 조회 =====
+
+    def has(self, name: str) -> bool:
+        return name in self.tables
+
+    def table(self, name: str) -> pd.DataFrame:
+        return self.tables[name]
+
+    @property
+    def source_rows(self) -> int:
+        """집계에 포함된 원본 행 수"""
+        return int(self.tables['day_funnel'][ROW_COUNT].sum()) if self.has('day_funnel') else 0
+
+    @property
+    def max_day(self) -> Optional[pd.Timestamp]:
+        if not self.has('day_funnel'):
+            return None
+        day = self.tables['day_funnel']['Day'].max()
+        return None if pd.isna(day) else day
+
+    def window(self, days: int) -> 'GA4Rollup':
+        """
+        최근 N일 rollup (최대 일자 - N일 이상, last_days와 동일 기준. days <= 0이면 전체)
+
+        Day가 결측인 행은 윈도우에서 제외됩니다.
+        """
+        if days <= 0 or self.max_day is None:
+            return self
+        cutoff = self.max_day - pd.Timedelta(days=days)
+        return GA4Rollup({name: table[(table['Day'] >= cutoff).to_numpy()].reset_index(drop=True)
+                          for name, table in self.tables.items()}, self.source)
+
+    def channel_categories(self) -> pd.DataFrame:
+        """채널별 첫 category 프레임 (channel, category) - 원본.groupby('channel')['category'].first()와 같은 결과"""
+        if not self.has(CATEGORY_TABLE):
+            return pd.DataFrame(columns=['channel', 'category'])
+        table = self.tables[CATEGORY_TABLE].sort_values('first_row', kind='mergesort')
+        return table.drop_duplicates('channel')[['channel', 'category']].reset_index(drop=True)
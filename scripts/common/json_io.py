@@ -0,0 +1,135 @@
+"""
+JSON 직렬화 공통 모듈 (JSON I/O)
+
+인사이트/내보내기 JSON을 한 곳에서 직렬화합니다 (스크립트별 NpEncoder/재귀 정리 함수 대체).
+- NaN/Inf → null, numpy 스칼라/배열 → Python 값, DataFrame → 레코드 목록, Series → 목록,
+  Timestamp/datetime → ISO 문자열 (NaT → null)
+- 타입 분기는 type() 조회 1회로 처리 (str/int/float/dict/list는 isinstance 체인 없이 통과)
+- pretty 모드 (기본, 디버깅용): indent=2, ensure_ascii=False 표준 json 출력 (기존 파일과 바이트 동일)
+- compact 모드 (운영용): 공백 없는 출력, orjson이 있으면 orjson, 없으면 표준 json C 인코더
+  (orjson은 실수 표기가 표준 json과 달라(1.5e-05 → 0.000015, 1e+16 → 1e16) pretty 모드에는 쓰지 않음)
+
+사용법:
+    from scripts.common.json_io import write_json
+
+    write_json(insights, output_file)                   # pretty (기존 형식)
+    write_json(kpi_data, output_file, compact=True)     # compact (운영 배포용)
+"""
+
+import json
+import math
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# orjson 가용성 체크 (없으면 표준 json 사용)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def to_builtin(obj: Any) -> Any:
+    """
+    JSON 직렬화 가능한 Python 기본 타입으로 변환 (NaN/Inf → None)
+
+    변환할 수 없는 객체는 그대로 반환합니다 (직렬화 시 TypeError).
+    """
+    kind = type(obj)
+    if kind is str or kind is int or kind is bool or obj is None:
+        return obj
+    if kind is float:
+        return obj if math.isfinite(obj) else None
+    if kind is dict:
+        return {key if type(key) is str else _key(key): to_builtin(value) for key, value in obj.items()}
+    if kind is list or kind is tuple:
+        return [to_builtin(item) for item in obj]
+    return _convert(obj)
+
+
+def _key(key: Any) -> Any:
+    """dict 키 (numpy 스칼라 키는 Python 값으로)"""
+    return key.item() if isinstance(key, np.generic) else key
+
+
+def _convert(obj: Any) -> Any:
+    """기본 타입이 아닌 값 변환 (numpy/pandas/datetime, dict/list 하위 클래스)"""
+    if isinstance(obj, np.generic):
+        if isinstance(obj, np.datetime64):
+            return None if np.isnat(obj) else pd.Timestamp(obj).isoformat()
+        if isinstance(obj, np.floating):
+            return float(obj) if np.isfinite(obj) else None
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return to_builtin(obj.tolist())
+    if isinstance(obj, pd.DataFrame):
+        return to_builtin(obj.to_dict('records'))
+    if isinstance(obj, pd.Series):
+        return to_builtin(obj.tolist())
+    if isinstance(obj, (datetime, date)):
+        return None if obj is pd.NaT else obj.isoformat()
+    if isinstance(obj, dict):
+        return {_key(key): to_builtin(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_builtin(item) for item in obj]
+    if isinstance(obj, float):
+        return float(obj) if math.isfinite(obj) else None
+    if isinstance(obj, int):
+        return int(obj)
+    if obj is pd.NA:
+        return None
+    return obj
+
+
+def _orjson_default(obj: Any) -> Any:
+    converted = to_builtin(obj)
+    if converted is obj:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return converted
+
+
+def dumps(data: Any, compact: bool = False) -> str:
+    """
+    JSON 문자열 생성
+
+    Args:
+        data: 직렬화할 데이터 (dict/list, numpy/pandas 값 포함 가능)
+        compact: True면 공백 없는 운영용 출력, False면 indent=2 출력
+    """
+    if compact:
+        if ORJSON_AVAILABLE:
+            return _orjson_dumps(data).decode('utf-8')
+        return json.dumps(to_builtin(data), ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(to_builtin(data), ensure_ascii=False, indent=2)
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    # datetime은 default로 넘겨 표준 경로와 같은 isoformat/NaT 처리
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    try:
+        return orjson.dumps(data, default=_orjson_default, option=option)
+    except orjson.JSONEncodeError:
+        # numpy 스칼라 dict 키 등 orjson이 직접 처리하지 못하는 값 → 변환 후 재시도
+        return orjson.dumps(to_builtin(data), default=_orjson_default, option=option)
+
+
+def write_json(data: Any, file_path: Path, compact: bool = False) -> Path:
+    """
+    JSON 파일 저장 (UTF-8)
+
+    Args:
+        data: 저장할 데이터
+        file_path: 출력 경로 (상위 디렉토리는 호출 측에서 생성)
+        compact: True면 공백 없는 운영용 출력, False면 indent=2 출력 (기존 파일과 동일)
+    """
+    file_path = Path(file_path)
+    if compact and ORJSON_AVAILABLE:
+        file_path.write_bytes(_orjson_dumps(data))
+    else:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(dumps(data, compact))
+    return file_path
@@ -0,0 +1,232 @@
+"""
+차원 라벨 정규화 모듈 (성별/연령/기기유형/기기플랫폼)
+
+- 통합 매핑 테이블(GENDER_MAP, AGE_MAP, DEVICE_MAP, PLATFORM_MAP)과 성별/연령 유효성 판정을 한 곳에서 관리
+- 컬럼을 범주(categorical)로 변환해 고유값(범주) 단위로만 매핑/판정한 뒤 코드로 전체 행에 펼침 (행 단위 apply 없음)
+- multi_analysis_dimension_detail.py가 차원 테이블 생성 시 통합 컬럼(성별_통합 등)과
+  유효 플래그(성별_유효/연령_유효, bool)를 함께 저장하므로, 인사이트 생성 단계는 저장된 플래그를 그대로 사용
+
+사용법:
+    from scripts.common.normalization import apply_gender_mapping, valid_gender_flags, normalize_gender_values
+
+    table = apply_gender_mapping(table)                      # 성별_통합 컬럼 추가
+    table = apply_validity_flags(table)                      # 성별_유효/연령_유효 컬럼 추가
+    valid = table[valid_gender_flags(table, '성별_통합')]     # 저장된 플래그 우선, 없으면 범주 단위 판정
+    labels = normalize_gender_values(forecast['성별_통합'])   # '남성'/'여성'/원본값, 알수없음은 None
+"""
+
+import re
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# 통합 매핑 (data_mapping_guide.md 기준)
+# ============================================================================
+GENDER_MAP = {
+    # 남성 통합
+    'MALE': '남성',
+    'male': '남성',
+    'Male': '남성',
+    '남자': '남성',
+    # 여성 통합
+    'FEMALE': '여성',
+    'female': '여성',
+    'Female': '여성',
+    '여자': '여성',
+    # 알 수 없음 통합
+    'UNDETERMINED': '알 수 없음',
+    'Unknown': '알 수 없음'
+}
+
+AGE_MAP = {
+    # 영문 → 한글 변환
+    'AGE_RANGE_18_24': '19세 ~ 24세',
+    '18-24': '19세 ~ 24세',
+    'AGE_RANGE_25_34': '25세 ~ 34세',
+    '25-34': '25세 ~ 34세',
+    'AGE_RANGE_35_44': '35세 ~ 44세',
+    '35-44': '35세 ~ 44세',
+    'AGE_RANGE_45_54': '45세 ~ 54세',
+    '45-54': '45세 ~ 54세',
+    'AGE_RANGE_55_64': '55세 ~ 64세',
+    '55-64': '55세 ~ 64세',
+    'AGE_RANGE_65_UP': '65세 이상',
+    '65+': '65세 이상',
+    'AGE_RANGE_UNDETERMINED': '알 수 없음',
+    'Unknown': '알 수 없음',
+    # 한글 세부 연령대 → 10세 단위 통합
+    '25세 ~ 29세': '25세 ~ 34세',
+    '30세 ~ 34세': '25세 ~ 34세',
+    '35세 ~ 39세': '35세 ~ 44세',
+    '40세 ~ 44세': '35세 ~ 44세',
+    '45세 ~ 49세': '45세 ~ 54세',
+    '50세 ~ 54세': '45세 ~ 54세',
+    '55세 ~ 59세': '55세 ~ 64세',
+    '60세 ~ 99세': '65세 이상'
+}
+
+# 기기유형 통합 매핑
+DEVICE_MAP = {
+    # 안드로이드 (Meta)
+    'Android Smartphone': '안드로이드',
+    'Android Tablet': '안드로이드',
+    # 애플 (Meta)
+    'iPhone': '애플',
+    'iPad': '애플',
+    # 모바일 (Google Ads - OS 구분 불가)
+    'Mobile phones': '모바일',
+    'Tablets': '모바일',
+    # 웹/데스크톱
+    'Computers': '웹',
+    'Desktop': '웹',
+    # TV
+    'TV screens': 'TV'
+}
+
+# 기기플랫폼 통합 매핑
+# 기기유형 '모바일'과 혼동 방지를 위해 'Mobile web' → '모바일웹'으로 명명
+PLATFORM_MAP = {
+    'Mobile app': '앱',
+    'Mobile web': '모바일웹',
+    'Desktop': '웹',
+    'PC': '웹',
+    'pc': '웹'
+}
+
+# 유효 플래그 컬럼 (차원 테이블에 bool로 저장)
+GENDER_VALID = '성별_유효'
+AGE_VALID = '연령_유효'
+
+# 알수없음/남성/여성 판정 패턴
+UNKNOWN_PATTERN = re.compile(r'^(구분없음|알\s?수\s?없음|un.*|unknown)$', re.IGNORECASE)
+MALE_PATTERN = re.compile(r'^(남자|남성|male|m)$', re.IGNORECASE)
+FEMALE_PATTERN = re.compile(r'^(여자|여성|female|f)$', re.IGNORECASE)
+
+
+# ============================================================================
+# 값 단위 판정
+# ============================================================================
+def normalize_gender(gender_value):
+    """성별 값을 정규화하고 알수없음은 None 반환"""
+    if pd.isna(gender_value) or gender_value == '-':
+        return None
+
+    gender_str = str(gender_value).strip().lower()
+
+    if UNKNOWN_PATTERN.match(gender_str):
+        return None
+    if MALE_PATTERN.match(gender_str):
+        return '남성'
+    if FEMALE_PATTERN.match(gender_str):
+        return '여성'
+
+    # 그 외는 원본 반환 (필요시 추가 처리)
+    return gender_value
+
+
+def is_valid_gender(gender_value):
+    """유효한 성별 데이터인지 확인 (알수없음 제외)"""
+    return normalize_gender(gender_value) is not None
+
+
+def is_valid_age(age_value):
+    """유효한 연령 데이터인지 확인 (알수없음 제외)"""
+    if pd.isna(age_value) or age_value == '-':
+        return False
+    return not UNKNOWN_PATTERN.match(str(age_value).strip().lower())
+
+
+# ============================================================================
+# 범주 단위 매핑 (컬럼 전체)
+# ============================================================================
+def map_categories(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """범주(고유값) 단위로 func를 적용한 뒤 전체 행으로 펼침 (결측값은 그대로 유지)"""
+    categorical = pd.Categorical(series)
+    mapped = func(pd.Series(categorical.categories))
+    return pd.Series(mapped.array.take(categorical.codes, allow_fill=True), index=series.index)
+
+
+def _flags(series: pd.Series, predicate: Callable) -> pd.Series:
+    """범주 단위 판정 결과 bool Series (결측값은 predicate(NaN) 결과)"""
+    categorical = pd.Categorical(series)
+    flags = np.fromiter((predicate(value) for value in categorical.categories), dtype=bool,
+                        count=len(categorical.categories))
+    result = np.full(len(series), bool(predicate(np.nan)))
+    present = categorical.codes >= 0
+    result[present] = flags[categorical.codes[present]]
+    return pd.Series(result, index=series.index)
+
+
+def normalize_gender_values(series: pd.Series) -> pd.Series:
+    """성별 컬럼 정규화 ('남성'/'여성'/원본값, 알수없음·결측은 None)"""
+    return map_categories(series, lambda values: values.map(normalize_gender).astype(object))
+
+
+def valid_gender_mask(series: pd.Series) -> pd.Series:
+    """성별 유효 여부 (범주 단위 판정)"""
+    return _flags(series, is_valid_gender)
+
+
+def valid_age_mask(series: pd.Series) -> pd.Series:
+    """연령 유효 여부 (범주 단위 판정)"""
+    return _flags(series, is_valid_age)
+
+
+def valid_gender_flags(df: pd.DataFrame, gender_col: str) -> pd.Series:
+    """성별 유효 플래그 (차원 테이블에 저장된 성별_유효 우선, 없으면 범주 단위 판정)"""
+    if gender_col == '성별_통합' and GENDER_VALID in df.columns:
+        return df[GENDER_VALID].astype(bool)
+    return valid_gender_mask(df[gender_col])
+
+
+def valid_age_flags(df: pd.DataFrame, age_col: str) -> pd.Series:
+    """연령 유효 플래그 (차원 테이블에 저장된 연령_유효 우선, 없으면 범주 단위 판정)"""
+    if age_col == '연령_통합' and AGE_VALID in df.columns:
+        return df[AGE_VALID].astype(bool)
+    return valid_age_mask(df[age_col])
+
+
+# ============================================================================
+# 차원 테이블 통합 컬럼 / 유효 플래그
+# ============================================================================
+def apply_gender_mapping(df):
+    """성별 통합 컬럼 추가"""
+    if '성별' in df.columns:
+        # 매핑되지 않은 값은 원본 유지
+        df['성별_통합'] = map_categories(df['성별'], lambda values: values.replace(GENDER_MAP))
+    return df
+
+
+def apply_age_mapping(df):
+    """연령 통합 컬럼 추가"""
+    if '연령' in df.columns:
+        # 매핑되지 않은 값은 원본 유지 (이미 통합 형식인 경우)
+        df['연령_통합'] = map_categories(df['연령'], lambda values: values.replace(AGE_MAP))
+    return df
+
+
+def apply_device_mapping(df):
+    """기기유형 통합 컬럼 추가"""
+    if '기기유형' in df.columns:
+        # 매핑되지 않은 값은 원본 유지
+        df['기기유형_통합'] = map_categories(df['기기유형'], lambda values: values.replace(DEVICE_MAP))
+    return df
+
+
+def apply_platform_mapping(df):
+    """기기플랫폼 통합 컬럼 추가"""
+    if '기기플랫폼' in df.columns:
+        # 매핑되지 않은 값은 원본 유지
+        df['기기플랫폼_통합'] = map_categories(df['기기플랫폼'], lambda values: values.replace(PLATFORM_MAP))
+    return df
+
+
+def apply_validity_flags(df):
+    """성별_유효/연령_유효 플래그 컬럼 추가 (통합 컬럼 기준, 알수없음·결측은 False)"""
+    if '성별_통합' in df.columns:
+        df[GENDER_VALID] = valid_gender_mask(df['성별_통합'])
+    if '연령_통합' in df.columns:
+        df[AGE_VALID] = valid_age_mask(df['연령_통합'])
+    return df
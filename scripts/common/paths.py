@@ -105,6 +105,10 @@ class ClientPaths:
     def forecast_insights_json(self) -> Path:
         return self.forecast / 'insights.json'
 
+    @property
+    def forecast_store(self) -> Path:
+        return self.forecast / 'store'
+
     # ===== Funnel =====
     @property
     def daily_funnel(self) -> Path:
@@ -130,6 +134,18 @@ class ClientPaths:
     def channel_engagement(self) -> Path:
         return self.funnel / 'channel_engagement.csv'
 
+    @property
+    def channel_engagement_by_period(self) -> Path:
+        return self.funnel / 'channel_engagement_by_period.csv'
+
+    @property
+    def cohort_retention(self) -> Path:
+        return self.funnel / 'cohort_retention.csv'
+
+    @property
+    def cohort_curves(self) -> Path:
+        return self.funnel / 'cohort_curves.csv'
+
     @property
     def funnel_insights_json(self) -> Path:
         return self.funnel / 'insights.json'
@@ -167,6 +183,10 @@ class ClientPaths:
     def dimension_type7(self) -> Path:
         return self.type / 'dimension_type7_adset_deviceplatform.csv'
 
+    @property
+    def dimension_cube(self) -> Path:
+        return self.type / 'dimension_cube.pkl'
+
     @property
     def type_insights_json(self) -> Path:
         return self.type / 'insights.json'
@@ -185,6 +205,14 @@ class ClientPaths:
     def ga4_data(self) -> Path:
         return self.ga4 / 'GA4_data.csv'
 
+    @property
+    def ga4_rollup(self) -> Path:
+        return self.ga4 / 'rollup'
+
+    @property
+    def ga4_user_events(self) -> Path:
+        return self.ga4 / 'GA4_user_events.csv'
+
     # ===== Statistics =====
     @property
     def statistics_json(self) -> Path:
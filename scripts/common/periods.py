@@ -0,0 +1,22 @@
+"""
+분석 기간 설정 (Periods)
+
+퍼널 멀티기간 인사이트와 채널 참여도 기간별 집계가 같은 기간 윈도우를 쓰도록 공유합니다.
+- key: 출력 JSON/CSV의 기간 키
+- days: 최근 N일 (0 = 전체 기간, last_days/GA4Rollup.window와 같은 기준)
+- label: 화면 표시용 이름
+
+사용법:
+    from scripts.common.periods import FUNNEL_PERIODS
+
+    for period in FUNNEL_PERIODS:
+        recent = rollup.window(period['days'])
+"""
+
+# 퍼널/참여도 기간 (전체, 180일, 90일, 30일)
+FUNNEL_PERIODS = [
+    {'key': 'full', 'days': 0, 'label': '전체 기간'},
+    {'key': '180d', 'days': 180, 'label': '최근 180일'},
+    {'key': '90d', 'days': 90, 'label': '최근 90일'},
+    {'key': '30d', 'days': 30, 'label': '최근 30일'}
+]
@@ -0,0 +1,207 @@
+"""
+인사이트 레코드 빌더 (Record Builder)
+
+집계된 KPI DataFrame을 필드 스펙에 따라 JSON 인사이트 레코드 목록(list of dict)으로 변환합니다.
+iterrows() 행 단위 루프 대신 컬럼 단위로 값을 한 번에 변환(float 캐스팅, 반올림, 등급 판정,
+문자열 템플릿)한 뒤 레코드를 조립합니다.
+
+필드 스펙:
+- col(컬럼): 컬럼 값 (기본 float 변환). default=컬럼이 없을 때 상수, optional=컬럼이 없으면 키 생략
+- const(값): 모든 레코드에 같은 값
+- template('{연령} {성별} 타겟'): 컬럼 값을 채운 문자열 (서식 지정자 없이 {컬럼}만 지원)
+- levels(컬럼, 규칙, 기본값): 임계값 규칙에 따른 등급 라벨 (위에서부터 처음 만족하는 규칙)
+
+레코드 키 순서는 fields 순서를 따릅니다.
+
+사용법:
+    from scripts.common.record_builder import build_records, col, const, levels, template
+
+    records = build_records(summary, {
+        'brand': col('브랜드명', cast=None),
+        'campaign_type': const('전환'),
+        'cost': col('비용'),
+        'roas': col('ROAS', fillna=0),
+        'clicks': col('클릭', optional=True),
+        'performance_level': levels('ROAS', [('>', 1000, '우수'), ('>', 200, '양호')], '개선 필요'),
+        'recommendation': template('{브랜드명} 예산 확대를 검토하세요'),
+    }, top=10, by='ROAS')
+"""
+
+import operator
+import string
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+# levels() 비교 연산자
+_OPERATORS: Dict[str, Callable] = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    """컬럼 값 필드"""
+    column: str
+    cast: Optional[type] = float
+    fillna: Any = None
+    digits: Optional[int] = None
+    default: Any = _MISSING
+    optional: bool = False
+
+
+@dataclass(frozen=True)
+class Constant:
+    """상수 필드"""
+    value: Any
+
+
+@dataclass(frozen=True)
+class Template:
+    """문자열 템플릿 필드"""
+    fmt: str
+
+
+@dataclass(frozen=True)
+class Levels:
+    """임계값 등급 필드"""
+    column: str
+    rules: Tuple[Tuple[str, float, Any], ...]
+    default: Any
+
+
+def col(column: str, cast: Optional[type] = float, fillna: Any = None, digits: Optional[int] = None,
+        default: Any = _MISSING, optional: bool = False) -> Column:
+    """
+    컬럼 값 필드
+
+    Args:
+        column: 원본 컬럼명
+        cast: 변환 타입 (float/int/str, None이면 원본 값 그대로)
+        fillna: 결측값 대체값 (None이면 결측 유지)
+        digits: 반올림 자릿수 (float 변환 후 적용)
+        default: 컬럼이 없을 때 모든 레코드에 넣을 값
+        optional: 컬럼이 없으면 레코드에서 키 생략
+    """
+    return Column(column, cast, fillna, digits, default, optional)
+
+
+def const(value: Any) -> Constant:
+    """모든 레코드에 같은 값을 넣는 필드"""
+    return Constant(value)
+
+
+def template(fmt: str) -> Template:
+    """'{컬럼}' 자리에 컬럼 값을 채운 문자열 필드"""
+    return Template(fmt)
+
+
+def levels(column: str, rules: Sequence[Tuple[str, float, Any]], default: Any) -> Levels:
+    """
+    임계값 등급 필드
+
+    Args:
+        column: 판정 컬럼
+        rules: [(연산자, 임계값, 라벨), ...] 위에서부터 처음 만족하는 규칙의 라벨 (연산자: > >= < <=)
+        default: 어떤 규칙도 만족하지 않을 때(결측 포함) 라벨
+    """
+    for op, _, _ in rules:
+        if op not in _OPERATORS:
+            raise ValueError(f"지원하지 않는 연산자: {op}")
+    return Levels(column, tuple(tuple(rule) for rule in rules), default)
+
+
+def _column_values(frame: pd.DataFrame, spec: Column) -> List[Any]:
+    series = frame[spec.column]
+    if spec.fillna is not None:
+        series = series.fillna(spec.fillna)
+    if spec.cast is None:
+        return series.tolist()
+    if spec.cast is str:
+        return series.astype(str).tolist()
+    values = series.to_numpy(dtype=spec.cast)
+    if spec.digits is not None:
+        values = np.round(values, spec.digits)
+    return values.tolist()
+
+
+def _template_values(frame: pd.DataFrame, spec: Template) -> List[str]:
+    result = np.full(len(frame), '', dtype=object)
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(spec.fmt):
+        if literal:
+            result = result + literal
+        if field_name is None:
+            continue
+        if format_spec or conversion:
+            raise ValueError(f"template은 서식 지정자를 지원하지 않습니다: {spec.fmt}")
+        result = result + frame[field_name].to_numpy(dtype=object).astype(str).astype(object)
+    return result.tolist()
+
+
+def _level_values(frame: pd.DataFrame, spec: Levels) -> List[Any]:
+    if not spec.rules:
+        return [spec.default] * len(frame)
+    values = frame[spec.column].to_numpy(dtype=float)
+    conditions = [_OPERATORS[op](values, threshold) for op, threshold, _ in spec.rules]
+    labels = [label for _, _, label in spec.rules]
+    return np.select(conditions, labels, default=spec.default).tolist()
+
+
+def build_records(frame: pd.DataFrame, fields: Mapping[str, Any], top: Optional[int] = None,
+                  by: Optional[str] = None, ascending: bool = False) -> List[Dict[str, Any]]:
+    """
+    KPI DataFrame → 인사이트 레코드 목록
+
+    Args:
+        frame: 집계된 KPI DataFrame (행 순서대로 레코드 생성)
+        fields: {출력 키: 필드 스펙} (col/const/template/levels)
+        top: 상위 N행만 사용 (by가 없으면 앞에서부터 N행)
+        by: top 기준 컬럼 (nlargest/nsmallest와 동일한 순서)
+        ascending: True면 by 값이 작은 순서 (nsmallest)
+
+    Returns:
+        [{출력 키: 값}, ...]
+    """
+    if top is not None:
+        if by is None:
+            frame = frame.head(top)
+        elif ascending:
+            frame = frame.nsmallest(top, by)
+        else:
+            frame = frame.nlargest(top, by)
+
+    n = len(frame)
+    if n == 0:
+        return []
+
+    keys = []
+    columns = []
+    for key, spec in fields.items():
+        if isinstance(spec, Column):
+            if spec.column in frame.columns:
+                values = _column_values(frame, spec)
+            elif spec.optional:
+                continue
+            elif spec.default is not _MISSING:
+                values = [spec.default] * n
+            else:
+                raise KeyError(spec.column)
+        elif isinstance(spec, Constant):
+            values = [spec.value] * n
+        elif isinstance(spec, Template):
+            values = _template_values(frame, spec)
+        elif isinstance(spec, Levels):
+            values = _level_values(frame, spec)
+        else:
+            raise TypeError(f"알 수 없는 필드 스펙: {key}={spec!r}")
+        keys.append(key)
+        columns.append(values)
+
+    return [dict(zip(keys, row)) for row in zip(*columns)]
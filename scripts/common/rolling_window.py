@@ -0,0 +1,78 @@
+"""
+롤링 윈도우 비교 커널 (Rolling Window)
+
+일별 시계열 프레임(행=날짜순, 열=지표/퍼널 단계/채널×단계)의 최근 구간 평균을
+(window, lag) 조합별로 한 번에 계산합니다.
+- 열마다 마지막 행부터의 누적합(유효값 합/개수)을 1회 계산
+- (window, lag) = 마지막 lag행을 제외한 직전 window행 → 누적합 차이로 O(1)
+  · (7, 0) = tail(7), (7, 7) = iloc[-14:-7], (7, 30) = iloc[-37:-30]
+- pandas mean()/sum()과 같은 의미: 결측 제외, 데이터보다 긴 구간은 있는 행만 사용,
+  유효값이 없으면 mean은 NaN, sum은 0
+- 정수 지표는 슬라이스 계산과 같은 값, 실수 지표는 합산 순서 차이로 마지막 자리가 다를 수 있음
+
+사용법:
+    from scripts.common.rolling_window import window_compare
+
+    means = window_compare(daily_pivot[['유입', '활동']], windows=[7, 30], lags=[0, 7, 30])
+    recent, previous = means.loc['유입', (7, 0)], means.loc['유입', (7, 7)]
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def window_compare(series_frame: pd.DataFrame, windows: Iterable[int], lags: Iterable[int],
+                   how: str = 'mean') -> pd.DataFrame:
+    """
+    (window, lag) 조합별 구간 평균/합계
+
+    Args:
+        series_frame: 날짜순 정렬된 일별 시계열 (열마다 하나의 시계열, 숫자형)
+        windows: 구간 길이(행 수) 목록
+        lags: 마지막 행에서 건너뛸 행 수 목록 (0 = 최근 구간)
+        how: 'mean' 또는 'sum'
+
+    Returns:
+        index=series_frame.columns, columns=MultiIndex(window, lag) DataFrame
+    """
+    if how not in ('mean', 'sum'):
+        raise ValueError(f"지원하지 않는 how: {how}")
+    windows, lags = list(windows), list(lags)
+
+    values = series_frame.to_numpy(dtype=np.float64)[::-1]
+    n = len(values)
+
+    # 마지막 행부터의 누적합 (0행 포함) - 무한대는 개수로 따로 세어 inf - inf 방지
+    finite = np.isfinite(values)
+    sums = _prefix(np.where(finite, values, 0.0))
+    counts = _prefix(~np.isnan(values))
+    pos_inf = _prefix(values == np.inf)
+    neg_inf = _prefix(values == -np.inf)
+
+    columns = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for window in windows:
+            for lag in lags:
+                start, end = min(lag, n), min(lag + window, n)
+                total = sums[end] - sums[start]
+                has_pos = pos_inf[end] > pos_inf[start]
+                has_neg = neg_inf[end] > neg_inf[start]
+                total = np.where(has_pos, np.inf, total)
+                total = np.where(has_neg, -np.inf, total)
+                total = np.where(has_pos & has_neg, np.nan, total)
+                if how == 'mean':
+                    count = counts[end] - counts[start]
+                    total = np.where(count > 0, total / np.where(count > 0, count, 1), np.nan)
+                columns[(window, lag)] = total
+
+    result = pd.DataFrame(columns, index=series_frame.columns)
+    result.columns = pd.MultiIndex.from_tuples(list(columns), names=['window', 'lag'])
+    return result
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    """0행을 앞에 붙인 열별 누적합"""
+    cumulative = np.cumsum(values, axis=0, dtype=np.float64)
+    return np.vstack([np.zeros((1, values.shape[1])), cumulative])
@@ -0,0 +1,142 @@
+"""
+선언형 인사이트 규칙 엔진 (Rules Engine)
+
+세그먼트 지표 테이블(행=세그먼트, 열=지표)에 대해 규칙을 선언하고 한 번에 평가합니다.
+- 규칙 = 벡터 조건(테이블 → bool 마스크) + 레코드 템플릿
+- 규칙마다 테이블 전체에 대해 마스크를 1회 계산 (세그먼트별 Python 루프 없음)
+- 레코드(dict)는 조건을 만족한 행에 대해서만 생성
+- 규칙별 평가 시간/발생 건수 기록 (report()로 출력)
+
+레코드 템플릿:
+- dict: {출력 키: 값} 값이 callable이면 row(dict)를 받아 계산, 아니면 상수
+- callable: row(dict) → 레코드 dict (None이면 생략)
+
+레코드 순서:
+- order='row' (기본): 행 순서대로, 같은 행 안에서는 규칙 순서 (기존 행 단위 루프와 동일)
+- order='rule': 규칙 순서대로, 같은 규칙 안에서는 행 순서
+
+exclusive=True면 if/elif 체인처럼 행마다 처음 만족한 규칙 하나만 발생합니다.
+
+사용법:
+    from scripts.common.rules_engine import Rule, RuleSet
+
+    rules = RuleSet([
+        Rule('roas_decline',
+             when=lambda t: t['roas_change'] < -10,
+             record={
+                 'type': 'roas_decline',
+                 'segment_value': lambda r: r['segment_value'],
+                 'message': lambda r: f"ROAS가 {r['actual_roas']:.0f}%에서 {r['forecast_roas']:.0f}%로 떨어질 전망입니다.",
+             }),
+    ])
+    alerts = rules.evaluate(table)
+    print(rules.report())
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+RecordTemplate = Union[Mapping[str, Any], Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """인사이트 규칙 (벡터 조건 + 레코드 템플릿)"""
+    name: str
+    when: Callable[[pd.DataFrame], Any]
+    record: RecordTemplate
+
+
+@dataclass
+class RuleTiming:
+    """규칙별 평가 결과"""
+    fired: int = 0
+    seconds: float = 0.0
+
+
+def _materialize(template: RecordTemplate, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if callable(template):
+        return template(row)
+    return {key: value(row) if callable(value) else value for key, value in template.items()}
+
+
+class RuleSet:
+    """규칙 묶음 평가기"""
+
+    def __init__(self, rules: Sequence[Rule], exclusive: bool = False):
+        """
+        Args:
+            rules: 평가 순서대로 나열한 규칙
+            exclusive: True면 행마다 처음 만족한 규칙만 발생 (if/elif 체인)
+        """
+        names = [rule.name for rule in rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"규칙 이름이 중복되었습니다: {names}")
+        self.rules = list(rules)
+        self.exclusive = exclusive
+        self.timings: Dict[str, RuleTiming] = {}
+
+    def masks(self, table: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """규칙별 bool 마스크 (결측 비교는 False, exclusive면 앞선 규칙과 겹치는 행 제외)"""
+        masks = {}
+        taken = np.zeros(len(table), dtype=bool)
+        for rule in self.rules:
+            start = time.perf_counter()
+            mask = np.zeros(len(table), dtype=bool)
+            if len(table):
+                mask = pd.Series(rule.when(table), index=table.index).fillna(False).to_numpy(dtype=bool)
+            if self.exclusive:
+                mask = mask & ~taken
+                taken |= mask
+            masks[rule.name] = mask
+            self.timings[rule.name] = RuleTiming(int(mask.sum()), time.perf_counter() - start)
+        return masks
+
+    def evaluate(self, table: pd.DataFrame, order: str = 'row') -> List[Dict[str, Any]]:
+        """
+        규칙 평가 → 레코드 목록
+
+        Args:
+            table: 세그먼트 지표 테이블
+            order: 'row' (행 우선) 또는 'rule' (규칙 우선)
+
+        Returns:
+            조건을 만족한 (행, 규칙)마다 생성한 레코드 목록
+        """
+        if order not in ('row', 'rule'):
+            raise ValueError(f"지원하지 않는 order: {order}")
+        self.timings = {}
+        masks = self.masks(table)
+
+        # 발생한 (행, 규칙) 위치
+        fired = [(np.flatnonzero(mask), index) for index, mask in enumerate(masks.values())]
+        positions = np.concatenate([rows for rows, _ in fired]) if fired else np.zeros(0, dtype=np.intp)
+        rule_ids = np.concatenate([np.full(len(rows), index) for rows, index in fired]) if fired \
+            else np.zeros(0, dtype=np.intp)
+        if len(positions) == 0:
+            return []
+        sequence = np.lexsort((rule_ids, positions)) if order == 'row' else np.arange(len(positions))
+
+        # 발생한 행만 dict로 변환
+        unique_rows = np.unique(positions)
+        rows = dict(zip(unique_rows.tolist(), table.iloc[unique_rows].to_dict('records')))
+
+        records = []
+        for k in sequence:
+            rule = self.rules[rule_ids[k]]
+            start = time.perf_counter()
+            record = _materialize(rule.record, rows[int(positions[k])])
+            self.timings[rule.name].seconds += time.perf_counter() - start
+            if record is not None:
+                records.append(record)
+        return records
+
+    def report(self) -> str:
+        """규칙별 발생 건수/평가 시간 요약 (마지막 evaluate 기준)"""
+        return ', '.join(
+            f"{name} {timing.fired}건 {timing.seconds * 1000:.2f}ms" for name, timing in self.timings.items()
+        )
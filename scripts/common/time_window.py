@@ -0,0 +1,103 @@
+"""
+기간(최근 N일) 윈도우 조회 유틸리티
+
+여러 스크립트의 filter_by_days(최근 N일 필터)를 대체합니다.
+- 날짜 컬럼을 1회만 파싱해 정렬된 datetime64 배열로 보관
+- 최근 N일 윈도우는 searchsorted(이진 탐색)로 시작 위치만 찾아 슬라이스 (전체 boolean mask 없음)
+- 날짜순으로 정렬된 프레임(대부분의 일별 집계/차원 테이블)은 iloc 슬라이스로 복사 없이 반환
+- 정렬되지 않은 프레임은 1회 계산한 정렬 순서로 윈도우 행만 원본 순서대로 선택
+- 원본 날짜 컬럼(문자열 등)은 변경하지 않음
+- 기준: 최대 일자 - N일 이상 (기존 filter_by_days와 동일, 날짜 파싱 실패 행은 윈도우에서 제외)
+
+사용법:
+    from scripts.common.time_window import TimeWindow, last_days
+
+    recent = last_days(df, 30, '일')                 # 1회성 조회
+
+    window = TimeWindow(df, '일')                    # 여러 기간 조회 (파싱/정렬 1회)
+    periods = {days: window.last_days(days) for days in (0, 180, 90, 30)}
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class TimeWindow:
+    """날짜 정렬 인덱스 기반 최근 N일 윈도우 조회"""
+
+    def __init__(self, df: pd.DataFrame, date_column: str):
+        """
+        Args:
+            df: 원본 DataFrame
+            date_column: 날짜 컬럼명 (문자열이면 1회 파싱, 파싱 실패는 NaT)
+        """
+        self.frame = df
+        self.date_column = date_column
+        self._windows: Dict[int, pd.DataFrame] = {}
+
+        dates = df[date_column] if date_column in df.columns else None
+        if dates is not None and not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors='coerce')
+        self.available = dates is not None
+
+        if not self.available:
+            self.order = None
+            self.sorted_dates = np.array([], dtype='datetime64[ns]')
+            self.valid_count = 0
+            return
+
+        values = dates.to_numpy()
+        valid = ~pd.isna(values)
+        self.valid_count = int(valid.sum())
+
+        if valid.all() and dates.is_monotonic_increasing:
+            # 이미 날짜순: 정렬 없이 원본 위치 그대로 사용
+            self.order = None
+            self.sorted_dates = values
+        else:
+            # 안정 정렬 (NaT는 맨 뒤) → 같은 날짜 안에서는 원본 순서 유지
+            self.order = np.argsort(values, kind='mergesort')
+            self.sorted_dates = values[self.order]
+
+    @property
+    def max_date(self) -> Optional[pd.Timestamp]:
+        if self.valid_count == 0:
+            return None
+        return pd.Timestamp(self.sorted_dates[self.valid_count - 1])
+
+    def cutoff(self, days: int) -> Optional[pd.Timestamp]:
+        """최근 N일 시작 기준일 (최대 일자 - N일). days <= 0이거나 날짜가 없으면 None"""
+        if days <= 0 or self.max_date is None:
+            return None
+        return self.max_date - pd.Timedelta(days=days)
+
+    def last_days(self, days: int) -> pd.DataFrame:
+        """
+        최근 N일 데이터
+
+        days <= 0, 날짜 컬럼이 없거나 유효한 날짜가 없으면 원본 프레임을 그대로 반환합니다.
+        같은 days 결과는 캐시해 재사용합니다.
+        """
+        cutoff = self.cutoff(days) if self.available else None
+        if cutoff is None:
+            return self.frame
+        if days in self._windows:
+            return self._windows[days]
+
+        start = int(np.searchsorted(self.sorted_dates[:self.valid_count], cutoff.to_datetime64(), side='left'))
+        if self.order is None:
+            window = self.frame.iloc[start:self.valid_count]
+        else:
+            window = self.frame.take(np.sort(self.order[start:self.valid_count]))
+
+        self._windows[days] = window
+        return window
+
+
+def last_days(df: pd.DataFrame, days: int, date_column: str) -> pd.DataFrame:
+    """최근 N일 데이터 (1회성 조회용, days <= 0이면 원본 반환)"""
+    if days <= 0 or date_column not in df.columns:
+        return df
+    return TimeWindow(df, date_column).last_days(days)
@@ -3,6 +3,7 @@ CSV/JSON 데이터를 Next.js용 JSON으로 변환하는 스크립트
 
 사용법:
     python scripts/export_json.py --client clientA
+    python scripts/export_json.py --client clientA --pretty   # 들여쓰기 출력 (디버깅용)
 
 출력:
     public/data/{clientId}/
@@ -19,6 +20,7 @@ CSV/JSON 데이터를 Next.js용 JSON으로 변환하는 스크립트
 import os
 import sys
 import json
+import argparse
 import csv
 from pathlib import Path
 from datetime import datetime
@@ -28,66 +30,26 @@ from typing import Dict, List, Any, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.forecast_store import ForecastStore
+from scripts.common.json_io import write_json
+from scripts.common.normalization import AGE_VALID, GENDER_VALID
 
 import pandas as pd
-import numpy as np
-
-
-class NpEncoder(json.JSONEncoder):
-    """NumPy/Pandas 타입을 JSON으로 변환하는 인코더"""
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            if np.isnan(obj) or np.isinf(obj):
-                return None
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, pd.Timestamp):
-            return obj.isoformat()
-        if pd.isna(obj):
-            return None
-        # Python native float NaN/Inf 처리
-        if isinstance(obj, float):
-            if obj != obj or obj == float('inf') or obj == float('-inf'):  # NaN check: NaN != NaN
-                return None
-        return super().default(obj)
-
-
-def clean_nan_values(data: Any) -> Any:
-    """
-    재귀적으로 모든 NaN/Inf 값을 None으로 변환
-    JSON 직렬화 전에 호출하여 안전하게 처리
+
+
+def load_csv_as_dict(file_path: Path, exclude_columns: Optional[List[str]] = None) -> List[Dict]:
+    """CSV 파일을 딕셔너리 리스트로 로드
+
+    Args:
+        exclude_columns: 내보내지 않을 컬럼 (파이프라인 내부용 컬럼 등)
     """
-    if isinstance(data, dict):
-        return {k: clean_nan_values(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [clean_nan_values(item) for item in data]
-    elif isinstance(data, float):
-        # NaN check: NaN != NaN, also check for inf
-        if data != data or data == float('inf') or data == float('-inf'):
-            return None
-        return data
-    elif isinstance(data, np.floating):
-        if np.isnan(data) or np.isinf(data):
-            return None
-        return float(data)
-    elif isinstance(data, np.integer):
-        return int(data)
-    elif pd.isna(data):
-        return None
-    return data
-
-
-def load_csv_as_dict(file_path: Path) -> List[Dict]:
-    """CSV 파일을 딕셔너리 리스트로 로드"""
     if not file_path.exists():
         print(f"  ⚠️ 파일 없음: {file_path.name}")
         return []
 
     try:
-        df = pd.read_csv(file_path, encoding='utf-8')
+        usecols = (lambda column: column not in exclude_columns) if exclude_columns else None
+        df = pd.read_csv(file_path, encoding='utf-8', usecols=usecols)
         # NaN을 None으로 변환
         df = df.where(pd.notnull(df), None)
         return df.to_dict('records')
@@ -96,6 +58,26 @@ def load_csv_as_dict(file_path: Path) -> List[Dict]:
         return []
 
 
+def load_forecast_as_dict(store: ForecastStore, dimension: str, source: str, legacy_path: Path) -> List[Dict]:
+    """통합 예측 저장소 파티션(없으면 기존 CSV)을 딕셔너리 리스트로 로드
+
+    forecast.json은 timeseries 페이지가 읽는 기존 CSV 필드명('일 구분', '비용_예측', ...)을 유지하므로
+    요청한 파티션만 읽어 기존 레이아웃으로 변환합니다.
+    """
+    if not store.has(dimension, source):
+        return load_csv_as_dict(legacy_path)
+
+    try:
+        df = store.view(dimension, source)
+    except Exception as e:
+        print(f"  ❌ 로드 실패 {source}/{dimension}: {e}")
+        return []
+
+    # NaN을 None으로 변환
+    df = df.where(pd.notnull(df), None)
+    return df.to_dict('records')
+
+
 def load_json_file(file_path: Path) -> Dict:
     """JSON 파일 로드"""
     if not file_path.exists():
@@ -110,14 +92,15 @@ def load_json_file(file_path: Path) -> Dict:
         return {}
 
 
-def save_json(data: Any, file_path: Path) -> bool:
-    """JSON 파일 저장 (NaN/Inf 값 자동 정리)"""
+def save_json(data: Any, file_path: Path, compact: bool = True) -> bool:
+    """JSON 파일 저장 (NaN/Inf → null, numpy/pandas 값 자동 변환)
+
+    Args:
+        compact: True면 공백 없는 운영용 출력, False면 indent=2 디버깅용 출력
+    """
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        # NaN/Inf 값을 None으로 변환 (JSON 호환성 보장)
-        cleaned_data = clean_nan_values(data)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2, cls=NpEncoder)
+        write_json(data, file_path, compact=compact)
         return True
     except Exception as e:
         print(f"  ❌ 저장 실패 {file_path.name}: {e}")
@@ -168,16 +151,20 @@ def export_forecast(paths: ClientPaths) -> Dict:
         "insights": {}
     }
 
+    store = ForecastStore.for_paths(paths)
+
     # 예측 데이터
-    forecast_data["predictions"]["daily"] = load_csv_as_dict(paths.predictions_daily)
+    forecast_data["predictions"]["daily"] = load_forecast_as_dict(store, 'daily', 'marketing',
+                                                                  paths.predictions_daily)
     forecast_data["predictions"]["weekly"] = load_csv_as_dict(paths.predictions_weekly)
     forecast_data["predictions"]["monthly"] = load_csv_as_dict(paths.predictions_monthly)
 
     # 세그먼트 데이터
-    forecast_data["segments"]["brand"] = load_csv_as_dict(paths.segment_brand)
-    forecast_data["segments"]["channel"] = load_csv_as_dict(paths.segment_channel)
-    forecast_data["segments"]["product"] = load_csv_as_dict(paths.segment_product)
-    forecast_data["segments"]["promotion"] = load_csv_as_dict(paths.segment_promotion)
+    forecast_data["segments"]["brand"] = load_forecast_as_dict(store, 'brand', 'segment', paths.segment_brand)
+    forecast_data["segments"]["channel"] = load_forecast_as_dict(store, 'channel', 'segment', paths.segment_channel)
+    forecast_data["segments"]["product"] = load_forecast_as_dict(store, 'product', 'segment', paths.segment_product)
+    forecast_data["segments"]["promotion"] = load_forecast_as_dict(store, 'promotion', 'segment',
+                                                                   paths.segment_promotion)
 
     # 인사이트
     forecast_data["insights"] = load_json_file(paths.forecast_insights_json)
@@ -200,6 +187,9 @@ def export_funnel(paths: ClientPaths) -> Dict:
         "campaign": [],
         "new_vs_returning": [],
         "channel_engagement": [],
+        "channel_engagement_by_period": [],
+        "cohort_retention": [],
+        "cohort_curves": [],
         "insights": {}
     }
 
@@ -209,6 +199,9 @@ def export_funnel(paths: ClientPaths) -> Dict:
     funnel_data["campaign"] = load_csv_as_dict(paths.campaign_funnel)
     funnel_data["new_vs_returning"] = load_csv_as_dict(paths.new_vs_returning)
     funnel_data["channel_engagement"] = load_csv_as_dict(paths.channel_engagement)
+    funnel_data["channel_engagement_by_period"] = load_csv_as_dict(paths.channel_engagement_by_period)
+    funnel_data["cohort_retention"] = load_csv_as_dict(paths.cohort_retention)
+    funnel_data["cohort_curves"] = load_csv_as_dict(paths.cohort_curves)
     funnel_data["insights"] = load_json_file(paths.funnel_insights_json)
 
     if funnel_data["daily"]:
@@ -249,10 +242,13 @@ def export_dimensions(paths: ClientPaths) -> Dict:
         "adset_deviceplatform": [] # type7
     }
 
+    # 성별_유효/연령_유효는 인사이트 생성 단계용 내부 플래그 → 대시보드 JSON에서는 제외
+    internal_columns = [GENDER_VALID, AGE_VALID]
+
     dimensions_data["campaign_adset"] = load_csv_as_dict(paths.dimension_type1)
-    dimensions_data["adset_age_gender"] = load_csv_as_dict(paths.dimension_type2)
-    dimensions_data["adset_age"] = load_csv_as_dict(paths.dimension_type3)
-    dimensions_data["adset_gender"] = load_csv_as_dict(paths.dimension_type4)
+    dimensions_data["adset_age_gender"] = load_csv_as_dict(paths.dimension_type2, internal_columns)
+    dimensions_data["adset_age"] = load_csv_as_dict(paths.dimension_type3, internal_columns)
+    dimensions_data["adset_gender"] = load_csv_as_dict(paths.dimension_type4, internal_columns)
     dimensions_data["adset_device"] = load_csv_as_dict(paths.dimension_type5)
     dimensions_data["adset_platform"] = load_csv_as_dict(paths.dimension_type6)
     dimensions_data["adset_deviceplatform"] = load_csv_as_dict(paths.dimension_type7)
@@ -311,8 +307,13 @@ def export_meta(paths: ClientPaths, client_id: str) -> Dict:
     return meta_data
 
 
-def export_json(client_id: str):
-    """메인 내보내기 함수"""
+def export_json(client_id: str, compact: bool = True):
+    """메인 내보내기 함수
+
+    Args:
+        client_id: 클라이언트 ID
+        compact: True면 공백 없는 JSON (운영용), False면 indent=2 JSON (--pretty, 디버깅용)
+    """
     print("=" * 80)
     print("📦 Next.js용 JSON 내보내기")
     print("=" * 80)
@@ -336,37 +337,37 @@ def export_json(client_id: str):
 
     # KPI
     kpi_data = export_kpi(paths)
-    if save_json(kpi_data, paths.public_kpi_json):
+    if save_json(kpi_data, paths.public_kpi_json, compact):
         results["kpi"] = True
 
     # Forecast
     forecast_data = export_forecast(paths)
-    if save_json(forecast_data, paths.public_forecast_json):
+    if save_json(forecast_data, paths.public_forecast_json, compact):
         results["forecast"] = True
 
     # Funnel
     funnel_data = export_funnel(paths)
-    if save_json(funnel_data, paths.public_funnel_json):
+    if save_json(funnel_data, paths.public_funnel_json, compact):
         results["funnel"] = True
 
     # Creative
     creative_data = export_creative(paths)
-    if save_json(creative_data, paths.public_creative_json):
+    if save_json(creative_data, paths.public_creative_json, compact):
         results["creative"] = True
 
     # Dimensions
     dimensions_data = export_dimensions(paths)
-    if save_json(dimensions_data, paths.public_dimensions_json):
+    if save_json(dimensions_data, paths.public_dimensions_json, compact):
         results["dimensions"] = True
 
     # Insights
     insights_data = export_insights(paths)
-    if save_json(insights_data, paths.public_insights_json):
+    if save_json(insights_data, paths.public_insights_json, compact):
         results["insights"] = True
 
     # Meta
     meta_data = export_meta(paths, client_id)
-    if save_json(meta_data, paths.public_meta_json):
+    if save_json(meta_data, paths.public_meta_json, compact):
         results["meta"] = True
 
     # 결과 요약
@@ -403,12 +404,17 @@ if __name__ == '__main__':
     # --client 인자 파싱 (필수)
     client_id = parse_client_arg(required=True)
 
+    # --pretty: 들여쓰기 JSON 출력 (디버깅/비교용, 기본은 compact)
+    option_parser = argparse.ArgumentParser(add_help=False)
+    option_parser.add_argument('--pretty', action='store_true')
+    options, _ = option_parser.parse_known_args()
+
     if not client_id:
         print("❌ 오류: --client 인자가 필요합니다")
         print("   사용법: python scripts/export_json.py --client clientA")
         sys.exit(1)
 
-    export_json(client_id)
+    export_json(client_id, compact=not options.pretty)
 
     print("\n" + "=" * 80)
     print("✅ JSON 내보내기 완료!")
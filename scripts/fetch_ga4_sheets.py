@@ -30,6 +30,7 @@ from oauth2client.service_account import ServiceAccountCredentials
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, get_client_config, get_google_credentials_path, parse_client_arg, PROJECT_ROOT
+from scripts.common.ga4_rollup import build_rollup_file
 
 
 def fetch_ga4_sheets_data(client_id: Optional[str] = None):
@@ -175,6 +176,14 @@ def fetch_ga4_sheets_data(client_id: Optional[str] = None):
             print(f"   ├ 헤더: {', '.join(data[0][:5])}{'...' if len(data[0]) > 5 else ''}")
         print(f"   └ 워크시트: '{worksheet_name}'")
 
+        # GA4 rollup 생성 (퍼널/참여도 단계가 원시 이벤트 대신 사용)
+        try:
+            result = build_rollup_file(Path(output_path_str))
+            print(f"\n📊 GA4 rollup 생성: 원본 {result['source_rows']:,}행 → "
+                  f"{', '.join(f'{name} {rows:,}행' for name, rows in result['tables'].items())} ({result['seconds']}초)")
+        except Exception as e:
+            print(f"\n⚠️  GA4 rollup 생성 실패 (분석 단계에서 다시 생성): {e}")
+
         return output_path
 
     except gspread.exceptions.APIError as e:
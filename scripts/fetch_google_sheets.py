@@ -23,6 +23,7 @@ import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
 from scripts.common.paths import ClientPaths, get_client_config, get_google_credentials_path, parse_client_arg, PROJECT_ROOT
+from scripts.common.daily_aggregates import sync_file
 
 
 def fetch_google_sheets_data(client_id: str = None):
@@ -249,6 +250,14 @@ def fetch_google_sheets_data(client_id: str = None):
             print(f"\n❌ 파일 저장 오류: {e}")
             sys.exit(1)
 
+        # 일별 집계 테이블 갱신 (이전 수집과 비교해 바뀐 날짜만 재집계)
+        try:
+            result = sync_file('raw', output_file)
+            print(f"\n📊 일별 집계 갱신: 변경 {result['changed']}일, 삭제 {result['removed']}일"
+                  f"{' (전체 재생성)' if result['rebuilt'] else ''}")
+        except Exception as e:
+            print(f"\n⚠️  일별 집계 갱신 실패 (분석 단계에서 다시 동기화): {e}")
+
         return output_file
 
     except gspread.exceptions.APIError as e:
@@ -11,7 +11,7 @@
 
 출력:
 - data/{client}/type/{각 시트별}.csv (클라이언트 모드)
-- data/{client}/type/merged_data.csv (클라이언트 모드)
+- data/{client}/type/merged_data.csv (클라이언트 모드, data_type 분류 컬럼 포함)
 - data/type/{각 시트별}.csv (레거시 모드)
 - data/type/merged_data.csv (레거시 모드)
 """
@@ -20,6 +20,8 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from scripts.common.paths import ClientPaths, get_client_config, get_google_credentials_path, parse_client_arg, PROJECT_ROOT
+from scripts.common.data_type import DATA_TYPE_COLUMN, align_rows, classify_rows
+from scripts.common.daily_aggregates import sync_file
 
 import os
 import json
@@ -183,6 +185,19 @@ def merge_csv_files(all_data_list, output_dir, merged_filename):
 
         print(f"   ├ [{idx}] {len(data) - 1:,}개 행 추가")
 
+    # 데이터 타입 분류 (수집 시점에 1회 계산하여 data_type 컬럼으로 저장)
+    if DATA_TYPE_COLUMN not in header:
+        # 열 수가 다른 시트 행은 헤더 길이로 맞춰야 data_type이 항상 마지막 열에 기록됨
+        rows = align_rows(header, merged_data[1:])
+        data_types = classify_rows(header, rows)
+        merged_data = [header + [DATA_TYPE_COLUMN]] + [
+            row + [data_type] for row, data_type in zip(rows, data_types)
+        ]
+        type_counts = {}
+        for data_type in data_types:
+            type_counts[data_type] = type_counts.get(data_type, 0) + 1
+        print(f"   ├ 데이터 타입 분류: " + ", ".join(f"{k} {v:,}" for k, v in sorted(type_counts.items())))
+
     # 통합 파일 저장
     output_path = os.path.join(output_dir, merged_filename)
 
@@ -199,6 +214,14 @@ def merge_csv_files(all_data_list, output_dir, merged_filename):
     print(f"   ├ 데이터 행 수: {total_rows:,}")
     print(f"   └ 헤더: {', '.join(header[:5])}{'...' if len(header) > 5 else ''}")
 
+    # 일별 집계 테이블 갱신 (이전 수집과 비교해 바뀐 날짜만 재집계)
+    try:
+        result = sync_file('merged', output_path)
+        print(f"\n📊 일별 집계 갱신: 변경 {result['changed']}일, 삭제 {result['removed']}일"
+              f"{' (전체 재생성)' if result['rebuilt'] else ''}")
+    except Exception as e:
+        print(f"\n⚠️  일별 집계 갱신 실패 (분석 단계에서 다시 동기화): {e}")
+
     return output_path
 
 
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+"""
+사용자 단위 코호트 리텐션 분석 (리텐션 / 재구매율 / LTV)
+
+GA4_data.csv는 집계 데이터라 코호트 분석이 불가능하므로(docs/COHORT_RETENTION_GUIDE.md),
+user_pseudo_id 단위 이벤트 export(GA4_user_events.csv, 수천만 행)를 청크 단위로 스트리밍 처리합니다.
+
+처리 방식 (메모리 = 청크 1개 + 사용자당 고정 크기 상태 약 48바이트):
+- 1차 패스: 사용자 ID 64비트 해시 → 등장 순서 정수 ID, 첫 방문일/첫 방문 채널(코호트) 기록
+- 2차 패스: 사용자별 활동/구매 기간 비트마스크(uint64, 코호트 기준 경과 0~63기간)와
+            (채널 × 코호트) × 경과 기간 매출 희소 행렬 누적
+- 집계: 비트마스크 → (채널 × 코호트) × 경과 기간 활동 희소 행렬,
+        재구매 = 서로 다른 2개 기간 이상 구매 (경과 기간까지 누적)
+
+출력 (funnel/ 디렉토리):
+- cohort_retention.csv: 채널 × 코호트 × 경과 기간
+  (코호트 크기, 활동 사용자, 리텐션율, 매출, 누적 LTV, 구매자, 재구매자, 재구매율)
+- cohort_curves.csv: 채널별(+ 전체) 경과 기간 곡선 (해당 경과 기간까지 관측된 코호트만 포함)
+
+입력 컬럼 (별칭 중 처음 발견된 컬럼 사용):
+- 사용자: user_pseudo_id / user_id
+- 날짜: event_date (YYYYMMDD 또는 YYYY-MM-DD) / date / Day
+- 이벤트: event_name / Event name (purchase 이벤트를 구매로 집계)
+- 매출: purchase_revenue / event_value / Event value (없으면 0)
+- 채널: channel / session_source_medium (없으면 '전체' 단일 채널)
+
+사용법:
+- 레거시: python generate_cohort_retention.py
+- 멀티클라이언트: python generate_cohort_retention.py --client clientA [--period month] [--memory-mb 256]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.common.paths import ClientPaths
+
+# 데이터 경로 설정 (레거시 호환용)
+BASE_DIR = Path(__file__).parent.parent / 'data'
+USER_EVENTS_FILE = BASE_DIR / 'GA4' / 'GA4_user_events.csv'
+
+# 출력 파일 경로 (레거시)
+OUTPUT_COHORT_RETENTION = BASE_DIR / 'funnel' / 'cohort_retention.csv'
+OUTPUT_COHORT_CURVES = BASE_DIR / 'funnel' / 'cohort_curves.csv'
+
+# 입력 컬럼 별칭
+COLUMN_ALIASES = {
+    'user': ['user_pseudo_id', 'user_id'],
+    'date': ['event_date', 'date', 'Day'],
+    'event': ['event_name', 'Event name'],
+    'revenue': ['purchase_revenue', 'event_value', 'Event value'],
+    'channel': ['channel', 'session_source_medium'],
+}
+REQUIRED_COLUMNS = ['user', 'date', 'event']
+
+PURCHASE_EVENTS = ['purchase', 'ecommerce_purchase']
+ALL_CHANNELS = '전체'
+
+PERIODS = ('week', 'month')
+MAX_PERIODS = 64                # 비트마스크 폭 (uint64) = 추적 가능한 최대 경과 기간 수
+BYTES_PER_ROW = 256             # 청크 1행 메모리 추정치 (문자열 컬럼 포함)
+BYTES_PER_USER = 48             # 사용자당 상태 메모리 (해시/ID/첫 방문일/채널/코호트 행/비트마스크 2개)
+MIN_CHUNK_ROWS = 10_000
+
+
+# ============================================================================
+# 입력 스트리밍
+# ============================================================================
+def resolve_columns(input_file: Path) -> Dict[str, str]:
+    """헤더에서 역할별 입력 컬럼 결정 (필수 컬럼이 없으면 ValueError)"""
+    header = pd.read_csv(input_file, nrows=0, encoding='utf-8-sig').columns
+    columns = {}
+    for role, aliases in COLUMN_ALIASES.items():
+        found = next((alias for alias in aliases if alias in header), None)
+        if found:
+            columns[role] = found
+    missing = [role for role in REQUIRED_COLUMNS if role not in columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(COLUMN_ALIASES[role][0] for role in missing)}")
+    return columns
+
+
+def parse_days(values: pd.Series) -> np.ndarray:
+    """
+    날짜 문자열(YYYYMMDD 또는 YYYY-MM-DD) → datetime64[D] (결측/파싱 실패는 NaT)
+
+    청크 안의 날짜 종류는 적으므로 고유값 단위로만 파싱한 뒤 코드로 전체 행에 펼칩니다.
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    compact = text.str.fullmatch(r'\d{8}')
+    dates = pd.to_datetime(text.where(~compact), errors='coerce')
+    if compact.any():
+        dates = dates.where(~compact, pd.to_datetime(text.where(compact), format='%Y%m%d', errors='coerce'))
+
+    days = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[D]')
+    present = codes >= 0
+    days[present] = dates.to_numpy(dtype='datetime64[D]')[codes[present]]
+    return days
+
+
+def iter_events(input_file: Path, columns: Dict[str, str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    청크 단위 이벤트 로드 (표준 컬럼: user_hash, day, event, revenue, channel)
+
+    사용자 ID/날짜가 없는 행은 제외합니다.
+    """
+    usecols = list(columns.values())
+    dtype = {columns[role]: str for role in ('user', 'event', 'channel', 'date') if role in columns}
+    reader = pd.read_csv(input_file, usecols=usecols, dtype=dtype, chunksize=chunk_rows, encoding='utf-8-sig')
+    for chunk in reader:
+        users = chunk[columns['user']]
+        days = parse_days(chunk[columns['date']])
+        valid = users.notna().to_numpy() & ~np.isnat(days)
+        if not valid.any():
+            continue
+        chunk = chunk[valid]
+        revenue = (pd.to_numeric(chunk[columns['revenue']], errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+                   if 'revenue' in columns else np.zeros(len(chunk)))
+        channel = chunk[columns['channel']].fillna('(not set)') if 'channel' in columns else ALL_CHANNELS
+        yield pd.DataFrame({
+            'user_hash': pd.util.hash_array(chunk[columns['user']].to_numpy(dtype=object)),
+            'day': days[valid].astype(np.int64),
+            'event': chunk[columns['event']].to_numpy(dtype=object),
+            'revenue': revenue,
+            'channel': channel,
+        })
+
+
+def period_index(days: np.ndarray, period: str) -> np.ndarray:
+    """일수 → 기간 번호 (week: 월요일 시작 주, month: 달력 월)"""
+    days = np.asarray(days, dtype=np.int64)
+    if period == 'week':
+        # 1970-01-01은 목요일 → +3일 이동 시 월요일 기준 주 번호
+        return (days + 3) // 7
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def period_start(index: np.ndarray, period: str) -> np.ndarray:
+    """기간 번호 → 기간 시작일 문자열 (YYYY-MM-DD)"""
+    index = np.asarray(index, dtype=np.int64)
+    if period == 'week':
+        starts = (index * 7 - 3).astype('datetime64[D]')
+    else:
+        starts = index.astype('datetime64[M]').astype('datetime64[D]')
+    return np.datetime_as_string(starts, unit='D')
+
+
+# ============================================================================
+# 사용자 ID 압축
+# ============================================================================
+class UserIndex:
+    """사용자 ID 해시(uint64) → 등장 순서 정수 ID (정렬된 해시 배열 + searchsorted)"""
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.ids = np.empty(0, dtype=np.int64)
+
+    @property
+    def size(self) -> int:
+        return len(self.keys)
+
+    def encode(self, hashes: np.ndarray) -> np.ndarray:
+        """해시 → 정수 ID (처음 보는 해시는 새 ID 부여)"""
+        unique, inverse = np.unique(hashes, return_inverse=True)
+        positions = np.searchsorted(self.keys, unique)
+        found = positions < len(self.keys)
+        found[found] = self.keys[positions[found]] == unique[found]
+
+        unique_ids = np.empty(len(unique), dtype=np.int64)
+        unique_ids[found] = self.ids[positions[found]]
+        new = ~found
+        if new.any():
+            new_ids = np.arange(self.size, self.size + int(new.sum()), dtype=np.int64)
+            unique_ids[new] = new_ids
+            self.keys = np.insert(self.keys, positions[new], unique[new])
+            self.ids = np.insert(self.ids, positions[new], new_ids)
+        return unique_ids[inverse]
+
+    def lookup(self, hashes: np.ndarray) -> np.ndarray:
+        """이미 등록된 해시 → 정수 ID"""
+        return self.ids[np.searchsorted(self.keys, hashes)]
+
+
+# ============================================================================
+# 코호트 집계
+# ============================================================================
+class CohortBuilder:
+    """2패스 스트리밍 코호트 집계기 (observe → prepare → accumulate → tables)"""
+
+    def __init__(self, period: str = 'week'):
+        if period not in PERIODS:
+            raise ValueError(f"지원하지 않는 코호트 기간: {period}")
+        self.period = period
+        self.users = UserIndex()
+        self.channels: Dict[str, int] = {}
+        self.first_day = np.empty(0, dtype=np.int32)
+        self.first_channel = np.empty(0, dtype=np.int32)
+        self.last_day: Optional[int] = None
+
+    def _channel_codes(self, channel: pd.Series) -> np.ndarray:
+        """채널명 → 누적 채널 코드"""
+        codes, uniques = pd.factorize(channel)
+        mapping = np.array([self.channels.setdefault(str(value), len(self.channels)) for value in uniques],
+                           dtype=np.int32)
+        return mapping[codes]
+
+    def _grow(self, size: int) -> None:
+        """사용자 상태 배열 확장 (2배씩)"""
+        if size <= len(self.first_day):
+            return
+        capacity = max(size, 2 * len(self.first_day), 1024)
+        first_day = np.full(capacity, np.iinfo(np.int32).max, dtype=np.int32)
+        first_day[:len(self.first_day)] = self.first_day
+        first_channel = np.zeros(capacity, dtype=np.int32)
+        first_channel[:len(self.first_channel)] = self.first_channel
+        self.first_day, self.first_channel = first_day, first_channel
+
+    # ----- 1차 패스 -----
+    def observe(self, events: pd.DataFrame) -> None:
+        """첫 방문일/첫 방문 채널 갱신 (같은 날짜면 먼저 읽은 행 우선)"""
+        uid = self.users.encode(events['user_hash'].to_numpy())
+        self._grow(self.users.size)
+        day = events['day'].to_numpy()
+        channel = self._channel_codes(events['channel'])
+
+        # 청크 내 사용자별 첫 이벤트 (사용자 → 일자 → 행 순서)
+        order = np.lexsort((day, uid))
+        sorted_uid = uid[order]
+        first = order[np.r_[True, sorted_uid[1:] != sorted_uid[:-1]]]
+        users, days = uid[first], day[first]
+        earlier = days < self.first_day[users]
+        self.first_day[users[earlier]] = days[earlier]
+        self.first_channel[users[earlier]] = channel[first][earlier]
+
+        chunk_last = int(day.max())
+        self.last_day = chunk_last if self.last_day is None else max(self.last_day, chunk_last)
+
+    # ----- 집계 준비 -----
+    def prepare(self) -> None:
+        """코호트 기간/행 번호 확정, 2차 패스 상태 할당"""
+        n_users = self.users.size
+        self.first_day = self.first_day[:n_users]
+        self.first_channel = self.first_channel[:n_users]
+
+        self.cohort = period_index(self.first_day, self.period).astype(np.int32)
+        self.first_period = int(self.cohort.min())
+        self.last_period = int(period_index(np.array([self.last_day]), self.period)[0])
+        self.n_cohorts = self.last_period - self.first_period + 1
+        self.n_rows = len(self.channels) * self.n_cohorts
+
+        # (채널 × 코호트) 행 번호
+        self.row = (self.first_channel * self.n_cohorts + (self.cohort - self.first_period)).astype(np.int32)
+        self.active = np.zeros(n_users, dtype=np.uint64)
+        self.purchased = np.zeros(n_users, dtype=np.uint64)
+        self.revenue = sparse.csr_matrix((self.n_rows, MAX_PERIODS), dtype=np.float64)
+
+    # ----- 2차 패스 -----
+    def accumulate(self, events: pd.DataFrame) -> None:
+        """활동/구매 비트마스크와 매출 희소 행렬 누적"""
+        uid = self.users.lookup(events['user_hash'].to_numpy())
+        offset = period_index(events['day'].to_numpy(), self.period) - self.cohort[uid]
+        keep = (offset >= 0) & (offset < MAX_PERIODS)
+        uid, offset = uid[keep], offset[keep]
+        bits = np.left_shift(np.uint64(1), offset.astype(np.uint64))
+        np.bitwise_or.at(self.active, uid, bits)
+
+        purchase = events['event'].isin(PURCHASE_EVENTS).to_numpy()[keep]
+        if purchase.any():
+            np.bitwise_or.at(self.purchased, uid[purchase], bits[purchase])
+            revenue = events['revenue'].to_numpy()[keep][purchase]
+            self.revenue = self.revenue + sparse.coo_matrix(
+                (revenue, (self.row[uid[purchase]], offset[purchase])), shape=self.revenue.shape
+            ).tocsr()
+
+    def _bit_counts(self, masks: np.ndarray, periods: int) -> sparse.csr_matrix:
+        """사용자 비트마스크 → (채널 × 코호트) × 경과 기간 사용자 수 희소 행렬"""
+        matrix = sparse.csr_matrix((self.n_rows, MAX_PERIODS), dtype=np.int64)
+        for k in range(periods):
+            rows = self.row[(masks >> np.uint64(k)) & np.uint64(1) == 1]
+            if len(rows):
+                matrix = matrix + sparse.coo_matrix(
+                    (np.ones(len(rows), dtype=np.int64), (rows, np.full(len(rows), k))), shape=matrix.shape
+                ).tocsr()
+        return matrix
+
+    def _purchase_counts(self, periods: int) -> Tuple[np.ndarray, np.ndarray]:
+        """경과 기간별 누적 구매자 / 재구매자(서로 다른 2개 기간 이상 구매) 수 (행 × 기간)"""
+        buyers = np.zeros((self.n_rows, periods), dtype=np.int64)
+        repeaters = np.zeros((self.n_rows, periods), dtype=np.int64)
+        for k in range(periods):
+            window = np.uint64((1 << (k + 1)) - 1)
+            purchase_periods = np.bitwise_count(self.purchased & window)
+            buyers[:, k] = np.bincount(self.row[purchase_periods >= 1], minlength=self.n_rows)
+            repeaters[:, k] = np.bincount(self.row[purchase_periods >= 2], minlength=self.n_rows)
+        return buyers, repeaters
+
+    # ----- 결과 -----
+    def tables(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """(cohort_retention, cohort_curves) DataFrame"""
+        periods = min(MAX_PERIODS, self.n_cohorts)
+        sizes = np.bincount(self.row, minlength=self.n_rows)
+        rows = np.flatnonzero(sizes)
+
+        activity = self._bit_counts(self.active, periods)[rows][:, :periods].toarray()
+        revenue = self.revenue[rows][:, :periods].toarray()
+        buyers, repeaters = self._purchase_counts(periods)
+        buyers, repeaters = buyers[rows], repeaters[rows]
+
+        # 행별 관측 가능한 경과 기간 (마지막 기간 - 코호트 기간)
+        cohort_offset = rows % self.n_cohorts
+        observed = np.minimum(self.n_cohorts - 1 - cohort_offset, periods - 1)
+        grid_rows = np.repeat(np.arange(len(rows)), observed + 1)
+        grid_k = np.concatenate([np.arange(n + 1) for n in observed]) if len(rows) else np.zeros(0, dtype=np.int64)
+
+        channel_names = np.array(sorted(self.channels, key=self.channels.get), dtype=object)
+        cumulative_revenue = np.cumsum(revenue, axis=1)
+        size = sizes[rows][grid_rows]
+        retention = pd.DataFrame({
+            'channel': channel_names[rows // self.n_cohorts][grid_rows],
+            'cohort': period_start(self.first_period + cohort_offset, self.period)[grid_rows],
+            'cohort_size': size,
+            'period': grid_k,
+            'active_users': activity[grid_rows, grid_k],
+            'revenue': revenue[grid_rows, grid_k],
+            'cumulative_revenue': cumulative_revenue[grid_rows, grid_k],
+            'buyers': buyers[grid_rows, grid_k],
+            'repeat_buyers': repeaters[grid_rows, grid_k],
+        })
+        retention = retention.sort_values(['channel', 'cohort', 'period'], kind='mergesort').reset_index(drop=True)
+        retention = _with_rates(retention)
+
+        # 채널별 + 전체 곡선 (관측된 코호트만 합산)
+        sums = ['cohort_size', 'active_users', 'revenue', 'cumulative_revenue', 'buyers', 'repeat_buyers']
+        by_channel = retention.groupby(['channel', 'period'], sort=True)[sums].sum().reset_index()
+        overall = retention.groupby('period', sort=True)[sums].sum().reset_index()
+        overall.insert(0, 'channel', ALL_CHANNELS)
+        curves = pd.concat([overall, by_channel[by_channel['channel'] != ALL_CHANNELS]], ignore_index=True)
+        curves = _with_rates(curves).rename(columns={'cohort_size': 'cohort_users'})
+        return retention, curves
+
+
+def _with_rates(table: pd.DataFrame) -> pd.DataFrame:
+    """리텐션율/LTV/재구매율 컬럼 추가"""
+    size = table['cohort_size'].where(table['cohort_size'] > 0)
+    buyers = table['buyers'].where(table['buyers'] > 0)
+    return table.assign(
+        retention_rate=(table['active_users'] / size * 100).fillna(0).round(2),
+        ltv=(table['cumulative_revenue'] / size).fillna(0).round(2),
+        repurchase_rate=(table['repeat_buyers'] / buyers * 100).fillna(0).round(2),
+    )
+
+
+# ============================================================================
+# 실행
+# ============================================================================
+def chunk_rows_for(memory_mb: int) -> int:
+    """메모리 예산 → 청크 행 수"""
+    return max(MIN_CHUNK_ROWS, memory_mb * 1024 * 1024 // BYTES_PER_ROW)
+
+
+def generate_cohort_retention(paths: Optional[ClientPaths] = None, input_file: Optional[Path] = None,
+                              period: str = 'week', memory_mb: int = 256) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    사용자 단위 이벤트 export → 코호트 리텐션/곡선 CSV 생성
+
+    Args:
+        paths: 클라이언트 경로 (None이면 레거시 경로)
+        input_file: 사용자 이벤트 CSV (None이면 GA4/GA4_user_events.csv)
+        period: 코호트 기간 ('week' 또는 'month')
+        memory_mb: 청크 메모리 예산 (MB)
+
+    Returns:
+        (cohort_retention, cohort_curves) 또는 입력 파일이 없으면 None
+    """
+    print("=== 코호트 리텐션 분석 시작 ===")
+
+    if paths:
+        input_file = input_file or paths.ga4_user_events
+        retention_file, curves_file = paths.cohort_retention, paths.cohort_curves
+    else:
+        input_file = input_file or USER_EVENTS_FILE
+        retention_file, curves_file = OUTPUT_COHORT_RETENTION, OUTPUT_COHORT_CURVES
+
+    input_file = Path(input_file)
+    if not input_file.exists():
+        print(f"⚠️ 사용자 단위 이벤트 파일이 없어 건너뜁니다: {input_file}")
+        print("   (docs/COHORT_RETENTION_GUIDE.md의 user_pseudo_id 단위 export 필요)")
+        return None
+
+    columns = resolve_columns(input_file)
+    chunk_rows = chunk_rows_for(memory_mb)
+    print(f"입력: {input_file}")
+    print(f"컬럼: {', '.join(f'{role}={name}' for role, name in columns.items())}")
+    print(f"코호트 기간: {period}, 청크: {chunk_rows:,}행 (메모리 예산 {memory_mb}MB)")
+
+    builder = CohortBuilder(period)
+
+    # 1차 패스: 사용자 ID 압축 + 첫 방문 코호트
+    started = time.time()
+    total_rows = 0
+    for events in iter_events(input_file, columns, chunk_rows):
+        builder.observe(events)
+        total_rows += len(events)
+    if builder.users.size == 0:
+        print("⚠️ 유효한 사용자 이벤트가 없습니다.")
+        return None
+    print(f"1차 패스: {total_rows:,}행, 사용자 {builder.users.size:,}명, 채널 {len(builder.channels)}개 "
+          f"(사용자 상태 약 {builder.users.size * BYTES_PER_USER / 1024 / 1024:.1f}MB, {time.time() - started:.1f}초)")
+
+    # 2차 패스: 활동/구매 비트마스크 + 매출
+    started = time.time()
+    builder.prepare()
+    for events in iter_events(input_file, columns, chunk_rows):
+        builder.accumulate(events)
+    print(f"2차 패스: 코호트 {builder.n_cohorts}개 ({time.time() - started:.1f}초)")
+
+    retention, curves = builder.tables()
+
+    retention_file.parent.mkdir(parents=True, exist_ok=True)
+    retention.to_csv(retention_file, index=False, encoding='utf-8-sig')
+    curves.to_csv(curves_file, index=False, encoding='utf-8-sig')
+    print(f"✓ 코호트 리텐션: {len(retention)} rows → {retention_file}")
+    print(f"✓ 채널별 곡선: {len(curves)} rows → {curves_file}")
+
+    return retention, curves
+
+
+def main(client_id: Optional[str] = None):
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='사용자 단위 코호트 리텐션 분석')
+    parser.add_argument('--client', type=str, default=None,
+                        help='클라이언트 ID (멀티클라이언트 모드)')
+    parser.add_argument('--input', type=str, default=None,
+                        help='사용자 이벤트 CSV 경로 (기본: GA4/GA4_user_events.csv)')
+    parser.add_argument('--period', type=str, default='week', choices=PERIODS,
+                        help='코호트 기간 단위')
+    parser.add_argument('--memory-mb', type=int, default=256,
+                        help='청크 메모리 예산 (MB)')
+    args = parser.parse_args()
+
+    actual_client_id = args.client or client_id
+
+    # 클라이언트 모드 설정
+    paths = None
+    if actual_client_id:
+        paths = ClientPaths(actual_client_id).ensure_dirs()
+
+    print("=" * 60)
+    print("코호트 리텐션 분석 스크립트")
+    if actual_client_id:
+        print(f"Client: {actual_client_id}")
+    print("=" * 60)
+
+    try:
+        generate_cohort_retention(paths, Path(args.input) if args.input else None, args.period, args.memory_mb)
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
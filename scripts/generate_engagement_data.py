@@ -2,22 +2,32 @@
 """
 채널별 참여도 및 재방문율 분석 데이터 생성 스크립트
 
+- GA4 데이터는 rollup(채널 × 일 합계) 또는 미리 로드한 GA4 프레임을 1회만 사용
+- 세션 가중 평균 = sum(duration × sessions) / sum(sessions) (채널별 합계 1회 groupby)
+- 퍼널 멀티기간과 같은 기간(전체/180일/90일/30일)을 rollup 윈도우로 계산해
+  channel_engagement_by_period.csv에 저장 (channel_engagement.csv는 항상 전체 기간)
+- --days N 단일 기간 결과는 channel_engagement_{N}d.csv에 따로 저장 (전체 기간 파일을 덮어쓰지 않음)
+- new_vs_returning.csv도 1회만 로드해 두 분석이 공유
+
 사용법:
 - 레거시: python generate_engagement_data.py
 - 멀티클라이언트: python generate_engagement_data.py --client clientA
+- 단일 기간: python generate_engagement_data.py --client clientA --days 30
 """
 
 import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import sys
 
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.ga4_rollup import GA4Rollup, SESSION_DURATION_TOTAL
+from scripts.common.periods import FUNNEL_PERIODS
 
 # 데이터 경로 설정 (레거시 호환용)
 BASE_DIR = Path(__file__).parent.parent / 'data'
@@ -27,54 +37,62 @@ CHANNEL_FUNNEL_FILE = BASE_DIR / 'funnel' / 'channel_funnel.csv'
 
 # 출력 파일 경로 (레거시)
 OUTPUT_ENGAGEMENT = BASE_DIR / 'funnel' / 'channel_engagement.csv'
+OUTPUT_ENGAGEMENT_BY_PERIOD = BASE_DIR / 'funnel' / 'channel_engagement_by_period.csv'
 OUTPUT_NEW_VS_RETURNING_CVR = BASE_DIR / 'funnel' / 'new_vs_returning_conversion.csv'
 
 
-def generate_channel_engagement_data(paths: Optional[ClientPaths] = None):
-    """
-    채널별 참여도 및 재방문율 데이터 생성
-    - Sessions, Engaged sessions, Avg session duration, Bounce rate
-    - Return rate (100 - New user %)
-    """
-    print("=== 채널별 참여도 데이터 생성 시작 ===")
+ENGAGEMENT_COLUMNS = [
+    'channel',
+    'Sessions',
+    'Engaged sessions',
+    'Engagement rate',
+    'Average session duration',
+    'Bounce rate',
+    'Return rate'
+]
 
-    # 경로 설정 (클라이언트 모드 vs 레거시 모드)
-    if paths:
-        ga4_file = paths.ga4_data
-        nvr_file = paths.new_vs_returning
-        output_file = paths.channel_engagement
-    else:
-        ga4_file = GA4_FILE
-        nvr_file = NEW_VS_RETURNING_FILE
-        output_file = OUTPUT_ENGAGEMENT
 
-    # GA4 데이터 로드
-    print(f"GA4 데이터 로드 중: {ga4_file}")
-    ga4_df = pd.read_csv(ga4_file, encoding='utf-8-sig')
+def load_engagement_source(ga4_file: Path, rollup: Optional[GA4Rollup] = None,
+                           ga4_df: Optional[pd.DataFrame] = None) -> GA4Rollup:
+    """
+    참여도 집계용 GA4 rollup 준비 (파일은 필요할 때만 읽음)
 
-    # new_vs_returning 데이터 로드 (재방문율 계산용)
-    print(f"재방문 데이터 로드 중: {nvr_file}")
-    nvr_df = pd.read_csv(nvr_file, encoding='utf-8-sig')
+    Args:
+        ga4_file: GA4_data.csv 경로 (rollup/ga4_df가 없을 때 사용)
+        rollup: 이미 로드한 GA4 rollup
+        ga4_df: 이미 로드한 GA4 원본 (read_ga4_file() 형식, Day는 datetime) → 메모리에서 rollup 생성
+    """
+    if rollup is not None:
+        return rollup
+    if ga4_df is not None:
+        return GA4Rollup.build(ga4_df)
+    # GA4 rollup 로드 (채널 × 일 합계, 없거나 원본과 다르면 GA4_data.csv로 생성)
+    print(f"GA4 rollup 로드 중: {ga4_file}")
+    return GA4Rollup.load_or_build(Path(ga4_file))
 
-    # 채널별로 집계
-    print("채널별 집계 중...")
 
-    # GA4 데이터에서 채널별 참여도 지표 계산
-    channel_stats = ga4_df.groupby('channel').agg({
+def calculate_channel_engagement(engagement_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    channel × 일 참여도 합계 → 채널별 참여도 지표
+
+    - Sessions, Engaged sessions, Avg session duration, Bounce rate
+    - Return rate (100 - New user %)
+    """
+    # rollup에서 채널별 참여도 지표 계산
+    channel_stats = engagement_df.groupby('channel').agg({
         'Sessions': 'sum',
         'Engaged sessions': 'sum',
         'Total users': 'sum',
-        'New users': 'sum'
+        'New users': 'sum',
+        SESSION_DURATION_TOTAL: 'sum'
     }).reset_index()
 
     # Average session duration 세션 가중 평균 계산
     # = sum(duration × sessions) / sum(sessions)
-    weighted_duration = ga4_df.groupby('channel').apply(
-        lambda x: (x['Average session duration'] * x['Sessions']).sum() / x['Sessions'].sum()
-        if x['Sessions'].sum() > 0 else 0,
-        include_groups=False
-    ).reset_index(name='Average session duration')
-    channel_stats = channel_stats.merge(weighted_duration, on='channel', how='left')
+    sessions = channel_stats['Sessions']
+    channel_stats['Average session duration'] = np.where(
+        sessions > 0, channel_stats[SESSION_DURATION_TOTAL] / sessions.where(sessions > 0), 0
+    )
 
     # 참여율 계산 (Engaged sessions / Total sessions * 100)
     channel_stats['Engagement rate'] = (
@@ -98,15 +116,38 @@ def generate_channel_engagement_data(paths: Optional[ClientPaths] = None):
     channel_stats['Average session duration'] = channel_stats['Average session duration'].round(1)
 
     # 필요한 컬럼만 선택
-    result = channel_stats[[
-        'channel',
-        'Sessions',
-        'Engaged sessions',
-        'Engagement rate',
-        'Average session duration',
-        'Bounce rate',
-        'Return rate'
-    ]]
+    return channel_stats[ENGAGEMENT_COLUMNS]
+
+
+def generate_channel_engagement_data(paths: Optional[ClientPaths] = None, rollup: Optional[GA4Rollup] = None,
+                                     ga4_df: Optional[pd.DataFrame] = None, days: int = 0):
+    """
+    채널별 참여도 및 재방문율 데이터 생성
+
+    Args:
+        paths: 클라이언트 경로 (None이면 레거시 경로)
+        rollup: 이미 로드한 GA4 rollup (없으면 ga4_df 또는 GA4_data.csv 사용)
+        ga4_df: 이미 로드한 GA4 원본 프레임
+        days: 최근 N일만 집계 (0이면 전체 기간, N > 0이면 channel_engagement_{N}d.csv에 저장)
+    """
+    print("=== 채널별 참여도 데이터 생성 시작 ===")
+
+    # 경로 설정 (클라이언트 모드 vs 레거시 모드)
+    if paths:
+        ga4_file = paths.ga4_data
+        output_file = paths.channel_engagement
+    else:
+        ga4_file = GA4_FILE
+        output_file = OUTPUT_ENGAGEMENT
+    # 대시보드가 읽는 channel_engagement.csv는 전체 기간 전용 → 기간 결과는 접미사 파일로 분리
+    if days > 0:
+        output_file = output_file.with_name(f"{output_file.stem}_{days}d{output_file.suffix}")
+
+    rollup = load_engagement_source(ga4_file, rollup, ga4_df)
+
+    # 채널별로 집계
+    print(f"채널별 집계 중... ({'전체 기간' if days <= 0 else f'최근 {days}일'})")
+    result = calculate_channel_engagement(rollup.window(days).table('channel_day_engagement'))
 
     # CSV 저장
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -119,23 +160,69 @@ def generate_channel_engagement_data(paths: Optional[ClientPaths] = None):
     return result
 
 
-def generate_new_vs_returning_conversion(paths: Optional[ClientPaths] = None):
+def generate_channel_engagement_by_period(paths: Optional[ClientPaths] = None, rollup: Optional[GA4Rollup] = None,
+                                          ga4_df: Optional[pd.DataFrame] = None,
+                                          periods: Optional[List[dict]] = None):
+    """
+    기간별(전체/180일/90일/30일) 채널 참여도 데이터 생성 (GA4 데이터 1회 로드, 기간은 rollup 윈도우)
+
+    Returns:
+        period, period_label 컬럼이 추가된 기간별 채널 참여도 DataFrame
+    """
+    print("\n=== 기간별 채널 참여도 데이터 생성 시작 ===")
+
+    if paths:
+        ga4_file = paths.ga4_data
+        output_file = paths.channel_engagement_by_period
+    else:
+        ga4_file = GA4_FILE
+        output_file = OUTPUT_ENGAGEMENT_BY_PERIOD
+
+    rollup = load_engagement_source(ga4_file, rollup, ga4_df)
+
+    frames = []
+    for period in periods or FUNNEL_PERIODS:
+        stats = calculate_channel_engagement(rollup.window(period['days']).table('channel_day_engagement'))
+        print(f"  - {period['label']}: {len(stats)}개 채널")
+        frames.append(stats.assign(period=period['key'], period_label=period['label']))
+
+    result = pd.concat(frames, ignore_index=True)[['period', 'period_label'] + ENGAGEMENT_COLUMNS]
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    print(f"데이터 저장 중: {output_file}")
+    result.to_csv(output_file, index=False, encoding='utf-8-sig')
+    print(f"✓ 기간별 채널 참여도 데이터 생성 완료: {len(result)}행")
+
+    return result
+
+
+def load_new_vs_returning(paths: Optional[ClientPaths] = None) -> pd.DataFrame:
+    """new_vs_returning.csv 로드"""
+    nvr_file = paths.new_vs_returning if paths else NEW_VS_RETURNING_FILE
+    print(f"재방문 데이터 로드 중: {nvr_file}")
+    return pd.read_csv(nvr_file, encoding='utf-8-sig')
+
+
+def generate_new_vs_returning_conversion(paths: Optional[ClientPaths] = None,
+                                         nvr_df: Optional[pd.DataFrame] = None):
     """
     신규 vs 재방문 고객의 퍼널 단계별 전환율 비교 데이터 생성
+
+    Args:
+        paths: 클라이언트 경로 (None이면 레거시 경로)
+        nvr_df: 이미 로드한 new_vs_returning 데이터 (없으면 파일에서 로드)
     """
     print("\n=== 신규 vs 재방문 고객 전환율 비교 데이터 생성 시작 ===")
 
     # 경로 설정 (클라이언트 모드 vs 레거시 모드)
     if paths:
-        nvr_file = paths.new_vs_returning
         output_file = paths.funnel / 'new_vs_returning_conversion.csv'
     else:
-        nvr_file = NEW_VS_RETURNING_FILE
         output_file = OUTPUT_NEW_VS_RETURNING_CVR
 
     # new_vs_returning 데이터 로드
-    print(f"재방문 데이터 로드 중: {nvr_file}")
-    nvr_df = pd.read_csv(nvr_file, encoding='utf-8-sig')
+    if nvr_df is None:
+        nvr_df = load_new_vs_returning(paths)
 
     print(f"데이터 행 수: {len(nvr_df)}")
     print(f"컬럼: {nvr_df.columns.tolist()}")
@@ -196,6 +283,8 @@ def main(client_id: Optional[str] = None):
     parser = argparse.ArgumentParser(description='재방문 및 참여도 분석 데이터 생성')
     parser.add_argument('--client', type=str, default=None,
                         help='클라이언트 ID (멀티클라이언트 모드)')
+    parser.add_argument('--days', type=int, default=0,
+                        help='최근 N일만 집계해 channel_engagement_{N}d.csv에 저장 (기본: 0 = 전체 기간 + 기간별 데이터 생성)')
     args = parser.parse_args()
 
     actual_client_id = args.client or client_id
@@ -212,11 +301,20 @@ def main(client_id: Optional[str] = None):
     print("=" * 60)
 
     try:
+        # 입력 데이터 1회 로드 (GA4 rollup, new_vs_returning)
+        ga4_file = paths.ga4_data if paths else GA4_FILE
+        rollup = load_engagement_source(ga4_file)
+        nvr_df = load_new_vs_returning(paths)
+
         # 1. 채널별 참여도 데이터 생성
-        engagement_data = generate_channel_engagement_data(paths)
+        engagement_data = generate_channel_engagement_data(paths, rollup=rollup, days=args.days)
+
+        # 2. 기간별 채널 참여도 데이터 생성 (전체 기간 실행에서만)
+        if args.days <= 0:
+            generate_channel_engagement_by_period(paths, rollup=rollup)
 
-        # 2. 신규 vs 재방문 고객 전환율 비교 데이터 생성
-        conversion_data = generate_new_vs_returning_conversion(paths)
+        # 3. 신규 vs 재방문 고객 전환율 비교 데이터 생성
+        conversion_data = generate_new_vs_returning_conversion(paths, nvr_df=nvr_df)
 
         print("\n" + "=" * 60)
         print("✓ 모든 데이터 생성 완료!")
@@ -9,12 +9,12 @@ GA4 데이터를 기반으로 AARRR 퍼널 분석 데이터 생성
 - 다중 기간 필터링 지원 (--days 파라미터)
 """
 import pandas as pd
-import json
 import os
 import numpy as np
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Optional
 from scipy import stats
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
@@ -24,6 +24,10 @@ warnings.filterwarnings('ignore')
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.ga4_rollup import GA4Rollup
+from scripts.common.rules_engine import Rule, RuleSet
+from scripts.common.rolling_window import window_compare
+from scripts.common.json_io import to_builtin, write_json
 
 # ============================================================================
 # 커맨드라인 인자 파싱 (기간 필터링용)
@@ -36,32 +40,6 @@ parser.add_argument('--category', type=str, default=None,
 args, unknown = parser.parse_known_args()
 
 
-def filter_by_days(df, days, date_column='Day'):
-    """
-    최근 N일 데이터만 필터링
-
-    Args:
-        df: DataFrame
-        days: 필터링할 일수 (0이면 전체)
-        date_column: 날짜 컬럼명
-
-    Returns:
-        필터링된 DataFrame
-    """
-    if days <= 0:
-        return df
-    if date_column not in df.columns:
-        return df
-
-    df_copy = df.copy()
-    df_copy[date_column] = pd.to_datetime(df_copy[date_column])
-    max_date = df_copy[date_column].max()
-    cutoff_date = max_date - timedelta(days=days)
-    filtered = df_copy[df_copy[date_column] >= cutoff_date].copy()
-
-    return filtered
-
-
 # ============================================================================
 # 1. 설정 및 상수 정의 (Configuration)
 # ============================================================================
@@ -450,22 +428,8 @@ def safe_division(numerator, denominator, multiply=100):
 
 
 def convert_to_serializable(obj):
-    """numpy/pandas 타입을 JSON 직렬화 가능한 Python 타입으로 변환"""
-    if isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, (np.bool_, bool)):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {k: convert_to_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_serializable(i) for i in obj]
-    elif pd.isna(obj):
-        return None
-    return obj
+    """numpy/pandas 타입을 JSON 직렬화 가능한 Python 타입으로 변환 (NaN/Inf → None)"""
+    return to_builtin(obj)
 
 
 def check_data_sufficiency(df, thresholds):
@@ -518,10 +482,8 @@ def calculate_rpv_metrics(channel_funnel_pivot):
     df = channel_funnel_pivot.copy()
 
     # RPV (Revenue Per Visitor) 계산 (ZeroDivision 방지)
-    df['rpv'] = df.apply(
-        lambda x: x['Revenue'] / x['유입'] if x.get('유입', 0) > 0 else 0,
-        axis=1
-    )
+    users = df['유입'] if '유입' in df.columns else pd.Series(0, index=df.index)
+    df['rpv'] = np.where(users > 0, df['Revenue'] / users.where(users > 0), 0)
 
     # Log RPV 계산 (왜도 보정, 내부 판단용)
     df['rpv_log'] = np.log1p(df['rpv'])
@@ -617,59 +579,79 @@ def get_segment_action_detail(category, segment_type):
     return CATEGORY_SEGMENT_ACTIONS.get(key, default_actions)
 
 
-def calculate_urgency_score(alert, channel_metrics, avg_metrics):
+def calculate_urgency_scores(severity, traffic, act_rate, lost_users, avg_metrics):
     """
-    [긴급도 점수] 알림의 우선순위 점수 계산 (0-100)
+    [긴급도 점수] 알림 후보 전체의 우선순위 점수 일괄 계산 (0-100)
 
     Args:
-        alert: 알림 딕셔너리
-        channel_metrics: 해당 채널의 메트릭스
+        severity: 심각도 (모든 행 공통 문자열 또는 행별 목록)
+        traffic: 행별 유입
+        act_rate: 행별 알림 metrics의 '유입→활동' 값 (없으면 NaN)
+        lost_users: 행별 예상 손실 유저 (impact.lost_users)
         avg_metrics: 전체 평균 메트릭스
 
     Returns:
-        int: 긴급도 점수 (0-100)
+        np.ndarray: 행별 긴급도 점수 (0-100)
     """
-    score = 0
+    traffic = np.asarray(traffic, dtype=np.float64)
+    act_rate = np.asarray(act_rate, dtype=np.float64)
+    lost_users = np.asarray(lost_users, dtype=np.float64)
 
     # 1. Severity 기본 점수 (40점)
     severity_scores = {'critical': 40, 'high': 30, 'medium': 20, 'opportunity': 10}
-    score += severity_scores.get(alert.get('severity', 'medium'), 20)
+    if isinstance(severity, str):
+        score = np.full(len(traffic), severity_scores.get(severity, 20), dtype=np.int64)
+    else:
+        score = np.array([severity_scores.get(s, 20) for s in severity], dtype=np.int64)
 
     # 2. Traffic Volume 가중치 (30점) - 트래픽 많을수록 중요
-    traffic = channel_metrics.get('유입', 0)
     avg_traffic = avg_metrics.get('avg_traffic', 1)
     if avg_traffic > 0:
-        traffic_ratio = min(traffic / avg_traffic, 3)  # 최대 3배까지
-        score += int(traffic_ratio * 10)  # 최대 30점
+        traffic_ratio = np.minimum(traffic / avg_traffic, 3)  # 최대 3배까지
+        score += np.trunc(traffic_ratio * 10).astype(np.int64)  # 최대 30점
 
     # 3. Gap 심각도 (20점) - 평균 대비 격차
-    metrics = alert.get('metrics', {})
-    if '유입→활동' in metrics:
-        avg_act_rate = avg_metrics.get('avg_act_rate', 50)
-        gap = avg_act_rate - metrics['유입→활동']
-        if gap > 0:
-            score += min(int(gap), 20)  # 최대 20점
+    gap = avg_metrics.get('avg_act_rate', 50) - act_rate
+    score += np.where(gap > 0, np.minimum(np.trunc(np.where(gap > 0, gap, 0)), 20), 0).astype(np.int64)  # 최대 20점
 
     # 4. 잠재 손실 규모 (10점)
-    impact = alert.get('impact', {})
-    lost_users = impact.get('lost_users', 0)
-    if lost_users > 500:
-        score += 10
-    elif lost_users > 200:
-        score += 7
-    elif lost_users > 50:
-        score += 4
+    score += np.select([lost_users > 500, lost_users > 200, lost_users > 50], [10, 7, 4], 0)
 
-    return min(round(score), 100)
+    return np.minimum(score, 100)
+
+
+def calculate_urgency_score(alert, channel_metrics, avg_metrics):
+    """
+    [긴급도 점수] 알림의 우선순위 점수 계산 (0-100)
+
+    Args:
+        alert: 알림 딕셔너리
+        channel_metrics: 해당 채널의 메트릭스
+        avg_metrics: 전체 평균 메트릭스
+
+    Returns:
+        int: 긴급도 점수 (0-100)
+    """
+    score = calculate_urgency_scores(
+        [alert.get('severity', 'medium')],
+        [channel_metrics.get('유입', 0)],
+        [alert.get('metrics', {}).get('유입→활동', np.nan)],
+        [alert.get('impact', {}).get('lost_users', 0)],
+        avg_metrics
+    )
+    return int(score[0])
 
 
 def generate_micro_segment_alerts(channel_funnel_pivot, df_raw, thresholds):
     """
     [마이크로 세그먼트] 데이터 분석 및 마이크로 세그먼트 Alert 생성 (보강 버전)
 
+    채널별 전환율/손실 추정/긴급도를 열 단위로 한 번에 계산하고, 세그먼트 조건은
+    마스크로 평가하여 조건을 만족한 채널에 대해서만 Alert를 생성합니다.
+
     Args:
         channel_funnel_pivot: 채널별 퍼널 피벗 DataFrame (RPV 계산 완료)
-        df_raw: 원본 GA4 데이터 (category 컬럼 포함)
+        df_raw: 채널별 category 정보가 있는 GA4 데이터 (channel, category 컬럼)
         thresholds: 카테고리별 임계값
 
     Returns:
@@ -681,9 +663,6 @@ def generate_micro_segment_alerts(channel_funnel_pivot, df_raw, thresholds):
     # 동적 임계값 계산
     dynamic_th = get_dynamic_thresholds(df)
 
-    alerts = []
-    channel_metrics = {}
-
     # 채널별 category 매핑 (원본 데이터에서 추출)
     channel_category_map = {}
     if 'channel' in df_raw.columns and 'category' in df_raw.columns:
@@ -703,256 +682,247 @@ def generate_micro_segment_alerts(channel_funnel_pivot, df_raw, thresholds):
         'avg_cvr': (total_pur / total_acq * 100) if total_acq > 0 else 0
     }
 
-    for _, row in df.iterrows():
-        channel = row['channel']
-        category = channel_category_map.get(channel, 'etc')
+    # ========== 채널별 지표 (열 단위 1회 계산) ==========
+    table = df.reindex(
+        columns=['channel', '유입', '활동', '관심', '구매완료', 'Revenue', 'rpv', 'rpv_log', 'traffic_rank_pct'],
+        fill_value=0
+    ).reset_index(drop=True)
+    table['category'] = [channel_category_map.get(channel, 'etc') for channel in table['channel']]
 
-        # 지표 추출
-        acq = row.get('유입', 0)
-        activation = row.get('활동', 0)
-        consideration = row.get('관심', 0)
-        purchase = row.get('구매완료', 0)
-        revenue = row.get('Revenue', 0)
-        rpv = row.get('rpv', 0)
+    acq = table['유입'].to_numpy(dtype=np.float64)
+    activation = table['활동'].to_numpy(dtype=np.float64)
+    consideration = table['관심'].to_numpy(dtype=np.float64)
+    purchase = table['구매완료'].to_numpy(dtype=np.float64)
+    revenue = table['Revenue'].to_numpy(dtype=np.float64)
 
+    with np.errstate(divide='ignore', invalid='ignore'):
         # 전환율 계산
-        act_rate = (activation / acq * 100) if acq > 0 else 0
-        engagement_rate = (consideration / activation * 100) if activation > 0 else 0
-        cvr = (purchase / acq * 100) if acq > 0 else 0
-        cart_rate = (purchase / consideration * 100) if consideration > 0 else 0
+        act_rate = np.where(acq > 0, activation / acq * 100, 0.0)
+        engagement_rate = np.where(activation > 0, consideration / activation * 100, 0.0)
+        cvr = np.where(acq > 0, purchase / acq * 100, 0.0)
+        cart_rate = np.where(consideration > 0, purchase / consideration * 100, 0.0)
 
         # 예상 손실 유저 (Impact 산출용)
-        loss_users = int(acq * (avg_metrics['avg_act_rate'] - act_rate) / 100) if act_rate < avg_metrics['avg_act_rate'] else 0
+        loss_users = np.where(act_rate < avg_metrics['avg_act_rate'],
+                              np.trunc(acq * (avg_metrics['avg_act_rate'] - act_rate) / 100), 0)
 
         # 잠재 매출 손실 계산
-        avg_revenue_per_purchase = revenue / purchase if purchase > 0 else 50000  # 기본값 5만원
-        potential_lost_revenue = int(loss_users * avg_metrics['avg_cvr'] / 100 * avg_revenue_per_purchase)
-
-        # 채널 메트릭스 (urgency_score 계산용)
-        ch_metrics = {
-            '유입': acq,
-            'act_rate': act_rate,
-            'engagement_rate': engagement_rate,
-            'cvr': cvr,
-            'cart_rate': cart_rate
+        avg_revenue_per_purchase = np.where(purchase > 0, revenue / purchase, 50000)  # 기본값 5만원
+        potential_lost_revenue = np.trunc(loss_users * avg_metrics['avg_cvr'] / 100 * avg_revenue_per_purchase)
+
+        # 결제 이탈로 인한 잠재 손실
+        lost_purchases = np.where(cart_rate < avg_metrics['avg_cart_rate'],
+                                  np.trunc(consideration * (avg_metrics['avg_cart_rate'] - cart_rate) / 100), 0)
+        checkout_lost_revenue = np.trunc(lost_purchases * avg_revenue_per_purchase)
+
+        # 관심 단절로 인한 잠재 손실
+        expected_consideration = np.trunc(activation * avg_metrics['avg_engagement_rate'] / 100)
+        lost_consideration = np.maximum(0, expected_consideration - consideration)
+
+    table = table.assign(
+        act_rate=act_rate, engagement_rate=engagement_rate, cvr=cvr, cart_rate=cart_rate,
+        loss_users=loss_users, avg_revenue_per_purchase=avg_revenue_per_purchase,
+        potential_lost_revenue=potential_lost_revenue, lost_purchases=lost_purchases,
+        checkout_lost_revenue=checkout_lost_revenue, lost_consideration=lost_consideration
+    )
+
+    # ========== 세그먼트 조건 (평가 순서대로, 앞선 세그먼트 결과 참조) ==========
+    rpv = table['rpv'].to_numpy(dtype=np.float64)
+    segment_masks = {
+        # [Logic A] Hidden VIP (저전환/고가치) -> Opportunity
+        'vip_segment': (cvr < 1.0) & (rpv >= dynamic_th['rpv_high']) & (rpv > 0),
+        # [Logic B] Traffic Waste (고유입/저효율) -> High Alert
+        'traffic_leak': (acq >= dynamic_th['traffic_high']) & (act_rate < 40) & (rpv < dynamic_th['rpv_low']),
+        # [Logic C] Checkout Friction (결제 이탈) -> Critical Alert
+        'checkout_friction': (consideration > 50) & (cart_rate < 10),
+        # [Logic D] Rising Star (성장 기회) -> Opportunity
+        'growth_engine': (acq < dynamic_th['traffic_low']) & (act_rate > 70) & (acq > 0),
+    }
+    # [Logic E] Activation Drop (첫 이탈) -> High Alert (urgent_alerts의 activation_low 통합)
+    segment_masks['activation_drop'] = (
+        (acq >= thresholds['min_users_for_analysis']) & (act_rate < thresholds['activation_rate_warning'])
+        & ~segment_masks['traffic_leak']
+    )
+    # [Logic F] Engagement Gap (관심 단절) -> Medium Alert
+    segment_masks['engagement_gap'] = (
+        (activation > 50) & (act_rate >= 50) & (engagement_rate < avg_metrics['avg_engagement_rate'] * 0.6)
+    )
+    # [Logic G] Silent Majority (침묵하는 다수) -> 다른 세그먼트가 없고 모든 지표가 평균 대비 20% 이상 낮은 경우
+    segment_masks['silent_majority'] = (
+        (acq >= thresholds['min_users_for_analysis']) & ~np.logical_or.reduce(list(segment_masks.values()))
+        & (act_rate < avg_metrics['avg_act_rate'] * 0.8) & (cvr < avg_metrics['avg_cvr'] * 0.8)
+    )
+
+    # 세그먼트별 긴급도 (알림 metrics의 '유입→활동'은 소수 첫째 자리 반올림 값)
+    segment_lost_users = {
+        'vip_segment': 0, 'traffic_leak': loss_users, 'checkout_friction': lost_purchases, 'growth_engine': 0,
+        'activation_drop': loss_users, 'engagement_gap': lost_consideration, 'silent_majority': loss_users
+    }
+    for segment_type, lost in segment_lost_users.items():
+        table[segment_type] = segment_masks[segment_type]
+        table[f'urgency_{segment_type}'] = calculate_urgency_scores(
+            MICRO_SEGMENT_DEFINITIONS[segment_type]['severity'], acq, np.round(act_rate, 1),
+            np.broadcast_to(lost, acq.shape), avg_metrics
+        )
+
+    # ========== Alert 레코드 (조건을 만족한 채널만 생성) ==========
+    def benchmark(avg_value, value, digits):
+        return {'channel_avg': round(avg_value, digits), 'your_value': round(value, digits), 'gap': round(value - avg_value, digits)}
+
+    def vip_segment(r, seg_def, action_detail):
+        return {
+            'type': 'opportunity',
+            'sub_type': 'vip_segment',
+            'severity': seg_def['severity'],
+            'title': f"{seg_def['icon']} {r['channel']}: VIP 채널 발견",
+            'message': f"전환율은 낮지만, 객단가가 높아 방문당 {int(r['rpv']):,}원의 가치를 창출합니다.",
+            'diagnosis': f"[{r['category']}] 고객 단가가 높은 프리미엄 채널입니다.",
+            'action': "전환율보다는 ROAS 유지에 집중하세요. 섣불리 예산을 줄이지 마세요.",
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '전환율': round(r['cvr'], 2), 'RPV': int(r['rpv'])},
+            'impact': {'lost_users': 0, 'potential_revenue': int(r['rpv'] * r['유입'])},
+            'benchmark': benchmark(avg_metrics['avg_cvr'], r['cvr'], 2)
         }
 
-        # 세그먼트 분류 플래그
-        detected_segments = []
+    def traffic_leak(r, seg_def, action_detail):
+        return {
+            'type': 'problem',
+            'sub_type': 'traffic_leak',
+            'severity': seg_def['severity'],
+            'title': f"{seg_def['icon']} {r['channel']}: 예산 누수 경고",
+            'message': f"[{r['category']}] 유입은 많지만(Top 20%) 실속이 없습니다. 예상 손실 유저: {int(r['loss_users']):,}명",
+            'diagnosis': f"[{r['category']}] 채널 특성에 맞지 않는 랜딩페이지 전략입니다.",
+            'action': action_detail.get('primary', get_category_advice(r['category'], 'activation')),
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '전환율': round(r['cvr'], 2), '유입': int(r['유입'])},
+            'impact': {'lost_users': int(r['loss_users']), 'potential_revenue': int(r['potential_lost_revenue'])},
+            'benchmark': benchmark(avg_metrics['avg_act_rate'], r['act_rate'], 1)
+        }
 
-        # ----------------------------------------------------------------
-        # [Logic A] Hidden VIP (저전환/고가치) -> Opportunity
-        # ----------------------------------------------------------------
-        if (cvr < 1.0) and (rpv >= dynamic_th['rpv_high']) and rpv > 0:
-            segment_type = 'vip_segment'
-            seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-            action_detail = get_segment_action_detail(category, segment_type)
+    def checkout_friction(r, seg_def, action_detail):
+        return {
+            'type': 'problem',
+            'sub_type': 'checkout_friction',
+            'severity': seg_def['severity'],
+            'title': f"{seg_def['icon']} {r['channel']}: 결제 장벽 감지",
+            'message': f"관심→구매 전환율이 {r['cart_rate']:.1f}%로 매우 낮습니다. (기준 10% 대비 -{(10 - r['cart_rate']):.1f}%p)",
+            'diagnosis': f"[{r['category']}] 유저의 구매 결정을 막는 요소가 있습니다.",
+            'action': action_detail.get('primary', get_category_advice(r['category'], 'conversion')),
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '관심→구매': round(r['cart_rate'], 1), '관심': int(r['관심'])},
+            'impact': {'lost_users': int(r['lost_purchases']), 'potential_revenue': int(r['checkout_lost_revenue'])},
+            'benchmark': benchmark(avg_metrics['avg_cart_rate'], r['cart_rate'], 1)
+        }
 
-            alert = {
-                'type': 'opportunity',
-                'sub_type': segment_type,
-                'severity': seg_def['severity'],
-                'title': f"{seg_def['icon']} {channel}: VIP 채널 발견",
-                'message': f"전환율은 낮지만, 객단가가 높아 방문당 {int(rpv):,}원의 가치를 창출합니다.",
-                'diagnosis': f"[{category}] 고객 단가가 높은 프리미엄 채널입니다.",
-                'action': "전환율보다는 ROAS 유지에 집중하세요. 섣불리 예산을 줄이지 마세요.",
-                'action_detail': action_detail,
-                'category': category,
-                'metrics': {'유입→활동': round(act_rate, 1), '전환율': round(cvr, 2), 'RPV': int(rpv)},
-                'impact': {'lost_users': 0, 'potential_revenue': int(rpv * acq)},
-                'benchmark': {'channel_avg': round(avg_metrics['avg_cvr'], 2), 'your_value': round(cvr, 2), 'gap': round(cvr - avg_metrics['avg_cvr'], 2)}
-            }
-            alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-            alerts.append(alert)
-            detected_segments.append(segment_type)
+    def growth_engine(r, seg_def, action_detail):
+        channel = r['channel']
+        return {
+            'type': 'opportunity',
+            'sub_type': 'growth_engine',
+            'severity': seg_def['severity'],
+            'channel': channel,  # 채널명 추가
+            'title': f"{seg_def['icon']} {channel}: 성장 엔진 점화",
+            'message': f"'{channel}' 채널은 방문자의 {r['act_rate']:.1f}%가 반응하는 알짜 채널입니다. 예산 증액 시 성장이 확실시됩니다.",
+            'diagnosis': f"[{r['category']}] 작지만 강한 채널입니다. 스케일업 기회!",
+            'action': f"'{channel}' 채널의 트래픽 볼륨을 확보하여 매출 규모를 키우세요.",
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '전환율': round(r['cvr'], 2), '유입': int(r['유입'])},
+            'impact': {'lost_users': 0, 'potential_revenue': int(r['유입'] * 3 * r['cvr'] / 100 * r['avg_revenue_per_purchase'])},  # 3배 증액 시 예상
+            'benchmark': benchmark(avg_metrics['avg_act_rate'], r['act_rate'], 1)
+        }
 
-        # ----------------------------------------------------------------
-        # [Logic B] Traffic Waste (고유입/저효율) -> High Alert
-        # ----------------------------------------------------------------
-        if (acq >= dynamic_th['traffic_high']) and (act_rate < 40) and (rpv < dynamic_th['rpv_low']):
-            segment_type = 'traffic_leak'
-            seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-            action_detail = get_segment_action_detail(category, segment_type)
-
-            alert = {
-                'type': 'problem',
-                'sub_type': segment_type,
-                'severity': seg_def['severity'],
-                'title': f"{seg_def['icon']} {channel}: 예산 누수 경고",
-                'message': f"[{category}] 유입은 많지만(Top 20%) 실속이 없습니다. 예상 손실 유저: {loss_users:,}명",
-                'diagnosis': f"[{category}] 채널 특성에 맞지 않는 랜딩페이지 전략입니다.",
-                'action': action_detail.get('primary', get_category_advice(category, 'activation')),
-                'action_detail': action_detail,
-                'category': category,
-                'metrics': {'유입→활동': round(act_rate, 1), '전환율': round(cvr, 2), '유입': int(acq)},
-                'impact': {'lost_users': loss_users, 'potential_revenue': potential_lost_revenue},
-                'benchmark': {'channel_avg': round(avg_metrics['avg_act_rate'], 1), 'your_value': round(act_rate, 1), 'gap': round(act_rate - avg_metrics['avg_act_rate'], 1)}
-            }
-            alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-            alerts.append(alert)
-            detected_segments.append(segment_type)
+    def activation_drop(r, seg_def, action_detail):
+        return {
+            'type': 'problem',
+            'sub_type': 'activation_drop',
+            'severity': seg_def['severity'],
+            'title': f"{seg_def['icon']} {r['channel']}: 첫 이탈 경고",
+            'message': f"유입→활동 전환율이 {r['act_rate']:.1f}%로 기준({thresholds['activation_rate_warning']}%) 미달입니다.",
+            'diagnosis': f"[{r['category']}] 랜딩페이지에서 대량 이탈이 발생하고 있습니다.",
+            'action': action_detail.get('primary', get_category_advice(r['category'], 'activation')),
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '전환율': round(r['cvr'], 2), '유입': int(r['유입'])},
+            'impact': {'lost_users': int(r['loss_users']), 'potential_revenue': int(r['potential_lost_revenue'])},
+            'benchmark': benchmark(avg_metrics['avg_act_rate'], r['act_rate'], 1)
+        }
 
-        # ----------------------------------------------------------------
-        # [Logic C] Checkout Friction (결제 이탈) -> Critical Alert
-        # ----------------------------------------------------------------
-        if (consideration > 50) and (cart_rate < 10):
-            segment_type = 'checkout_friction'
-            seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-            action_detail = get_segment_action_detail(category, segment_type)
-
-            # 결제 이탈로 인한 잠재 손실
-            lost_purchases = int(consideration * (avg_metrics['avg_cart_rate'] - cart_rate) / 100) if cart_rate < avg_metrics['avg_cart_rate'] else 0
-            checkout_lost_revenue = int(lost_purchases * avg_revenue_per_purchase)
-
-            alert = {
-                'type': 'problem',
-                'sub_type': segment_type,
-                'severity': seg_def['severity'],
-                'title': f"{seg_def['icon']} {channel}: 결제 장벽 감지",
-                'message': f"관심→구매 전환율이 {cart_rate:.1f}%로 매우 낮습니다. (기준 10% 대비 -{(10-cart_rate):.1f}%p)",
-                'diagnosis': f"[{category}] 유저의 구매 결정을 막는 요소가 있습니다.",
-                'action': action_detail.get('primary', get_category_advice(category, 'conversion')),
-                'action_detail': action_detail,
-                'category': category,
-                'metrics': {'유입→활동': round(act_rate, 1), '관심→구매': round(cart_rate, 1), '관심': int(consideration)},
-                'impact': {'lost_users': lost_purchases, 'potential_revenue': checkout_lost_revenue},
-                'benchmark': {'channel_avg': round(avg_metrics['avg_cart_rate'], 1), 'your_value': round(cart_rate, 1), 'gap': round(cart_rate - avg_metrics['avg_cart_rate'], 1)}
-            }
-            alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-            alerts.append(alert)
-            detected_segments.append(segment_type)
+    def engagement_gap(r, seg_def, action_detail):
+        lost_consideration = int(r['lost_consideration'])
+        return {
+            'type': 'problem',
+            'sub_type': 'engagement_gap',
+            'severity': seg_def['severity'],
+            'title': f"{seg_def['icon']} {r['channel']}: 관심 단절 감지",
+            'message': f"활동→관심 전환율이 {r['engagement_rate']:.1f}%로 평균({avg_metrics['avg_engagement_rate']:.1f}%)의 60% 미만입니다.",
+            'diagnosis': f"[{r['category']}] 상품 탐색에서 장바구니로 연결되지 않습니다.",
+            'action': action_detail.get('primary', "상품 추천 알고리즘 또는 CTA 배치를 개선하세요."),
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '활동→관심': round(r['engagement_rate'], 1), '활동': int(r['활동'])},
+            'impact': {'lost_users': lost_consideration, 'potential_revenue': int(lost_consideration * avg_metrics['avg_cart_rate'] / 100 * r['avg_revenue_per_purchase'])},
+            'benchmark': benchmark(avg_metrics['avg_engagement_rate'], r['engagement_rate'], 1)
+        }
 
-        # ----------------------------------------------------------------
-        # [Logic D] Rising Star (성장 기회) -> Opportunity
-        # ----------------------------------------------------------------
-        if (acq < dynamic_th['traffic_low']) and (act_rate > 70) and acq > 0 and 'growth_engine' not in detected_segments:
-            segment_type = 'growth_engine'
-            seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-            action_detail = get_segment_action_detail(category, segment_type)
+    def silent_majority(r, seg_def, action_detail):
+        return {
+            'type': 'problem',
+            'sub_type': 'silent_majority',
+            'severity': seg_def['severity'],
+            'title': f"{seg_def['icon']} {r['channel']}: 전반적 저조",
+            'message': f"모든 전환 지표가 평균 대비 20% 이상 낮습니다. 채널-타겟 미스매치 의심.",
+            'diagnosis': f"[{r['category']}] 채널 특성과 타겟 고객이 맞지 않을 수 있습니다.",
+            'action': action_detail.get('primary', "채널별 타겟 오디언스 재검토 및 예산 재배분을 검토하세요."),
+            'action_detail': action_detail,
+            'category': r['category'],
+            'metrics': {'유입→활동': round(r['act_rate'], 1), '전환율': round(r['cvr'], 2), '유입': int(r['유입'])},
+            'impact': {'lost_users': int(r['loss_users']), 'potential_revenue': int(r['potential_lost_revenue'])},
+            'benchmark': benchmark(avg_metrics['avg_cvr'], r['cvr'], 2)
+        }
 
-            alert = {
-                'type': 'opportunity',
-                'sub_type': segment_type,
-                'severity': seg_def['severity'],
-                'channel': channel,  # 채널명 추가
-                'title': f"{seg_def['icon']} {channel}: 성장 엔진 점화",
-                'message': f"'{channel}' 채널은 방문자의 {act_rate:.1f}%가 반응하는 알짜 채널입니다. 예산 증액 시 성장이 확실시됩니다.",
-                'diagnosis': f"[{category}] 작지만 강한 채널입니다. 스케일업 기회!",
-                'action': f"'{channel}' 채널의 트래픽 볼륨을 확보하여 매출 규모를 키우세요.",
-                'action_detail': action_detail,
-                'category': category,
-                'metrics': {'유입→활동': round(act_rate, 1), '전환율': round(cvr, 2), '유입': int(acq)},
-                'impact': {'lost_users': 0, 'potential_revenue': int(acq * 3 * cvr / 100 * avg_revenue_per_purchase)},  # 3배 증액 시 예상
-                'benchmark': {'channel_avg': round(avg_metrics['avg_act_rate'], 1), 'your_value': round(act_rate, 1), 'gap': round(act_rate - avg_metrics['avg_act_rate'], 1)}
-            }
-            alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-            alerts.append(alert)
-            detected_segments.append(segment_type)
-
-        # ----------------------------------------------------------------
-        # [Logic E] Activation Drop (첫 이탈) -> High Alert (신규)
-        # urgent_alerts의 activation_low 통합
-        # ----------------------------------------------------------------
-        if (acq >= thresholds['min_users_for_analysis']) and (act_rate < thresholds['activation_rate_warning']) and 'traffic_leak' not in detected_segments:
-            segment_type = 'activation_drop'
-            seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-            action_detail = get_segment_action_detail(category, segment_type)
-
-            alert = {
-                'type': 'problem',
-                'sub_type': segment_type,
-                'severity': seg_def['severity'],
-                'title': f"{seg_def['icon']} {channel}: 첫 이탈 경고",
-                'message': f"유입→활동 전환율이 {act_rate:.1f}%로 기준({thresholds['activation_rate_warning']}%) 미달입니다.",
-                'diagnosis': f"[{category}] 랜딩페이지에서 대량 이탈이 발생하고 있습니다.",
-                'action': action_detail.get('primary', get_category_advice(category, 'activation')),
-                'action_detail': action_detail,
-                'category': category,
-                'metrics': {'유입→활동': round(act_rate, 1), '전환율': round(cvr, 2), '유입': int(acq)},
-                'impact': {'lost_users': loss_users, 'potential_revenue': potential_lost_revenue},
-                'benchmark': {'channel_avg': round(avg_metrics['avg_act_rate'], 1), 'your_value': round(act_rate, 1), 'gap': round(act_rate - avg_metrics['avg_act_rate'], 1)}
-            }
-            alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-            alerts.append(alert)
-            detected_segments.append(segment_type)
-
-        # ----------------------------------------------------------------
-        # [Logic F] Engagement Gap (관심 단절) -> Medium Alert (신규)
-        # ----------------------------------------------------------------
-        if (activation > 50) and (act_rate >= 50) and (engagement_rate < avg_metrics['avg_engagement_rate'] * 0.6):
-            segment_type = 'engagement_gap'
-            seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-            action_detail = get_segment_action_detail(category, segment_type)
-
-            # 관심 단절로 인한 잠재 손실
-            expected_consideration = int(activation * avg_metrics['avg_engagement_rate'] / 100)
-            lost_consideration = max(0, expected_consideration - consideration)
-
-            alert = {
-                'type': 'problem',
-                'sub_type': segment_type,
-                'severity': seg_def['severity'],
-                'title': f"{seg_def['icon']} {channel}: 관심 단절 감지",
-                'message': f"활동→관심 전환율이 {engagement_rate:.1f}%로 평균({avg_metrics['avg_engagement_rate']:.1f}%)의 60% 미만입니다.",
-                'diagnosis': f"[{category}] 상품 탐색에서 장바구니로 연결되지 않습니다.",
-                'action': action_detail.get('primary', "상품 추천 알고리즘 또는 CTA 배치를 개선하세요."),
-                'action_detail': action_detail,
-                'category': category,
-                'metrics': {'유입→활동': round(act_rate, 1), '활동→관심': round(engagement_rate, 1), '활동': int(activation)},
-                'impact': {'lost_users': lost_consideration, 'potential_revenue': int(lost_consideration * avg_metrics['avg_cart_rate'] / 100 * avg_revenue_per_purchase)},
-                'benchmark': {'channel_avg': round(avg_metrics['avg_engagement_rate'], 1), 'your_value': round(engagement_rate, 1), 'gap': round(engagement_rate - avg_metrics['avg_engagement_rate'], 1)}
-            }
-            alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-            alerts.append(alert)
-            detected_segments.append(segment_type)
-
-        # ----------------------------------------------------------------
-        # [Logic G] Silent Majority (침묵하는 다수) -> Medium Alert (신규)
-        # ----------------------------------------------------------------
-        if (acq >= thresholds['min_users_for_analysis']) and len(detected_segments) == 0:
-            # 모든 지표가 평균 대비 20% 이상 낮은 경우
-            is_silent = (
-                act_rate < avg_metrics['avg_act_rate'] * 0.8 and
-                cvr < avg_metrics['avg_cvr'] * 0.8
-            )
-            if is_silent:
-                segment_type = 'silent_majority'
-                seg_def = MICRO_SEGMENT_DEFINITIONS[segment_type]
-                action_detail = get_segment_action_detail(category, segment_type)
-
-                alert = {
-                    'type': 'problem',
-                    'sub_type': segment_type,
-                    'severity': seg_def['severity'],
-                    'title': f"{seg_def['icon']} {channel}: 전반적 저조",
-                    'message': f"모든 전환 지표가 평균 대비 20% 이상 낮습니다. 채널-타겟 미스매치 의심.",
-                    'diagnosis': f"[{category}] 채널 특성과 타겟 고객이 맞지 않을 수 있습니다.",
-                    'action': action_detail.get('primary', "채널별 타겟 오디언스 재검토 및 예산 재배분을 검토하세요."),
-                    'action_detail': action_detail,
-                    'category': category,
-                    'metrics': {'유입→활동': round(act_rate, 1), '전환율': round(cvr, 2), '유입': int(acq)},
-                    'impact': {'lost_users': loss_users, 'potential_revenue': potential_lost_revenue},
-                    'benchmark': {'channel_avg': round(avg_metrics['avg_cvr'], 2), 'your_value': round(cvr, 2), 'gap': round(cvr - avg_metrics['avg_cvr'], 2)}
-                }
-                alert['urgency_score'] = calculate_urgency_score(alert, ch_metrics, avg_metrics)
-                alerts.append(alert)
-                detected_segments.append(segment_type)
-
-        # 채널별 확장 메트릭스 저장
-        channel_metrics[channel] = {
-            'category': category,
-            'rpv': round(rpv, 2),
-            'rpv_log': round(row.get('rpv_log', 0), 4),
-            'traffic_rank_pct': round(row.get('traffic_rank_pct', 0), 2),
-            'segment_types': detected_segments,  # 복수 세그먼트 지원
-            'activation_rate': round(act_rate, 1),
-            'engagement_rate': round(engagement_rate, 1),
-            'cvr': round(cvr, 2),
-            'cart_conversion_rate': round(cart_rate, 1),
-            '유입': int(acq),
-            '활동': int(activation),
-            '관심': int(consideration),
-            '구매완료': int(purchase)
+    def segment_alert(segment_type, build):
+        def record(r):
+            action_detail = get_segment_action_detail(r['category'], segment_type)
+            alert = build(r, MICRO_SEGMENT_DEFINITIONS[segment_type], action_detail)
+            alert['urgency_score'] = int(r[f'urgency_{segment_type}'])
+            return alert
+        return Rule(segment_type, when=lambda t: t[segment_type], record=record)
+
+    rules = RuleSet([
+        segment_alert('vip_segment', vip_segment),
+        segment_alert('traffic_leak', traffic_leak),
+        segment_alert('checkout_friction', checkout_friction),
+        segment_alert('growth_engine', growth_engine),
+        segment_alert('activation_drop', activation_drop),
+        segment_alert('engagement_gap', engagement_gap),
+        segment_alert('silent_majority', silent_majority),
+    ])
+    alerts = rules.evaluate(table)
+    print(f"     규칙: {rules.report()}")
+
+    # 채널별 확장 메트릭스 저장
+    segment_types = list(segment_masks)
+    segment_flags = np.column_stack(list(segment_masks.values())).tolist()
+    channel_metrics = {}
+    for r, flags in zip(table.to_dict('records'), segment_flags):
+        channel_metrics[r['channel']] = {
+            'category': r['category'],
+            'rpv': round(r['rpv'], 2),
+            'rpv_log': round(r['rpv_log'], 4),
+            'traffic_rank_pct': round(r['traffic_rank_pct'], 2),
+            'segment_types': [s for s, hit in zip(segment_types, flags) if hit],  # 복수 세그먼트 지원
+            'activation_rate': round(r['act_rate'], 1),
+            'engagement_rate': round(r['engagement_rate'], 1),
+            'cvr': round(r['cvr'], 2),
+            'cart_conversion_rate': round(r['cart_rate'], 1),
+            '유입': int(r['유입']),
+            '활동': int(r['활동']),
+            '관심': int(r['관심']),
+            '구매완료': int(r['구매완료'])
         }
 
     # ========== 우선순위 정렬 ==========
@@ -1147,43 +1117,111 @@ def analyze_bcg_matrix(channel_funnel_pivot, thresholds):
 def analyze_contextual_alerts(df, channel_funnel_pivot, thresholds):
     """
     상황(Context) 인식형 경고 생성
-    채널 특성에 따른 원인 추론
+    채널 특성에 따른 원인 추론 (채널 × 규칙 마스크로 평가, 발생한 채널만 메시지 생성)
     """
-    alerts = []
+    table = channel_funnel_pivot.reindex(columns=['channel', '유입', '활동', '관심', '구매완료'], fill_value=0)
+    table = table[table['유입'] >= thresholds['min_users_for_analysis']]
 
-    for _, row in channel_funnel_pivot.iterrows():
-        channel = row['channel']
-        users = row.get('유입', 0)
+    users = table['유입']
+    table = table.assign(
+        act_rate=np.where(users != 0, table['활동'] / users.where(users != 0) * 100, 0.0),
+        cart_to_pay_rate=np.where(table['관심'] != 0, table['구매완료'] / table['관심'].where(table['관심'] != 0) * 100, 0.0)
+    )
 
-        if users < thresholds['min_users_for_analysis']:
-            continue
+    rules = RuleSet([
+        # 1. 유입→활동 전환율 체크
+        Rule('activation_low',
+             when=lambda t: t['act_rate'] < thresholds['activation_rate_warning'],
+             record=lambda r: generate_alert_message('activation_low', r['channel'], r['act_rate'], thresholds)),
+        # 2. 관심→구매 전환율 체크
+        Rule('cart_abandonment',
+             when=lambda t: (t['관심'] > 50) & (t['cart_to_pay_rate'] < thresholds['cart_conversion_warning']),
+             record=lambda r: generate_alert_message('cart_abandonment', r['channel'], r['cart_to_pay_rate'], thresholds)),
+    ])
+    alerts = rules.evaluate(table)
+    print(f"     규칙: {rules.report()}")
 
-        activation = row.get('활동', 0)
-        consideration = row.get('관심', 0)
-        purchase = row.get('구매완료', 0)
+    return alerts
 
-        act_rate = safe_division(activation, users)
-        cart_to_pay_rate = safe_division(purchase, consideration)
 
-        # 1. 유입→활동 전환율 체크
-        if act_rate < thresholds['activation_rate_warning']:
-            alert = generate_alert_message('activation_low', channel, act_rate, thresholds)
-            if alert:
-                alerts.append(alert)
+def pairwise_chi2_2x2(success, total):
+    """
+    모든 채널 쌍(i < j)의 2×2 분할표 카이제곱 검정 (Yates 보정, 브로드캐스팅 일괄 계산)
 
-        # 2. 관심→구매 전환율 체크
-        if consideration > 50 and cart_to_pay_rate < thresholds['cart_conversion_warning']:
-            alert = generate_alert_message('cart_abandonment', channel, cart_to_pay_rate, thresholds)
-            if alert:
-                alerts.append(alert)
+    쌍마다 [[success_i, total_i - success_i], [success_j, total_j - success_j]] 분할표를 만들고
+    stats.chi2_contingency(correction=True)와 같은 순서로 기대빈도/보정/통계량을 계산합니다.
+
+    Returns:
+        dict: i, j (쌍 인덱스), observed (쌍 × 2 × 2), chi2, p_value,
+              testable (음수 칸이나 기대빈도 0이 없어 검정 가능한 쌍)
+    """
+    success = np.asarray(success, dtype=np.float64)
+    failure = np.asarray(total, dtype=np.float64) - success
+    i, j = np.triu_indices(len(success), k=1)
+
+    observed = np.stack([
+        np.stack([success[i], failure[i]], axis=-1),
+        np.stack([success[j], failure[j]], axis=-1)
+    ], axis=1)
+
+    row_sums = observed[:, :, 0:1] + observed[:, :, 1:2]
+    col_sums = observed[:, 0:1, :] + observed[:, 1:2, :]
+    grand = observed.reshape(len(observed), 4).sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = row_sums * col_sums / grand[:, None, None]
+
+        # Yates 연속성 보정 (보정 폭은 관측-기대 차이보다 크지 않음)
+        diff = expected - observed
+        corrected = observed + np.minimum(0.5, np.abs(diff)) * np.sign(diff)
+
+        terms = ((corrected - expected) ** 2 / expected).reshape(len(observed), 4)
+        chi2 = ((terms[:, 0] + terms[:, 1]) + terms[:, 2]) + terms[:, 3]
+
+    testable = (observed >= 0).all(axis=(1, 2)) & (expected != 0).all(axis=(1, 2))
+    p_value = np.full(len(chi2), np.nan)
+    p_value[testable] = stats.chi2.sf(chi2[testable], 1)
+
+    return {'i': i, 'j': j, 'observed': observed, 'chi2': chi2, 'p_value': p_value, 'testable': testable}
 
-    return alerts
+
+def adjust_p_values(p_values, method=None):
+    """
+    다중 비교 보정 p-value
+
+    Args:
+        p_values: 검정한 쌍의 p-value 배열
+        method: None(보정 없음) / 'bonferroni' / 'holm' / 'fdr_bh'(Benjamini-Hochberg)
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    m = len(p_values)
+    if method is None or m == 0:
+        return p_values
+    if method == 'bonferroni':
+        return np.minimum(p_values * m, 1.0)
+
+    order = np.argsort(p_values, kind='mergesort')
+    ranked = p_values[order]
+    if method == 'holm':
+        adjusted = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == 'fdr_bh':
+        adjusted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"지원하지 않는 다중 비교 보정: {method}")
+
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
 
 
 def analyze_ab_with_revenue_impact(channel_funnel_pivot, thresholds):
     """
     A/B 테스트 및 매출 임팩트 분석
     통계적 유의성 + 돈으로 환산
+
+    모든 채널 쌍의 카이제곱 검정을 한 번에 계산하고 min_sample_size는 마스크로 적용합니다.
+    thresholds['ab_correction']('bonferroni'/'holm'/'fdr_bh')이 있으면 보정 p-value로 유의성을 판정하고
+    결과에 p_value_adjusted를 추가합니다.
     """
     ab_results = []
     revenue_insights = []
@@ -1191,82 +1229,68 @@ def analyze_ab_with_revenue_impact(channel_funnel_pivot, thresholds):
     if len(channel_funnel_pivot) < 2:
         return ab_results, [{'status': 'insufficient_data', 'message': INSUFFICIENT_DATA_MESSAGES['few_channels']}]
 
-    channels = channel_funnel_pivot['channel'].values
-
-    for i, ch_a in enumerate(channels):
-        for ch_b in channels[i+1:]:
-            try:
-                row_a = channel_funnel_pivot[channel_funnel_pivot['channel'] == ch_a].iloc[0]
-                row_b = channel_funnel_pivot[channel_funnel_pivot['channel'] == ch_b].iloc[0]
-
-                users_a = row_a.get('유입', 0)
-                conv_a = row_a.get('구매완료', 0)
-                rev_a = row_a.get('Revenue', 0)
-
-                users_b = row_b.get('유입', 0)
-                conv_b = row_b.get('구매완료', 0)
-                rev_b = row_b.get('Revenue', 0)
-
-                # 카이제곱 검정
-                contingency_table = np.array([
-                    [conv_a, users_a - conv_a],
-                    [conv_b, users_b - conv_b]
-                ])
-
-                if contingency_table.min() < thresholds['min_sample_size']:
-                    continue
-
-                chi2, p_value, _, _ = stats.chi2_contingency(contingency_table)
-
-                cvr_a = safe_division(conv_a, users_a)
-                cvr_b = safe_division(conv_b, users_b)
-
-                is_significant = bool(p_value < thresholds['ab_significance'])
-
-                ab_result = {
-                    'type': 'channel_comparison',
-                    'group_a': ch_a,
-                    'group_b': ch_b,
-                    'metric': 'conversion_rate',
-                    'chi2_statistic': float(chi2),
-                    'p_value': float(p_value),
-                    'significant': is_significant,
-                    'cvr_a': round(float(cvr_a), 2),
-                    'cvr_b': round(float(cvr_b), 2)
-                }
-
-                # 유의미한 경우 매출 임팩트 계산
-                if is_significant:
-                    winner = ch_a if cvr_a > cvr_b else ch_b
-                    loser = ch_b if cvr_a > cvr_b else ch_a
-                    cvr_diff = abs(cvr_a - cvr_b) / 100
-
-                    # 평균 객단가
-                    total_conv = conv_a + conv_b
-                    total_rev = rev_a + rev_b
-                    arpu = total_rev / total_conv if total_conv > 0 else 0
-
-                    # 잠재 매출
-                    loser_users = users_b if cvr_a > cvr_b else users_a
-                    potential_revenue = loser_users * cvr_diff * arpu
-
-                    if potential_revenue > thresholds['potential_uplift_min']:
-                        revenue_insights.append({
-                            'test_pair': f"{ch_a} vs {ch_b}",
-                            'winner': winner,
-                            'loser': loser,
-                            'message': f"🎉 [{winner}] 채널 효율이 압도적으로 좋습니다!",
-                            'detail': f"전환율이 {abs(cvr_a-cvr_b):.1f}%p 더 높습니다.",
-                            'impact': f"💰 만약 [{loser}] 대신 [{winner}]에 집중했다면, 약 {format_korean_currency(potential_revenue)}을 더 벌었을 거예요.",
-                            'potential_revenue': potential_revenue,
-                            'potential_revenue_formatted': format_korean_currency(potential_revenue),
-                            'action': f"이제 고민 끝! [{winner}] 스타일의 전략을 확대 적용하세요."
-                        })
-
-                ab_results.append(ab_result)
+    table = channel_funnel_pivot.reindex(columns=['유입', '구매완료', 'Revenue'], fill_value=0)
+    channels = channel_funnel_pivot['channel'].to_numpy()
+    users = table['유입'].to_numpy()
+    conversions = table['구매완료'].to_numpy()
+    revenue = table['Revenue'].to_numpy()
+
+    # 채널별 전환율 (safe_division과 동일)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cvr = np.where(users != 0, conversions / np.where(users != 0, users, 1) * 100, 0.0)
+
+    # 전체 쌍 카이제곱 + 최소 샘플 마스크
+    pairs = pairwise_chi2_2x2(conversions, users)
+    tested = pairs['testable'] & (pairs['observed'].min(axis=(1, 2)) >= thresholds['min_sample_size'])
+    i, j = pairs['i'][tested], pairs['j'][tested]
+    chi2, p_value = pairs['chi2'][tested], pairs['p_value'][tested]
+
+    correction = thresholds.get('ab_correction')
+    p_adjusted = adjust_p_values(p_value, correction)
+    significant = p_adjusted < thresholds['ab_significance']
+
+    # 유의미한 쌍의 매출 임팩트 (패자 채널이 승자 전환율이었다면 얻었을 매출)
+    cvr_a, cvr_b = cvr[i], cvr[j]
+    a_wins = cvr_a > cvr_b
+    total_conv = conversions[i] + conversions[j]
+    total_rev = revenue[i] + revenue[j]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        arpu = np.where(total_conv > 0, total_rev / np.where(total_conv > 0, total_conv, 1), 0)
+    loser_users = np.where(a_wins, users[j], users[i])
+    potential_revenue = loser_users * (np.abs(cvr_a - cvr_b) / 100) * arpu
+
+    for k in range(len(i)):
+        ch_a, ch_b = channels[i[k]], channels[j[k]]
+        ab_result = {
+            'type': 'channel_comparison',
+            'group_a': ch_a,
+            'group_b': ch_b,
+            'metric': 'conversion_rate',
+            'chi2_statistic': float(chi2[k]),
+            'p_value': float(p_value[k]),
+            'significant': bool(significant[k]),
+            'cvr_a': round(float(cvr_a[k]), 2),
+            'cvr_b': round(float(cvr_b[k]), 2)
+        }
+        if correction is not None:
+            ab_result['p_value_adjusted'] = float(p_adjusted[k])
+
+        if significant[k] and potential_revenue[k] > thresholds['potential_uplift_min']:
+            winner = ch_a if a_wins[k] else ch_b
+            loser = ch_b if a_wins[k] else ch_a
+            revenue_insights.append({
+                'test_pair': f"{ch_a} vs {ch_b}",
+                'winner': winner,
+                'loser': loser,
+                'message': f"🎉 [{winner}] 채널 효율이 압도적으로 좋습니다!",
+                'detail': f"전환율이 {abs(cvr_a[k]-cvr_b[k]):.1f}%p 더 높습니다.",
+                'impact': f"💰 만약 [{loser}] 대신 [{winner}]에 집중했다면, 약 {format_korean_currency(potential_revenue[k])}을 더 벌었을 거예요.",
+                'potential_revenue': potential_revenue[k],
+                'potential_revenue_formatted': format_korean_currency(potential_revenue[k]),
+                'action': f"이제 고민 끝! [{winner}] 스타일의 전략을 확대 적용하세요."
+            })
 
-            except Exception as e:
-                continue
+        ab_results.append(ab_result)
 
     return ab_results, revenue_insights
 
@@ -1396,6 +1420,7 @@ def analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days=0)
     - d_day (마지막 7일 평균) vs d_day-N (N일 전 7일 평균)
     - 변화율 = (d_day_value - d_day-N_value) / d_day_value × 100
     - 180d, 90d, 30d 각각의 추이를 분석
+    - 구간 평균은 window_compare로 단계별 누적합에서 한 번에 계산
     """
 
     results = {
@@ -1428,12 +1453,14 @@ def analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days=0)
         {'key': '30d', 'days': 30, 'label': '30일 전 대비', 'min_data': 37}
     ]
 
-    for stage in ['유입', '활동', '관심', '결제진행']:
-        if stage not in daily_funnel_pivot.columns:
-            continue
+    # 단계별 (window, lag) 구간 평균
+    stages = [stage for stage in ['유입', '활동', '관심', '결제진행'] if stage in daily_funnel_pivot.columns]
+    means = window_compare(daily_funnel_pivot[stages], windows=[7, 30],
+                           lags=[0, 7, 30] + [period['days'] for period in trend_periods])
 
+    for stage in stages:
         # d_day: 마지막 7일 평균
-        d_day_value = daily_funnel_pivot[stage].tail(7).mean()
+        d_day_value = means.at[stage, (7, 0)]
 
         if d_day_value <= 0:
             continue
@@ -1442,9 +1469,7 @@ def analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days=0)
         for period in trend_periods:
             if data_len >= period['min_data']:
                 # d_day-N: N일 전 시점의 7일 평균 (예: -37:-30 = 30일 전 기준 7일)
-                start_idx = -(period['days'] + 7)
-                end_idx = -period['days']
-                d_day_n_value = daily_funnel_pivot[stage].iloc[start_idx:end_idx].mean()
+                d_day_n_value = means.at[stage, (7, period['days'])]
 
                 if d_day_n_value > 0:
                     # 변화율 = (현재 - 과거) / 현재 × 100
@@ -1472,13 +1497,10 @@ def analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days=0)
     results['crm_actions'] = results['crm_actions_by_trend']['30d'].copy()
 
     # 기존 7일 비교 (churn_7d, improvement_7d용 - 전체 기간용)
-    for stage in ['유입', '활동', '관심', '결제진행']:
-        if stage not in daily_funnel_pivot.columns:
-            continue
-
+    for stage in stages:
         if filter_days == 0 and data_len >= 14:
-            recent_7d = daily_funnel_pivot[stage].tail(7).mean()
-            previous_7d = daily_funnel_pivot[stage].iloc[-14:-7].mean()
+            recent_7d = means.at[stage, (7, 0)]
+            previous_7d = means.at[stage, (7, 7)]
 
             if previous_7d > 0:
                 change_pct = ((recent_7d - previous_7d) / previous_7d) * 100
@@ -1499,8 +1521,8 @@ def analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days=0)
 
         # 기존 30일 비교 (churn_30d, improvement_30d용 - 전체 기간용)
         if filter_days == 0 and data_len >= 60:
-            recent_30d = daily_funnel_pivot[stage].tail(30).mean()
-            previous_30d = daily_funnel_pivot[stage].iloc[-60:-30].mean()
+            recent_30d = means.at[stage, (30, 0)]
+            previous_30d = means.at[stage, (30, 30)]
 
             if previous_30d > 0:
                 change_pct = ((recent_30d - previous_30d) / previous_30d) * 100
@@ -1523,6 +1545,94 @@ def analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days=0)
     return results
 
 
+def analyze_channel_churn(channel_daily_pivot, days, thresholds, filter_days=0):
+    """
+    채널별 이탈/개선 예측 (채널 × 퍼널 단계의 최근 7일/30일 평균 vs 직전 같은 기간)
+
+    채널×단계를 열로 펼친 일별 프레임(전체 퍼널과 같은 일자 기준, 데이터가 없는 날은 0)에
+    window_compare를 1회 적용해 모든 채널·단계의 구간 평균을 한 번에 계산합니다.
+    비교 구간(최근+직전) 유입 합계가 min_users_for_analysis 미만인 채널은 제외합니다.
+
+    Args:
+        channel_daily_pivot: 채널별 일별 퍼널 피벗 (channel, Day, 단계 컬럼)
+        days: 전체 일별 퍼널의 일자 목록 (정렬)
+        thresholds: 카테고리별 임계값
+        filter_days: 기간 필터 (전체 기간 분석에서만 실행, 0 이외이면 빈 결과)
+
+    Returns:
+        {'churn_7d': [...], 'improvement_7d': [...], 'churn_30d': [...], 'improvement_30d': [...]}
+    """
+    results = {'churn_7d': [], 'improvement_7d': [], 'churn_30d': [], 'improvement_30d': []}
+
+    stages = [stage for stage in ['유입', '활동', '관심', '결제진행'] if stage in channel_daily_pivot.columns]
+    if filter_days != 0 or channel_daily_pivot.empty or '유입' not in stages:
+        return results
+
+    wide = channel_daily_pivot.pivot(index='Day', columns='channel', values=stages)
+    wide = wide.reindex(pd.Index(days, name='Day')).fillna(0)
+
+    period_configs = [
+        {'key': '7d', 'days': 7, 'min_data': 14},
+        {'key': '30d', 'days': 30, 'min_data': 60}
+    ]
+    windows = [cfg['days'] for cfg in period_configs]
+    means = window_compare(wide, windows=windows, lags=[0] + windows)
+    volume = window_compare(wide['유입'], windows=windows, lags=[0] + windows, how='sum')
+
+    rules = RuleSet([
+        Rule('churn',
+             when=lambda t: t['change_pct'] < thresholds['churn_alert_threshold'],
+             record=lambda r: {
+                 'type': 'churn',
+                 'channel': r['channel'],
+                 'stage': FRIENDLY_NAMES.get(r['stage'], r['stage']),
+                 'period': r['period'],
+                 'priority': 'high' if r['change_pct'] < thresholds['high_risk_threshold'] else 'medium',
+                 'change_pct': round(r['change_pct'], 1),
+                 'recent_avg': round(r['recent_avg'], 2),
+                 'previous_avg': round(r['previous_avg'], 2),
+                 'prescription': CRM_RECIPES.get(r['stage'], CRM_RECIPES['유입'])['action']
+             }),
+        Rule('improvement',
+             when=lambda t: t['change_pct'] > thresholds['improvement_threshold'],
+             record=lambda r: {
+                 'type': 'improvement',
+                 'channel': r['channel'],
+                 'stage': FRIENDLY_NAMES.get(r['stage'], r['stage']),
+                 'period': r['period'],
+                 'priority': 'high' if r['change_pct'] > thresholds['high_improvement_threshold'] else 'medium',
+                 'change_pct': round(r['change_pct'], 1),
+                 'recent_avg': round(r['recent_avg'], 2),
+                 'previous_avg': round(r['previous_avg'], 2)
+             }),
+    ], exclusive=True)
+
+    for cfg in period_configs:
+        window = cfg['days']
+        if len(wide) < cfg['min_data']:
+            continue
+
+        table = pd.DataFrame({
+            'stage': means.index.get_level_values(0),
+            'channel': means.index.get_level_values(1),
+            'period': cfg['key'],
+            'recent_avg': means[(window, 0)].to_numpy(),
+            'previous_avg': means[(window, window)].to_numpy()
+        })
+        channel_volume = volume[(window, 0)] + volume[(window, window)]
+        table = table[(table['previous_avg'] > 0) &
+                      (table['channel'].map(channel_volume) >= thresholds['min_users_for_analysis'])]
+        table = table.assign(change_pct=(table['recent_avg'] - table['previous_avg']) / table['previous_avg'] * 100)
+
+        # 변화율 오름차순 평가 → 이탈은 감소폭 큰 순, 개선은 역순으로 증가폭 큰 순
+        records = rules.evaluate(table.sort_values('change_pct', kind='mergesort'), order='rule')
+        print(f"     규칙({cfg['key']}): {rules.report()}")
+        results[f"churn_{cfg['key']}"] = [r for r in records if r['type'] == 'churn']
+        results[f"improvement_{cfg['key']}"] = [r for r in records if r['type'] == 'improvement'][::-1]
+
+    return results
+
+
 def analyze_performance_trends(daily_funnel_pivot, thresholds):
     """
     퍼널 성과 트렌드 분석 (timeseries_analysis와 동일한 구조)
@@ -1582,6 +1692,11 @@ def analyze_performance_trends(daily_funnel_pivot, thresholds):
     high_improvement = thresholds.get('high_improvement_threshold', 30.0)
     high_risk = thresholds.get('high_risk_threshold', -30.0)
 
+    # 메트릭별 최근/이전 N일 평균 (누적합 1회)
+    period_days = [cfg['days'] for cfg in period_configs]
+    means = window_compare(daily_funnel_pivot[[metric['column'] for metric in metrics_to_analyze]],
+                           windows=period_days, lags=[0] + period_days)
+
     for metric in metrics_to_analyze:
         col = metric['column']
         metric_name = metric['name']
@@ -1595,9 +1710,9 @@ def analyze_performance_trends(daily_funnel_pivot, thresholds):
                 continue
 
             # 최근 N일 평균
-            recent_avg = daily_funnel_pivot[col].tail(days).mean()
+            recent_avg = means.at[col, (days, 0)]
             # 이전 N일 평균 (N일 전 ~ 2N일 전)
-            previous_avg = daily_funnel_pivot[col].iloc[-(days*2):-days].mean()
+            previous_avg = means.at[col, (days, days)]
 
             if previous_avg <= 0:
                 continue
@@ -1677,8 +1792,20 @@ def _generate_decline_recommendation(metric_name, change_pct, period):
 # 5. 메인 실행 함수 (Main Executor)
 # ============================================================================
 
-def generate_funnel_insights(category='default', ga4_file=None, client_id: str = None):
-    """퍼널 인사이트 생성 메인 함수"""
+def generate_funnel_insights(category='default', ga4_file=None, client_id: str = None,
+                             days: Optional[int] = None, rollup: Optional[GA4Rollup] = None,
+                             save_csv: bool = True, save_json: bool = True):
+    """퍼널 인사이트 생성 메인 함수
+
+    Args:
+        category: 비즈니스 카테고리 (임계값 프리셋)
+        ga4_file: GA4_data.csv 경로 (None이면 클라이언트/레거시 기본 경로)
+        client_id: 클라이언트 ID
+        days: 최근 N일 필터 (0=전체, None이면 --days 인자)
+        rollup: 미리 로드한 GA4 rollup (다중 기간 실행 시 1회 로드 공유, None이면 GA4_data.csv 기준으로 로드)
+        save_csv: 퍼널 CSV 저장 여부
+        save_json: insights.json 저장 여부
+    """
 
     print("🚀 퍼널 분석을 시작합니다...")
     print(f"   카테고리: {category}")
@@ -1702,48 +1829,49 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     # 출력 디렉토리 생성
     funnel_dir.mkdir(parents=True, exist_ok=True)
 
-    # 데이터 로드
-    if ga4_file is None:
-        ga4_file = ga4_dir / 'GA4_data.csv'
+    # 데이터 로드 (미리 로드한 rollup이 있으면 재사용, 원시 이벤트 대신 일 단위 rollup 사용)
+    if rollup is None:
+        if ga4_file is None:
+            ga4_file = ga4_dir / 'GA4_data.csv'
 
-    if not os.path.exists(ga4_file):
-        print(f"❌ {INSUFFICIENT_DATA_MESSAGES['no_file']}")
-        print(f"   경로: {ga4_file}")
+        if not os.path.exists(ga4_file):
+            print(f"❌ {INSUFFICIENT_DATA_MESSAGES['no_file']}")
+            print(f"   경로: {ga4_file}")
 
-        # 빈 인사이트 저장
-        empty_insights = {
-            'status': 'no_data',
-            'message': INSUFFICIENT_DATA_MESSAGES['no_file'],
-            'generated_at': datetime.now().isoformat()
-        }
-        with open(funnel_dir / 'insights.json', 'w', encoding='utf-8') as f:
-            json.dump(empty_insights, f, ensure_ascii=False, indent=2)
-        return empty_insights
+            # 빈 인사이트 저장
+            empty_insights = {
+                'status': 'no_data',
+                'message': INSUFFICIENT_DATA_MESSAGES['no_file'],
+                'generated_at': datetime.now().isoformat()
+            }
+            if save_json:
+                write_json(empty_insights, funnel_dir / 'insights.json')
+            return empty_insights
 
-    print(f"   데이터 파일: {ga4_file}")
-
-    df = pd.read_csv(ga4_file, encoding='utf-8-sig')
-    df['Day'] = pd.to_datetime(df['Day'])
-    if 'week' in df.columns:
-        df['week'] = pd.to_datetime(df['week'])
+        print(f"   데이터 파일: {ga4_file}")
+        rollup = GA4Rollup.load_or_build(Path(ga4_file))
 
     # ========================================
     # 날짜 필터링 적용 (--days 파라미터)
     # ========================================
-    filter_days = args.days
-    original_count = len(df)
-    original_start = df['Day'].min()
-    original_end = df['Day'].max()
+    filter_days = args.days if days is None else days
+    original_count = rollup.source_rows
 
     if filter_days > 0:
         print(f"\n⏰ 최근 {filter_days}일 데이터로 필터링 적용 중...")
-        df = filter_by_days(df, filter_days, 'Day')
-        print(f"   - 전체 데이터: {original_count:,}행 → {len(df):,}행")
-        if len(df) > 0:
-            print(f"   - 필터링 기간: {df['Day'].min().strftime('%Y-%m-%d')} ~ {df['Day'].max().strftime('%Y-%m-%d')}")
+        rollup = rollup.window(filter_days)
+        print(f"   - 전체 데이터: {original_count:,}행 → {rollup.source_rows:,}행")
+        if rollup.source_rows > 0:
+            window_days = rollup.table('day_funnel')['Day']
+            print(f"   - 필터링 기간: {window_days.min().strftime('%Y-%m-%d')} ~ {window_days.max().strftime('%Y-%m-%d')}")
     else:
         print("\n📊 전체 기간 데이터 사용")
 
+    # 그룹핑 세트별 일 단위 합계 (원시 이벤트 groupby와 같은 결과)
+    df = rollup.table('day_funnel')
+    channel_df = rollup.table('channel_day_funnel')
+    campaign_df = rollup.table('campaign_day_funnel')
+
     # 데이터 충분성 체크
     data_issues = check_data_sufficiency(df, thresholds)
     if any(issue['type'] in ['empty_data', 'no_conversion'] for issue in data_issues):
@@ -1752,7 +1880,7 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     # ========================================
     # CSV 파일 생성
     # ========================================
-    print("\n📊 CSV 파일 생성 중...")
+    print("\n📊 CSV 파일 생성 중..." if save_csv else "\n📊 퍼널 집계 중 (CSV 저장 생략)...")
 
     # 1. 일별 퍼널
     daily_funnel = df.groupby(['Day', 'funnel']).agg({
@@ -1774,11 +1902,12 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     if '유입' in daily_funnel_pivot.columns and '구매완료' in daily_funnel_pivot.columns:
         daily_funnel_pivot['CVR'] = (daily_funnel_pivot['구매완료'] / daily_funnel_pivot['유입'] * 100).fillna(0)
 
-    daily_funnel_pivot.to_csv(funnel_dir / 'daily_funnel.csv', index=False, encoding='utf-8-sig')
+    if save_csv:
+        daily_funnel_pivot.to_csv(funnel_dir / 'daily_funnel.csv', index=False, encoding='utf-8-sig')
     print(f"   ✓ 일별 퍼널: {len(daily_funnel_pivot)} rows")
 
     # 1-2. 채널별 일별 퍼널 (channel_daily_funnel.csv)
-    channel_daily_funnel = df.groupby(['channel', 'Day', 'funnel']).agg({
+    channel_daily_funnel = channel_df.groupby(['channel', 'Day', 'funnel']).agg({
         'Total users': 'sum',
         'Event value': 'sum'
     }).reset_index()
@@ -1794,7 +1923,8 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     if '유입' in channel_daily_pivot.columns and '구매완료' in channel_daily_pivot.columns:
         channel_daily_pivot['CVR'] = (channel_daily_pivot['구매완료'] / channel_daily_pivot['유입'] * 100).fillna(0)
 
-    channel_daily_pivot.to_csv(funnel_dir / 'channel_daily_funnel.csv', index=False, encoding='utf-8-sig')
+    if save_csv:
+        channel_daily_pivot.to_csv(funnel_dir / 'channel_daily_funnel.csv', index=False, encoding='utf-8-sig')
     print(f"   ✓ 채널별 일별 퍼널: {len(channel_daily_pivot)} rows")
 
     # 2. 주별 퍼널
@@ -1815,11 +1945,12 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
         if '유입' in weekly_funnel_pivot.columns and '구매완료' in weekly_funnel_pivot.columns:
             weekly_funnel_pivot['CVR'] = (weekly_funnel_pivot['구매완료'] / weekly_funnel_pivot['유입'] * 100).fillna(0)
 
-        weekly_funnel_pivot.to_csv(funnel_dir / 'weekly_funnel.csv', index=False, encoding='utf-8-sig')
+        if save_csv:
+            weekly_funnel_pivot.to_csv(funnel_dir / 'weekly_funnel.csv', index=False, encoding='utf-8-sig')
         print(f"   ✓ 주별 퍼널: {len(weekly_funnel_pivot)} rows")
 
     # 3. 채널별 퍼널
-    channel_funnel = df.groupby(['channel', 'funnel']).agg({
+    channel_funnel = channel_df.groupby(['channel', 'funnel']).agg({
         'Total users': 'sum', 'Event value': 'sum'
     }).reset_index()
 
@@ -1828,7 +1959,7 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
         aggfunc='sum', fill_value=0
     ).reset_index()
 
-    channel_revenue = df[df['funnel'] == '구매완료'].groupby('channel')['Event value'].sum().reset_index()
+    channel_revenue = channel_df[channel_df['funnel'] == '구매완료'].groupby('channel')['Event value'].sum().reset_index()
     channel_revenue.columns = ['channel', 'Revenue']
 
     channel_funnel_pivot = channel_funnel_pivot.merge(channel_revenue, on='channel', how='left')
@@ -1837,15 +1968,16 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     if '유입' in channel_funnel_pivot.columns and '구매완료' in channel_funnel_pivot.columns:
         channel_funnel_pivot['CVR'] = (channel_funnel_pivot['구매완료'] / channel_funnel_pivot['유입'] * 100).fillna(0)
 
-    channel_funnel_pivot.to_csv(funnel_dir / 'channel_funnel.csv', index=False, encoding='utf-8-sig')
+    if save_csv:
+        channel_funnel_pivot.to_csv(funnel_dir / 'channel_funnel.csv', index=False, encoding='utf-8-sig')
     print(f"   ✓ 채널별 퍼널: {len(channel_funnel_pivot)} rows")
 
     # 4. 캠페인별 퍼널
-    campaign_funnel = df.groupby(['Session campaign', 'funnel']).agg({
+    campaign_funnel = campaign_df.groupby(['Session campaign', 'funnel']).agg({
         'Total users': 'sum', 'Event value': 'sum'
     }).reset_index()
 
-    top_campaigns = df[df['funnel'] == '유입'].groupby('Session campaign')['Total users'].sum().nlargest(20).index
+    top_campaigns = campaign_df[campaign_df['funnel'] == '유입'].groupby('Session campaign')['Total users'].sum().nlargest(20).index
     campaign_funnel_top = campaign_funnel[campaign_funnel['Session campaign'].isin(top_campaigns)]
 
     campaign_funnel_pivot = campaign_funnel_top.pivot_table(
@@ -1853,7 +1985,7 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
         aggfunc='sum', fill_value=0
     ).reset_index()
 
-    campaign_revenue = df[df['funnel'] == '구매완료'].groupby('Session campaign')['Event value'].sum().reset_index()
+    campaign_revenue = campaign_df[campaign_df['funnel'] == '구매완료'].groupby('Session campaign')['Event value'].sum().reset_index()
     campaign_revenue.columns = ['Session campaign', 'Revenue']
 
     campaign_funnel_pivot = campaign_funnel_pivot.merge(campaign_revenue, on='Session campaign', how='left')
@@ -1862,7 +1994,8 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     if '유입' in campaign_funnel_pivot.columns and '구매완료' in campaign_funnel_pivot.columns:
         campaign_funnel_pivot['CVR'] = (campaign_funnel_pivot['구매완료'] / campaign_funnel_pivot['유입'] * 100).fillna(0)
 
-    campaign_funnel_pivot.to_csv(funnel_dir / 'campaign_funnel.csv', index=False, encoding='utf-8-sig')
+    if save_csv:
+        campaign_funnel_pivot.to_csv(funnel_dir / 'campaign_funnel.csv', index=False, encoding='utf-8-sig')
     print(f"   ✓ 캠페인별 퍼널: {len(campaign_funnel_pivot)} rows")
 
     # 5. 신규 vs 재방문
@@ -1873,7 +2006,8 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     new_vs_returning['Returning users'] = new_vs_returning['Total users'] - new_vs_returning['New users']
     new_vs_returning['New user %'] = (new_vs_returning['New users'] / new_vs_returning['Total users'] * 100).fillna(0)
 
-    new_vs_returning.to_csv(funnel_dir / 'new_vs_returning.csv', index=False, encoding='utf-8-sig')
+    if save_csv:
+        new_vs_returning.to_csv(funnel_dir / 'new_vs_returning.csv', index=False, encoding='utf-8-sig')
     print(f"   ✓ 신규/재방문: {len(new_vs_returning)} rows")
 
     # ========================================
@@ -1903,7 +2037,7 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
 
     # 상위 채널/캠페인
     top_channels = []
-    channel_summary = df[df['funnel'] == '구매완료'].groupby('channel').agg({
+    channel_summary = channel_df[channel_df['funnel'] == '구매완료'].groupby('channel').agg({
         'Total users': 'sum', 'Event value': 'sum'
     }).reset_index().nlargest(5, 'Event value')
 
@@ -1916,7 +2050,7 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
         })
 
     top_campaigns_list = []
-    campaign_summary = df[df['funnel'] == '구매완료'].groupby('Session campaign').agg({
+    campaign_summary = campaign_df[campaign_df['funnel'] == '구매완료'].groupby('Session campaign').agg({
         'Total users': 'sum', 'Event value': 'sum'
     }).reset_index().nlargest(5, 'Event value')
 
@@ -1944,12 +2078,15 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     print("   - 이탈/개선 예측...")
     churn_analysis = analyze_churn_and_improvement(daily_funnel_pivot, thresholds, filter_days)
 
+    print("   - 채널별 이탈/개선 예측...")
+    channel_churn = analyze_channel_churn(channel_daily_pivot, daily_funnel_pivot['Day'], thresholds, filter_days)
+
     print("   - 성과 트렌드 분석 (7d/14d/30d)...")
     performance_trends = analyze_performance_trends(daily_funnel_pivot, thresholds)
 
     print("   - 마이크로 세그먼트 분석 (Upgrade Guide)...")
     micro_alerts, channel_metrics_enhanced, dynamic_thresholds = generate_micro_segment_alerts(
-        channel_funnel_pivot, df, thresholds
+        channel_funnel_pivot, rollup.channel_categories(), thresholds
     )
 
     # 기본 퍼널 경고 (원본 유지)
@@ -2236,6 +2373,9 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
         'improvement_predictions_30d': churn_analysis.get('improvement_30d', []),
         'churn_predictions': churn_analysis.get('churn_7d', []),  # 하위 호환
 
+        # 채널별 이탈/개선 예측 (채널 × 퍼널 단계, 전체 기간에서만 생성)
+        'channel_churn': channel_churn,
+
         # 성과 트렌드 분석 (timeseries_analysis와 동일 구조)
         'performance_trends': performance_trends,
 
@@ -2287,10 +2427,9 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
         }
     }
 
-    # JSON 저장 (numpy 타입 변환 적용)
-    serializable_insights = convert_to_serializable(insights)
-    with open(funnel_dir / 'insights.json', 'w', encoding='utf-8') as f:
-        json.dump(serializable_insights, f, ensure_ascii=False, indent=2)
+    # JSON 저장 (json_io가 numpy 타입/NaN 변환)
+    if save_json:
+        write_json(insights, funnel_dir / 'insights.json')
 
     # 결과 출력
     print("\n" + "="*60)
@@ -2317,13 +2456,16 @@ def generate_funnel_insights(category='default', ga4_file=None, client_id: str =
     print(f"   - 하락 항목 (7일): {len(performance_trends.get('declines_7d', []))}개")
     print(f"   - 하락 항목 (14일): {len(performance_trends.get('declines_14d', []))}개")
     print(f"   - 동적 임계값: 트래픽 상위 {dynamic_thresholds.get('traffic_high', 0):.0f}명 / RPV 상위 {dynamic_thresholds.get('rpv_high', 0):,.0f}원")
-    print(f"\n📁 생성된 파일:")
-    print(f"   - {funnel_dir / 'insights.json'}")
-    print(f"   - {funnel_dir / 'daily_funnel.csv'}")
-    print(f"   - {funnel_dir / 'weekly_funnel.csv'}")
-    print(f"   - {funnel_dir / 'channel_funnel.csv'}")
-    print(f"   - {funnel_dir / 'campaign_funnel.csv'}")
-    print(f"   - {funnel_dir / 'new_vs_returning.csv'}")
+    if save_json or save_csv:
+        print(f"\n📁 생성된 파일:")
+    if save_json:
+        print(f"   - {funnel_dir / 'insights.json'}")
+    if save_csv:
+        print(f"   - {funnel_dir / 'daily_funnel.csv'}")
+        print(f"   - {funnel_dir / 'weekly_funnel.csv'}")
+        print(f"   - {funnel_dir / 'channel_funnel.csv'}")
+        print(f"   - {funnel_dir / 'campaign_funnel.csv'}")
+        print(f"   - {funnel_dir / 'new_vs_returning.csv'}")
 
     return insights
 
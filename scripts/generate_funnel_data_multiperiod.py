@@ -4,18 +4,22 @@
 4개 기간(전체, 180일, 90일, 30일)의 인사이트를 중첩 구조로 생성합니다.
 이탈 예측(churn) 분석은 전체 기간 데이터만 사용합니다.
 
+- GA4_data.csv는 1회만 로드하고, 기간별 윈도우는 정렬된 날짜 인덱스에서 슬라이스 (프로세스 내 실행)
+- 퍼널 CSV는 전체 기간 실행에서만 1회 저장
+- 기간별 인사이트는 메모리에서 중첩 구조로 조립해 insights.json 1회 저장
+
 사용법:
     python scripts/generate_funnel_data_multiperiod.py
     python scripts/generate_funnel_data_multiperiod.py --client clientA
     python scripts/generate_funnel_data_multiperiod.py --category fashion
 """
 
-import pandas as pd
-import numpy as np
-import json
-import subprocess
+import contextlib
+import io
+import os
 import sys
-from datetime import datetime, timedelta
+import traceback
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -23,18 +27,18 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg
+from scripts.common.ga4_rollup import GA4Rollup
+from scripts.common.json_io import write_json
+from scripts.common.periods import FUNNEL_PERIODS
+from scripts.generate_funnel_data import (
+    GA4_DIR, convert_to_serializable, generate_funnel_insights
+)
 
-# 기간 설정
-PERIODS = [
-    {'key': 'full', 'days': 0, 'label': '전체 기간'},
-    {'key': '180d', 'days': 180, 'label': '최근 180일'},
-    {'key': '90d', 'days': 90, 'label': '최근 90일'},
-    {'key': '30d', 'days': 30, 'label': '최근 30일'}
-]
+# 기간 설정 (참여도 기간별 집계와 공유)
+PERIODS = FUNNEL_PERIODS
 
 # 경로 설정
 SCRIPT_DIR = Path(__file__).parent
-INSIGHTS_SCRIPT = SCRIPT_DIR / 'generate_funnel_data.py'
 
 
 def get_data_dir(client_id: Optional[str] = None) -> Path:
@@ -44,31 +48,40 @@ def get_data_dir(client_id: Optional[str] = None) -> Path:
     return SCRIPT_DIR.parent / 'data' / 'funnel'
 
 
-def run_insights_generation(days, category='default', client_id: Optional[str] = None):
-    """generate_funnel_data.py를 특정 기간으로 실행"""
-    cmd = [sys.executable, str(INSIGHTS_SCRIPT), '--days', str(days)]
-    if client_id:
-        cmd.extend(['--client', client_id])
-    if category and category != 'default':
-        cmd.extend(['--category', category])
+def load_ga4_rollup(client_id: Optional[str] = None) -> Optional[GA4Rollup]:
+    """GA4 rollup 1회 로드 (없거나 원본과 다르면 GA4_data.csv로 생성, 파일이 없으면 None)"""
+    ga4_dir = ClientPaths(client_id).ga4 if client_id else GA4_DIR
+    ga4_file = ga4_dir / 'GA4_data.csv'
+    if not ga4_file.exists():
+        return None
+    return GA4Rollup.load_or_build(ga4_file)
+
 
+def run_insights_generation(days, category='default', client_id: Optional[str] = None,
+                            rollup: Optional[GA4Rollup] = None):
+    """generate_funnel_insights를 특정 기간으로 실행 (프로세스 내, 로그는 실패 시에만 출력)
+
+    퍼널 CSV는 전체 기간(days=0) 실행에서만 저장하고, 기간별 insights.json은 저장하지 않습니다.
+    """
     print(f"\n{'='*60}")
     print(f"기간: {'전체' if days == 0 else f'{days}일'} (--days {days})")
     print('='*60)
 
-    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
-
-    if result.returncode != 0:
-        print(f"오류 발생: {result.stderr}")
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            insights = generate_funnel_insights(
+                category=category, client_id=client_id, days=days, rollup=rollup,
+                save_csv=(days == 0), save_json=False
+            )
+    except Exception as e:
+        print(log.getvalue())
+        print(f"오류 발생: {e}")
+        traceback.print_exc()
         return None
 
-    # 생성된 insights.json 로드
-    data_dir = get_data_dir(client_id)
-    insights_file = data_dir / 'insights.json'
-    if insights_file.exists():
-        with open(insights_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return None
+    # 저장 시와 동일한 JSON 호환 타입으로 변환
+    return convert_to_serializable(insights)
 
 
 def main(category='default', client_id: Optional[str] = None):
@@ -81,6 +94,11 @@ def main(category='default', client_id: Optional[str] = None):
     print(f"카테고리: {category}")
     print(f"기간: {', '.join([p['label'] for p in PERIODS])}")
 
+    # GA4 rollup 1회 로드 (기간별 실행이 공유)
+    # 카테고리 미지정 시 단일 실행과 동일하게 BUSINESS_CATEGORY 환경변수 사용
+    run_category = category if category and category != 'default' else os.environ.get('BUSINESS_CATEGORY', 'default')
+    rollup = load_ga4_rollup(client_id)
+
     # 각 기간별 인사이트 생성
     period_insights = {}
     churn_data = None
@@ -92,7 +110,7 @@ def main(category='default', client_id: Optional[str] = None):
         print(f"# {period['label']} 데이터 생성 중...")
         print('#'*100)
 
-        insights = run_insights_generation(period['days'], category, client_id)
+        insights = run_insights_generation(period['days'], run_category, client_id, rollup)
 
         if insights:
             # 전체 기간에서 churn 데이터 및 추이 분석 결과 저장
@@ -101,7 +119,8 @@ def main(category='default', client_id: Optional[str] = None):
                     'churn_predictions_7d': insights.get('churn_predictions_7d', []),
                     'churn_predictions_30d': insights.get('churn_predictions_30d', []),
                     'improvement_predictions_7d': insights.get('improvement_predictions_7d', []),
-                    'improvement_predictions_30d': insights.get('improvement_predictions_30d', [])
+                    'improvement_predictions_30d': insights.get('improvement_predictions_30d', []),
+                    'channel_churn': insights.get('channel_churn', {})
                 }
                 # 추이 분석 결과 저장 (전체 기간에서만 생성됨)
                 crm_actions_by_trend = insights.get('crm_actions_by_trend', {})
@@ -110,7 +129,8 @@ def main(category='default', client_id: Optional[str] = None):
             period_data = {k: v for k, v in insights.items()
                           if k not in ['churn_predictions_7d', 'churn_predictions_30d',
                                        'improvement_predictions_7d', 'improvement_predictions_30d',
-                                       'crm_actions', 'crm_actions_by_trend', 'churn_predictions']}
+                                       'crm_actions', 'crm_actions_by_trend', 'churn_predictions',
+                                       'channel_churn']}
             period_data['period_info'] = {
                 'key': period['key'],
                 'days': period['days'],
@@ -154,8 +174,7 @@ def main(category='default', client_id: Optional[str] = None):
     data_dir = get_data_dir(client_id)
     data_dir.mkdir(parents=True, exist_ok=True)
     output_file = data_dir / 'insights.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_insights, f, ensure_ascii=False, indent=2)
+    write_json(combined_insights, output_file)
 
     print("\n" + "=" * 100)
     print("다중 기간 퍼널 인사이트 생성 완료!")
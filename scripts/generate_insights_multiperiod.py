@@ -3,12 +3,16 @@
 
 기능:
 1. insight_generator.py를 여러 기간(전체, 180일, 90일, 30일)에 대해 실행
+   - 입력 데이터(segment_*.csv, predictions_*.csv)는 1회만 읽고 날짜 인덱스를 만든 뒤
+     기간별 InsightGenerator에 같은 번들을 전달 (기간별로는 윈도우 슬라이스만 수행)
+   - 기간별 실행은 스레드 풀로 병렬 처리 (로그는 기간 순서대로 출력)
 2. 결과를 by_period 구조로 통합
 3. data/forecast/insights.json에 저장
 
 사용법:
     python generate_insights_multiperiod.py
     python generate_insights_multiperiod.py --client clientA
+    python generate_insights_multiperiod.py --client clientA --workers 1   # 순차 실행
 
 출력 구조:
 {
@@ -26,13 +30,15 @@
 - segment_processor.py가 먼저 실행되어야 함
 """
 
+import io
 import os
 import sys
-import json
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 # 스크립트 디렉토리를 path에 추가
 SCRIPT_DIR = Path(__file__).parent
@@ -40,8 +46,9 @@ sys.path.insert(0, str(SCRIPT_DIR))
 sys.path.insert(0, str(SCRIPT_DIR.parent))
 
 # insight_generator를 먼저 import (UTF-8 설정 포함)
-from insight_generator import InsightGenerator, NpEncoder
+from insight_generator import InsightGenerator, load_insight_bundle
 from scripts.common.paths import ClientPaths
+from scripts.common.json_io import write_json
 
 # 디렉토리 설정
 BASE_DIR = SCRIPT_DIR.parent
@@ -59,10 +66,105 @@ def get_forecast_dir(client_id: Optional[str] = None) -> Path:
     return DATA_DIR / 'forecast'
 
 
-def generate_all_periods(client_id: Optional[str] = None):
-    """모든 기간에 대해 인사이트 생성"""
+class ThreadOutput(io.TextIOBase):
+    """스레드별 출력 버퍼 (병렬 실행 중 기간별 로그가 섞이지 않도록 모았다가 순서대로 출력)"""
+
+    def __init__(self, target):
+        self.target = target
+        self.local = threading.local()
+
+    def capture(self) -> io.StringIO:
+        """현재 스레드의 출력을 버퍼로 수집"""
+        self.local.buffer = io.StringIO()
+        return self.local.buffer
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.target).write(text)
+
+    def flush(self):
+        self.target.flush()
+
+
+def run_period(period: Optional[int], paths: Optional[ClientPaths],
+               data_bundle: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """단일 기간 인사이트 생성 (오류 시 error 객체 반환)"""
+    period_label = PERIOD_LABELS[period]
+    period_display = "전체" if period is None else f"최근 {period}일"
+
+    print(f"\n{'='*60}")
+    print(f"📊 [{period_label}] {period_display} 분석 시작...")
+    print('='*60)
+
+    try:
+        # InsightGenerator 실행 (개별 저장 안 함, 공유 번들 사용)
+        generator = InsightGenerator(days=period, paths=paths, data_bundle=data_bundle)
+        insights = generator.generate(save=False)
+
+        # 결과 저장 (period 키 제거하여 중복 방지)
+        if 'period' in insights:
+            del insights['period']
+
+        # 네이티브 타입으로 변환
+        insights_converted = generator.convert_to_native_types(insights)
+
+        print(f"\n   ✅ [{period_label}] 완료")
+        return insights_converted
+
+    except Exception as e:
+        print(f"\n   ❌ [{period_label}] 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        # 오류 발생 시에도 빈 객체로 저장
+        return {
+            'error': str(e),
+            'generated_at': datetime.now().isoformat()
+        }
+
+
+def run_all_periods(paths: Optional[ClientPaths], data_bundle: Optional[Dict[str, Any]],
+                    workers: int) -> Dict[str, Dict[str, Any]]:
+    """
+    전체 기간 실행 (workers > 1이면 스레드 풀 병렬 실행)
+
+    병렬 실행 시 기간별 로그는 버퍼에 모았다가 PERIODS 순서대로 출력합니다.
+    """
+    if workers <= 1:
+        return {PERIOD_LABELS[period]: run_period(period, paths, data_bundle) for period in PERIODS}
+
+    output = ThreadOutput(sys.stdout)
+
+    def run_captured(period) -> Tuple[Dict[str, Any], str]:
+        buffer = output.capture()
+        result = run_period(period, paths, data_bundle)
+        return result, buffer.getvalue()
+
+    original_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_captured, period) for period in PERIODS]
+            outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = original_stdout
+
+    results = {}
+    for period, (result, log) in zip(PERIODS, outcomes):
+        sys.stdout.write(log)
+        results[PERIOD_LABELS[period]] = result
+    return results
+
+
+def generate_all_periods(client_id: Optional[str] = None, workers: Optional[int] = None):
+    """모든 기간에 대해 인사이트 생성
+
+    Args:
+        client_id: 클라이언트 ID
+        workers: 병렬 실행 스레드 수 (None이면 min(기간 수, CPU 수), 1이면 순차 실행)
+    """
     paths = ClientPaths(client_id) if client_id else None
     forecast_dir = get_forecast_dir(client_id)
+    workers = min(len(PERIODS), workers or os.cpu_count() or 1)
 
     print("\n" + "="*70)
     print("🔄 Multi-Period Insight Generator")
@@ -78,44 +180,21 @@ def generate_all_periods(client_id: Optional[str] = None):
         'by_period': {}
     }
 
-    for period in PERIODS:
-        period_label = PERIOD_LABELS[period]
-        period_display = "전체" if period is None else f"최근 {period}일"
-
-        print(f"\n{'='*60}")
-        print(f"📊 [{period_label}] {period_display} 분석 시작...")
-        print('='*60)
-
-        try:
-            # InsightGenerator 실행 (개별 저장 안 함)
-            generator = InsightGenerator(days=period, paths=paths)
-            insights = generator.generate(save=False)
-
-            # 결과 저장 (period 키 제거하여 중복 방지)
-            if 'period' in insights:
-                del insights['period']
-
-            # 네이티브 타입으로 변환
-            insights_converted = generator.convert_to_native_types(insights)
-            all_insights['by_period'][period_label] = insights_converted
-
-            print(f"\n   ✅ [{period_label}] 완료")
+    # 입력 데이터 1회 로드 + 날짜 인덱스 (실패 시 기간별 InsightGenerator가 직접 로드)
+    try:
+        data_bundle = load_insight_bundle(paths)
+        loaded = sum(df is not None for frames in data_bundle['frames'].values() for df in frames.values())
+        print(f"   📦 입력 데이터 1회 로드: {loaded}개 파일 (병렬 {workers}개 스레드)")
+    except Exception as e:
+        print(f"   ⚠️ 입력 데이터 번들 로드 실패 ({e}) - 기간별로 개별 로드합니다.")
+        data_bundle = None
 
-        except Exception as e:
-            print(f"\n   ❌ [{period_label}] 오류: {e}")
-            import traceback
-            traceback.print_exc()
-            # 오류 발생 시에도 빈 객체로 저장
-            all_insights['by_period'][period_label] = {
-                'error': str(e),
-                'generated_at': datetime.now().isoformat()
-            }
+    all_insights['by_period'] = run_all_periods(paths, data_bundle, workers)
 
-    # 최종 JSON 저장 (NpEncoder로 안전한 직렬화)
+    # 최종 JSON 저장 (json_io로 안전한 직렬화)
     forecast_dir.mkdir(parents=True, exist_ok=True)
     output_file = forecast_dir / 'insights.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_insights, f, cls=NpEncoder, ensure_ascii=False, indent=2)
+    write_json(all_insights, output_file)
 
     print("\n" + "="*70)
     print("🎯 Multi-Period Insight Generator 완료!")
@@ -134,10 +213,10 @@ def generate_all_periods(client_id: Optional[str] = None):
     return all_insights
 
 
-def main(client_id: Optional[str] = None):
+def main(client_id: Optional[str] = None, workers: Optional[int] = None):
     """메인 실행 함수"""
     try:
-        insights = generate_all_periods(client_id)
+        insights = generate_all_periods(client_id, workers=workers)
 
         # 간단한 요약 출력
         print("\n" + "="*60)
@@ -165,6 +244,8 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='다중 기간 인사이트 생성')
     parser.add_argument('--client', type=str, default=None,
                         help='클라이언트 ID (멀티클라이언트 모드)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='기간별 병렬 실행 스레드 수 (기본: min(기간 수, CPU 수), 1=순차 실행)')
     args = parser.parse_args()
 
-    main(client_id=args.client)
+    main(client_id=args.client, workers=args.workers)
@@ -4,6 +4,7 @@ Type 분석 인사이트 생성 - 다중 기간 버전
 3개 기간(전체, 180일, 90일)의 인사이트를 중첩 구조로 생성합니다.
 각 기간별로 Prophet 예측을 새로 생성합니다 (기간별 학습 데이터 사용).
 분기별 추이(seasonality)는 전체 기간 데이터만 사용합니다.
+분석/차원 테이블은 1회만 로드하고, 기간별 인사이트는 generate_type_insights()를 같은 프로세스에서 호출합니다.
 
 사용법:
     python scripts/generate_type_insights_multiperiod.py
@@ -12,18 +13,25 @@ Type 분석 인사이트 생성 - 다중 기간 버전
 
 import pandas as pd
 import numpy as np
-import json
+import io
 import subprocess
 import sys
 import argparse
+import traceback
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
-# 프로젝트 루트를 path에 추가
+# 스크립트 디렉토리 / 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from generate_type_insights import (
+    generate_type_insights, load_data_bundle, load_prophet_forecasts
+)
 from scripts.common.paths import ClientPaths
+from scripts.common.json_io import write_json
 
 # 기간 설정 (365일, 180일, 90일 - 30일 제외)
 PERIODS = [
@@ -32,9 +40,11 @@ PERIODS = [
     {'key': '90d', 'days': 90, 'label': '최근 90일'}
 ]
 
+# 상세 로그를 생략해도 출력할 경고/오류 표시
+WARNING_MARKERS = ('Warning', 'Error', '경고', '오류', '실패', '없음', '⚠️', '❌')
+
 # 경로 설정
 SCRIPT_DIR = Path(__file__).parent
-INSIGHTS_SCRIPT = SCRIPT_DIR / 'generate_type_insights.py'
 PROPHET_SCRIPT = SCRIPT_DIR / 'multi_analysis_prophet_forecast.py'
 
 
@@ -66,14 +76,15 @@ def run_prophet_forecast(days, client_id: Optional[str] = None):
     return True
 
 
-def run_insights_generation(days, output_suffix, client_id: Optional[str] = None):
-    """generate_type_insights.py를 특정 기간으로 실행"""
-    cmd = [sys.executable, str(INSIGHTS_SCRIPT)]
-    if client_id:
-        cmd.extend(['--client', client_id])
-    if days > 0:
-        cmd.extend(['--days', str(days)])
+def forward_warnings(log: str) -> None:
+    """캡처한 상세 로그 중 경고/오류 줄만 출력"""
+    for line in log.splitlines():
+        if any(marker in line for marker in WARNING_MARKERS):
+            print(f"  {line.strip()}")
+
 
+def run_insights_generation(days, output_suffix, data_bundle, client_id: Optional[str] = None):
+    """특정 기간 인사이트 생성 (기간별 Prophet 예측 생성 후 같은 프로세스에서 generate_type_insights 호출)"""
     print(f"\n{'='*60}")
     print(f"기간: {output_suffix} (--days {days})")
     print('='*60)
@@ -84,21 +95,23 @@ def run_insights_generation(days, output_suffix, client_id: Optional[str] = None
     if not prophet_success:
         print("  [Warning] Prophet 예측 생성 실패, 인사이트 생성 계속 진행")
 
-    # 2. Insights 생성
+    # 2. Insights 생성 (기간별로 새로 생성된 Prophet 예측만 다시 로드, 상세 로그는 생략하고 경고만 출력)
     print("\n  [Step 2] 인사이트 생성 중...")
-    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
-
-    if result.returncode != 0:
-        print(f"오류 발생: {result.stderr}")
+    if data_bundle is None:
         return None
-
-    # 생성된 insights.json 로드
-    data_dir = get_data_dir(client_id)
-    insights_file = data_dir / 'insights.json'
-    if insights_file.exists():
-        with open(insights_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return None
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log):
+            prophet_forecasts, prophet_actuals = load_prophet_forecasts(data_bundle['paths'], data_bundle['data_dir'])
+            period_bundle = {**data_bundle, 'prophet_forecasts': prophet_forecasts, 'prophet_actuals': prophet_actuals}
+            insights = generate_type_insights(period_bundle, days)
+    except Exception as e:
+        forward_warnings(log.getvalue())
+        print(f"오류 발생: {e}")
+        traceback.print_exc()
+        return None
+    forward_warnings(log.getvalue())
+    return insights
 
 
 def main(client_id: Optional[str] = None):
@@ -110,6 +123,17 @@ def main(client_id: Optional[str] = None):
     print(f"생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"기간: {', '.join([p['label'] for p in PERIODS])}")
 
+    # 분석/차원 테이블 1회 로드 (모든 기간 공유)
+    paths = ClientPaths(client_id).ensure_dirs() if client_id else None
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log):
+            data_bundle = load_data_bundle(paths)
+    except Exception as e:
+        print(f"데이터 로드 오류: {e}")
+        data_bundle = None
+    forward_warnings(log.getvalue())
+
     # 각 기간별 인사이트 생성
     period_insights = {}
     seasonality_data = None
@@ -119,7 +143,7 @@ def main(client_id: Optional[str] = None):
         print(f"# {period['label']} 데이터 생성 중...")
         print('#'*100)
 
-        insights = run_insights_generation(period['days'], period['key'], client_id)
+        insights = run_insights_generation(period['days'], period['key'], data_bundle, client_id)
 
         if insights:
             # 전체 기간에서 seasonality 데이터 저장 (분기별 추이용)
@@ -155,8 +179,7 @@ def main(client_id: Optional[str] = None):
     data_dir = get_data_dir(client_id)
     data_dir.mkdir(parents=True, exist_ok=True)
     output_file = data_dir / 'insights.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_insights, f, ensure_ascii=False, indent=2)
+    write_json(combined_insights, output_file)
 
     print("\n" + "=" * 100)
     print("다중 기간 인사이트 생성 완료!")
@@ -34,11 +34,10 @@ v2.0 업데이트:
 
 import os
 import sys
-import json
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple, Optional
+from datetime import datetime
+from typing import Dict, List, Any, Tuple, Optional, Callable
 import warnings
 
 # UTF-8 출력 설정 (Windows 콘솔 호환, 중복 래핑 방지)
@@ -62,6 +61,11 @@ import numpy as np
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.forecast_store import ForecastStore
+from scripts.common.time_window import TimeWindow, last_days
+from scripts.common.rules_engine import Rule, RuleSet
+from scripts.common.rolling_window import window_compare
+from scripts.common.json_io import to_builtin, write_json
 
 warnings.filterwarnings('ignore')
 
@@ -207,21 +211,157 @@ def safe_float(val):
         return 0.0
     return float(val)
 
-# JSON 인코더 (NaN, Inf, numpy 타입 안전 처리)
-class NpEncoder(json.JSONEncoder):
-    """numpy 타입과 NaN/Inf를 JSON 안전하게 변환하는 인코더"""
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            if np.isnan(obj) or np.isinf(obj):
-                return None
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if pd.isna(obj):
-            return None
-        return super(NpEncoder, self).default(obj)
+def group_reduce(df: pd.DataFrame, keys: List[str], columns: List[str], how: str = 'sum') -> pd.DataFrame:
+    """그룹별 합계/평균 (1회 안정 정렬 후 그룹 구간 단위 합산)
+
+    그룹 안의 행 순서를 유지한 연속 구간을 np.sum으로 합산하므로 그룹별로 잘라낸
+    Series.sum()/mean()과 결과가 비트 단위까지 동일합니다. 결측값은 합계에서 제외하고,
+    평균의 분모는 결측이 아닌 행 수입니다. 그룹 키가 결측인 행은 제외합니다.
+
+    Returns:
+        DataFrame: index=그룹 키(등장 순서, keys가 2개 이상이면 MultiIndex), columns=columns
+    """
+    codes, uniques = pd.factorize(
+        pd.MultiIndex.from_frame(df[keys]) if len(keys) > 1 else df[keys[0]], sort=False
+    )
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+    result = {}
+    for column in columns:
+        values = df[column].to_numpy()[order]
+        if how == 'mean' or values.dtype.kind == 'f':
+            values = values.astype(np.float64)
+            valid = ~np.isnan(values)
+            values = np.where(valid, values, 0.0)
+        else:
+            valid = np.ones(len(values), dtype=bool)
+        sums = [values[start:end].sum() for start, end in zip(bounds[:-1], bounds[1:])]
+        if how == 'mean':
+            counts = np.add.reduceat(valid.astype(np.int64), bounds[:-1]) if len(valid) else np.zeros(0, dtype=np.int64)
+            result[column] = np.array(sums, dtype=np.float64) / counts
+        else:
+            result[column] = np.array(sums, dtype=values.dtype)
+
+    index = uniques if isinstance(uniques, pd.MultiIndex) else pd.Index(uniques, name=keys[0])
+    if isinstance(index, pd.MultiIndex):
+        index = index.set_names(keys)
+    return pd.DataFrame(result, index=index, columns=columns)
+
+
+# ============================================================================
+# 인사이트 규칙 (Rules Engine) - 세그먼트 지표 테이블 기준 벡터 조건
+# ============================================================================
+def alert_rules(thresholds: dict) -> RuleSet:
+    """KPI 하락 경고 규칙 (전환수/전환값/ROAS 하락)
+
+    테이블 컬럼: segment_type, segment_value, forecast(원본 dict),
+    changes.*, actual_avg.*, forecast_avg.*, roas_change, roas_change_pct
+    """
+    decline = -thresholds['decline_alert_pct']
+    critical = -thresholds['critical_decline_pct']
+
+    def severity(change):
+        return 'high' if change < critical else 'medium'
+
+    return RuleSet([
+        # 전환수 하락 감지 (예상 손실 전환: 7일 기준)
+        Rule('conversion_decline', when=lambda t: t['changes.전환수'] < decline, record={
+            'type': 'conversion_decline',
+            'segment_type': lambda r: r['segment_type'],
+            'segment_value': lambda r: r['segment_value'],
+            'metric': '전환수',
+            'change_pct': lambda r: r['forecast']['changes']['전환수'],
+            'severity': lambda r: severity(r['changes.전환수']),
+            'title': lambda r: FRIENDLY_TITLES['conversion_drop'].format(target=r['segment_value']),
+            'message': lambda r: f"다음 주 전환수가 {abs(r['changes.전환수']):.1f}% 감소할 것으로 예상됩니다.",
+            'action': ACTION_GUIDES['conversion_drop'],
+            'financial_impact': lambda r: f"예상 손실 전환: {int(r['actual_avg.전환수'] * 7 - r['forecast_avg.전환수'] * 7):,}건"
+        }),
+        # 전환값(매출) 하락 감지 (예상 손실액: 7일 기준)
+        Rule('revenue_decline', when=lambda t: t['changes.전환값'] < decline, record={
+            'type': 'revenue_decline',
+            'segment_type': lambda r: r['segment_type'],
+            'segment_value': lambda r: r['segment_value'],
+            'metric': '전환값',
+            'change_pct': lambda r: r['forecast']['changes']['전환값'],
+            'severity': lambda r: severity(r['changes.전환값']),
+            'title': lambda r: FRIENDLY_TITLES['revenue_drop'].format(target=r['segment_value']),
+            'message': lambda r: f"다음 주 매출이 {abs(r['changes.전환값']):.1f}% 빠질 것으로 예상됩니다.",
+            'action': ACTION_GUIDES['conversion_drop'],
+            'financial_impact': lambda r: f"예상 손실액: {format_currency(r['actual_avg.전환값'] * 7 - r['forecast_avg.전환값'] * 7)}",
+            'loss_amount': lambda r: safe_float(r['actual_avg.전환값'] * 7 - r['forecast_avg.전환값'] * 7)
+        }),
+        # ROAS 하락 감지 (%p 차이)
+        Rule('roas_decline', when=lambda t: t['roas_change'] < decline, record={
+            'type': 'roas_decline',
+            'segment_type': lambda r: r['segment_type'],
+            'segment_value': lambda r: r['segment_value'],
+            'metric': 'ROAS',
+            'change_pct': lambda r: r['roas_change_pct'],
+            'severity': lambda r: severity(r['roas_change']),
+            'title': lambda r: FRIENDLY_TITLES['roas_drop'].format(target=r['segment_value']),
+            'message': lambda r: f"ROAS가 {r['actual_roas']:.0f}%에서 {r['forecast_roas']:.0f}%로 떨어질 전망입니다.",
+            'action': ACTION_GUIDES['roas_decline'],
+            'actual_roas': lambda r: r['forecast']['actual_roas'],
+            'forecast_roas': lambda r: r['forecast']['forecast_roas']
+        }),
+    ])
+
+
+def _opportunity_record(opportunity_type: str, tag: str, title: str, message: Callable,
+                        impact: Callable, priority: int, uplift: Optional[Callable] = None) -> Callable:
+    """기회 레코드 템플릿 (세그먼트별 맞춤 액션은 OPPORTUNITY_ACTIONS에서 선택)"""
+    def build(row: dict) -> dict:
+        actions = OPPORTUNITY_ACTIONS[opportunity_type]
+        record = {
+            'type': opportunity_type,
+            'tag': tag,
+            'segment_type': row['segment_type'],
+            'segment_value': row['segment_value'],
+            'title': title.format(value=row['segment_value']),
+            'message': message(row),
+            'action': actions.get(row['segment_type'], actions['default']).format(value=row['segment_value']),
+            'financial_impact': impact(row),
+        }
+        if uplift is not None:
+            record['potential_uplift'] = safe_float(uplift(row))
+        record['roas'] = row['roas']
+        record['priority'] = priority
+        return record
+    return build
+
+
+def opportunity_rules() -> RuleSet:
+    """숨은 기회 규칙 (if/elif 순서: 고효율 > 숨은 보석 > 성장 가속, 세그먼트당 1건)
+
+    테이블 컬럼: segment_type, segment_value, roas, total_cost, total_revenue,
+    changes.전환수, forecast_avg.전환수 (예측이 없는 세그먼트는 0)
+    """
+    return RuleSet([
+        # Opportunity 1: High ROAS (Star/Cash Cow) - 예산 20% 증액 시 선형 가정
+        Rule('scale_up', when=lambda t: t['roas'] > THRESHOLDS['high_roas'], record=_opportunity_record(
+            'scale_up', FRIENDLY_TITLES['scale_up'], "🚀 {value}: 수익성 최고조!",
+            message=lambda r: f"예상 ROAS가 {r['roas']:.0f}%로 매우 높습니다. 물 들어올 때 노 저으세요!",
+            impact=lambda r: f"예산 20% 증액 시, 약 {format_currency(r['total_revenue'] * 0.2)} 추가 매출 기대",
+            priority=1, uplift=lambda r: r['total_revenue'] * 0.2)),
+        # Opportunity 2: Hidden Gem (저예산 100만원 미만 + 고효율) - 2배 증액 시 현재 매출만큼 추가
+        Rule('hidden_gem', when=lambda t: (t['roas'] > THRESHOLDS['opportunity_roas']) & (t['total_cost'] < 1000000),
+             record=_opportunity_record(
+                 'hidden_gem', FRIENDLY_TITLES['hidden_gem'], "💎 숨은 보석 발견: {value}",
+                 message=lambda r: f"아직 예산은 {format_currency(r['total_cost'])}이지만 ROAS {r['roas']:.0f}%로 효율이 터지고 있어요!",
+                 impact=lambda r: f"예산 2배 증액 시, 약 {format_currency(r['total_revenue'])} 추가 매출 기대 (ROAS 유지 가정)",
+                 priority=2, uplift=lambda r: r['total_revenue'])),
+        # Opportunity 3: 성장 가속 (전환수 증가 + 양호한 ROAS) - 예산 10% 증액 시 주당 추가 전환
+        Rule('growth_momentum',
+             when=lambda t: (t['changes.전환수'] > THRESHOLDS['growth_star']) & (t['roas'] > THRESHOLDS['low_roas']),
+             record=_opportunity_record(
+                 'growth_momentum', "📈 성장 모멘텀", "📈 {value}: 성장 가속 중!",
+                 message=lambda r: f"전환수가 {r['changes.전환수']:.1f}% 증가하면서 ROAS {r['roas']:.0f}%를 유지하고 있어요.",
+                 impact=lambda r: f"예산 10% 증액 시, 주당 약 {int(r['forecast_avg.전환수'] * 7 * 0.1):,}건 추가 전환 기대",
+                 priority=3)),
+    ], exclusive=True)
 
 
 # ============================================================================
@@ -440,22 +580,90 @@ class InsightMicroAnalyzer:
         return insights
 
 
+def get_source_files(forecast_dir: Path) -> Dict[str, Dict[str, Path]]:
+    """인사이트 입력 파일 (segment_*.csv, predictions_*.csv)"""
+    return {
+        'segment': {
+            'brand': forecast_dir / 'segment_brand.csv',
+            'channel': forecast_dir / 'segment_channel.csv',
+            'product': forecast_dir / 'segment_product.csv',
+            'promotion': forecast_dir / 'segment_promotion.csv'
+        },
+        'predictions': {
+            'daily': forecast_dir / 'predictions_daily.csv',
+            'weekly': forecast_dir / 'predictions_weekly.csv',
+            'monthly': forecast_dir / 'predictions_monthly.csv'
+        }
+    }
+
+
+# 통합 예측 저장소 컬럼 → segment_*.csv / predictions_daily.csv 컬럼 (ROAS/CPA/CPC 예측 없음)
+FORECAST_COLUMNS = {'date': '일 구분', **{value: f'{value}_예측' for value in ['비용', '노출', '클릭', '전환수', '전환값']}}
+
+
+def load_forecast_frame(store: ForecastStore, dimension: str, source: str, filepath: Path) -> Optional[pd.DataFrame]:
+    """저장소 파티션 조회 (없으면 기존 CSV), 일 구분은 CSV와 같은 'YYYY-MM-DD' 문자열"""
+    if store.has(dimension, source):
+        df = store.get_forecast(dimension, kind='all', source=source).rename(columns=FORECAST_COLUMNS)
+        df['일 구분'] = df['일 구분'].dt.strftime('%Y-%m-%d')
+        return df
+    return pd.read_csv(filepath, encoding='utf-8') if filepath.exists() else None
+
+
+def load_insight_bundle(paths: Optional[ClientPaths] = None) -> Dict[str, Any]:
+    """인사이트 입력 데이터 번들 (1회 로드 + 날짜 인덱스)
+
+    segment_*.csv / predictions_*.csv를 1회 읽고 '일 구분' 기준 TimeWindow를 만들어 둡니다.
+    InsightGenerator(days, paths, data_bundle=bundle)는 파일을 다시 읽지 않고
+    기간 윈도우만 슬라이스하므로 여러 기간을 같은 번들로 실행할 수 있습니다.
+
+    Args:
+        paths: ClientPaths 인스턴스 (None이면 레거시 경로)
+
+    Returns:
+        {'files': 입력 파일, 'frames': {kind: {name: DataFrame 또는 None}}, 'windows': {kind: {name: TimeWindow}}}
+    """
+    forecast_dir = paths.forecast if paths else FORECAST_DIR
+    store = ForecastStore(forecast_dir / 'store')
+    files = get_source_files(forecast_dir)
+
+    frames = {'segment': {}, 'predictions': {}}
+    for name, filepath in files['segment'].items():
+        frames['segment'][name] = load_forecast_frame(store, name, 'segment', filepath)
+    for name, filepath in files['predictions'].items():
+        if name == 'daily':
+            frames['predictions'][name] = load_forecast_frame(store, 'daily', 'marketing', filepath)
+        else:
+            frames['predictions'][name] = pd.read_csv(filepath, encoding='utf-8') if filepath.exists() else None
+
+    windows = {
+        kind: {name: TimeWindow(df, '일 구분') for name, df in kind_frames.items() if df is not None}
+        for kind, kind_frames in frames.items()
+    }
+    return {'files': files, 'frames': frames, 'windows': windows}
+
+
 class InsightGenerator:
     """마케팅 인사이트 생성 클래스 (AI Consultant Edition + Multi-Period)"""
 
-    def __init__(self, days: Optional[int] = None, paths: Optional[ClientPaths] = None):
+    def __init__(self, days: Optional[int] = None, paths: Optional[ClientPaths] = None,
+                 data_bundle: Optional[Dict[str, Any]] = None):
         """초기화
 
         Args:
             days: 분석 기간 (None=전체, 180, 90, 30)
             paths: ClientPaths 인스턴스 (멀티클라이언트 모드)
+            data_bundle: load_insight_bundle() 결과 (None이면 load_data에서 직접 로드)
         """
         self.days = days
         self.paths = paths
+        self.data_bundle = data_bundle
         self.period_label = 'full' if days is None else f'{days}d'
         self.segment_data = {}
         self.segment_stats = {}
         self.forecasts = {}
+        self.segment_tables = {}   # 규칙 엔진용 세그먼트 통계 테이블 (segment_stats와 같은 값)
+        self.forecast_tables = {}  # 규칙 엔진용 예측 분석 테이블 (forecasts와 같은 값)
         self.predictions_data = {}  # predictions_*.csv 데이터
 
         # 경로 설정 (클라이언트 모드 vs 레거시 모드)
@@ -505,72 +713,94 @@ class InsightGenerator:
             return df
 
         try:
-            # 날짜 컬럼을 datetime으로 변환
-            df = df.copy()
-            df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-
-            # 최신 날짜 기준으로 필터링
-            max_date = df[date_column].max()
-            if pd.isna(max_date):
-                return df
-
-            cutoff_date = max_date - timedelta(days=self.days)
-            filtered_df = df[df[date_column] >= cutoff_date]
+            # 정렬된 날짜 인덱스에서 최근 N일 슬라이스 (날짜 컬럼은 원래 형식 그대로 유지)
+            return last_days(df, self.days, date_column)
+        except Exception as e:
+            print(f"   Warning: Date filtering failed - {e}")
+            return df
 
-            # 날짜를 다시 문자열로 변환 (원래 형식 유지)
-            filtered_df[date_column] = filtered_df[date_column].dt.strftime('%Y-%m-%d')
+    def slice_window(self, window: TimeWindow) -> pd.DataFrame:
+        """번들의 날짜 인덱스에서 days 기간 윈도우 조회 (filter_by_days와 동일 기준, 복사 없음)"""
+        if self.days is None:
+            return window.frame
 
-            return filtered_df
+        try:
+            return window.last_days(self.days)
         except Exception as e:
             print(f"   Warning: Date filtering failed - {e}")
-            return df
+            return window.frame
 
     def _calculate_segment_stats_from_data(self) -> dict:
         """segment_data에서 기간별 통계를 직접 계산 (segment_stats.json 대체)
 
         각 세그먼트별로 actual 데이터만 사용하여 ROAS, CPA, CVR 등을 계산합니다.
         기간 필터링이 이미 적용된 segment_data를 사용하므로 기간별로 다른 결과가 나옵니다.
+        세그먼트 값별 합계는 group_reduce 1회로 계산합니다.
 
         Returns:
             dict: 세그먼트별 통계 (channel, brand, product, promotion)
         """
         stats = {}
+        self.segment_tables = {}
+        total_columns = {
+            'total_cost': '비용_예측',
+            'total_revenue': '전환값_예측',
+            'total_conversions': '전환수_예측',
+            'total_clicks': '클릭_예측'
+        }
 
         for segment_name, df in self.segment_data.items():
             if df.empty:
                 continue
 
             # actual 데이터만 사용 (예측 데이터 제외)
-            actual_df = df[df['type'] == 'actual'].copy() if 'type' in df.columns else df.copy()
+            actual_df = df[df['type'] == 'actual'] if 'type' in df.columns else df
 
             if actual_df.empty:
                 continue
 
-            segment_col = segment_name
-            segment_stats = {}
-
-            for segment_value in actual_df[segment_col].unique():
-                seg_data = actual_df[actual_df[segment_col] == segment_value]
-
-                # 합계 계산
-                total_cost = seg_data['비용_예측'].sum() if '비용_예측' in seg_data.columns else 0
-                total_revenue = seg_data['전환값_예측'].sum() if '전환값_예측' in seg_data.columns else 0
-                total_conversions = seg_data['전환수_예측'].sum() if '전환수_예측' in seg_data.columns else 0
-                total_clicks = seg_data['클릭_예측'].sum() if '클릭_예측' in seg_data.columns else 0
-
-                # 비율 지표 계산 (총합 기준 - RATIO_METRIC_CALCULATION_FIX.md 참조)
-                roas = round((total_revenue / total_cost * 100), 2) if total_cost > 0 else 0
-                cpa = round((total_cost / total_conversions), 2) if total_conversions > 0 else 0
-                cvr = round((total_conversions / total_clicks * 100), 2) if total_clicks > 0 else 0
-
-                segment_stats[segment_value] = {
-                    'total_cost': total_cost,
-                    'total_revenue': total_revenue,
-                    'total_conversions': total_conversions,
-                    'roas': roas,
-                    'cpa': cpa,
-                    'cvr': cvr
+            # 세그먼트 값별 합계 (등장 순서 유지, 없는 컬럼은 0)
+            present = [column for column in total_columns.values() if column in actual_df.columns]
+            sums = group_reduce(actual_df, [segment_name], present, how='sum')
+            totals = {
+                key: sums[column] if column in present else pd.Series(0, index=sums.index)
+                for key, column in total_columns.items()
+            }
+            cost, revenue = totals['total_cost'], totals['total_revenue']
+            conversions, clicks = totals['total_conversions'], totals['total_clicks']
+
+            # 비율 지표 계산 (총합 기준 - RATIO_METRIC_CALCULATION_FIX.md 참조, 분모가 0 이하면 0)
+            roas = (revenue / cost * 100).round(2).to_numpy()
+            cpa = (cost / conversions).round(2).to_numpy()
+            cvr = (conversions / clicks * 100).round(2).to_numpy()
+            has_cost = (cost > 0).to_numpy()
+            has_conversions = (conversions > 0).to_numpy()
+            has_clicks = (clicks > 0).to_numpy()
+
+            segment_stats = {
+                segment_value: {
+                    'total_cost': cost.iat[i],
+                    'total_revenue': revenue.iat[i],
+                    'total_conversions': conversions.iat[i],
+                    'roas': roas[i] if has_cost[i] else 0,
+                    'cpa': cpa[i] if has_conversions[i] else 0,
+                    'cvr': cvr[i] if has_clicks[i] else 0
                 }
+                for i, segment_value in enumerate(sums.index)
+            }
+
+            # 규칙 엔진용 지표 테이블 (원본 dict 포함)
+            self.segment_tables[segment_name] = pd.DataFrame({
+                'segment_type': segment_name,
+                'segment_value': pd.Series(list(segment_stats.keys()), dtype=object),
+                'stats': pd.Series(list(segment_stats.values()), dtype=object),
+                'total_cost': cost.to_numpy(dtype=float),
+                'total_revenue': revenue.to_numpy(dtype=float),
+                'total_conversions': conversions.to_numpy(dtype=float),
+                'roas': np.where(has_cost, roas, 0.0),
+                'cpa': np.where(has_conversions, cpa, 0.0),
+                'cvr': np.where(has_clicks, cvr, 0.0)
+            })
 
             if segment_stats:
                 stats[segment_name] = segment_stats
@@ -588,20 +818,17 @@ class InsightGenerator:
         print(f"   📅 분석 기간: {period_display}")
         print("\n[1/6] Loading segment data...")
 
-        # 세그먼트별 예측 데이터 로드 (클라이언트 모드 지원)
-        segment_files = {
-            'brand': self.forecast_dir / 'segment_brand.csv',
-            'channel': self.forecast_dir / 'segment_channel.csv',
-            'product': self.forecast_dir / 'segment_product.csv',
-            'promotion': self.forecast_dir / 'segment_promotion.csv'
-        }
+        # 입력 데이터 (다중 기간 실행 시 공유 번들 재사용)
+        bundle = self.data_bundle if self.data_bundle is not None else load_insight_bundle(self.paths)
+        files, frames, windows = bundle['files'], bundle['frames'], bundle['windows']
 
+        # 세그먼트별 예측 데이터 (클라이언트 모드 지원)
         loaded_count = 0
-        for name, filepath in segment_files.items():
-            if filepath.exists():
-                df = pd.read_csv(filepath, encoding='utf-8')
+        for name, filepath in files['segment'].items():
+            df = frames['segment'][name]
+            if df is not None:
                 # 기간 필터링 적용
-                self.segment_data[name] = self.filter_by_days(df)
+                self.segment_data[name] = self.slice_window(windows['segment'][name])
                 loaded_count += 1
                 original_len = len(df)
                 filtered_len = len(self.segment_data[name])
@@ -617,18 +844,12 @@ class InsightGenerator:
         if self.segment_stats:
             print(f"   Calculated segment_stats from filtered data ({len(self.segment_stats)} segments)")
 
-        # predictions_*.csv 파일 로드 (클라이언트 모드 지원)
-        predictions_files = {
-            'daily': self.forecast_dir / 'predictions_daily.csv',
-            'weekly': self.forecast_dir / 'predictions_weekly.csv',
-            'monthly': self.forecast_dir / 'predictions_monthly.csv'
-        }
-
-        for name, filepath in predictions_files.items():
-            if filepath.exists():
-                df = pd.read_csv(filepath, encoding='utf-8')
+        # predictions_*.csv (클라이언트 모드 지원)
+        for name, filepath in files['predictions'].items():
+            df = frames['predictions'][name]
+            if df is not None:
                 # 기간 필터링 적용
-                self.predictions_data[name] = self.filter_by_days(df)
+                self.predictions_data[name] = self.slice_window(windows['predictions'][name])
                 original_len = len(df)
                 filtered_len = len(self.predictions_data[name])
                 if self.days and original_len != filtered_len:
@@ -654,59 +875,59 @@ class InsightGenerator:
 
             segment_col = segment_name
 
-            # 실제 vs 예측 비교
-            actual = df[df['type'] == 'actual']
-            forecast = df[df['type'] == 'forecast']
+            # 실제 vs 예측 비교 (세그먼트 값 × type 평균을 group_reduce 1회로 계산)
+            metric_columns = {'비용': '비용_예측', '전환수': '전환수_예측', '전환값': '전환값_예측'}
+            means = group_reduce(df, [segment_col, 'type'], list(metric_columns.values()), how='mean')
+            types = means.index.get_level_values('type')
 
-            if actual.empty or forecast.empty:
+            if 'actual' not in types or 'forecast' not in types:
                 continue
 
-            # 각 세그먼트별 분석
-            segment_analysis = {}
-
-            for segment_value in df[segment_col].unique():
-                seg_actual = actual[actual[segment_col] == segment_value]
-                seg_forecast = forecast[forecast[segment_col] == segment_value]
-
-                if seg_actual.empty or seg_forecast.empty:
-                    continue
+            # 실제/예측이 모두 있는 세그먼트만 (원본 등장 순서 유지)
+            actual_avg = means.xs('actual', level='type')
+            forecast_avg = means.xs('forecast', level='type')
+            segment_values = pd.Index(df[segment_col].unique())
+            segment_values = segment_values[segment_values.isin(actual_avg.index) & segment_values.isin(forecast_avg.index)]
+            actual_avg = actual_avg.reindex(segment_values).rename(columns={v: k for k, v in metric_columns.items()})
+            forecast_avg = forecast_avg.reindex(segment_values).rename(columns={v: k for k, v in metric_columns.items()})
+
+            # 변화율 계산 (실제 평균이 0 이하면 0)
+            changes = {
+                metric: ((forecast_avg[metric] - actual_avg[metric]) / actual_avg[metric] * 100).round(1).to_numpy()
+                for metric in metric_columns
+            }
+            has_actual = {metric: (actual_avg[metric] > 0).to_numpy() for metric in metric_columns}
 
-                # 실제 평균 vs 예측 평균
-                actual_metrics = {
-                    '비용': seg_actual['비용_예측'].mean(),
-                    '전환수': seg_actual['전환수_예측'].mean(),
-                    '전환값': seg_actual['전환값_예측'].mean()
-                }
+            # ROAS 변화 (비용이 0 이하면 0)
+            actual_roas = (actual_avg['전환값'] / actual_avg['비용'] * 100).round(1).to_numpy()
+            forecast_roas = (forecast_avg['전환값'] / forecast_avg['비용'] * 100).round(1).to_numpy()
+            has_actual_cost = (actual_avg['비용'] > 0).to_numpy()
+            has_forecast_cost = (forecast_avg['비용'] > 0).to_numpy()
 
-                forecast_metrics = {
-                    '비용': seg_forecast['비용_예측'].mean(),
-                    '전환수': seg_forecast['전환수_예측'].mean(),
-                    '전환값': seg_forecast['전환값_예측'].mean()
+            # 각 세그먼트별 분석
+            segment_analysis = {
+                segment_value: {
+                    'actual_avg': {metric: actual_avg[metric].iat[i] for metric in metric_columns},
+                    'forecast_avg': {metric: forecast_avg[metric].iat[i] for metric in metric_columns},
+                    'changes': {metric: changes[metric][i] if has_actual[metric][i] else 0
+                                for metric in metric_columns},
+                    'actual_roas': actual_roas[i] if has_actual_cost[i] else 0,
+                    'forecast_roas': forecast_roas[i] if has_forecast_cost[i] else 0
                 }
+                for i, segment_value in enumerate(segment_values)
+            }
 
-                # 변화율 계산
-                changes = {}
-                for metric in ['비용', '전환수', '전환값']:
-                    if actual_metrics[metric] > 0:
-                        change = ((forecast_metrics[metric] - actual_metrics[metric])
-                                 / actual_metrics[metric] * 100)
-                        changes[metric] = round(change, 1)
-                    else:
-                        changes[metric] = 0
-
-                # ROAS 변화
-                actual_roas = (actual_metrics['전환값'] / actual_metrics['비용'] * 100
-                              if actual_metrics['비용'] > 0 else 0)
-                forecast_roas = (forecast_metrics['전환값'] / forecast_metrics['비용'] * 100
-                                if forecast_metrics['비용'] > 0 else 0)
-
-                segment_analysis[segment_value] = {
-                    'actual_avg': actual_metrics,
-                    'forecast_avg': forecast_metrics,
-                    'changes': changes,
-                    'actual_roas': round(actual_roas, 1),
-                    'forecast_roas': round(forecast_roas, 1)
-                }
+            # 규칙 엔진용 지표 테이블 (원본 dict 포함)
+            self.forecast_tables[segment_name] = pd.DataFrame({
+                'segment_type': segment_name,
+                'segment_value': pd.Series(list(segment_values), dtype=object),
+                'forecast': pd.Series(list(segment_analysis.values()), dtype=object),
+                **{f'actual_avg.{metric}': actual_avg[metric].to_numpy(dtype=float) for metric in metric_columns},
+                **{f'forecast_avg.{metric}': forecast_avg[metric].to_numpy(dtype=float) for metric in metric_columns},
+                **{f'changes.{metric}': np.where(has_actual[metric], changes[metric], 0.0) for metric in metric_columns},
+                'actual_roas': np.where(has_actual_cost, actual_roas, 0.0),
+                'forecast_roas': np.where(has_forecast_cost, forecast_roas, 0.0)
+            })
 
             self.forecasts[segment_name] = segment_analysis
             print(f"   Analyzed {len(segment_analysis)} {segment_name} segments")
@@ -925,7 +1146,7 @@ class InsightGenerator:
         print(f"   ROAS: {overall_insights.get('current_period', {}).get('roas', 0)}%")
 
     def analyze_performance_trends(self) -> None:
-        """성과 트렌드 분석 (7일/14일/30일 비교)"""
+        """성과 트렌드 분석 (7일/14일/30일 비교, 구간 평균/합계는 window_compare로 1회 계산)"""
         print("\n[2.7/5] Analyzing performance trends (7d/14d/30d)...")
 
         if 'daily' not in self.predictions_data or self.predictions_data['daily'].empty:
@@ -942,305 +1163,167 @@ class InsightGenerator:
         # 날짜 정렬
         actual = actual.sort_values('일 구분')
 
-        improvements_7d = []
-        declines_7d = []
-        improvements_14d = []
-        declines_14d = []
-        improvements_30d = []
-        declines_30d = []
-
         metrics = {
             '비용': '비용_예측',
             '전환수': '전환수_예측',
             '전환값': '전환값_예측'
         }
 
-        # 7일 비교
-        if len(actual) >= 14:
-            recent_7d = actual.tail(7)
-            previous_7d = actual.iloc[-14:-7]
-
-            for metric_name, col_name in metrics.items():
-                if col_name not in actual.columns:
-                    continue
-
-                recent_avg = recent_7d[col_name].mean()
-                previous_avg = previous_7d[col_name].mean()
-
-                if previous_avg > 0:
-                    change_pct = ((recent_avg - previous_avg) / previous_avg) * 100
-
-                    if change_pct > 20:  # 20% 이상 증가
-                        improvements_7d.append({
-                            'metric': metric_name,
-                            'period': '7d',
-                            'improvement_level': 'high' if change_pct > 30 else 'medium',
-                            'change_pct': round(change_pct, 2),
-                            'recent_avg': round(recent_avg, 2),
-                            'previous_avg': round(previous_avg, 2),
-                            'recommendation': f'{metric_name}이(가) 개선되고 있습니다. 현재 전략을 유지하고 확대하세요.'
-                        })
-                    elif change_pct < -20:  # 20% 이상 감소
-                        declines_7d.append({
-                            'metric': metric_name,
-                            'period': '7d',
-                            'risk_level': 'high' if change_pct < -30 else 'medium',
-                            'change_pct': round(change_pct, 2),
-                            'recent_avg': round(recent_avg, 2),
-                            'previous_avg': round(previous_avg, 2),
-                            'recommendation': f'{metric_name}이(가) 하락하고 있습니다. 마케팅 전략 점검이 필요합니다.'
-                        })
-
-            # ROAS 계산 (7일)
-            recent_roas_7d = (recent_7d['전환값_예측'].sum() / recent_7d['비용_예측'].sum() * 100) if recent_7d['비용_예측'].sum() > 0 else 0
-            previous_roas_7d = (previous_7d['전환값_예측'].sum() / previous_7d['비용_예측'].sum() * 100) if previous_7d['비용_예측'].sum() > 0 else 0
-
-            if previous_roas_7d > 0:
-                roas_change = recent_roas_7d - previous_roas_7d
-                roas_change_pct = (roas_change / previous_roas_7d) * 100
-
-                if roas_change_pct > 20:
-                    improvements_7d.append({
-                        'metric': 'ROAS',
-                        'period': '7d',
-                        'improvement_level': 'high' if roas_change_pct > 30 else 'medium',
-                        'change_pct': round(roas_change_pct, 2),
-                        'recent_avg': round(recent_roas_7d, 2),
-                        'previous_avg': round(previous_roas_7d, 2),
-                        'recommendation': 'ROAS가 크게 개선되었습니다. 현재 캠페인 전략을 강화하세요.'
-                    })
-                elif roas_change_pct < -20:
-                    declines_7d.append({
-                        'metric': 'ROAS',
-                        'period': '7d',
-                        'risk_level': 'high' if roas_change_pct < -30 else 'medium',
-                        'change_pct': round(roas_change_pct, 2),
-                        'recent_avg': round(recent_roas_7d, 2),
-                        'previous_avg': round(previous_roas_7d, 2),
-                        'recommendation': 'ROAS가 하락하고 있습니다. 광고 효율성 점검이 필요합니다.'
-                    })
-
-        # 14일 비교
-        if len(actual) >= 28:
-            recent_14d = actual.tail(14)
-            previous_14d = actual.iloc[-28:-14]
+        # 기간별 비교 설정 (권장 문구의 {metric}은 지표명)
+        period_configs = [
+            {'key': '7d', 'days': 7,
+             'improvement': '{metric}이(가) 개선되고 있습니다. 현재 전략을 유지하고 확대하세요.',
+             'decline': '{metric}이(가) 하락하고 있습니다. 마케팅 전략 점검이 필요합니다.',
+             'roas_improvement': 'ROAS가 크게 개선되었습니다. 현재 캠페인 전략을 강화하세요.',
+             'roas_decline': 'ROAS가 하락하고 있습니다. 광고 효율성 점검이 필요합니다.'},
+            {'key': '14d', 'days': 14,
+             'improvement': '{metric}이(가) 2주간 개선되고 있습니다. 현재 전략을 유지하세요.',
+             'decline': '{metric}이(가) 2주간 하락하고 있습니다. 전략 점검이 필요합니다.',
+             'roas_improvement': 'ROAS가 2주간 개선되었습니다. 현재 캠페인 전략을 유지하세요.',
+             'roas_decline': 'ROAS가 2주간 하락하고 있습니다. 광고 효율성 점검이 필요합니다.'},
+            {'key': '30d', 'days': 30,
+             'improvement': '{metric}이(가) 지속적으로 개선되고 있습니다. 장기 전략으로 확대하세요.',
+             'decline': '{metric}의 장기 하락 추세가 감지되었습니다. 전략 재검토가 필요합니다.',
+             'roas_improvement': 'ROAS의 장기 개선 추세가 확인되었습니다. 성공 전략을 확대 적용하세요.',
+             'roas_decline': 'ROAS의 장기 하락 추세가 심각합니다. 즉시 개선 조치가 필요합니다.'},
+        ]
+
+        # 지표별 최근/이전 N일 평균, ROAS용 비용/전환값 합계 (누적합 1회)
+        period_days = [cfg['days'] for cfg in period_configs]
+        metric_columns = [col_name for col_name in metrics.values() if col_name in actual.columns]
+        means = window_compare(actual[metric_columns], windows=period_days, lags=[0] + period_days)
+        sums = window_compare(actual[['전환값_예측', '비용_예측']], windows=period_days,
+                              lags=[0] + period_days, how='sum')
+
+        def roas(days: int, lag: int) -> float:
+            cost = sums.at['비용_예측', (days, lag)]
+            return (sums.at['전환값_예측', (days, lag)] / cost * 100) if cost > 0 else 0
+
+        trends = {f'{kind}_{cfg["key"]}': [] for kind in ('improvements', 'declines') for cfg in period_configs}
+
+        for cfg in period_configs:
+            key, days = cfg['key'], cfg['days']
+            if len(actual) < days * 2:
+                continue
+            improvements, declines = trends[f'improvements_{key}'], trends[f'declines_{key}']
 
             for metric_name, col_name in metrics.items():
                 if col_name not in actual.columns:
                     continue
 
-                recent_avg = recent_14d[col_name].mean()
-                previous_avg = previous_14d[col_name].mean()
+                recent_avg = means.at[col_name, (days, 0)]
+                previous_avg = means.at[col_name, (days, days)]
 
                 if previous_avg > 0:
                     change_pct = ((recent_avg - previous_avg) / previous_avg) * 100
 
                     if change_pct > 20:  # 20% 이상 증가
-                        improvements_14d.append({
+                        improvements.append({
                             'metric': metric_name,
-                            'period': '14d',
+                            'period': key,
                             'improvement_level': 'high' if change_pct > 30 else 'medium',
                             'change_pct': round(change_pct, 2),
                             'recent_avg': round(recent_avg, 2),
                             'previous_avg': round(previous_avg, 2),
-                            'recommendation': f'{metric_name}이(가) 2주간 개선되고 있습니다. 현재 전략을 유지하세요.'
+                            'recommendation': cfg['improvement'].format(metric=metric_name)
                         })
                     elif change_pct < -20:  # 20% 이상 감소
-                        declines_14d.append({
+                        declines.append({
                             'metric': metric_name,
-                            'period': '14d',
+                            'period': key,
                             'risk_level': 'high' if change_pct < -30 else 'medium',
                             'change_pct': round(change_pct, 2),
                             'recent_avg': round(recent_avg, 2),
                             'previous_avg': round(previous_avg, 2),
-                            'recommendation': f'{metric_name}이(가) 2주간 하락하고 있습니다. 전략 점검이 필요합니다.'
+                            'recommendation': cfg['decline'].format(metric=metric_name)
                         })
 
-            # ROAS 계산 (14일)
-            recent_roas_14d = (recent_14d['전환값_예측'].sum() / recent_14d['비용_예측'].sum() * 100) if recent_14d['비용_예측'].sum() > 0 else 0
-            previous_roas_14d = (previous_14d['전환값_예측'].sum() / previous_14d['비용_예측'].sum() * 100) if previous_14d['비용_예측'].sum() > 0 else 0
+            # ROAS 계산 (기간 합계 기준)
+            recent_roas = roas(days, 0)
+            previous_roas = roas(days, days)
 
-            if previous_roas_14d > 0:
-                roas_change = recent_roas_14d - previous_roas_14d
-                roas_change_pct = (roas_change / previous_roas_14d) * 100
+            if previous_roas > 0:
+                roas_change = recent_roas - previous_roas
+                roas_change_pct = (roas_change / previous_roas) * 100
 
                 if roas_change_pct > 20:
-                    improvements_14d.append({
+                    improvements.append({
                         'metric': 'ROAS',
-                        'period': '14d',
+                        'period': key,
                         'improvement_level': 'high' if roas_change_pct > 30 else 'medium',
                         'change_pct': round(roas_change_pct, 2),
-                        'recent_avg': round(recent_roas_14d, 2),
-                        'previous_avg': round(previous_roas_14d, 2),
-                        'recommendation': 'ROAS가 2주간 개선되었습니다. 현재 캠페인 전략을 유지하세요.'
+                        'recent_avg': round(recent_roas, 2),
+                        'previous_avg': round(previous_roas, 2),
+                        'recommendation': cfg['roas_improvement']
                     })
                 elif roas_change_pct < -20:
-                    declines_14d.append({
+                    declines.append({
                         'metric': 'ROAS',
-                        'period': '14d',
+                        'period': key,
                         'risk_level': 'high' if roas_change_pct < -30 else 'medium',
                         'change_pct': round(roas_change_pct, 2),
-                        'recent_avg': round(recent_roas_14d, 2),
-                        'previous_avg': round(previous_roas_14d, 2),
-                        'recommendation': 'ROAS가 2주간 하락하고 있습니다. 광고 효율성 점검이 필요합니다.'
+                        'recent_avg': round(recent_roas, 2),
+                        'previous_avg': round(previous_roas, 2),
+                        'recommendation': cfg['roas_decline']
                     })
 
-        # 30일 비교
-        if len(actual) >= 60:
-            recent_30d = actual.tail(30)
-            previous_30d = actual.iloc[-60:-30]
-
-            for metric_name, col_name in metrics.items():
-                if col_name not in actual.columns:
-                    continue
-
-                recent_avg = recent_30d[col_name].mean()
-                previous_avg = previous_30d[col_name].mean()
-
-                if previous_avg > 0:
-                    change_pct = ((recent_avg - previous_avg) / previous_avg) * 100
-
-                    if change_pct > 20:
-                        improvements_30d.append({
-                            'metric': metric_name,
-                            'period': '30d',
-                            'improvement_level': 'high' if change_pct > 30 else 'medium',
-                            'change_pct': round(change_pct, 2),
-                            'recent_avg': round(recent_avg, 2),
-                            'previous_avg': round(previous_avg, 2),
-                            'recommendation': f'{metric_name}이(가) 지속적으로 개선되고 있습니다. 장기 전략으로 확대하세요.'
-                        })
-                    elif change_pct < -20:
-                        declines_30d.append({
-                            'metric': metric_name,
-                            'period': '30d',
-                            'risk_level': 'high' if change_pct < -30 else 'medium',
-                            'change_pct': round(change_pct, 2),
-                            'recent_avg': round(recent_avg, 2),
-                            'previous_avg': round(previous_avg, 2),
-                            'recommendation': f'{metric_name}의 장기 하락 추세가 감지되었습니다. 전략 재검토가 필요합니다.'
-                        })
-
-            # ROAS 계산 (30일)
-            recent_roas_30d = (recent_30d['전환값_예측'].sum() / recent_30d['비용_예측'].sum() * 100) if recent_30d['비용_예측'].sum() > 0 else 0
-            previous_roas_30d = (previous_30d['전환값_예측'].sum() / previous_30d['비용_예측'].sum() * 100) if previous_30d['비용_예측'].sum() > 0 else 0
-
-            if previous_roas_30d > 0:
-                roas_change = recent_roas_30d - previous_roas_30d
-                roas_change_pct = (roas_change / previous_roas_30d) * 100
+        # insights에 추가
+        self.insights['performance_trends'] = trends
 
-                if roas_change_pct > 20:
-                    improvements_30d.append({
-                        'metric': 'ROAS',
-                        'period': '30d',
-                        'improvement_level': 'high' if roas_change_pct > 30 else 'medium',
-                        'change_pct': round(roas_change_pct, 2),
-                        'recent_avg': round(recent_roas_30d, 2),
-                        'previous_avg': round(previous_roas_30d, 2),
-                        'recommendation': 'ROAS의 장기 개선 추세가 확인되었습니다. 성공 전략을 확대 적용하세요.'
-                    })
-                elif roas_change_pct < -20:
-                    declines_30d.append({
-                        'metric': 'ROAS',
-                        'period': '30d',
-                        'risk_level': 'high' if roas_change_pct < -30 else 'medium',
-                        'change_pct': round(roas_change_pct, 2),
-                        'recent_avg': round(recent_roas_30d, 2),
-                        'previous_avg': round(previous_roas_30d, 2),
-                        'recommendation': 'ROAS의 장기 하락 추세가 심각합니다. 즉시 개선 조치가 필요합니다.'
-                    })
+        for cfg, label in zip(period_configs, ('7-day', '14-day', '30-day')):
+            key = cfg['key']
+            print(f"   {label} improvements: {len(trends['improvements_' + key])}, "
+                  f"declines: {len(trends['declines_' + key])}")
 
-        # insights에 추가
-        self.insights['performance_trends'] = {
-            'improvements_7d': improvements_7d,
-            'improvements_14d': improvements_14d,
-            'improvements_30d': improvements_30d,
-            'declines_7d': declines_7d,
-            'declines_14d': declines_14d,
-            'declines_30d': declines_30d
-        }
+    def _forecast_table(self) -> pd.DataFrame:
+        """예측 분석 테이블 (규칙 엔진 입력, analyze_forecasts 결과)
 
-        print(f"   7-day improvements: {len(improvements_7d)}, declines: {len(declines_7d)}")
-        print(f"   14-day improvements: {len(improvements_14d)}, declines: {len(declines_14d)}")
-        print(f"   30-day improvements: {len(improvements_30d)}, declines: {len(declines_30d)}")
+        컬럼: segment_type, segment_value, forecast(원본 dict), actual_roas, forecast_roas,
+        changes.*, actual_avg.*, forecast_avg.*, roas_change(%p), roas_change_pct(소수 1자리)
+        """
+        tables = [table for table in self.forecast_tables.values() if not table.empty]
+        if not tables:
+            return pd.DataFrame(columns=['segment_type', 'segment_value', 'forecast', 'actual_roas', 'forecast_roas',
+                                         'changes.전환수', 'changes.전환값', 'forecast_avg.전환수',
+                                         'roas_change', 'roas_change_pct'])
+
+        table = pd.concat(tables, ignore_index=True)
+        table['roas_change'] = table['forecast_roas'] - table['actual_roas']
+        table['roas_change_pct'] = table['roas_change'].round(1)
+        return table
+
+    def _stats_table(self, segment_names: List[str]) -> pd.DataFrame:
+        """세그먼트 통계 + 예측 변화율/평균 테이블 (규칙 엔진 입력)
+
+        컬럼: segment_type, segment_value, stats(원본 dict), total_cost, total_revenue, total_conversions,
+        roas, cpa, cvr, changes.전환수, changes.전환값, forecast_avg.전환수 (예측이 없는 세그먼트는 0)
+        """
+        forecast_columns = ['changes.전환수', 'changes.전환값', 'forecast_avg.전환수']
+        tables = [self.segment_tables[name] for name in segment_names
+                  if name in self.segment_tables and not self.segment_tables[name].empty]
+        if not tables:
+            return pd.DataFrame(columns=['segment_type', 'segment_value', 'stats', 'total_cost', 'total_revenue',
+                                         'total_conversions', 'roas', 'cpa', 'cvr'] + forecast_columns)
+
+        table = pd.concat(tables, ignore_index=True)
+        forecast = self._forecast_table()[['segment_type', 'segment_value'] + forecast_columns]
+        table = table.merge(forecast, on=['segment_type', 'segment_value'], how='left')
+        table[forecast_columns] = table[forecast_columns].astype(float).fillna(0.0)
+        return table
 
     def detect_alerts(self) -> None:
         """KPI 하락 경고 감지 (Financial Impact 포함)"""
         print("\n[3/6] Detecting alerts (Risk Management)...")
 
-        alerts = []
-
-        for segment_name, analysis in self.forecasts.items():
-            for segment_value, data in analysis.items():
-                changes = data['changes']
-                actual_avg = data.get('actual_avg', {})
-                forecast_avg = data.get('forecast_avg', {})
-
-                # 전환수 하락 감지
-                conv_change = changes.get('전환수', 0)
-                if conv_change < -self.thresholds['decline_alert_pct']:
-                    # 예상 손실 계산
-                    actual_conv = actual_avg.get('전환수', 0) * 7  # 7일 기준
-                    forecast_conv = forecast_avg.get('전환수', 0) * 7
-                    loss_conversions = actual_conv - forecast_conv
-
-                    alerts.append({
-                        'type': 'conversion_decline',
-                        'segment_type': segment_name,
-                        'segment_value': segment_value,
-                        'metric': '전환수',
-                        'change_pct': conv_change,
-                        'severity': 'high' if conv_change < -self.thresholds['critical_decline_pct'] else 'medium',
-                        'title': FRIENDLY_TITLES['conversion_drop'].format(target=segment_value),
-                        'message': f"다음 주 전환수가 {abs(conv_change):.1f}% 감소할 것으로 예상됩니다.",
-                        'action': ACTION_GUIDES['conversion_drop'],
-                        'financial_impact': f"예상 손실 전환: {int(loss_conversions):,}건"
-                    })
-
-                # 전환값(매출) 하락 감지
-                rev_change = changes.get('전환값', 0)
-                if rev_change < -self.thresholds['decline_alert_pct']:
-                    # 예상 손실액 계산
-                    actual_rev = actual_avg.get('전환값', 0) * 7
-                    forecast_rev = forecast_avg.get('전환값', 0) * 7
-                    loss_amount = actual_rev - forecast_rev
-
-                    alerts.append({
-                        'type': 'revenue_decline',
-                        'segment_type': segment_name,
-                        'segment_value': segment_value,
-                        'metric': '전환값',
-                        'change_pct': rev_change,
-                        'severity': 'high' if rev_change < -self.thresholds['critical_decline_pct'] else 'medium',
-                        'title': FRIENDLY_TITLES['revenue_drop'].format(target=segment_value),
-                        'message': f"다음 주 매출이 {abs(rev_change):.1f}% 빠질 것으로 예상됩니다.",
-                        'action': ACTION_GUIDES['conversion_drop'],
-                        'financial_impact': f"예상 손실액: {format_currency(loss_amount)}",
-                        'loss_amount': safe_float(loss_amount)
-                    })
-
-                # ROAS 하락 감지
-                roas_change = data['forecast_roas'] - data['actual_roas']
-                if roas_change < -self.thresholds['decline_alert_pct']:
-                    alerts.append({
-                        'type': 'roas_decline',
-                        'segment_type': segment_name,
-                        'segment_value': segment_value,
-                        'metric': 'ROAS',
-                        'change_pct': round(roas_change, 1),
-                        'severity': 'high' if roas_change < -self.thresholds['critical_decline_pct'] else 'medium',
-                        'title': FRIENDLY_TITLES['roas_drop'].format(target=segment_value),
-                        'message': f"ROAS가 {data['actual_roas']:.0f}%에서 {data['forecast_roas']:.0f}%로 떨어질 전망입니다.",
-                        'action': ACTION_GUIDES['roas_decline'],
-                        'actual_roas': data['actual_roas'],
-                        'forecast_roas': data['forecast_roas']
-                    })
+        rules = alert_rules(self.thresholds)
+        alerts = rules.evaluate(self._forecast_table())
 
         # 심각도 순 정렬 (high > medium)
         alerts = sorted(alerts, key=lambda x: (x['severity'] == 'high', abs(x.get('change_pct', 0))), reverse=True)
 
         self.insights['segments']['alerts'] = alerts
         print(f"   Detected {len(alerts)} segment alerts (Risk signals)")
+        print(f"   Rules: {rules.report()}")
 
         for alert in alerts[:5]:  # 상위 5개만 출력
             print(f"      - {alert.get('title', alert['segment_value'])}: {alert['metric']} {alert['change_pct']:.1f}%")
@@ -1249,101 +1332,9 @@ class InsightGenerator:
         """숨은 기회 발굴 (Growth Hacking) - Financial Impact 포함"""
         print("\n[4/6] Finding opportunities (Growth Hacking)...")
 
-        opportunities = []
-
         # 채널/상품/브랜드 포트폴리오 분석
-        for segment_name in ['channel', 'product', 'brand']:
-            if segment_name not in self.segment_stats:
-                continue
-
-            stats = self.segment_stats[segment_name]
-
-            for segment_value, segment_data in stats.items():
-                roas = segment_data.get('roas', 0)
-                total_cost = segment_data.get('total_cost', 0)
-                total_revenue = segment_data.get('total_revenue', 0)
-
-                # 예측 데이터에서 트렌드 확인
-                forecast_data = self.forecasts.get(segment_name, {}).get(segment_value, {})
-                forecast_avg = forecast_data.get('forecast_avg', {})
-                changes = forecast_data.get('changes', {})
-
-                # ================================================================
-                # Opportunity 1: High ROAS (Star/Cash Cow) - 강력 추천
-                # ================================================================
-                if roas > THRESHOLDS['high_roas']:
-                    # 예상 추가 매출 (예산 20% 증액 시)
-                    potential_uplift = total_revenue * 0.2  # 선형 가정
-
-                    # 세그먼트별 맞춤 액션
-                    action_template = OPPORTUNITY_ACTIONS['scale_up'].get(segment_name, OPPORTUNITY_ACTIONS['scale_up']['default'])
-                    action_text = action_template.format(value=segment_value)
-
-                    opportunities.append({
-                        'type': 'scale_up',
-                        'tag': FRIENDLY_TITLES['scale_up'],
-                        'segment_type': segment_name,
-                        'segment_value': segment_value,
-                        'title': f"🚀 {segment_value}: 수익성 최고조!",
-                        'message': f"예상 ROAS가 {roas:.0f}%로 매우 높습니다. 물 들어올 때 노 저으세요!",
-                        'action': action_text,
-                        'financial_impact': f"예산 20% 증액 시, 약 {format_currency(potential_uplift)} 추가 매출 기대",
-                        'potential_uplift': safe_float(potential_uplift),
-                        'roas': roas,
-                        'priority': 1
-                    })
-
-                # ================================================================
-                # Opportunity 2: Hidden Gem (저예산 고효율) - 숨은 보석
-                # ================================================================
-                elif roas > THRESHOLDS['opportunity_roas'] and total_cost < 1000000:  # 100만원 미만
-                    # 세그먼트별 맞춤 액션
-                    action_template = OPPORTUNITY_ACTIONS['hidden_gem'].get(segment_name, OPPORTUNITY_ACTIONS['hidden_gem']['default'])
-                    action_text = action_template.format(value=segment_value)
-
-                    # 예상 추가 매출 (2배 증액 시)
-                    potential_uplift = total_revenue  # 현재 매출만큼 추가 기대
-
-                    opportunities.append({
-                        'type': 'hidden_gem',
-                        'tag': FRIENDLY_TITLES['hidden_gem'],
-                        'segment_type': segment_name,
-                        'segment_value': segment_value,
-                        'title': f"💎 숨은 보석 발견: {segment_value}",
-                        'message': f"아직 예산은 {format_currency(total_cost)}이지만 ROAS {roas:.0f}%로 효율이 터지고 있어요!",
-                        'action': action_text,
-                        'financial_impact': f"예산 2배 증액 시, 약 {format_currency(potential_uplift)} 추가 매출 기대 (ROAS 유지 가정)",
-                        'potential_uplift': safe_float(potential_uplift),
-                        'roas': roas,
-                        'priority': 2
-                    })
-
-                # ================================================================
-                # Opportunity 3: 성장 가속 (전환수 증가 + 양호한 ROAS)
-                # ================================================================
-                elif changes.get('전환수', 0) > THRESHOLDS['growth_star'] and roas > THRESHOLDS['low_roas']:
-                    growth_pct = changes.get('전환수', 0)
-
-                    # 세그먼트별 맞춤 액션
-                    action_template = OPPORTUNITY_ACTIONS['growth_momentum'].get(segment_name, OPPORTUNITY_ACTIONS['growth_momentum']['default'])
-                    action_text = action_template.format(value=segment_value)
-
-                    # 예상 추가 전환 계산
-                    weekly_conversions = forecast_avg.get('전환수', 0) * 7
-                    additional_conversions = int(weekly_conversions * 0.1)
-
-                    opportunities.append({
-                        'type': 'growth_momentum',
-                        'tag': "📈 성장 모멘텀",
-                        'segment_type': segment_name,
-                        'segment_value': segment_value,
-                        'title': f"📈 {segment_value}: 성장 가속 중!",
-                        'message': f"전환수가 {growth_pct:.1f}% 증가하면서 ROAS {roas:.0f}%를 유지하고 있어요.",
-                        'action': action_text,
-                        'financial_impact': f"예산 10% 증액 시, 주당 약 {additional_conversions:,}건 추가 전환 기대",
-                        'roas': roas,
-                        'priority': 3
-                    })
+        rules = opportunity_rules()
+        opportunities = rules.evaluate(self._stats_table(['channel', 'product', 'brand']))
 
         # ROAS 높은 순 + 우선순위 순 정렬
         opportunities = sorted(opportunities, key=lambda x: (x.get('priority', 99), -x.get('roas', 0)))
@@ -1351,6 +1342,7 @@ class InsightGenerator:
         # 상위 5개만 저장
         self.insights['opportunities'] = opportunities[:5]
         print(f"   Found {len(opportunities)} opportunities (Growth signals)")
+        print(f"   Rules: {rules.report()}")
 
         for opp in opportunities[:3]:
             print(f"      - {opp.get('title', opp['segment_value'])}: ROAS {opp['roas']:.0f}%")
@@ -1396,8 +1388,6 @@ class InsightGenerator:
         """투자 권장 세그먼트 도출 (Action-First + 4분면 연동) - v2.3 개선"""
         print("\n[5/6] Generating recommendations...")
 
-        recommendations = []
-
         # 세그먼트 유형별 맞춤 액션 템플릿 (ADVICE_CONTEXT_MAP 확장)
         ACTION_TEMPLATES = {
             'channel': {
@@ -1426,25 +1416,20 @@ class InsightGenerator:
             }
         }
 
-        # 4분면 기반 액션 유형 결정 함수
-        def determine_action_type(roas, growth_rate, th_eff_high, th_growth_high):
-            """ROAS와 성장률 기반으로 액션 유형 결정"""
-            if roas >= th_eff_high and growth_rate >= th_growth_high:
-                return 'scale_up', 30  # Super Star: 공격적 증액
-            elif roas >= th_eff_high and growth_rate < 0:
-                return 'defend', 0     # Fading Hero: 방어
-            elif roas < th_eff_high and growth_rate >= th_growth_high:
-                return 'optimize', 20  # Rising Potential: 최적화 + 소폭 증액
-            else:
-                return 'reduce', -20   # Problem Child: 감액
+        # ADVICE_CONTEXT_MAP 4분면 유형 매핑
+        matrix_type_map = {
+            'scale_up': 'super_star',
+            'optimize': 'rising_potential',
+            'defend': 'fading_hero',
+            'reduce': 'problem_child'
+        }
+
+        segment_names = ['channel', 'product', 'brand', 'promotion']
+        table = self._stats_table(segment_names)
+        table['growth_rate'] = table['changes.전환값'] / 100  # % to ratio
 
         # 동적 임계값 계산
-        all_roas = []
-        for segment_name in ['channel', 'product', 'brand', 'promotion']:
-            if segment_name in self.segment_stats:
-                for v in self.segment_stats[segment_name].values():
-                    if v.get('roas', 0) > 0:
-                        all_roas.append(v['roas'])
+        all_roas = table.loc[table['roas'] > 0, 'roas']
 
         if len(all_roas) >= 3:
             th_eff_high = float(np.quantile(all_roas, 0.7))
@@ -1453,113 +1438,97 @@ class InsightGenerator:
 
         th_growth_high = 0.05  # 5% 성장률
 
-        # 각 세그먼트 타입별로 권장 대상 도출
-        for segment_name in ['channel', 'product', 'brand', 'promotion']:
-            if segment_name not in self.segment_stats:
-                continue
-
-            stats = self.segment_stats[segment_name]
-
-            # 효율성 기준 랭킹 (ROAS 기준)
-            ranked = sorted(
-                [(k, v) for k, v in stats.items() if v.get('roas', 0) > 0],
-                key=lambda x: x[1]['roas'],
-                reverse=True
-            )
-
-            if not ranked:
-                continue
-
-            # 상위 효율 세그먼트
-            top_segment = ranked[0]
-            segment_value = top_segment[0]
-            segment_stats_data = top_segment[1]
-
-            # 예측 데이터에서 트렌드 확인
-            forecast_data = self.forecasts.get(segment_name, {}).get(segment_value, {})
-            changes = forecast_data.get('changes', {})
-            forecast_avg = forecast_data.get('forecast_avg', {})
-
-            # 성장률 계산 (전환값 변화율)
-            growth_rate = changes.get('전환값', 0) / 100  # % to ratio
-
-            # 4분면 기반 액션 유형 결정
-            action_type, budget_pct = determine_action_type(
-                segment_stats_data['roas'], growth_rate, th_eff_high, th_growth_high
-            )
-
-            # 맞춤 액션 생성
-            templates = ACTION_TEMPLATES.get(segment_name, ACTION_TEMPLATES['channel'])
-            action = templates[action_type].format(
-                value=segment_value,
-                pct=abs(budget_pct)
-            )
+        def recommendation(action_type: str, budget_pct: int) -> Callable:
+            """권장 레코드 템플릿 (세그먼트 유형별 맞춤 액션 + 실제 수치 기반 expected_impact)"""
+            def build(row: dict) -> dict:
+                segment_name, segment_value = row['segment_type'], row['segment_value']
+                segment_stats_data = row['stats']
+                growth_rate = row['growth_rate']
+
+                # 맞춤 액션 생성
+                templates = ACTION_TEMPLATES.get(segment_name, ACTION_TEMPLATES['channel'])
+                action = templates[action_type].format(
+                    value=segment_value,
+                    pct=abs(budget_pct)
+                )
 
-            # 실제 수치 기반 expected_impact 계산
-            current_revenue = segment_stats_data.get('total_revenue', 0)
-            current_conversions = segment_stats_data.get('total_conversions', 0)
-            forecast_conv = forecast_avg.get('전환수', 0) * 7  # 7일 기준
+                # 실제 수치 기반 expected_impact 계산
+                current_revenue = segment_stats_data.get('total_revenue', 0)
+                current_conversions = segment_stats_data.get('total_conversions', 0)
+                forecast_conv = row['forecast_avg.전환수'] * 7  # 7일 기준
 
-            if action_type == 'scale_up':
-                expected_revenue_uplift = current_revenue * (budget_pct / 100)
-                expected_conv_uplift = int(current_conversions * (budget_pct / 100))
-                if expected_revenue_uplift > 0:
-                    expected_impact = f"예상 추가 매출 {format_currency(expected_revenue_uplift)}, 전환 +{expected_conv_uplift}건"
+                if action_type == 'scale_up':
+                    expected_revenue_uplift = current_revenue * (budget_pct / 100)
+                    expected_conv_uplift = int(current_conversions * (budget_pct / 100))
+                    if expected_revenue_uplift > 0:
+                        expected_impact = f"예상 추가 매출 {format_currency(expected_revenue_uplift)}, 전환 +{expected_conv_uplift}건"
+                    else:
+                        expected_impact = f"전환수 {int(budget_pct * 0.8)}~{budget_pct}% 증가 예상"
+                elif action_type == 'optimize':
+                    expected_impact = f"전환율 10~20% 개선 시, 전환 +{max(1, int(forecast_conv * 0.15))}건/주 예상"
+                elif action_type == 'defend':
+                    expected_impact = f"현재 ROAS {int(segment_stats_data['roas'])}% 유지, 마진 방어"
+                else:  # reduce
+                    saved_cost = segment_stats_data.get('total_cost', 0) * (abs(budget_pct) / 100)
+                    expected_impact = f"예산 {format_currency(saved_cost)} 절감, 효율 채널로 재배치"
+
+                # 권장 이유 생성 (더 상세하게)
+                reasons = []
+                if segment_stats_data['roas'] > th_eff_high:
+                    reasons.append(f"ROAS {segment_stats_data['roas']:.0f}%로 상위 30% 효율")
+                elif segment_stats_data['roas'] > 100:
+                    reasons.append(f"ROAS {segment_stats_data['roas']:.0f}%로 양호한 효율")
                 else:
-                    expected_impact = f"전환수 {int(budget_pct * 0.8)}~{budget_pct}% 증가 예상"
-            elif action_type == 'optimize':
-                expected_impact = f"전환율 10~20% 개선 시, 전환 +{max(1, int(forecast_conv * 0.15))}건/주 예상"
-            elif action_type == 'defend':
-                expected_impact = f"현재 ROAS {int(segment_stats_data['roas'])}% 유지, 마진 방어"
-            else:  # reduce
-                saved_cost = segment_stats_data.get('total_cost', 0) * (abs(budget_pct) / 100)
-                expected_impact = f"예산 {format_currency(saved_cost)} 절감, 효율 채널로 재배치"
-
-            # 권장 이유 생성 (더 상세하게)
-            reasons = []
-            if segment_stats_data['roas'] > th_eff_high:
-                reasons.append(f"ROAS {segment_stats_data['roas']:.0f}%로 상위 30% 효율")
-            elif segment_stats_data['roas'] > 100:
-                reasons.append(f"ROAS {segment_stats_data['roas']:.0f}%로 양호한 효율")
-            else:
-                reasons.append(f"ROAS {segment_stats_data['roas']:.0f}%로 개선 필요")
-
-            if segment_stats_data['cvr'] > 0:
-                reasons.append(f"CVR {segment_stats_data['cvr']:.2f}%")
-
-            if growth_rate > 0.05:
-                reasons.append(f"전환값 {growth_rate*100:.1f}% 성장 예측")
-            elif growth_rate < -0.05:
-                reasons.append(f"전환값 {abs(growth_rate)*100:.1f}% 하락 예측")
-
-            # ADVICE_CONTEXT_MAP에서 맞춤 조언 추가
-            matrix_type_map = {
-                'scale_up': 'super_star',
-                'optimize': 'rising_potential',
-                'defend': 'fading_hero',
-                'reduce': 'problem_child'
-            }
-            matrix_type = matrix_type_map.get(action_type, 'super_star')
-            context_advice = ADVICE_CONTEXT_MAP.get(segment_name, {}).get(matrix_type, '')
-
-            recommendations.append({
-                'priority': len(recommendations) + 1,
-                'action': action,
-                'action_type': action_type,  # scale_up/optimize/defend/reduce
-                'target': {
-                    'type': segment_name,
-                    'value': segment_value
-                },
-                'reasons': reasons,
-                'expected_impact': expected_impact,
-                'context_advice': context_advice,  # 4분면 기반 맞춤 조언
-                'metrics': {
-                    'roas': segment_stats_data['roas'],
-                    'cvr': segment_stats_data['cvr'],
-                    'cpa': segment_stats_data['cpa'],
-                    'growth_rate': round(growth_rate * 100, 1)
+                    reasons.append(f"ROAS {segment_stats_data['roas']:.0f}%로 개선 필요")
+
+                if segment_stats_data['cvr'] > 0:
+                    reasons.append(f"CVR {segment_stats_data['cvr']:.2f}%")
+
+                if growth_rate > 0.05:
+                    reasons.append(f"전환값 {growth_rate*100:.1f}% 성장 예측")
+                elif growth_rate < -0.05:
+                    reasons.append(f"전환값 {abs(growth_rate)*100:.1f}% 하락 예측")
+
+                # ADVICE_CONTEXT_MAP에서 맞춤 조언 추가
+                matrix_type = matrix_type_map.get(action_type, 'super_star')
+                context_advice = ADVICE_CONTEXT_MAP.get(segment_name, {}).get(matrix_type, '')
+
+                return {
+                    'priority': None,  # 정렬 후 할당
+                    'action': action,
+                    'action_type': action_type,  # scale_up/optimize/defend/reduce
+                    'target': {
+                        'type': segment_name,
+                        'value': segment_value
+                    },
+                    'reasons': reasons,
+                    'expected_impact': expected_impact,
+                    'context_advice': context_advice,  # 4분면 기반 맞춤 조언
+                    'metrics': {
+                        'roas': segment_stats_data['roas'],
+                        'cvr': segment_stats_data['cvr'],
+                        'cpa': segment_stats_data['cpa'],
+                        'growth_rate': np.round(growth_rate * 100, 1)
+                    }
                 }
-            })
+            return build
+
+        # 4분면 기반 액션 유형 결정 (ROAS와 성장률 기준, 위에서부터 처음 만족하는 규칙)
+        rules = RuleSet([
+            Rule('scale_up', when=lambda t: (t['roas'] >= th_eff_high) & (t['growth_rate'] >= th_growth_high),
+                 record=recommendation('scale_up', 30)),    # Super Star: 공격적 증액
+            Rule('defend', when=lambda t: (t['roas'] >= th_eff_high) & (t['growth_rate'] < 0),
+                 record=recommendation('defend', 0)),       # Fading Hero: 방어
+            Rule('optimize', when=lambda t: (t['roas'] < th_eff_high) & (t['growth_rate'] >= th_growth_high),
+                 record=recommendation('optimize', 20)),    # Rising Potential: 최적화 + 소폭 증액
+            Rule('reduce', when=lambda t: np.ones(len(t), dtype=bool),
+                 record=recommendation('reduce', -20)),     # Problem Child: 감액
+        ], exclusive=True)
+
+        # 세그먼트 유형별 효율(ROAS) 1위 세그먼트 (동률이면 먼저 나온 세그먼트)
+        ranked = table[table['roas'] > 0]
+        top_segments = ranked.loc[ranked.groupby('segment_type', sort=False)['roas'].idxmax()]
+        recommendations = rules.evaluate(top_segments)
 
         # 기대 ROI 기반 정렬 (scale_up > optimize > defend > reduce)
         action_priority = {'scale_up': 0, 'optimize': 1, 'defend': 2, 'reduce': 3}
@@ -1574,6 +1543,7 @@ class InsightGenerator:
 
         self.insights['segments']['recommendations'] = recommendations
         print(f"   Generated {len(recommendations)} segment recommendations")
+        print(f"   Rules: {rules.report()}")
 
         for rec in recommendations:
             print(f"      - {rec['target']['type']}/{rec['target']['value']}: [{rec.get('action_type', 'N/A')}] {rec['action'][:40]}...")
@@ -1666,30 +1636,15 @@ class InsightGenerator:
             print(f"      {line}")
 
     def convert_to_native_types(self, obj):
-        """pandas 타입을 Python 네이티브 타입으로 변환"""
-        if isinstance(obj, dict):
-            return {key: self.convert_to_native_types(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self.convert_to_native_types(item) for item in obj]
-        elif isinstance(obj, (np.int64, np.int32)):
-            return int(obj)
-        elif isinstance(obj, (np.float64, np.float32)):
-            return float(obj)
-        elif pd.isna(obj):
-            return None
-        else:
-            return obj
+        """pandas/numpy 타입을 Python 네이티브 타입으로 변환 (NaN/Inf → None)"""
+        return to_builtin(obj)
 
     def save_insights(self) -> None:
-        """인사이트 저장 (NpEncoder로 안전한 JSON 직렬화) - 클라이언트 모드 지원"""
+        """인사이트 저장 (json_io로 NaN/Inf/numpy 타입 안전 직렬화) - 클라이언트 모드 지원"""
         self.forecast_dir.mkdir(parents=True, exist_ok=True)
         output_file = self.forecast_dir / 'insights.json'
 
-        # pandas 타입을 Python 네이티브 타입으로 변환 후 NpEncoder로 저장
-        insights_converted = self.convert_to_native_types(self.insights)
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(insights_converted, f, cls=NpEncoder, ensure_ascii=False, indent=2)
+        write_json(self.insights, output_file)
 
         print(f"\n   ✅ Saved: {output_file}")
 
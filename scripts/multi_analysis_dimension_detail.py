@@ -10,17 +10,26 @@
 - Type6: 광고세트별 → 플랫폼 성과
 - Type7: 광고세트별 → 기기플랫폼 성과
 
+처리 방식:
+- data_type 기준 1회 정렬 후 타입별 파티션으로 분할
+- 그룹 키는 전체 데이터에서 1회 정수 코드로 인코딩하여 파티션별로 코드 기준 집계
+- ROAS/CPA/CPC는 0 나눗셈 안전 벡터 연산, 7개 CSV는 순차 저장 (대용량이거나 --write-workers 지정 시 병렬)
+- 성별/연령/기기 통합 라벨과 유효 플래그(성별_유효/연령_유효)는 common/normalization의 범주 단위 매핑으로 생성
+- 저장한 테이블로 OLAP 큐브(dimension_cube.pkl, 일/주/월 rollup) 생성
+
 사용법:
 - 레거시: python multi_analysis_dimension_detail.py
 - 멀티클라이언트: python multi_analysis_dimension_detail.py --client clientA
 """
 
 import argparse
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import sys
 import warnings
 warnings.filterwarnings('ignore')
@@ -29,85 +38,19 @@ warnings.filterwarnings('ignore')
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.data_type import (
+    ensure_data_type, DATA_TYPES, TYPE1, TYPE2, TYPE3, TYPE4, TYPE5, TYPE6, TYPE7
+)
+from scripts.common.dimension_cube import DimensionCube, file_signature
+from scripts.common.normalization import (
+    map_categories, apply_gender_mapping, apply_age_mapping, apply_device_mapping, apply_platform_mapping,
+    apply_validity_flags
+)
 
 # 레거시 경로 설정 (기본값)
 BASE_DIR = Path(__file__).parent.parent
 DATA_TYPE_DIR = BASE_DIR / 'data' / 'type'
 
-# ============================================================================
-# 성별/연령 통합 매핑 (data_mapping_guide.md 기준)
-# ============================================================================
-GENDER_MAP = {
-    # 남성 통합
-    'MALE': '남성',
-    'male': '남성',
-    'Male': '남성',
-    '남자': '남성',
-    # 여성 통합
-    'FEMALE': '여성',
-    'female': '여성',
-    'Female': '여성',
-    '여자': '여성',
-    # 알 수 없음 통합
-    'UNDETERMINED': '알 수 없음',
-    'Unknown': '알 수 없음'
-}
-
-AGE_MAP = {
-    # 영문 → 한글 변환
-    'AGE_RANGE_18_24': '19세 ~ 24세',
-    '18-24': '19세 ~ 24세',
-    'AGE_RANGE_25_34': '25세 ~ 34세',
-    '25-34': '25세 ~ 34세',
-    'AGE_RANGE_35_44': '35세 ~ 44세',
-    '35-44': '35세 ~ 44세',
-    'AGE_RANGE_45_54': '45세 ~ 54세',
-    '45-54': '45세 ~ 54세',
-    'AGE_RANGE_55_64': '55세 ~ 64세',
-    '55-64': '55세 ~ 64세',
-    'AGE_RANGE_65_UP': '65세 이상',
-    '65+': '65세 이상',
-    'AGE_RANGE_UNDETERMINED': '알 수 없음',
-    'Unknown': '알 수 없음',
-    # 한글 세부 연령대 → 10세 단위 통합
-    '25세 ~ 29세': '25세 ~ 34세',
-    '30세 ~ 34세': '25세 ~ 34세',
-    '35세 ~ 39세': '35세 ~ 44세',
-    '40세 ~ 44세': '35세 ~ 44세',
-    '45세 ~ 49세': '45세 ~ 54세',
-    '50세 ~ 54세': '45세 ~ 54세',
-    '55세 ~ 59세': '55세 ~ 64세',
-    '60세 ~ 99세': '65세 이상'
-}
-
-# 기기유형 통합 매핑 (data_mapping_guide.md 기준)
-DEVICE_MAP = {
-    # 안드로이드 (Meta)
-    'Android Smartphone': '안드로이드',
-    'Android Tablet': '안드로이드',
-    # 애플 (Meta)
-    'iPhone': '애플',
-    'iPad': '애플',
-    # 모바일 (Google Ads - OS 구분 불가)
-    'Mobile phones': '모바일',
-    'Tablets': '모바일',
-    # 웹/데스크톱
-    'Computers': '웹',
-    'Desktop': '웹',
-    # TV
-    'TV screens': 'TV'
-}
-
-# 기기플랫폼 통합 매핑 (data_mapping_guide.md 기준)
-# 기기유형 '모바일'과 혼동 방지를 위해 'Mobile web' → '모바일웹'으로 명명
-PLATFORM_MAP = {
-    'Mobile app': '앱',
-    'Mobile web': '모바일웹',
-    'Desktop': '웹',
-    'PC': '웹',
-    'pc': '웹'
-}
-
 # 유형구분 통합 매핑 (광고세트 기준 KPI 분류)
 # '광고세트' 컬럼에 '트래픽' 키워드 포함 → 트래픽 (메인 KPI: CPC)
 # 그 외 → 전환 (메인 KPI: ROAS, CPA)
@@ -116,84 +59,277 @@ PLATFORM_MAP = {
 def apply_campaign_type_mapping(df):
     """유형구분 통합 컬럼 추가 (광고세트 기준 트래픽/전환 분류)"""
     if '광고세트' in df.columns:
-        def map_campaign_type(adset_value):
-            if pd.isna(adset_value) or adset_value == '-':
-                return '전환'
-            # 광고세트에 '트래픽' 키워드가 포함된 경우 '트래픽'
-            adset_str = str(adset_value)
-            if '트래픽' in adset_str:
-                return '트래픽'
-            # 그 외는 모두 '전환'
-            return '전환'
-
-        df['유형구분_통합'] = df['광고세트'].apply(map_campaign_type)
+        # 광고세트에 '트래픽' 키워드가 포함된 경우 '트래픽', 그 외(결측/'-' 포함)는 모두 '전환'
+        is_traffic = map_categories(
+            df['광고세트'], lambda values: values.astype(str).str.contains('트래픽', regex=False)
+        )
+        df['유형구분_통합'] = np.where(is_traffic.fillna(False).astype(bool), '트래픽', '전환')
     return df
 
-def apply_gender_mapping(df):
-    """성별 통합 컬럼 추가"""
-    if '성별' in df.columns:
-        df['성별_통합'] = df['성별'].replace(GENDER_MAP)
-        # 매핑되지 않은 값은 원본 유지
-        df['성별_통합'] = df.apply(
-            lambda row: row['성별_통합'] if row['성별_통합'] != row['성별'] or row['성별'] in ['남성', '여성', '알 수 없음', '-'] else row['성별'],
-            axis=1
+
+# ============================================================================
+# 차원 테이블 빌더
+# ============================================================================
+METRIC_COLUMNS = ['비용', '노출', '클릭', '전환수', '전환값']
+# 병렬 저장 기준 행 수 (7개 테이블 합계)
+# spawn 방식(Windows) 프로세스 풀은 워커마다 pandas/스크립트 재import + 테이블 pickle 비용이 있어
+# 약 100만 행 미만에서는 순차 저장이 더 빠름
+PARALLEL_WRITE_MIN_ROWS = 1_000_000
+COMMON_KEYS = ['유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']
+DATE_KEYS = ['월', '주', '일']
+
+
+def print_type2_pivot(table):
+    """광고세트별 연령x성별 ROAS pivot 출력 (상위 5개 광고세트)"""
+    for adset in table['광고세트'].unique()[:5]:
+        adset_data = table[table['광고세트'] == adset]
+
+        # ROAS는 mean이 아닌, 비용/전환값을 각각 sum한 후 재계산
+        adset_agg = adset_data.groupby(['연령', '성별']).agg({
+            '비용': 'sum',
+            '전환값': 'sum'
+        }).reset_index()
+        adset_agg['ROAS'] = np.where(
+            adset_agg['비용'] > 0,
+            (adset_agg['전환값'] / adset_agg['비용']) * 100,
+            0
         )
-    return df
 
-def apply_age_mapping(df):
-    """연령 통합 컬럼 추가"""
-    if '연령' in df.columns:
-        df['연령_통합'] = df['연령'].replace(AGE_MAP)
-        # 매핑되지 않은 값은 원본 유지 (이미 통합 형식인 경우)
-    return df
+        pivot = adset_agg.pivot_table(
+            values='ROAS',
+            index='연령',
+            columns='성별',
+            aggfunc='first',  # 이미 집계된 값이므로 first 사용
+            fill_value=0
+        )
+        print(f"\n[{adset}] 연령x성별 ROAS:")
+        print(pivot.to_string())
+
+
+def print_gender_summary(table):
+    """성별 성과 비교 출력"""
+    print("\n성별 성과 비교:")
+    gender_summary = table.groupby('성별').agg({
+        '비용': 'sum',
+        '전환수': 'sum',
+        '전환값': 'sum'
+    })
+    gender_summary['ROAS'] = (gender_summary['전환값'] / gender_summary['비용'] * 100)
+    print(gender_summary.to_string())
+
+
+def print_platform_summary(table):
+    """기기플랫폼_통합 기준 성과 비교 출력"""
+    print("\n기기플랫폼_통합 성과 비교:")
+    platform_summary = table.groupby('기기플랫폼_통합').agg({
+        '비용': 'sum',
+        '전환수': 'sum',
+        '전환값': 'sum'
+    })
+    platform_summary['ROAS'] = (platform_summary['전환값'] / platform_summary['비용'] * 100)
+    print(platform_summary.to_string())
+
+
+# 타입별 차원 테이블 정의
+# - data_types: 포함할 데이터 타입 (Type3/Type4는 메타_* 유형구분 누락 방지를 위해 Type2 포함)
+# - keys: 그룹 키 (월/주/일 + 차원 + COMMON_KEYS)
+# - mappings: 통합 컬럼 추가 함수
+# - counts: 출력할 고유값 수 (컬럼, 라벨)
+DIMENSION_TABLES = [
+    {
+        'name': 'Type1',
+        'title': 'Type1: 캠페인별 → 광고세트 상세 성과',
+        'file': 'dimension_type1_campaign_adset.csv',
+        'description': '캠페인별 광고세트 성과',
+        'data_types': [TYPE1],
+        'keys': DATE_KEYS + ['캠페인이름', '광고세트'] + COMMON_KEYS,
+        'mappings': [apply_campaign_type_mapping],
+        'counts': [('캠페인이름', '캠페인 수'), ('광고세트', '광고세트 수')],
+    },
+    {
+        'name': 'Type2',
+        'title': 'Type2: 광고세트별 → 연령x성별 PIVOT 성과',
+        'file': 'dimension_type2_adset_age_gender.csv',
+        'description': '광고세트별 연령x성별 성과',
+        'data_types': [TYPE2],
+        'keys': DATE_KEYS + ['광고세트', '연령', '성별'] + COMMON_KEYS,
+        'mappings': [apply_gender_mapping, apply_age_mapping, apply_campaign_type_mapping, apply_validity_flags],
+        'counts': [('광고세트', '광고세트 수'), ('연령', '연령대 수'), ('성별', '성별 수')],
+        'report': print_type2_pivot,
+    },
+    {
+        'name': 'Type3',
+        'title': 'Type3: 광고세트별 → 연령 성과 (Type2 데이터 포함)',
+        'file': 'dimension_type3_adset_age.csv',
+        'description': '광고세트별 연령 성과',
+        'data_types': [TYPE2, TYPE3],
+        'keys': DATE_KEYS + ['광고세트', '연령'] + COMMON_KEYS,
+        'mappings': [apply_age_mapping, apply_campaign_type_mapping, apply_validity_flags],
+        'counts': [('광고세트', '광고세트 수'), ('연령', '연령대 수')],
+    },
+    {
+        'name': 'Type4',
+        'title': 'Type4: 광고세트별 → 성별 성과 (Type2 데이터 포함)',
+        'file': 'dimension_type4_adset_gender.csv',
+        'description': '광고세트별 성별 성과',
+        'data_types': [TYPE2, TYPE4],
+        'keys': DATE_KEYS + ['광고세트', '성별'] + COMMON_KEYS,
+        'mappings': [apply_gender_mapping, apply_campaign_type_mapping, apply_validity_flags],
+        'counts': [('광고세트', '광고세트 수'), ('성별', '성별 수')],
+        'report': print_gender_summary,
+    },
+    {
+        'name': 'Type5',
+        'title': 'Type5: 광고세트별 → 기기유형 성과',
+        'file': 'dimension_type5_adset_device.csv',
+        'description': '광고세트별 기기유형 성과',
+        'data_types': [TYPE5],
+        'keys': DATE_KEYS + ['광고세트', '기기유형'] + COMMON_KEYS,
+        'mappings': [apply_device_mapping, apply_campaign_type_mapping],
+        'counts': [('광고세트', '광고세트 수'), ('기기유형', '기기유형 수'), ('기기유형_통합', '기기유형_통합 수')],
+    },
+    {
+        'name': 'Type6',
+        'title': 'Type6: 광고세트별 → 플랫폼 성과',
+        'file': 'dimension_type6_adset_platform.csv',
+        'description': '광고세트별 플랫폼 성과',
+        'data_types': [TYPE6],
+        'keys': DATE_KEYS + ['광고세트', '플랫폼'] + COMMON_KEYS,
+        'mappings': [apply_campaign_type_mapping],
+        'counts': [('광고세트', '광고세트 수'), ('플랫폼', '플랫폼 수')],
+    },
+    {
+        'name': 'Type7',
+        'title': 'Type7: 광고세트별 → 기기플랫폼 성과',
+        'file': 'dimension_type7_adset_deviceplatform.csv',
+        'description': '광고세트별 기기플랫폼 성과',
+        'data_types': [TYPE7],
+        'keys': DATE_KEYS + ['광고세트', '기기플랫폼'] + COMMON_KEYS,
+        'mappings': [apply_platform_mapping, apply_campaign_type_mapping],
+        'counts': [('광고세트', '광고세트 수'), ('기기플랫폼', '기기플랫폼 수'), ('기기플랫폼_통합', '기기플랫폼_통합 수')],
+        'report': print_platform_summary,
+    },
+]
+
+
+def safe_divide(numerator, denominator, scale: float = 1.0) -> np.ndarray:
+    """0으로 나누는 경우 0을 반환하는 벡터 나눗셈 (numerator / denominator * scale)"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    result = np.zeros(len(numerator), dtype=float)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result * scale
+
+
+def partition_by_data_type(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """data_type 기준으로 1회 정렬하여 타입별 행 위치(원본 순서 유지) 반환"""
+    codes = df['data_type'].cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(DATA_TYPES) + 1))
+    return {label: order[bounds[i]:bounds[i + 1]] for i, label in enumerate(DATA_TYPES)}
+
+
+def encode_keys(df: pd.DataFrame, columns: List[str]) -> Dict[str, Tuple[np.ndarray, pd.Index]]:
+    """
+    그룹 키 컬럼을 정렬된 정수 코드로 1회 인코딩
 
-def apply_device_mapping(df):
-    """기기유형 통합 컬럼 추가"""
-    if '기기유형' in df.columns:
-        df['기기유형_통합'] = df['기기유형'].replace(DEVICE_MAP)
-        # 매핑되지 않은 값은 원본 유지
-    return df
+    코드 순서가 값의 정렬 순서와 같으므로 코드로 그룹/정렬한 결과는 원본 값으로 groupby한 결과와 동일합니다.
+    결측값은 -1로 인코딩되며 groupby와 마찬가지로 집계에서 제외됩니다.
+    """
+    return {column: pd.factorize(df[column], sort=True) for column in columns}
 
-def apply_platform_mapping(df):
-    """기기플랫폼 통합 컬럼 추가"""
-    if '기기플랫폼' in df.columns:
-        df['기기플랫폼_통합'] = df['기기플랫폼'].replace(PLATFORM_MAP)
-        # 매핑되지 않은 값은 원본 유지
-    return df
 
-def classify_data_type_v2(row):
-    """데이터 타입 분류"""
-    has_campaign = row['캠페인이름'] != '-'
-    has_adset = row['광고세트'] != '-'
-    has_age = row['연령'] != '-'
-    has_gender = row['성별'] != '-'
-    has_device_type = row['기기유형'] != '-'
-    has_platform = row['플랫폼'] != '-'
-    has_device_platform = row['기기플랫폼'] != '-'
-
-    if has_campaign and has_adset and not has_age and not has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type1_캠페인+광고세트'
-    if not has_campaign and has_adset and has_age and has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type2_광고세트+연령+성별'
-    if not has_campaign and has_adset and has_age and not has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type3_광고세트+연령'
-    if not has_campaign and has_adset and not has_age and has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type4_광고세트+성별'
-    if not has_campaign and has_adset and not has_age and not has_gender and has_device_type and not has_platform and not has_device_platform:
-        return 'Type5_광고세트+기기유형'
-    if not has_campaign and has_adset and not has_age and not has_gender and not has_device_type and has_platform and not has_device_platform:
-        return 'Type6_광고세트+플랫폼'
-    if not has_campaign and has_adset and not has_age and not has_gender and not has_device_type and not has_platform and has_device_platform:
-        return 'Type7_광고세트+기기플랫폼'
-    return 'Other_미분류'
-
-
-def run_dimension_analysis(paths: Optional[ClientPaths] = None):
+def build_dimension_table(df: pd.DataFrame, positions: np.ndarray, keys: List[str],
+                          encoded: Dict[str, Tuple[np.ndarray, pd.Index]]) -> pd.DataFrame:
+    """
+    한 파티션의 차원 테이블 생성 (정수 코드 groupby + KPI 계산)
+
+    Args:
+        df: 전체 데이터
+        positions: 파티션 행 위치
+        keys: 그룹 키 컬럼
+        encoded: encode_keys() 결과
+    """
+    frame = pd.DataFrame({key: encoded[key][0][positions] for key in keys})
+    for column in METRIC_COLUMNS:
+        frame[column] = df[column].to_numpy()[positions]
+    frame = frame[(frame[keys].to_numpy() >= 0).all(axis=1)]
+
+    grouped = frame.groupby(keys, sort=True)[METRIC_COLUMNS].sum().reset_index()
+
+    table = pd.DataFrame({key: encoded[key][1].take(grouped[key].to_numpy()) for key in keys})
+    for column in METRIC_COLUMNS:
+        table[column] = grouped[column].to_numpy()
+
+    table['ROAS'] = safe_divide(table['전환값'], table['비용'], 100)
+    table['CPA'] = safe_divide(table['비용'], table['전환수'])
+    table['CPC'] = safe_divide(table['비용'], table['클릭'])
+    return table
+
+
+def build_dimension_tables(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Type1~Type7 차원 테이블 일괄 생성
+
+    data_type 정렬 1회 + 그룹 키 인코딩 1회 후 타입별 파티션을 정수 코드로 집계합니다.
+    데이터가 없는 타입은 결과에서 제외됩니다.
+    """
+    partitions = partition_by_data_type(df)
+    key_columns = list(dict.fromkeys(key for spec in DIMENSION_TABLES for key in spec['keys']))
+    encoded = encode_keys(df, key_columns)
+
+    tables = {}
+    for spec in DIMENSION_TABLES:
+        positions = np.sort(np.concatenate([partitions[t] for t in spec['data_types']]))
+        if len(positions) == 0:
+            continue
+
+        table = build_dimension_table(df, positions, spec['keys'], encoded)
+        for mapping in spec['mappings']:
+            table = mapping(table)
+        tables[spec['name']] = table
+    return tables
+
+
+def _write_table(table: pd.DataFrame, path: Path) -> Path:
+    table.to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def write_dimension_tables(tables: Dict[str, pd.DataFrame], output_dir: Path,
+                           max_workers: Optional[int] = None) -> Dict[str, Path]:
+    """
+    차원 테이블 CSV 저장 (utf-8-sig)
+
+    기본은 현재 프로세스에서 순차 저장합니다.
+    max_workers를 지정하거나 전체 행 수가 PARALLEL_WRITE_MIN_ROWS 이상이면
+    프로세스 풀로 병렬 저장합니다 (CSV 직렬화는 GIL을 점유하므로 스레드 대신 프로세스).
+    """
+    files = {spec['name']: output_dir / spec['file'] for spec in DIMENSION_TABLES if spec['name'] in tables}
+    if max_workers is None:
+        total_rows = sum(len(tables[name]) for name in files)
+        max_workers = (os.cpu_count() or 1) if total_rows >= PARALLEL_WRITE_MIN_ROWS else 1
+    workers = min(len(files), max_workers)
+
+    if workers <= 1:
+        for name, path in files.items():
+            _write_table(tables[name], path)
+        return files
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_table, tables[name], path) for name, path in files.items()]
+        for future in futures:
+            future.result()
+    return files
+
+
+def run_dimension_analysis(paths: Optional[ClientPaths] = None, write_workers: Optional[int] = None):
     """
     차원별 상세 분석 실행
 
     Args:
         paths: ClientPaths 객체 (멀티클라이언트 모드) 또는 None (레거시 모드)
+        write_workers: CSV 병렬 저장 프로세스 수 (None이면 행 수 기준 자동: 소규모 순차, 대용량 CPU 수)
     """
     # 경로 설정 (클라이언트 모드 vs 레거시 모드)
     if paths:
@@ -232,283 +368,38 @@ def run_dimension_analysis(paths: Optional[ClientPaths] = None):
     print(f"총 데이터: {len(df):,}행")
 
     # 데이터 타입 분류
-    df['data_type'] = df.apply(classify_data_type_v2, axis=1)
+    df = ensure_data_type(df)
 
     # 출력 디렉토리 생성
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # ============================================================================
-    # Type1: 캠페인별 광고세트 성과 분석
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type1: 캠페인별 → 광고세트 상세 성과")
-    print("=" * 100)
-
-    type1_data = df[df['data_type'] == 'Type1_캠페인+광고세트']
-    if len(type1_data) > 0:
-        type1_analysis = type1_data.groupby(['월', '주', '일', '캠페인이름', '광고세트', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type1_analysis['ROAS'] = (type1_analysis['전환값'] / type1_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type1_analysis['CPA'] = (type1_analysis['비용'] / type1_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type1_analysis['CPC'] = (type1_analysis['비용'] / type1_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 유형구분_통합 컬럼 추가
-        type1_analysis = apply_campaign_type_mapping(type1_analysis)
-
-        output_file = output_dir / 'dimension_type1_campaign_adset.csv'
-        type1_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 캠페인 수: {type1_analysis['캠페인이름'].nunique()}개")
-        print(f"  - 광고세트 수: {type1_analysis['광고세트'].nunique()}개")
-        print(f"  - 총 조합: {len(type1_analysis)}개")
+    # 차원 테이블 생성 (data_type 정렬 1회, 정수 코드 집계) 및 병렬 저장
+    tables = build_dimension_tables(df)
+    files = write_dimension_tables(tables, output_dir, max_workers=write_workers)
 
-    # ============================================================================
-    # Type2: 광고세트별 연령x성별 pivot 성과
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type2: 광고세트별 → 연령x성별 PIVOT 성과")
-    print("=" * 100)
-
-    type2_data = df[df['data_type'] == 'Type2_광고세트+연령+성별']
-    if len(type2_data) > 0:
-        type2_analysis = type2_data.groupby(['월', '주', '일', '광고세트', '연령', '성별', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type2_analysis['ROAS'] = (type2_analysis['전환값'] / type2_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type2_analysis['CPA'] = (type2_analysis['비용'] / type2_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type2_analysis['CPC'] = (type2_analysis['비용'] / type2_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 성별_통합, 연령_통합, 유형구분_통합 컬럼 추가
-        type2_analysis = apply_gender_mapping(type2_analysis)
-        type2_analysis = apply_age_mapping(type2_analysis)
-        type2_analysis = apply_campaign_type_mapping(type2_analysis)
-
-        output_file = output_dir / 'dimension_type2_adset_age_gender.csv'
-        type2_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 광고세트 수: {type2_analysis['광고세트'].nunique()}개")
-        print(f"  - 연령대 수: {type2_analysis['연령'].nunique()}개")
-        print(f"  - 성별 수: {type2_analysis['성별'].nunique()}개")
-        print(f"  - 총 조합: {len(type2_analysis)}개")
-
-        # Pivot 테이블 생성 (광고세트별로)
-        for adset in type2_analysis['광고세트'].unique()[:5]:  # 상위 5개만 출력
-            adset_data = type2_analysis[type2_analysis['광고세트'] == adset]
-
-            # ROAS는 mean이 아닌, 비용/전환값을 각각 sum한 후 재계산
-            adset_agg = adset_data.groupby(['연령', '성별']).agg({
-                '비용': 'sum',
-                '전환값': 'sum'
-            }).reset_index()
-            adset_agg['ROAS'] = np.where(
-                adset_agg['비용'] > 0,
-                (adset_agg['전환값'] / adset_agg['비용']) * 100,
-                0
-            )
-
-            pivot = adset_agg.pivot_table(
-                values='ROAS',
-                index='연령',
-                columns='성별',
-                aggfunc='first',  # 이미 집계된 값이므로 first 사용
-                fill_value=0
-            )
-            print(f"\n[{adset}] 연령x성별 ROAS:")
-            print(pivot.to_string())
-
-    # ============================================================================
-    # Type3: 광고세트별 연령 성과 (Type2 데이터 포함 - 메타_* 유형구분 누락 방지)
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type3: 광고세트별 → 연령 성과 (Type2 데이터 포함)")
-    print("=" * 100)
-
-    # Type3 조건: 연령만 있는 데이터 + Type2 조건(연령+성별 둘 다 있는 데이터)
-    type3_data = df[(df['data_type'] == 'Type3_광고세트+연령') | (df['data_type'] == 'Type2_광고세트+연령+성별')]
-    if len(type3_data) > 0:
-        type3_analysis = type3_data.groupby(['월', '주', '일', '광고세트', '연령', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type3_analysis['ROAS'] = (type3_analysis['전환값'] / type3_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type3_analysis['CPA'] = (type3_analysis['비용'] / type3_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type3_analysis['CPC'] = (type3_analysis['비용'] / type3_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 연령_통합, 유형구분_통합 컬럼 추가
-        type3_analysis = apply_age_mapping(type3_analysis)
-        type3_analysis = apply_campaign_type_mapping(type3_analysis)
-
-        output_file = output_dir / 'dimension_type3_adset_age.csv'
-        type3_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 광고세트 수: {type3_analysis['광고세트'].nunique()}개")
-        print(f"  - 연령대 수: {type3_analysis['연령'].nunique()}개")
-        print(f"  - 총 조합: {len(type3_analysis)}개")
-
-    # ============================================================================
-    # Type4: 광고세트별 성별 성과 (Type2 데이터 포함 - 메타_* 유형구분 누락 방지)
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type4: 광고세트별 → 성별 성과 (Type2 데이터 포함)")
-    print("=" * 100)
-
-    # Type4 조건: 성별만 있는 데이터 + Type2 조건(연령+성별 둘 다 있는 데이터)
-    type4_data = df[(df['data_type'] == 'Type4_광고세트+성별') | (df['data_type'] == 'Type2_광고세트+연령+성별')]
-    if len(type4_data) > 0:
-        type4_analysis = type4_data.groupby(['월', '주', '일', '광고세트', '성별', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type4_analysis['ROAS'] = (type4_analysis['전환값'] / type4_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type4_analysis['CPA'] = (type4_analysis['비용'] / type4_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type4_analysis['CPC'] = (type4_analysis['비용'] / type4_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 성별_통합, 유형구분_통합 컬럼 추가
-        type4_analysis = apply_gender_mapping(type4_analysis)
-        type4_analysis = apply_campaign_type_mapping(type4_analysis)
-
-        output_file = output_dir / 'dimension_type4_adset_gender.csv'
-        type4_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 광고세트 수: {type4_analysis['광고세트'].nunique()}개")
-        print(f"  - 성별 수: {type4_analysis['성별'].nunique()}개")
-        print(f"  - 총 조합: {len(type4_analysis)}개")
+    # OLAP 큐브 생성 (일/주/월 rollup) - generate_type_insights.py 등에서 조회
+    cube = DimensionCube.build(
+        {name.lower(): table for name, table in tables.items()},
+        sources={name.lower(): file_signature(path) for name, path in files.items()}
+    )
+    cube_file = cube.save(output_dir / 'dimension_cube.pkl')
 
-        # 성별 성과 비교
-        print("\n성별 성과 비교:")
-        gender_summary = type4_analysis.groupby('성별').agg({
-            '비용': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        })
-        gender_summary['ROAS'] = (gender_summary['전환값'] / gender_summary['비용'] * 100)
-        print(gender_summary.to_string())
-
-    # ============================================================================
-    # Type5: 광고세트별 기기유형 성과
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type5: 광고세트별 → 기기유형 성과")
-    print("=" * 100)
-
-    type5_data = df[df['data_type'] == 'Type5_광고세트+기기유형']
-    if len(type5_data) > 0:
-        type5_analysis = type5_data.groupby(['월', '주', '일', '광고세트', '기기유형', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type5_analysis['ROAS'] = (type5_analysis['전환값'] / type5_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type5_analysis['CPA'] = (type5_analysis['비용'] / type5_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type5_analysis['CPC'] = (type5_analysis['비용'] / type5_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 기기유형_통합, 유형구분_통합 컬럼 추가
-        type5_analysis = apply_device_mapping(type5_analysis)
-        type5_analysis = apply_campaign_type_mapping(type5_analysis)
-
-        output_file = output_dir / 'dimension_type5_adset_device.csv'
-        type5_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 광고세트 수: {type5_analysis['광고세트'].nunique()}개")
-        print(f"  - 기기유형 수: {type5_analysis['기기유형'].nunique()}개")
-        print(f"  - 기기유형_통합 수: {type5_analysis['기기유형_통합'].nunique()}개")
-        print(f"  - 총 조합: {len(type5_analysis)}개")
-
-    # ============================================================================
-    # Type6: 광고세트별 플랫폼 성과
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type6: 광고세트별 → 플랫폼 성과")
-    print("=" * 100)
-
-    type6_data = df[df['data_type'] == 'Type6_광고세트+플랫폼']
-    if len(type6_data) > 0:
-        type6_analysis = type6_data.groupby(['월', '주', '일', '광고세트', '플랫폼', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type6_analysis['ROAS'] = (type6_analysis['전환값'] / type6_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type6_analysis['CPA'] = (type6_analysis['비용'] / type6_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type6_analysis['CPC'] = (type6_analysis['비용'] / type6_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
+    for spec in DIMENSION_TABLES:
+        print("\n" + "=" * 100)
+        print(spec['title'])
+        print("=" * 100)
 
-        # 유형구분_통합 컬럼 추가
-        type6_analysis = apply_campaign_type_mapping(type6_analysis)
+        table = tables.get(spec['name'])
+        if table is None:
+            continue
 
-        output_file = output_dir / 'dimension_type6_adset_platform.csv'
-        type6_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 광고세트 수: {type6_analysis['광고세트'].nunique()}개")
-        print(f"  - 플랫폼 수: {type6_analysis['플랫폼'].nunique()}개")
-        print(f"  - 총 조합: {len(type6_analysis)}개")
-
-    # ============================================================================
-    # Type7: 광고세트별 기기플랫폼 성과
-    # ============================================================================
-    print("\n" + "=" * 100)
-    print("Type7: 광고세트별 → 기기플랫폼 성과")
-    print("=" * 100)
+        print(f"✓ 저장: {files[spec['name']]}")
+        for column, label in spec['counts']:
+            print(f"  - {label}: {table[column].nunique()}개")
+        print(f"  - 총 조합: {len(table)}개")
 
-    type7_data = df[df['data_type'] == 'Type7_광고세트+기기플랫폼']
-    if len(type7_data) > 0:
-        type7_analysis = type7_data.groupby(['월', '주', '일', '광고세트', '기기플랫폼', '유형구분', '타겟팅', '브랜드명', '상품명', '프로모션']).agg({
-            '비용': 'sum',
-            '노출': 'sum',
-            '클릭': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        }).reset_index()
-
-        type7_analysis['ROAS'] = (type7_analysis['전환값'] / type7_analysis['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
-        type7_analysis['CPA'] = (type7_analysis['비용'] / type7_analysis['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
-        type7_analysis['CPC'] = (type7_analysis['비용'] / type7_analysis['클릭']).replace([np.inf, -np.inf], 0).fillna(0)
-
-        # 기기플랫폼_통합, 유형구분_통합 컬럼 추가
-        type7_analysis = apply_platform_mapping(type7_analysis)
-        type7_analysis = apply_campaign_type_mapping(type7_analysis)
-
-        output_file = output_dir / 'dimension_type7_adset_deviceplatform.csv'
-        type7_analysis.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"✓ 저장: {output_file}")
-        print(f"  - 광고세트 수: {type7_analysis['광고세트'].nunique()}개")
-        print(f"  - 기기플랫폼 수: {type7_analysis['기기플랫폼'].nunique()}개")
-        print(f"  - 기기플랫폼_통합 수: {type7_analysis['기기플랫폼_통합'].nunique()}개")
-        print(f"  - 총 조합: {len(type7_analysis)}개")
-
-        # 기기플랫폼_통합 기준 성과 비교
-        print("\n기기플랫폼_통합 성과 비교:")
-        platform_summary = type7_analysis.groupby('기기플랫폼_통합').agg({
-            '비용': 'sum',
-            '전환수': 'sum',
-            '전환값': 'sum'
-        })
-        platform_summary['ROAS'] = (platform_summary['전환값'] / platform_summary['비용'] * 100)
-        print(platform_summary.to_string())
+        if 'report' in spec:
+            spec['report'](table)
 
     print("\n" + "=" * 100)
     print("차원별 상세 분석 완료!")
@@ -516,13 +407,9 @@ def run_dimension_analysis(paths: Optional[ClientPaths] = None):
         print(f"클라이언트: {paths.client_id}")
     print("=" * 100)
     print(f"\n생성된 파일 ({output_dir} 디렉토리):")
-    print(f"  1. dimension_type1_campaign_adset.csv - 캠페인별 광고세트 성과")
-    print(f"  2. dimension_type2_adset_age_gender.csv - 광고세트별 연령x성별 성과")
-    print(f"  3. dimension_type3_adset_age.csv - 광고세트별 연령 성과")
-    print(f"  4. dimension_type4_adset_gender.csv - 광고세트별 성별 성과")
-    print(f"  5. dimension_type5_adset_device.csv - 광고세트별 기기유형 성과")
-    print(f"  6. dimension_type6_adset_platform.csv - 광고세트별 플랫폼 성과")
-    print(f"  7. dimension_type7_adset_deviceplatform.csv - 광고세트별 기기플랫폼 성과")
+    for idx, spec in enumerate(DIMENSION_TABLES, 1):
+        print(f"  {idx}. {spec['file']} - {spec['description']}")
+    print(f"  + {cube_file.name} - 차원 OLAP 큐브 ({len(cube.cuboids)}개 큐보이드)")
 
 
 def main(client_id: Optional[str] = None):
@@ -530,6 +417,8 @@ def main(client_id: Optional[str] = None):
     parser = argparse.ArgumentParser(description='차원별 상세 분석 스크립트')
     parser.add_argument('--client', type=str, default=None,
                         help='클라이언트 ID (멀티클라이언트 모드)')
+    parser.add_argument('--write-workers', type=int, default=None,
+                        help='CSV 병렬 저장 프로세스 수 (기본: 순차 저장, 합계 100만 행 이상이면 CPU 수)')
     args = parser.parse_args()
 
     actual_client_id = args.client or client_id
@@ -541,7 +430,7 @@ def main(client_id: Optional[str] = None):
         print(f"[멀티클라이언트 모드] 클라이언트: {actual_client_id}")
 
     try:
-        run_dimension_analysis(paths)
+        run_dimension_analysis(paths, write_workers=args.write_workers)
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
         import traceback
@@ -0,0 +1,539 @@
+"""
+글로벌 교차 시리즈 예측 - 광고세트 x 차원(연령/성별/기기/플랫폼) 단위
+
+- multi_analysis_dimension_detail.py가 생성한 Type1~Type7 차원 파일의 모든 시리즈를 대상으로 예측
+- 시리즈별 Prophet 대신 전체 시리즈를 한 번에 학습하는 단일 글로벌 모델 (HistGradientBoostingRegressor)
+  · 지표(비용, 노출, 클릭, 전환수, 전환값)도 범주형 특성으로 포함해 fit 1회
+  · 예측은 전체 시리즈 x 향후 N일을 한 번의 predict로 계산
+- 특성: 최근값/같은 요일 값/7·28일 평균/최근 28일 활동일 비율(lag), 예측일 요일·일·월(calendar),
+  차원 Type/광고세트/차원값 코드(categorical)
+- 학습 표본: 최근 구간에서 주 단위로 과거 기준일을 잡아 1~N일 뒤 실제값을 맞추도록 구성 (direct multi-horizon)
+
+출력 (prophet_forecast_by_* 와 동일한 long format: 키, 일자, 예측_*, type, model='global_gbm'):
+- prophet_forecast_by_adset.csv           - 캠페인 x 광고세트
+- prophet_forecast_by_{차원}.csv          - 광고세트 예측을 차원값별로 합산 (bottom-up)
+  (gender, age, age_gender, device, platform, deviceplatform, promotion)
+- prophet_forecast_by_adset_{차원}.csv    - 광고세트 x 차원값 시리즈별 예측 (최근 활동 시리즈만)
+
+사용법:
+- 레거시: python multi_analysis_global_forecast.py
+- 멀티클라이언트: python multi_analysis_global_forecast.py --client clientA
+- 옵션: --days 365 --output-days 30 --max-train-rows 2000000
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings('ignore')
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.common.paths import ClientPaths
+from scripts.common.forecast_store import ForecastStore, publish_forecast
+
+# scikit-learn 가용성 체크
+try:
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    print("scikit-learn이 설치되지 않았습니다.")
+    print("설치 방법: pip install scikit-learn>=1.3.0")
+
+# 레거시 경로 설정 (기본값)
+BASE_DIR = Path(__file__).parent.parent
+DATA_TYPE_DIR = BASE_DIR / 'data' / 'type'
+
+# 예측 대상 지표 목록 (multi_analysis_prophet_forecast.py와 동일)
+FORECAST_METRICS = ['비용', '노출', '클릭', '전환수', '전환값']
+
+# 출력 model 컬럼 값
+GLOBAL_MODEL_NAME = 'global_gbm'
+
+# 학습 설정
+TRAIN_ORIGINS = 12          # 과거 기준일 수 (주 단위)
+ORIGIN_STEP_DAYS = 7        # 기준일 간격
+MIN_HISTORY_DAYS = 7        # 기준일 이전 최소 이력 일수
+ACTIVE_DAYS = 28            # 시리즈별 출력 대상: 최근 N일 내 비용/노출 발생
+DEFAULT_MAX_TRAIN_ROWS = 2_000_000
+MAX_TARGET_RATIO = 10.0     # 목표값 비율(실제/28일 평균) 상한 - 간헐적 대형 전환값에 의한 과대 예측 방지
+MAX_CATEGORY_CODES = 254    # HistGradientBoosting 범주형 특성 최대 범주 수 (max_bins 255 - 기타 1)
+
+# 차원 파일별 시리즈 정의
+# - series: 시리즈 키 (광고세트 포함)
+# - output: 합산 출력 키 (prophet_forecast_by_{name}.csv)
+DIMENSION_SPECS = [
+    {'name': 'adset', 'file': 'dimension_type1_campaign_adset.csv',
+     'series': ['캠페인이름', '광고세트'], 'output': ['캠페인이름', '광고세트']},
+    {'name': 'promotion', 'file': 'dimension_type1_campaign_adset.csv',
+     'series': ['광고세트', '프로모션'], 'output': ['프로모션']},
+    {'name': 'age_gender', 'file': 'dimension_type2_adset_age_gender.csv',
+     'series': ['광고세트', '연령_통합', '성별_통합'], 'output': ['연령_통합', '성별_통합']},
+    {'name': 'age', 'file': 'dimension_type3_adset_age.csv',
+     'series': ['광고세트', '연령_통합'], 'output': ['연령_통합']},
+    {'name': 'gender', 'file': 'dimension_type4_adset_gender.csv',
+     'series': ['광고세트', '성별_통합'], 'output': ['성별_통합']},
+    {'name': 'device', 'file': 'dimension_type5_adset_device.csv',
+     'series': ['광고세트', '기기유형_통합'], 'output': ['기기유형_통합']},
+    {'name': 'platform', 'file': 'dimension_type6_adset_platform.csv',
+     'series': ['광고세트', '플랫폼'], 'output': ['플랫폼']},
+    {'name': 'deviceplatform', 'file': 'dimension_type7_adset_deviceplatform.csv',
+     'series': ['광고세트', '기기플랫폼_통합'], 'output': ['기기플랫폼_통합']},
+]
+
+# 특성 컬럼 (앞 4개는 범주형)
+CATEGORICAL_FEATURES = ['metric', 'dimension', 'adset', 'value']
+FEATURE_COLUMNS = CATEGORICAL_FEATURES + [
+    'horizon', 'dow', 'day', 'month', 'age_days',
+    'last', 'same_weekday', 'mean7', 'mean28', 'active28',
+    'cost_mean7', 'cost_mean28', 'impressions_mean28', 'clicks_mean28',
+]
+
+
+@dataclass
+class SeriesPanel:
+    """전체 시리즈를 같은 날짜 축에 정렬한 패널"""
+    dates: pd.DatetimeIndex
+    values: np.ndarray                  # (지표, 시리즈, 일) - 시리즈 시작 전은 NaN, 이후 미집행일은 0
+    first: np.ndarray                   # 시리즈별 첫 데이터 일 인덱스
+    codes: Dict[str, np.ndarray]        # 범주형 코드 (dimension, adset, value)
+    series: List[Dict] = field(default_factory=list)  # [{'spec', 'table', 'start', 'stop'}]
+
+    @property
+    def n_series(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def n_days(self) -> int:
+        return self.values.shape[2]
+
+
+def _category_codes(values: pd.Series) -> np.ndarray:
+    """빈도순 범주 코드 (상위 MAX_CATEGORY_CODES개 외에는 기타 코드로 묶음)"""
+    counts = values.value_counts()
+    mapping = {v: i for i, v in enumerate(counts.index[:MAX_CATEGORY_CODES])}
+    return values.map(mapping).fillna(MAX_CATEGORY_CODES).to_numpy(dtype=np.int32)
+
+
+def load_dimension_frames(data_dir: Path) -> List[tuple]:
+    """차원 파일 로드 (스펙별 (spec, DataFrame))"""
+    cache = {}
+    frames = []
+
+    for spec in DIMENSION_SPECS:
+        file_path = data_dir / spec['file']
+        if not file_path.exists():
+            print(f"  [건너뜀] {spec['file']} 없음")
+            continue
+
+        if spec['file'] not in cache:
+            df = pd.read_csv(file_path, encoding='utf-8-sig', low_memory=False)
+            df['일'] = pd.to_datetime(df['일'], errors='coerce')
+            df = df.dropna(subset=['일'])
+            for metric in FORECAST_METRICS:
+                if metric in df.columns:
+                    df[metric] = pd.to_numeric(df[metric], errors='coerce').fillna(0)
+                else:
+                    df[metric] = 0.0
+            cache[spec['file']] = df
+        df = cache[spec['file']]
+
+        missing = [c for c in spec['series'] if c not in df.columns]
+        if missing:
+            print(f"  [건너뜀] {spec['name']}: 컬럼 없음 ({', '.join(missing)})")
+            continue
+
+        frames.append((spec, df))
+        print(f"  ✓ {spec['name']}: {spec['file']} ({len(df):,}행)")
+
+    return frames
+
+
+def build_panel(frames: List[tuple], training_days: int) -> Optional[SeriesPanel]:
+    """차원 파일들을 (지표, 시리즈, 일) 패널로 변환"""
+    end = max(df['일'].max() for _, df in frames)
+    start = end - pd.Timedelta(days=training_days - 1)
+    dates = pd.date_range(start=start, end=end, freq='D')
+
+    blocks, firsts, series = [], [], []
+    dimension_codes, adset_values, value_values = [], [], []
+    offset = 0
+
+    for dim_idx, (spec, df) in enumerate(frames):
+        keys = spec['series']
+        window = df[df['일'] >= start]
+        if window.empty:
+            continue
+
+        window = window[keys + ['일'] + FORECAST_METRICS].copy()
+        window[keys] = window[keys].fillna('-').astype(str)
+        daily = window.groupby(keys + ['일'], sort=False)[FORECAST_METRICS].sum().reset_index()
+
+        series_id = daily.groupby(keys, sort=True).ngroup().to_numpy()
+        table = daily[keys].drop_duplicates().sort_values(keys).reset_index(drop=True)
+        day_idx = (daily['일'] - start).dt.days.to_numpy()
+        n_series = len(table)
+
+        block = np.full((len(FORECAST_METRICS), n_series, len(dates)), np.nan)
+        block[:, series_id, day_idx] = daily[FORECAST_METRICS].to_numpy(dtype=float).T
+
+        # 첫 데이터 이후 미집행일은 0
+        first = np.full(n_series, len(dates))
+        np.minimum.at(first, series_id, day_idx)
+        started = np.arange(len(dates))[None, :] >= first[:, None]
+        block[:, started & np.isnan(block[0])] = 0.0
+
+        blocks.append(block)
+        firsts.append(first)
+        series.append({'spec': spec, 'table': table, 'start': offset, 'stop': offset + n_series})
+        offset += n_series
+
+        value_keys = [k for k in keys if k != '광고세트']
+        dimension_codes.append(np.full(n_series, dim_idx, dtype=np.int32))
+        adset_values.append(table['광고세트'])
+        value_values.append(spec['name'] + '=' + table[value_keys].agg('|'.join, axis=1))
+
+    if not blocks:
+        return None
+
+    return SeriesPanel(
+        dates=dates,
+        values=np.concatenate(blocks, axis=1),
+        first=np.concatenate(firsts),
+        codes={
+            'dimension': np.concatenate(dimension_codes),
+            'adset': _category_codes(pd.concat(adset_values, ignore_index=True)),
+            'value': _category_codes(pd.concat(value_values, ignore_index=True)),
+        },
+        series=series,
+    )
+
+
+def active_series(panel: SeriesPanel, t: int) -> np.ndarray:
+    """기준일 t까지 최근 ACTIVE_DAYS일 내 비용 또는 노출이 발생한 시리즈 (휴면 시리즈는 0으로 예측)"""
+    lo = max(0, t + 1 - ACTIVE_DAYS)
+    return np.nan_to_num(panel.values[:2, :, lo:t + 1]).sum(axis=(0, 2)) > 0
+
+
+class _WindowStats:
+    """누적합 기반 이동 평균/활동일 비율 (기준일별 O(1) 조회)"""
+
+    def __init__(self, values: np.ndarray):
+        observed = ~np.isnan(values)
+        pad = np.zeros(values.shape[:-1] + (1,))
+        self.total = np.concatenate([pad, np.nancumsum(values, axis=-1)], axis=-1)
+        self.count = np.concatenate([pad, np.cumsum(observed, axis=-1)], axis=-1)
+        self.active = np.concatenate([pad, np.cumsum(np.nan_to_num(values) > 0, axis=-1)], axis=-1)
+
+    def mean(self, t: int, window: int) -> np.ndarray:
+        lo = max(0, t + 1 - window)
+        count = self.count[..., t + 1] - self.count[..., lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, (self.total[..., t + 1] - self.total[..., lo]) / count, np.nan)
+
+    def active_ratio(self, t: int, window: int) -> np.ndarray:
+        lo = max(0, t + 1 - window)
+        count = self.count[..., t + 1] - self.count[..., lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, (self.active[..., t + 1] - self.active[..., lo]) / count, np.nan)
+
+
+def build_features(panel: SeriesPanel, stats: _WindowStats, t: int, horizon: int,
+                   with_target: bool = True):
+    """
+    기준일 t(마지막 관측일 인덱스)에서 1~horizon일 뒤를 맞추는 특성 행렬
+
+    목표값은 시리즈별 최근 28일 평균(scale)으로 나눈 비율이며, 예측값 x scale이 실제 단위입니다.
+    (소규모 시리즈의 비율 폭주를 막기 위해 scale은 같은 기준일 활동 시리즈 28일 평균의 중앙값 이상,
+    비율은 MAX_TARGET_RATIO 이하로 제한)
+
+    Returns:
+        (X, y, scale, series_idx, horizons, metric_idx) - 행 순서: 지표 > 시리즈 > horizon
+        y는 with_target=False면 None
+    """
+    horizons = np.arange(1, horizon + 1)
+    series_idx = np.flatnonzero(active_series(panel, t))
+    s_rep = np.repeat(series_idx, horizon)
+    h_rep = np.tile(horizons, len(series_idx))
+    n_rows = len(s_rep)
+
+    target_dates = panel.dates[t] + pd.to_timedelta(h_rep, unit='D')
+    # 같은 요일의 가장 최근 관측일 (t-6 ~ t)
+    same_weekday_idx = t + h_rep - 7 * np.ceil(h_rep / 7).astype(int)
+
+    raw_mean28 = np.nan_to_num(stats.mean(t, 28))
+    mean7 = np.log1p(stats.mean(t, 7))
+    mean28 = np.log1p(raw_mean28)
+    active28 = stats.active_ratio(t, 28)
+
+    shared = {
+        'dimension': panel.codes['dimension'][s_rep],
+        'adset': panel.codes['adset'][s_rep],
+        'value': panel.codes['value'][s_rep],
+        'horizon': h_rep,
+        'dow': target_dates.dayofweek.to_numpy(),
+        'day': target_dates.day.to_numpy(),
+        'month': target_dates.month.to_numpy(),
+        'age_days': t - panel.first[s_rep],
+        'cost_mean7': mean7[0, s_rep],
+        'cost_mean28': mean28[0, s_rep],
+        'impressions_mean28': mean28[1, s_rep],
+        'clicks_mean28': mean28[2, s_rep],
+    }
+
+    X = np.empty((len(FORECAST_METRICS) * n_rows, len(FEATURE_COLUMNS)), dtype=np.float32)
+    y = np.empty(len(FORECAST_METRICS) * n_rows) if with_target else None
+    scale = np.empty(len(FORECAST_METRICS) * n_rows)
+
+    for m in range(len(FORECAST_METRICS)):
+        values = panel.values[m]
+        columns = {
+            **shared,
+            'metric': np.full(n_rows, m),
+            'last': np.log1p(values[s_rep, t]),
+            'same_weekday': np.log1p(values[s_rep, same_weekday_idx]),
+            'mean7': mean7[m, s_rep],
+            'mean28': mean28[m, s_rep],
+            'active28': active28[m, s_rep],
+        }
+        rows = slice(m * n_rows, (m + 1) * n_rows)
+        X[rows] = np.column_stack([columns[c] for c in FEATURE_COLUMNS])
+
+        series_scale = raw_mean28[m, series_idx]
+        positive = series_scale[series_scale > 0]
+        floor = float(np.median(positive)) if len(positive) else 1.0
+        scale[rows] = np.repeat(np.maximum(series_scale, floor), horizon)
+        if with_target:
+            y[rows] = np.minimum(values[s_rep, t + h_rep] / scale[rows], MAX_TARGET_RATIO)
+
+    metric_idx = np.repeat(np.arange(len(FORECAST_METRICS)), n_rows)
+    return X, y, scale, series_idx, horizons, metric_idx
+
+
+def train_global_model(panel: SeriesPanel, stats: _WindowStats, horizon: int,
+                       max_train_rows: int = DEFAULT_MAX_TRAIN_ROWS):
+    """과거 기준일들에서 표본을 만들어 글로벌 모델 1회 학습"""
+    last_origin = panel.n_days - 1 - horizon
+    origins = [t for t in range(last_origin, -1, -ORIGIN_STEP_DAYS)[:TRAIN_ORIGINS]
+               if t >= MIN_HISTORY_DAYS - 1]
+    if not origins:
+        print(f"  [오류] 학습 기간 부족: 최소 {horizon + MIN_HISTORY_DAYS}일 필요 (현재 {panel.n_days}일)")
+        return None
+
+    X_parts, y_parts = [], []
+    for t in origins:
+        X, y, _, _, _, _ = build_features(panel, stats, t, horizon)
+        X_parts.append(X)
+        y_parts.append(y)
+    X = np.concatenate(X_parts)
+    y = np.concatenate(y_parts)
+
+    if len(y) > max_train_rows:
+        rng = np.random.default_rng(42)
+        sample = rng.choice(len(y), size=max_train_rows, replace=False)
+        X, y = X[sample], y[sample]
+
+    print(f"  학습 표본: {len(y):,}행 (기준일 {len(origins)}개: "
+          f"{panel.dates[origins[-1]].date()} ~ {panel.dates[origins[0]].date()})")
+
+    model = HistGradientBoostingRegressor(
+        loss='squared_error',
+        learning_rate=0.08,
+        max_iter=300,
+        max_leaf_nodes=31,
+        min_samples_leaf=40,
+        l2_regularization=1.0,
+        categorical_features=list(range(len(CATEGORICAL_FEATURES))),
+        random_state=42,
+    )
+    start = time.perf_counter()
+    model.fit(X, y)
+    print(f"  학습 완료: {time.perf_counter() - start:.1f}초 (반복 {model.n_iter_}회)")
+    return model
+
+
+def _add_kpis(df: pd.DataFrame) -> pd.DataFrame:
+    """예측 ROAS, CPA, CPC 계산 (multi_analysis_prophet_forecast.py와 동일 정의)"""
+    cost = df['예측_비용']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        df['예측_ROAS'] = np.where(cost > 0, df['예측_전환값'] / cost * 100, 0.0)
+        df['예측_CPA'] = np.where(df['예측_전환수'] > 0, cost / df['예측_전환수'], 0.0)
+        df['예측_CPC'] = np.where(df['예측_클릭'] > 0, cost / df['예측_클릭'], 0.0)
+    return df
+
+
+def _long_frame(table: pd.DataFrame, series_rows: np.ndarray, dates: pd.DatetimeIndex,
+                values: np.ndarray, row_type: str) -> pd.DataFrame:
+    """(지표, 시리즈, 일) 값을 키, 일자, 예측_* long format으로 변환"""
+    n_days = len(dates)
+    frame = table.iloc[np.repeat(series_rows, n_days)].reset_index(drop=True)
+    frame['일자'] = np.tile(dates.strftime('%Y-%m-%d'), len(series_rows))
+    for m, metric in enumerate(FORECAST_METRICS):
+        frame[f'예측_{metric}'] = values[m].reshape(-1)
+    frame['type'] = row_type
+    return frame
+
+
+def _output_columns(keys: List[str]) -> List[str]:
+    return keys + ['일자'] + [f'예측_{m}' for m in FORECAST_METRICS] + \
+        ['예측_ROAS', '예측_CPA', '예측_CPC', 'type', 'model']
+
+
+def write_outputs(panel: SeriesPanel, forecast: np.ndarray, output_days: int, data_dir: Path,
+                  store: ForecastStore) -> List[Path]:
+    """스펙별 시리즈/합산 예측 저장 (통합 예측 저장소 + 기존 CSV)"""
+    end = panel.dates[-1]
+    actual_dates = panel.dates[-output_days:]
+    forecast_dates = pd.date_range(start=end + pd.Timedelta(days=1), periods=forecast.shape[2], freq='D')
+    actual_values = np.nan_to_num(panel.values[:, :, -output_days:])
+    active = active_series(panel, panel.n_days - 1)
+
+    written = []
+    for entry in panel.series:
+        spec, table = entry['spec'], entry['table']
+        block = slice(entry['start'], entry['stop'])
+        rows = np.arange(len(table))
+
+        combined = pd.concat([
+            _long_frame(table, rows, actual_dates, actual_values[:, block], 'actual'),
+            _long_frame(table, rows, forecast_dates, forecast[:, block], 'forecast'),
+        ], ignore_index=True)
+        combined['model'] = np.where(combined['type'] == 'actual', 'actual', GLOBAL_MODEL_NAME)
+
+        # 차원값별 합산 (bottom-up)
+        output_keys = spec['output']
+        metric_cols = [f'예측_{m}' for m in FORECAST_METRICS]
+        summed = combined.groupby(output_keys + ['일자', 'type', 'model'], sort=False)[metric_cols] \
+            .sum().reset_index()
+        summed = _add_kpis(summed).sort_values(output_keys + ['type', '일자'])
+        output_path = data_dir / f"prophet_forecast_by_{spec['name']}.csv"
+        publish_forecast(summed[_output_columns(output_keys)], store, 'global', spec['name'],
+                         key_columns=output_keys, legacy_path=output_path)
+        written.append(output_path)
+
+        # 광고세트 x 차원값 시리즈별 예측 (최근 활동 시리즈만)
+        if spec['series'] != output_keys:
+            series_active = active[block]
+            mask = np.concatenate([np.repeat(series_active, len(actual_dates)),
+                                   np.repeat(series_active, len(forecast_dates))])
+            detail = _add_kpis(combined[mask].copy())
+            detail_path = data_dir / f"prophet_forecast_by_adset_{spec['name']}.csv"
+            publish_forecast(detail[_output_columns(spec['series'])], store, 'global', f"adset_{spec['name']}",
+                             key_columns=spec['series'], legacy_path=detail_path)
+            written.append(detail_path)
+
+        print(f"  ✓ {spec['name']}: 시리즈 {len(table):,}개 (최근 {ACTIVE_DAYS}일 활동 "
+              f"{int(active[block].sum()):,}개), 향후 {forecast.shape[2]}일 예상 전환값 "
+              f"{forecast[4, block].sum():,.0f}원")
+
+    return written
+
+
+def run_global_forecast(paths: Optional[ClientPaths] = None, training_days: int = 365, output_days: int = 30,
+                        max_train_rows: int = DEFAULT_MAX_TRAIN_ROWS):
+    """
+    글로벌 교차 시리즈 예측 실행
+
+    Args:
+        paths: ClientPaths 객체 (멀티클라이언트 모드) 또는 None (레거시 모드)
+        training_days: 학습 데이터 기간 (일)
+        output_days: 예측 기간 (일)
+        max_train_rows: 학습 표본 최대 행 수 (초과 시 무작위 추출)
+    """
+    if not SKLEARN_AVAILABLE:
+        print("\n❌ scikit-learn이 없어 글로벌 예측을 건너뜁니다.")
+        return None
+
+    data_dir = paths.type if paths else DATA_TYPE_DIR
+
+    print("=" * 100)
+    print("글로벌 교차 시리즈 예측 (광고세트 x 차원)")
+    print("=" * 100)
+    if paths:
+        print(f"클라이언트: {paths.client_id}")
+
+    print("\n[1] 차원 파일 로드")
+    frames = load_dimension_frames(data_dir)
+    if not frames:
+        print("\n❌ 오류: 차원 파일이 없습니다. multi_analysis_dimension_detail.py를 먼저 실행하세요.")
+        return None
+
+    panel = build_panel(frames, training_days)
+    if panel is None:
+        print("\n❌ 오류: 학습 기간 내 데이터가 없습니다.")
+        return None
+    print(f"  패널: 시리즈 {panel.n_series:,}개 x {panel.n_days}일 "
+          f"({panel.dates[0].date()} ~ {panel.dates[-1].date()})")
+
+    print("\n[2] 글로벌 모델 학습")
+    stats = _WindowStats(panel.values)
+    model = train_global_model(panel, stats, output_days, max_train_rows)
+    if model is None:
+        return None
+
+    print("\n[3] 전체 시리즈 예측")
+    start = time.perf_counter()
+    X, _, scale, series_idx, horizons, metric_idx = build_features(
+        panel, stats, panel.n_days - 1, output_days, with_target=False
+    )
+    predicted = np.clip(model.predict(X) * scale, 0, None)
+    forecast = np.zeros((len(FORECAST_METRICS), panel.n_series, output_days))
+    forecast[metric_idx, np.tile(np.repeat(series_idx, output_days), len(FORECAST_METRICS)),
+             np.tile(horizons - 1, len(FORECAST_METRICS) * len(series_idx))] = predicted
+    print(f"  predict 1회: {len(X):,}행, {time.perf_counter() - start:.2f}초")
+
+    print("\n[4] 결과 저장")
+    written = write_outputs(panel, forecast, output_days, data_dir, ForecastStore.for_paths(paths))
+
+    print("\n" + "=" * 100)
+    print("분석 완료")
+    print("=" * 100)
+    print(f"\n생성된 파일 ({len(written)}개, model='{GLOBAL_MODEL_NAME}'):")
+    for path in written:
+        print(f"  - {path.name}")
+
+    return written
+
+
+def main(client_id: Optional[str] = None):
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='글로벌 교차 시리즈 예측 (광고세트 x 차원)')
+    parser.add_argument('--client', type=str, default=None,
+                        help='클라이언트 ID (멀티클라이언트 모드)')
+    parser.add_argument('--days', type=int, default=0,
+                        help='학습 데이터 기간 (0=전체/365일, 180=최근180일, 90=최근90일)')
+    parser.add_argument('--output-days', type=int, default=30,
+                        help='예측 기간 (기본 30일)')
+    parser.add_argument('--max-train-rows', type=int, default=DEFAULT_MAX_TRAIN_ROWS,
+                        help=f'학습 표본 최대 행 수 (기본 {DEFAULT_MAX_TRAIN_ROWS:,})')
+    args = parser.parse_args()
+
+    actual_client_id = args.client or client_id
+
+    training_days = args.days if args.days > 0 else 365
+
+    paths = None
+    if actual_client_id:
+        paths = ClientPaths(actual_client_id).ensure_dirs()
+        print(f"[멀티클라이언트 모드] 클라이언트: {actual_client_id}")
+
+    try:
+        run_global_forecast(paths, training_days=training_days, output_days=args.output_days,
+                            max_train_rows=args.max_train_rows)
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
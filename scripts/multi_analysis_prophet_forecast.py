@@ -29,10 +29,19 @@ warnings.filterwarnings('ignore')
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.data_type import ensure_data_type, TYPE1
+from scripts.common.daily_aggregates import DailyAggregates
+from scripts.common.time_window import last_days
+from scripts.common.forecast_profile import POINT, enable_profile_calibration, fit_and_predict, print_profile_report
+from scripts.common.fit_budget import (
+    FitBudget, load_budget_settings, weighted_ma_forecast, TIMEOUT_FALLBACK_MODEL
+)
+from scripts.common.drift_gate import DriftGate
+from scripts.common.forecast_store import ForecastStore, publish_forecast
 
 # Prophet 가용성 체크
 try:
-    from prophet import Prophet
+    import prophet  # noqa: F401
     PROPHET_AVAILABLE = True
 except ImportError:
     PROPHET_AVAILABLE = False
@@ -46,20 +55,25 @@ DATA_TYPE_DIR = BASE_DIR / 'data' / 'type'
 # 예측 대상 지표 목록
 FORECAST_METRICS = ['비용', '노출', '클릭', '전환수', '전환값']
 
+# 예측 프로파일 - combine_metric_forecasts는 yhat만 사용 (신뢰구간 미사용)
+FORECAST_PROFILE = POINT
 
-def forecast_multiple_metrics(daily_data, metrics=FORECAST_METRICS, periods=30, training_days=365):
+
+def forecast_multiple_metrics(daily_data, metrics=FORECAST_METRICS, periods=30, training_days=365,
+                              profile=FORECAST_PROFILE, budget: Optional[FitBudget] = None, label='default',
+                              gate: Optional[DriftGate] = None, key=None):
     """
     여러 지표를 동시에 예측하는 함수 (최근 training_days일 데이터 사용)
+
+    profile이 신뢰구간을 포함하는 경우에만 yhat_lower/yhat_upper 컬럼이 생성됩니다.
+    budget이 주어지면 시간 예산 내에서 학습하며, 초과 시 가중 이동평균으로 대체합니다
+    (model 컬럼: 'prophet' 또는 'timeout_fallback').
+    gate가 주어지면 이전 예측이 허용 오차 이내인 지표는 재학습 없이 재사용합니다.
     """
     forecasts = {}
 
     # 최근 training_days일 데이터만 필터링
-    if '일' in daily_data.columns:
-        max_date = daily_data['일'].max()
-        cutoff_date = max_date - pd.Timedelta(days=training_days)
-        filtered_data = daily_data[daily_data['일'] >= cutoff_date].copy()
-    else:
-        filtered_data = daily_data.copy()
+    filtered_data = last_days(daily_data, training_days, '일')
 
     for metric in metrics:
         if metric not in filtered_data.columns:
@@ -72,26 +86,53 @@ def forecast_multiple_metrics(daily_data, metrics=FORECAST_METRICS, periods=30,
         if len(prophet_df) < 10:
             continue
 
+        gate_key = f"{label}|{key or '전체'}|{metric}"
+        if gate is not None:
+            # 게이트에는 학습에 쓰는 시리즈(y > 0)를 그대로 전달 → 재사용 기준일 = 예측 시작 전날
+            reused = gate.reuse(gate_key, prophet_df['ds'], prophet_df['y'], periods)
+            if reused is not None:
+                forecast_result = reused[[c for c in ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+                                          if c in reused.columns]].copy()
+                forecast_result['yhat'] = forecast_result['yhat'].clip(lower=0)
+                forecast_result['model'] = 'prophet'
+                forecasts[metric] = forecast_result
+                continue
+
         # 데이터 기간 확인하여 연간 계절성 자동 설정
         data_days = (prophet_df['ds'].max() - prophet_df['ds'].min()).days
         use_yearly = data_days >= 365
 
-        model = Prophet(
+        prophet_kwargs = dict(
             yearly_seasonality=use_yearly,
             weekly_seasonality=True,
             daily_seasonality=False,
             changepoint_prior_scale=0.05,
         )
 
-        model.fit(prophet_df)
-        future = model.make_future_dataframe(periods=periods)
-        forecast = model.predict(future)
+        if budget is not None:
+            forecast = budget.forecast(prophet_df, profile, periods, label=label, **prophet_kwargs)
+        else:
+            forecast = fit_and_predict(prophet_df, profile, periods, **prophet_kwargs)
+
+        if forecast is None:
+            fallback = weighted_ma_forecast(filtered_data[metric].values, filtered_data['일'].max(), periods)
+            forecasts[metric] = pd.DataFrame({
+                'ds': fallback.index,
+                'yhat': fallback.values,
+                'model': TIMEOUT_FALLBACK_MODEL
+            })
+            continue
 
         # 음수 값을 0으로 클리핑
-        forecast_result = forecast.tail(periods)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
-        forecast_result['yhat'] = forecast_result['yhat'].clip(lower=0)
-        forecast_result['yhat_lower'] = forecast_result['yhat_lower'].clip(lower=0)
-        forecast_result['yhat_upper'] = forecast_result['yhat_upper'].clip(lower=0)
+        forecast_result = forecast.tail(periods)[
+            [c for c in ['ds', 'yhat', 'yhat_lower', 'yhat_upper'] if c in forecast.columns]
+        ].copy()
+        if gate is not None:
+            gate.store(gate_key, forecast_result, prophet_df['ds'], prophet_df['y'])
+        for col in ['yhat', 'yhat_lower', 'yhat_upper']:
+            if col in forecast_result.columns:
+                forecast_result[col] = forecast_result[col].clip(lower=0)
+        forecast_result['model'] = 'prophet'
         forecasts[metric] = forecast_result
 
     return forecasts
@@ -127,6 +168,12 @@ def combine_metric_forecasts(forecasts, key_column=None, key_value=None):
         result['예측_CPC'] = (result['예측_비용'] / result['예측_클릭']).replace([np.inf, -np.inf], 0).fillna(0)
         result['예측_CPC'] = result['예측_CPC'].clip(lower=0)
 
+    # 시간 예산 초과로 대체된 지표가 있으면 표시
+    fallback = any(
+        'model' in f.columns and (f['model'] == TIMEOUT_FALLBACK_MODEL).any() for f in forecasts.values()
+    )
+    result['model'] = TIMEOUT_FALLBACK_MODEL if fallback else 'prophet'
+
     if key_column and key_value:
         result[key_column] = key_value
 
@@ -155,6 +202,7 @@ def create_actual_data(daily_data, output_days=30, key_column=None, key_value=No
         result['예측_CPC'] = (result['예측_비용'] / result['예측_클릭']).replace([np.inf, -np.inf], 0).fillna(0)
 
     result['type'] = 'actual'
+    result['model'] = 'actual'
 
     if key_column and key_value:
         result[key_column] = key_value
@@ -177,34 +225,10 @@ def combine_actual_and_forecast(actual_df, forecast_df):
     return combined
 
 
-def classify_data_type_v2(row):
-    """데이터 타입 분류"""
-    has_campaign = row['캠페인이름'] != '-'
-    has_adset = row['광고세트'] != '-'
-    has_age = row['연령'] != '-'
-    has_gender = row['성별'] != '-'
-    has_device_type = row['기기유형'] != '-'
-    has_platform = row['플랫폼'] != '-'
-    has_device_platform = row['기기플랫폼'] != '-'
-
-    if has_campaign and has_adset and not has_age and not has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type1_캠페인+광고세트'
-    if not has_campaign and has_adset and has_age and has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type2_광고세트+연령+성별'
-    if not has_campaign and has_adset and has_age and not has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type3_광고세트+연령'
-    if not has_campaign and has_adset and not has_age and has_gender and not has_device_type and not has_platform and not has_device_platform:
-        return 'Type4_광고세트+성별'
-    if not has_campaign and has_adset and not has_age and not has_gender and has_device_type and not has_platform and not has_device_platform:
-        return 'Type5_광고세트+기기유형'
-    if not has_campaign and has_adset and not has_age and not has_gender and not has_device_type and has_platform and not has_device_platform:
-        return 'Type6_광고세트+플랫폼'
-    if not has_campaign and has_adset and not has_age and not has_gender and not has_device_type and not has_platform and has_device_platform:
-        return 'Type7_광고세트+기기플랫폼'
-    return 'Other_미분류'
-
-
-def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int = 365, output_days: int = 30):
+def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int = 365, output_days: int = 30,
+                         fit_timeout: Optional[float] = None, stage_timeout: Optional[float] = None,
+                         force_refit: bool = False, drift_tolerance: Optional[float] = None,
+                         drift_max_age: Optional[int] = None):
     """
     Prophet 예측 실행
 
@@ -212,12 +236,34 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         paths: ClientPaths 객체 (멀티클라이언트 모드) 또는 None (레거시 모드)
         training_days: 학습 데이터 기간 (일)
         output_days: 예측 기간 (일)
+        fit_timeout: Prophet fit 1건 시간 예산 (초, None이면 설정/기본값)
+        stage_timeout: 예측 단계 전체 시간 예산 (초, None이면 설정/기본값)
+        force_refit: True면 예측 재사용 게이트를 끄고 모든 시리즈 재학습
+        drift_tolerance: 예측 재사용 허용 오차 (WAPE, None이면 설정/기본값)
+        drift_max_age: 캐시 모델 최대 사용 일수 (None이면 설정/기본값)
     """
+    data_type_dir = paths.type if paths else DATA_TYPE_DIR
+    budget = FitBudget('multi_analysis_prophet_forecast', **load_budget_settings(fit_timeout, stage_timeout))
+    gate = DriftGate.for_stage(
+        data_type_dir, 'multi_analysis_prophet_forecast', training_days, output_days,
+        enabled=not force_refit, tolerance=drift_tolerance, max_age_days=drift_max_age
+    )
+    try:
+        return _run_prophet_forecast(paths, training_days, output_days, budget, gate)
+    finally:
+        budget.close()
+        gate.save()
+
+
+def _run_prophet_forecast(paths: Optional[ClientPaths], training_days: int, output_days: int,
+                          budget: FitBudget, gate: DriftGate):
+    """Prophet 예측 실행 본문"""
     # 경로 설정 (클라이언트 모드 vs 레거시 모드)
     if paths:
         data_type_dir = paths.type
     else:
         data_type_dir = DATA_TYPE_DIR
+    store = ForecastStore.for_paths(paths)
 
     file_path = data_type_dir / 'merged_data.csv'
 
@@ -254,16 +300,11 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         print(f"✓ 현재 데이터: {total_data_days}일 (연간 학습 가능)")
 
     # 데이터 타입 분류
-    df['data_type'] = df.apply(classify_data_type_v2, axis=1)
+    df = ensure_data_type(df)
 
-    # 전체 일별 집계
-    daily_data = df.groupby('일').agg({
-        '비용': 'sum',
-        '노출': 'sum',
-        '클릭': 'sum',
-        '전환수': 'sum',
-        '전환값': 'sum'
-    }).reset_index()
+    # 일별 집계 테이블 동기화 (바뀐 날짜만 재집계) 후 전체 일별 집계 조회
+    aggregates = DailyAggregates.for_source(paths, 'merged').sync(df, source_file=file_path)
+    daily_data = aggregates.overall()
 
     # KPI 계산
     daily_data['ROAS'] = (daily_data['전환값'] / daily_data['비용'] * 100).fillna(0).replace([np.inf, -np.inf], 0)
@@ -319,7 +360,8 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
 
     print("\nProphet 모델 학습 중... (비용, 노출, 클릭, 전환수, 전환값)")
 
-    overall_forecasts = forecast_multiple_metrics(daily_data, periods=output_days, training_days=training_days)
+    overall_forecasts = forecast_multiple_metrics(daily_data, periods=output_days, training_days=training_days,
+                                                  budget=budget, label='overall', gate=gate)
     overall_forecast_result = combine_metric_forecasts(overall_forecasts)
 
     overall_actual_result = create_actual_data(daily_data, output_days=output_days)
@@ -348,8 +390,8 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
             avg_cpa = (forecast_total_cost / forecast_total_conversions)
             print(f"  평균 CPA: {avg_cpa:,.0f}원")
 
-        overall_result.to_csv(data_type_dir / 'prophet_forecast_overall.csv',
-                              index=False, encoding='utf-8-sig')
+        publish_forecast(overall_result, store, 'prophet', 'overall',
+                         legacy_path=data_type_dir / 'prophet_forecast_overall.csv')
         print(f"\n✓ 전체 예측 결과 저장: {data_type_dir / 'prophet_forecast_overall.csv'}")
 
     # ============================================================================
@@ -369,9 +411,7 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
             print(f"\n[{category}]: 데이터 부족 (건수: {len(category_data)})")
             continue
 
-        daily_category = category_data.groupby('일').agg({
-            '비용': 'sum', '노출': 'sum', '클릭': 'sum', '전환수': 'sum', '전환값': 'sum'
-        }).reset_index()
+        daily_category = aggregates.daily('type1_category', {'data_type': TYPE1, '유형구분': category})
 
         if len(daily_category) < 10:
             print(f"\n[{category}]: 유효 데이터 부족")
@@ -380,7 +420,8 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         print(f"\n[{category}] 다중 지표 예측")
         print(f"학습 데이터: {len(daily_category)}일")
 
-        cat_forecasts = forecast_multiple_metrics(daily_category, periods=output_days, training_days=training_days)
+        cat_forecasts = forecast_multiple_metrics(daily_category, periods=output_days, training_days=training_days,
+                                                  budget=budget, label='category', gate=gate, key=category)
         cat_forecast_result = combine_metric_forecasts(cat_forecasts, '유형구분', category)
         cat_actual_result = create_actual_data(daily_category, output_days=output_days, key_column='유형구분', key_value=category)
         cat_result = combine_actual_and_forecast(cat_actual_result, cat_forecast_result)
@@ -402,10 +443,10 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         for kpi_col in ['예측_ROAS', '예측_CPA', '예측_CPC']:
             if kpi_col in combined_category.columns:
                 cols.append(kpi_col)
-        cols.append('type')
+        cols.extend(['type', 'model'])
         combined_category = combined_category[[c for c in cols if c in combined_category.columns]]
-        combined_category.to_csv(data_type_dir / 'prophet_forecast_by_category.csv',
-                                  index=False, encoding='utf-8-sig')
+        publish_forecast(combined_category, store, 'prophet', 'category', key_columns=['유형구분'],
+                         legacy_path=data_type_dir / 'prophet_forecast_by_category.csv')
         print(f"\n✓ 유형구분별 예측 결과 저장: {data_type_dir / 'prophet_forecast_by_category.csv'}")
 
     # ============================================================================
@@ -649,10 +690,7 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         top_brands = brand_summary.nlargest(5, '전환값')['브랜드명'].tolist()
 
         for brand in top_brands:
-            brand_data = type1_data[type1_data['브랜드명'] == brand]
-            daily_brand = brand_data.groupby('일').agg({
-                '비용': 'sum', '노출': 'sum', '클릭': 'sum', '전환수': 'sum', '전환값': 'sum'
-            }).reset_index()
+            daily_brand = aggregates.daily('type1_brand', {'data_type': TYPE1, '브랜드명': brand})
 
             if len(daily_brand) < 10:
                 print(f"\n[{brand}]: 데이터 부족 ({len(daily_brand)}일)")
@@ -661,7 +699,8 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
             print(f"\n[{brand}] 다중 지표 예측")
             print(f"학습 데이터: {len(daily_brand)}일")
 
-            brand_forecasts = forecast_multiple_metrics(daily_brand, periods=output_days, training_days=training_days)
+            brand_forecasts = forecast_multiple_metrics(daily_brand, periods=output_days, training_days=training_days,
+                                                        budget=budget, label='brand', gate=gate, key=brand)
             brand_forecast_result = combine_metric_forecasts(brand_forecasts, '브랜드명', brand)
             brand_actual_result = create_actual_data(daily_brand, output_days=output_days, key_column='브랜드명', key_value=brand)
             brand_result = combine_actual_and_forecast(brand_actual_result, brand_forecast_result)
@@ -678,10 +717,10 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         for kpi_col in ['예측_ROAS', '예측_CPA', '예측_CPC']:
             if kpi_col in combined_brand.columns:
                 cols.append(kpi_col)
-        cols.append('type')
+        cols.extend(['type', 'model'])
         combined_brand = combined_brand[[c for c in cols if c in combined_brand.columns]]
-        combined_brand.to_csv(data_type_dir / 'prophet_forecast_by_brand.csv',
-                                index=False, encoding='utf-8-sig')
+        publish_forecast(combined_brand, store, 'prophet', 'brand', key_columns=['브랜드명'],
+                         legacy_path=data_type_dir / 'prophet_forecast_by_brand.csv')
         print(f"\n✓ 브랜드별 예측 결과 저장: {data_type_dir / 'prophet_forecast_by_brand.csv'}")
 
     # 7. 상품별 예측
@@ -696,10 +735,7 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         top_products = product_summary.nlargest(5, '전환값')['상품명'].tolist()
 
         for product in top_products:
-            product_data = type1_data[type1_data['상품명'] == product]
-            daily_product = product_data.groupby('일').agg({
-                '비용': 'sum', '노출': 'sum', '클릭': 'sum', '전환수': 'sum', '전환값': 'sum'
-            }).reset_index()
+            daily_product = aggregates.daily('type1_product', {'data_type': TYPE1, '상품명': product})
 
             if len(daily_product) < 10:
                 print(f"\n[{product}]: 데이터 부족 ({len(daily_product)}일)")
@@ -708,7 +744,8 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
             print(f"\n[{product}] 다중 지표 예측")
             print(f"학습 데이터: {len(daily_product)}일")
 
-            product_forecasts = forecast_multiple_metrics(daily_product, periods=output_days, training_days=training_days)
+            product_forecasts = forecast_multiple_metrics(daily_product, periods=output_days, training_days=training_days,
+                                                          budget=budget, label='product', gate=gate, key=product)
             product_forecast_result = combine_metric_forecasts(product_forecasts, '상품명', product)
             product_actual_result = create_actual_data(daily_product, output_days=output_days, key_column='상품명', key_value=product)
             product_result = combine_actual_and_forecast(product_actual_result, product_forecast_result)
@@ -725,12 +762,16 @@ def run_prophet_forecast(paths: Optional[ClientPaths] = None, training_days: int
         for kpi_col in ['예측_ROAS', '예측_CPA', '예측_CPC']:
             if kpi_col in combined_product.columns:
                 cols.append(kpi_col)
-        cols.append('type')
+        cols.extend(['type', 'model'])
         combined_product = combined_product[[c for c in cols if c in combined_product.columns]]
-        combined_product.to_csv(data_type_dir / 'prophet_forecast_by_product.csv',
-                                  index=False, encoding='utf-8-sig')
+        publish_forecast(combined_product, store, 'prophet', 'product', key_columns=['상품명'],
+                         legacy_path=data_type_dir / 'prophet_forecast_by_product.csv')
         print(f"\n✓ 상품별 예측 결과 저장: {data_type_dir / 'prophet_forecast_by_product.csv'}")
 
+    print_profile_report()
+    budget.print_report()
+    gate.print_summary()
+
     # ============================================================================
     # 최종 요약
     # ============================================================================
@@ -765,7 +806,21 @@ def main(client_id: Optional[str] = None):
                         help='학습 데이터 기간 (0=전체/365일, 180=최근180일, 90=최근90일)')
     parser.add_argument('--output-days', type=int, default=30,
                         help='예측 기간 (기본 30일)')
+    parser.add_argument('--fit-timeout', type=float, default=None,
+                        help='Prophet fit 1건 시간 예산(초, 0=제한 없음, 기본 clients.json 또는 120)')
+    parser.add_argument('--stage-timeout', type=float, default=None,
+                        help='예측 단계 전체 시간 예산(초, 0=제한 없음, 기본 clients.json 또는 1800)')
+    parser.add_argument('--force-refit', action='store_true',
+                        help='예측 재사용 게이트를 끄고 모든 시리즈 재학습')
+    parser.add_argument('--drift-tolerance', type=float, default=None,
+                        help='예측 재사용 허용 오차 (WAPE, 기본 clients.json 또는 0.15)')
+    parser.add_argument('--drift-max-age', type=int, default=None,
+                        help='캐시 모델 최대 사용 일수 (기본 clients.json 또는 7)')
+    parser.add_argument('--profile-report', action='store_true',
+                        help='예측 프로파일 절감 시간 추정 (프로파일별 기존 방식 predict 1회 추가, 진단용)')
     args = parser.parse_args()
+    if args.profile_report:
+        enable_profile_calibration()
 
     actual_client_id = args.client or client_id
 
@@ -780,7 +835,10 @@ def main(client_id: Optional[str] = None):
         print(f"[멀티클라이언트 모드] 클라이언트: {actual_client_id}")
 
     try:
-        run_prophet_forecast(paths, training_days=training_days, output_days=output_days)
+        run_prophet_forecast(paths, training_days=training_days, output_days=output_days,
+                             fit_timeout=args.fit_timeout, stage_timeout=args.stage_timeout,
+                             force_refit=args.force_refit, drift_tolerance=args.drift_tolerance,
+                             drift_max_age=args.drift_max_age)
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
         import traceback
@@ -17,6 +17,12 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from scripts.common.paths import ClientPaths, get_client_config, parse_client_arg, PROJECT_ROOT
+from scripts.common.forecast_profile import (
+    COMPONENTS, build_prophet, enable_profile_calibration, predict_with_profile, print_profile_report
+)
+from scripts.common.forecast_store import ForecastStore, publish_forecast
+from scripts.common.daily_aggregates import DailyAggregates
+from scripts.common.time_window import last_days
 
 import os
 import json
@@ -42,7 +48,7 @@ from statsmodels.tsa.seasonal import seasonal_decompose
 
 # Prophet 시계열 예측 라이브러리
 try:
-    from prophet import Prophet
+    import prophet  # noqa: F401
     PROPHET_AVAILABLE = True
 except ImportError:
     PROPHET_AVAILABLE = False
@@ -73,7 +79,11 @@ parser.add_argument('--days', type=int, default=0,
                     help='학습 데이터 기간 (0=전체/365일, 180=최근180일, 90=최근90일)')
 parser.add_argument('--output-days', type=int, default=30,
                     help='예측 기간 (기본 30일)')
+parser.add_argument('--profile-report', action='store_true',
+                    help='예측 프로파일 절감 시간 추정 (프로파일별 기존 방식 predict 1회 추가, 진단용)')
 args = parser.parse_args()
+if args.profile_report:
+    enable_profile_calibration()
 
 # 클라이언트 ID
 CLIENT_ID = args.client
@@ -81,6 +91,8 @@ CLIENT_ID = args.client
 TRAINING_DAYS = args.days if args.days > 0 else 365
 # 출력 기간 설정 (일) - 예측 데이터
 OUTPUT_DAYS = args.output_days
+# 예측 프로파일 - 신뢰구간(시각화)과 in-sample MAE를 사용하므로 전체 결과 필요
+FORECAST_PROFILE = COMPONENTS
 
 
 def load_and_clean_data(file_path: str) -> pd.DataFrame:
@@ -275,18 +287,23 @@ def calculate_daily_statistics(df: pd.DataFrame, statistics: Dict, paths: Option
     print(f"   ✅ {daily_csv.name} 저장 완료 ({len(daily_stats):,}행)")
 
 
-def simple_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[ClientPaths] = None) -> pd.DataFrame:
+def load_daily_totals(df: pd.DataFrame, paths: Optional[ClientPaths] = None,
+                      source_file: Optional[str] = None) -> pd.DataFrame:
+    """일별 합계 조회 (raw 일별 집계 테이블을 df와 동기화 - 바뀐 날짜만 재집계)
+
+    source_file(df를 읽은 원본 CSV)이 마지막 동기화와 같으면 날짜별 비교도 생략합니다.
+    """
+    aggregates = DailyAggregates.for_source(paths, 'raw')
+    return aggregates.sync(df, source_file=Path(source_file) if source_file else None).overall()
+
+
+def simple_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[ClientPaths] = None,
+                    source_file: Optional[str] = None) -> pd.DataFrame:
     """최근 90일 데이터 기반 예측 (주간 패턴 반영)"""
     print(f"\n🔮 시계열 예측 중 ({days}일)...")
 
-    # 일별 집계
-    daily = df.groupby('일 구분').agg({
-        '비용': 'sum',
-        '노출': 'sum',
-        '클릭': 'sum',
-        '전환수': 'sum',
-        '전환값': 'sum'
-    }).reset_index()
+    # 일별 집계 (유지 중인 일별 집계 테이블)
+    daily = load_daily_totals(df, paths, source_file)
 
     daily = daily.sort_values('일 구분')
 
@@ -366,7 +383,8 @@ def simple_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[C
     # CSV 저장 - predictions_daily.csv로 저장
     forecast_file = paths.predictions_daily if paths else FORECAST_DIR / 'predictions_daily.csv'
     forecast_file.parent.mkdir(parents=True, exist_ok=True)
-    forecast_df.to_csv(forecast_file, index=False, encoding='utf-8')
+    publish_forecast(forecast_df, ForecastStore.for_paths(paths), 'marketing', 'daily', legacy_path=forecast_file,
+                     date_column='일 구분', default_model='weekly_pattern', encoding='utf-8')
 
     print(f"   ✅ {forecast_file.name} 저장 완료")
     print(f"   ├ 실제 데이터: {len(actual)}일")
@@ -375,30 +393,23 @@ def simple_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[C
     return forecast_df
 
 
-def advanced_detailed_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[ClientPaths] = None) -> Dict[str, pd.DataFrame]:
+def advanced_detailed_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[ClientPaths] = None,
+                               source_file: Optional[str] = None) -> Dict[str, pd.DataFrame]:
     """상세 시계열 분석 및 예측 (Prophet 사용, 최근 365일 데이터 활용)"""
     print(f"\n🔬 상세 시계열 분석 시작 ({days}일 예측)...")
 
     if not PROPHET_AVAILABLE:
         print("   ⚠️ Prophet이 설치되지 않아 단순 예측을 사용합니다.")
         # 단순 예측으로 대체
-        return simple_forecast_as_detailed(df, days, paths)
-
-    # 일별 집계
-    daily = df.groupby('일 구분').agg({
-        '비용': 'sum',
-        '노출': 'sum',
-        '클릭': 'sum',
-        '전환수': 'sum',
-        '전환값': 'sum'
-    }).reset_index()
+        return simple_forecast_as_detailed(df, days, paths, source_file)
+
+    # 일별 집계 (유지 중인 일별 집계 테이블)
+    daily = load_daily_totals(df, paths, source_file)
 
     daily = daily.sort_values('일 구분')
 
     # 최근 365일 데이터만 필터링
-    max_date = daily['일 구분'].max()
-    cutoff_date = max_date - timedelta(days=TRAINING_DAYS)
-    daily_filtered = daily[daily['일 구분'] >= cutoff_date].copy()
+    daily_filtered = last_days(daily, TRAINING_DAYS, '일 구분')
 
     daily_indexed = daily_filtered.set_index('일 구분')
 
@@ -435,7 +446,8 @@ def advanced_detailed_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths:
             use_yearly = data_days >= 365
 
             # Prophet 모델 생성 (연간 계절성 자동 설정)
-            model = Prophet(
+            model = build_prophet(
+                FORECAST_PROFILE,
                 yearly_seasonality=use_yearly,  # 365일 이상일 때만 활성화
                 weekly_seasonality=True,        # 주간 계절성
                 daily_seasonality=False,        # 일간 계절성
@@ -446,11 +458,8 @@ def advanced_detailed_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths:
             # 모델 학습
             model.fit(prophet_df)
 
-            # 미래 날짜 생성
-            future = model.make_future_dataframe(periods=days)
-
-            # 예측
-            forecast_result = model.predict(future)
+            # 예측 (학습 구간 포함)
+            forecast_result = predict_with_profile(model, FORECAST_PROFILE, days)
 
             # 예측값 추출 (마지막 days개)
             forecast_values = forecast_result.tail(days)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
@@ -533,7 +542,8 @@ def advanced_detailed_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths:
     # 저장
     detailed_file = paths.forecast / 'predictions_detailed.csv' if paths else FORECAST_DIR / 'predictions_detailed.csv'
     detailed_file.parent.mkdir(parents=True, exist_ok=True)
-    detailed_forecast.to_csv(detailed_file, index=False, encoding='utf-8')
+    publish_forecast(detailed_forecast, ForecastStore.for_paths(paths), 'marketing', 'detailed',
+                     legacy_path=detailed_file, date_column='일 구분', default_model='prophet', encoding='utf-8')
 
     print(f"   ✅ {detailed_file.name} 저장 완료")
 
@@ -544,16 +554,11 @@ def advanced_detailed_forecast(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths:
     }
 
 
-def simple_forecast_as_detailed(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[ClientPaths] = None) -> Dict[str, pd.DataFrame]:
+def simple_forecast_as_detailed(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths: Optional[ClientPaths] = None,
+                                source_file: Optional[str] = None) -> Dict[str, pd.DataFrame]:
     """Prophet 미설치 시 단순 예측으로 대체"""
-    # 일별 집계
-    daily = df.groupby('일 구분').agg({
-        '비용': 'sum',
-        '노출': 'sum',
-        '클릭': 'sum',
-        '전환수': 'sum',
-        '전환값': 'sum'
-    }).reset_index()
+    # 일별 집계 (유지 중인 일별 집계 테이블)
+    daily = load_daily_totals(df, paths, source_file)
 
     daily = daily.sort_values('일 구분')
     daily_indexed = daily.set_index('일 구분')
@@ -606,7 +611,9 @@ def simple_forecast_as_detailed(df: pd.DataFrame, days: int = OUTPUT_DAYS, paths
 
     detailed_file = paths.forecast / 'predictions_detailed.csv' if paths else FORECAST_DIR / 'predictions_detailed.csv'
     detailed_file.parent.mkdir(parents=True, exist_ok=True)
-    detailed_forecast.to_csv(detailed_file, index=False, encoding='utf-8')
+    publish_forecast(detailed_forecast, ForecastStore.for_paths(paths), 'marketing', 'detailed',
+                     legacy_path=detailed_file, date_column='일 구분', default_model='weekly_pattern',
+                     encoding='utf-8')
 
     print(f"   ✅ {detailed_file.name} 저장 완료 (단순 예측)")
 
@@ -1375,10 +1382,11 @@ def main(client_id: Optional[str] = None):
         calculate_daily_statistics(df, statistics, paths)
 
         # 6. 기본 예측 데이터 생성 (단순 버전)
-        simple_forecast(df, paths=paths)
+        simple_forecast(df, paths=paths, source_file=input_file)
 
         # 7. 상세 예측 데이터 생성 (Prophet - 전체 데이터 활용)
-        forecast_data = advanced_detailed_forecast(df, days=30, paths=paths)
+        forecast_data = advanced_detailed_forecast(df, days=30, paths=paths, source_file=input_file)
+        print_profile_report()
 
         # 8. 주별/월별 예측 생성
         generate_weekly_predictions(forecast_data['predictions'], paths)
@@ -45,24 +45,26 @@ MAPPING_SCRIPTS = [
     ('process_marketing_data.py', '마케팅 원본 데이터 가공'),
 ]
 
-# test_3_analysis.bat (13개)
+# test_3_analysis.bat (13개) + 글로벌 예측 + 코호트 리텐션 = 15개
 ANALYSIS_SCRIPTS = [
     ('run_multi_analysis.py', '통합 분석 (유형별/일별)'),
     ('multi_analysis_dimension_detail.py', '차원별 세부 분석'),
     ('multi_analysis_prophet_forecast.py', 'Prophet 예측 분석'),
+    ('multi_analysis_global_forecast.py', '글로벌 예측 (광고세트 x 차원)'),
     ('generate_type_insights.py', '유형별 인사이트 생성'),
     ('segment_processor.py', '세그먼트 분석'),
     ('insight_generator.py', '인사이트 생성'),
     ('visualization_generator.py', '시각화 데이터 생성'),
     ('generate_funnel_data.py', '퍼널 데이터 생성'),
     ('generate_engagement_data.py', '참여도 데이터 생성'),
+    ('generate_cohort_retention.py', '사용자 코호트 리텐션'),
     ('generate_funnel_data_multiperiod.py', '멀티기간 퍼널 데이터'),
     ('generate_insights_multiperiod.py', '멀티기간 인사이트'),
     ('generate_type_insights_multiperiod.py', '멀티기간 유형별 인사이트'),
     ('export_json.py', 'CSV to JSON 변환'),
 ]
 
-# 전체 스크립트 (19개)
+# 전체 스크립트 (21개)
 ALL_SCRIPTS = FETCH_SCRIPTS + MAPPING_SCRIPTS + ANALYSIS_SCRIPTS
 
 # 단계별 매핑
@@ -25,6 +25,7 @@ warnings.filterwarnings('ignore')
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.daily_aggregates import DailyAggregates
 
 # 레거시 경로 설정 (기본값)
 BASE_DIR = Path(__file__).parent.parent
@@ -74,6 +75,10 @@ def run_multi_analysis(paths: Optional[ClientPaths] = None):
 
     print(f"총 데이터: {len(df):,}행, {len(df.columns)}개 컬럼")
 
+    # 일별 집계 테이블 동기화 (바뀐 날짜만 재집계)
+    aggregates = DailyAggregates.for_source(paths, 'merged').sync(df, source_file=input_file)
+    print(f"일별 집계 동기화: 변경 {aggregates.last_sync['changed']}일, 삭제 {aggregates.last_sync['removed']}일")
+
     # ============================================================================
     # 1. 유형구분별 성과 분석
     # ============================================================================
@@ -81,7 +86,7 @@ def run_multi_analysis(paths: Optional[ClientPaths] = None):
     print("1단계: 유형구분별 성과 분석")
     print("=" * 100)
 
-    category_summary = df.groupby('유형구분').agg({
+    category_summary = aggregates.by('category').groupby('유형구분').agg({
         '비용': 'sum',
         '노출': 'sum',
         '클릭': 'sum',
@@ -111,13 +116,7 @@ def run_multi_analysis(paths: Optional[ClientPaths] = None):
     print("2단계: 일별 집계 데이터 생성")
     print("=" * 100)
 
-    daily_data = df.groupby('일').agg({
-        '비용': 'sum',
-        '노출': 'sum',
-        '클릭': 'sum',
-        '전환수': 'sum',
-        '전환값': 'sum'
-    }).reset_index()
+    daily_data = aggregates.overall()
 
     daily_data['ROAS'] = (daily_data['전환값'] / daily_data['비용'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
     daily_data['CPA'] = (daily_data['비용'] / daily_data['전환수']).replace([np.inf, -np.inf], 0).fillna(0)
@@ -36,10 +36,18 @@ import pandas as pd
 import numpy as np
 
 from scripts.common.paths import ClientPaths, parse_client_arg, PROJECT_ROOT
+from scripts.common.forecast_profile import POINT, enable_profile_calibration, print_profile_report
+from scripts.common.fit_budget import (
+    FitBudget, load_budget_settings, weighted_ma_forecast, TIMEOUT_FALLBACK_MODEL
+)
+from scripts.common.drift_gate import DriftGate
+from scripts.common.forecast_store import ForecastStore, publish_forecast
+from scripts.common.daily_aggregates import DailyAggregates, SOURCES
+from scripts.common.time_window import last_days
 
 # Prophet 시계열 예측 라이브러리
 try:
-    from prophet import Prophet
+    import prophet  # noqa: F401
     PROPHET_AVAILABLE = True
 except ImportError:
     PROPHET_AVAILABLE = False
@@ -64,14 +72,30 @@ parser.add_argument('--output-days', type=int, default=30,
                     help='예측 기간 (기본 30일)')
 parser.add_argument('--client', type=str, default=None,
                     help='클라이언트 ID (멀티클라이언트 모드)')
+parser.add_argument('--fit-timeout', type=float, default=None,
+                    help='Prophet fit 1건 시간 예산(초, 0=제한 없음, 기본 clients.json 또는 120)')
+parser.add_argument('--stage-timeout', type=float, default=None,
+                    help='세그먼트 예측 단계 전체 시간 예산(초, 0=제한 없음, 기본 clients.json 또는 1800)')
+parser.add_argument('--force-refit', action='store_true',
+                    help='예측 재사용 게이트를 끄고 모든 시리즈 재학습')
+parser.add_argument('--drift-tolerance', type=float, default=None,
+                    help='예측 재사용 허용 오차 (WAPE, 기본 clients.json 또는 0.15)')
+parser.add_argument('--drift-max-age', type=int, default=None,
+                    help='캐시 모델 최대 사용 일수 (기본 clients.json 또는 7)')
+parser.add_argument('--profile-report', action='store_true',
+                    help='예측 프로파일 절감 시간 추정 (프로파일별 기존 방식 predict 1회 추가, 진단용)')
 parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS,
                     help='도움말 표시')
 args = parser.parse_args()
+if args.profile_report:
+    enable_profile_calibration()
 
 # 학습 기간 설정 (일) - 명령줄 인자 또는 기본값
 TRAINING_DAYS = args.days if args.days > 0 else 365
 # 출력 기간 설정 (일) - 예측 데이터
 OUTPUT_DAYS = args.output_days
+# 예측 프로파일 - segment_*.csv는 yhat만 사용 (신뢰구간 미사용)
+FORECAST_PROFILE = POINT
 
 
 class SegmentProcessor:
@@ -88,6 +112,8 @@ class SegmentProcessor:
         self.input_file = input_file
         self.paths = paths
         self.df = None
+        self.aggregates = DailyAggregates.for_source(paths, 'raw')
+        self._segment_daily: Optional[Dict[str, Dict[str, pd.DataFrame]]] = None
 
         # 경로 설정 (클라이언트 모드 vs 레거시 모드)
         if paths:
@@ -105,6 +131,12 @@ class SegmentProcessor:
         ]
         self.metrics = ['비용', '노출', '클릭', '전환수', '전환값']
         self.forecast_days = OUTPUT_DAYS
+        self.store = ForecastStore(self.forecast_dir / 'store')
+        self.budget = FitBudget('segment_processor', **load_budget_settings(args.fit_timeout, args.stage_timeout))
+        self.gate = DriftGate.for_stage(
+            self.forecast_dir, 'segment_processor', TRAINING_DAYS, OUTPUT_DAYS,
+            enabled=not args.force_refit, tolerance=args.drift_tolerance, max_age_days=args.drift_max_age
+        )
 
     def load_data(self) -> pd.DataFrame:
         """데이터 로드"""
@@ -120,10 +152,12 @@ class SegmentProcessor:
 
         if self.input_file and os.path.exists(self.input_file):
             # 지정된 파일 로드
+            source_file = Path(self.input_file)
             df = pd.read_csv(self.input_file, encoding='utf-8')
             print(f"   Loaded from: {self.input_file}")
         elif raw_data_file.exists():
             # raw_data.csv 로드
+            source_file = raw_data_file
             df = pd.read_csv(raw_data_file, encoding='utf-8')
             print(f"   Loaded from: {raw_data_file}")
         else:
@@ -142,26 +176,68 @@ class SegmentProcessor:
         print(f"   Date range: {df['일 구분'].min().strftime('%Y-%m-%d')} ~ {df['일 구분'].max().strftime('%Y-%m-%d')}")
         print(f"   Unique dates: {df['일 구분'].nunique()}")
 
+        # 세그먼트 일별 집계 테이블 동기화 (바뀐 날짜만 재집계)
+        self.aggregates.sync(df, source_file=source_file)
+        print(f"   Daily aggregates: {self.aggregates.last_sync['changed']} changed, "
+              f"{self.aggregates.last_sync['removed']} removed dates")
+
         self.df = df
+        self._segment_daily = None
         return df
 
-    def aggregate_by_segment(self, segment_col: str) -> Dict[str, pd.DataFrame]:
-        """세그먼트별 일별 집계"""
-        results = {}
+    def aggregate_all_segments(self, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        세그먼트 차원별 일별 집계
 
-        for segment_value in self.df[segment_col].dropna().unique():
-            segment_df = self.df[self.df[segment_col] == segment_value]
+        raw 일별 집계 테이블이 유지하는 세그먼트(brand/channel/product/promotion)는 테이블을 그대로 읽고,
+        나머지 컬럼은 (세그먼트 컬럼, 값, 일 구분) 세로 형태로 쌓아 한 번에 집계합니다.
 
-            # 일별 집계
-            daily = segment_df.groupby('일 구분').agg({
-                col: 'sum' for col in self.metrics if col in segment_df.columns
-            }).reset_index()
+        Args:
+            columns: 집계할 세그먼트 컬럼 (None이면 segment_configs 전체)
 
-            daily = daily.sort_values('일 구분')
-            results[segment_value] = daily
+        Returns:
+            {세그먼트 컬럼: {세그먼트 값: 일별 DataFrame}} - 세그먼트 값은 원본 등장 순서
+            (유지 테이블은 처음 등장한 날짜 순서 - 날짜순 원본에서는 동일)
+        """
+        if columns is None:
+            columns = [c['column'] for c in self.segment_configs]
+        columns = [c for c in columns if c in self.df.columns]
+        metrics = [col for col in self.metrics if col in self.df.columns]
+        results: Dict[str, Dict[str, pd.DataFrame]] = {column: {} for column in columns}
+
+        # 유지 중인 일별 집계 테이블 사용
+        maintained = {c['column']: c['name'] for c in self.segment_configs
+                      if self.aggregates.has(c['name'])
+                      and SOURCES['raw']['dimensions'].get(c['name']) == [c['column']]}
+        for column in columns:
+            if column in maintained:
+                results[column] = self.aggregates.segments(maintained[column])
+        columns = [c for c in columns if c not in maintained]
+        if not columns:
+            return results
+
+        stacked = pd.concat([
+            pd.DataFrame({'segment': column, 'value': self.df[column], '일 구분': self.df['일 구분']})
+            .join(self.df[metrics])
+            for column in columns
+        ], ignore_index=True)
+
+        daily_all = stacked.groupby(['segment', 'value', '일 구분'], sort=False)[metrics].sum().reset_index()
+
+        for (column, segment_value), daily in daily_all.groupby(['segment', 'value'], sort=False):
+            results[column][segment_value] = daily[['일 구분'] + metrics] \
+                .sort_values('일 구분').reset_index(drop=True)
 
         return results
 
+    def aggregate_by_segment(self, segment_col: str) -> Dict[str, pd.DataFrame]:
+        """세그먼트별 일별 집계 (aggregate_all_segments 결과 재사용)"""
+        if self._segment_daily is None:
+            self._segment_daily = self.aggregate_all_segments()
+        if segment_col not in self._segment_daily:
+            self._segment_daily.update(self.aggregate_all_segments([segment_col]))
+        return self._segment_daily.get(segment_col, {})
+
     def select_forecast_model(self, days: int) -> str:
         """데이터 일수에 따라 예측 모델 선택"""
         if days >= 100 and PROPHET_AVAILABLE:
@@ -176,25 +252,37 @@ class SegmentProcessor:
             return 'last_value'
 
     def forecast_prophet(self, daily: pd.DataFrame, metric: str,
-                        weekly_seasonality: bool = True) -> pd.Series:
-        """Prophet을 사용한 예측 (최근 365일 데이터 사용)"""
+                        weekly_seasonality: bool = True, label: str = 'default',
+                        key: Optional[str] = None) -> pd.Series:
+        """
+        Prophet을 사용한 예측 (최근 365일 데이터 사용)
+
+        - 이전 예측이 허용 오차 이내면 재학습 없이 재사용 (DriftGate)
+        - 시간 예산 초과 시 가중 이동평균으로 대체하고 attrs['model']='timeout_fallback'으로 표시
+        """
         # 최근 365일 데이터만 필터링
-        if '일 구분' in daily.columns:
-            max_date = daily['일 구분'].max()
-            cutoff_date = max_date - timedelta(days=TRAINING_DAYS)
-            filtered_daily = daily[daily['일 구분'] >= cutoff_date].copy()
-        else:
-            filtered_daily = daily.copy()
+        filtered_daily = last_days(daily, TRAINING_DAYS, '일 구분')
 
         prophet_df = filtered_daily[['일 구분', metric]].copy()
         prophet_df.columns = ['ds', 'y']
         prophet_df['y'] = prophet_df['y'].fillna(0)
 
+        # 게이트에는 학습 시리즈를 그대로 전달 (재사용 결과 = 동일 입력 재학습 결과)
+        gate_key = f"{key or label}|{metric}"
+        reused = self.gate.reuse(gate_key, prophet_df['ds'], prophet_df['y'], self.forecast_days)
+        if reused is not None:
+            return pd.Series(
+                reused['yhat'].clip(lower=0).values,
+                index=pd.DatetimeIndex(reused['ds'].values)
+            )
+
         # 데이터 기간 확인하여 연간 계절성 자동 설정
         data_days = (prophet_df['ds'].max() - prophet_df['ds'].min()).days
         use_yearly = data_days >= 365
 
-        model = Prophet(
+        # 미래 forecast_days개만 예측 (시간 예산 내)
+        predictions = self.budget.forecast(
+            prophet_df, FORECAST_PROFILE, self.forecast_days, label=label,
             yearly_seasonality=use_yearly,
             weekly_seasonality=weekly_seasonality,
             daily_seasonality=False,
@@ -202,13 +290,12 @@ class SegmentProcessor:
             changepoint_prior_scale=0.05
         )
 
-        model.fit(prophet_df)
-
-        future = model.make_future_dataframe(periods=self.forecast_days)
-        forecast = model.predict(future)
+        if predictions is None:
+            fallback = weighted_ma_forecast(daily[metric].values, daily['일 구분'].max(), self.forecast_days)
+            fallback.attrs['model'] = TIMEOUT_FALLBACK_MODEL
+            return fallback
 
-        # 마지막 forecast_days개 추출
-        predictions = forecast.tail(self.forecast_days)[['ds', 'yhat']].copy()
+        self.gate.store(gate_key, predictions, prophet_df['ds'], prophet_df['y'])
         predictions['yhat'] = predictions['yhat'].clip(lower=0)
 
         return pd.Series(
@@ -219,18 +306,7 @@ class SegmentProcessor:
     def forecast_weighted_ma(self, daily: pd.DataFrame, metric: str) -> pd.Series:
         """가중 이동평균 예측"""
         # 최근 14일 데이터 사용, 최근 데이터에 더 높은 가중치
-        recent = daily.tail(14)[metric].values
-        weights = np.arange(1, len(recent) + 1)
-        weighted_avg = np.average(recent, weights=weights)
-
-        last_date = daily['일 구분'].max()
-        forecast_dates = pd.date_range(
-            start=last_date + timedelta(days=1),
-            periods=self.forecast_days,
-            freq='D'
-        )
-
-        return pd.Series([max(0, weighted_avg)] * self.forecast_days, index=forecast_dates)
+        return weighted_ma_forecast(daily[metric].values, daily['일 구분'].max(), self.forecast_days)
 
     def forecast_simple_ma(self, daily: pd.DataFrame, metric: str) -> pd.Series:
         """단순 이동평균 예측"""
@@ -258,7 +334,8 @@ class SegmentProcessor:
 
         return pd.Series([max(0, last_val)] * self.forecast_days, index=forecast_dates)
 
-    def forecast_segment(self, daily: pd.DataFrame, model_type: str) -> Dict[str, pd.Series]:
+    def forecast_segment(self, daily: pd.DataFrame, model_type: str,
+                         label: str = 'default', key: Optional[str] = None) -> Dict[str, pd.Series]:
         """세그먼트 데이터에 대해 모든 메트릭 예측"""
         forecasts = {}
 
@@ -268,9 +345,11 @@ class SegmentProcessor:
 
             try:
                 if model_type == 'prophet_full':
-                    forecasts[metric] = self.forecast_prophet(daily, metric, weekly_seasonality=True)
+                    forecasts[metric] = self.forecast_prophet(daily, metric, weekly_seasonality=True,
+                                                              label=label, key=key)
                 elif model_type == 'prophet_weekly':
-                    forecasts[metric] = self.forecast_prophet(daily, metric, weekly_seasonality=True)
+                    forecasts[metric] = self.forecast_prophet(daily, metric, weekly_seasonality=True,
+                                                              label=label, key=key)
                 elif model_type == 'weighted_ma':
                     forecasts[metric] = self.forecast_weighted_ma(daily, metric)
                 elif model_type == 'simple_ma':
@@ -283,6 +362,30 @@ class SegmentProcessor:
 
         return forecasts
 
+    @staticmethod
+    def _build_output_block(name: str, segment_value: str, dates, values: Dict[str, np.ndarray],
+                            row_type: str, model: str) -> pd.DataFrame:
+        """세그먼트 값 하나의 실제/예측 구간 출력 블록 (segment_*.csv 스키마)"""
+        dates = pd.DatetimeIndex(dates)
+        n_rows = len(dates)
+
+        def column(metric: str, as_int: bool = False):
+            if metric not in values:
+                return np.zeros(n_rows, dtype=int)
+            return values[metric].astype(int) if as_int else values[metric]
+
+        return pd.DataFrame({
+            '일 구분': dates.strftime('%Y-%m-%d'),
+            name: [segment_value] * n_rows,
+            '비용_예측': column('비용'),
+            '노출_예측': column('노출', as_int=True),
+            '클릭_예측': column('클릭', as_int=True),
+            '전환수_예측': column('전환수'),
+            '전환값_예측': column('전환값'),
+            'type': row_type,
+            'model': model,
+        })
+
     def process_segment(self, segment_config: Dict) -> pd.DataFrame:
         """단일 세그먼트 차원 처리"""
         name = segment_config['name']
@@ -307,44 +410,36 @@ class SegmentProcessor:
             model_type = self.select_forecast_model(days)
 
             # 예측
-            forecasts = self.forecast_segment(daily, model_type)
+            forecasts = self.forecast_segment(daily, model_type, label=name, key=f"{name}|{segment_value}")
 
             if not forecasts:
                 continue
 
+            # 시간 예산 초과로 대체된 지표가 있으면 표시
+            if any(f.attrs.get('model') == TIMEOUT_FALLBACK_MODEL for f in forecasts.values()):
+                model_type = TIMEOUT_FALLBACK_MODEL
+
             # 실제 데이터 (최근 OUTPUT_DAYS일)
-            actual = daily.tail(OUTPUT_DAYS).copy()
-            for _, row in actual.iterrows():
-                all_forecasts.append({
-                    '일 구분': row['일 구분'].strftime('%Y-%m-%d'),
-                    name: segment_value,
-                    '비용_예측': row.get('비용', 0),
-                    '노출_예측': int(row.get('노출', 0)),
-                    '클릭_예측': int(row.get('클릭', 0)),
-                    '전환수_예측': row.get('전환수', 0),
-                    '전환값_예측': row.get('전환값', 0),
-                    'type': 'actual',
-                    'model': 'actual'
-                })
+            actual = daily.tail(OUTPUT_DAYS)
+            all_forecasts.append(self._build_output_block(
+                name, segment_value, actual['일 구분'],
+                {metric: actual[metric].to_numpy() for metric in self.metrics if metric in actual.columns},
+                'actual', 'actual'
+            ))
 
             # 예측 데이터
             forecast_dates = forecasts[list(forecasts.keys())[0]].index
-            for date in forecast_dates:
-                all_forecasts.append({
-                    '일 구분': date.strftime('%Y-%m-%d'),
-                    name: segment_value,
-                    '비용_예측': forecasts.get('비용', pd.Series([0]))[date] if '비용' in forecasts else 0,
-                    '노출_예측': int(forecasts.get('노출', pd.Series([0]))[date]) if '노출' in forecasts else 0,
-                    '클릭_예측': int(forecasts.get('클릭', pd.Series([0]))[date]) if '클릭' in forecasts else 0,
-                    '전환수_예측': forecasts.get('전환수', pd.Series([0]))[date] if '전환수' in forecasts else 0,
-                    '전환값_예측': forecasts.get('전환값', pd.Series([0]))[date] if '전환값' in forecasts else 0,
-                    'type': 'forecast',
-                    'model': model_type
-                })
+            all_forecasts.append(self._build_output_block(
+                name, segment_value, forecast_dates,
+                {metric: f.reindex(forecast_dates).to_numpy() for metric, f in forecasts.items()},
+                'forecast', model_type
+            ))
 
             print(f"      - {segment_value}: {days} days, model={model_type}")
 
-        return pd.DataFrame(all_forecasts)
+        if not all_forecasts:
+            return pd.DataFrame()
+        return pd.concat(all_forecasts, ignore_index=True)
 
     def run(self) -> Dict[str, pd.DataFrame]:
         """전체 처리 실행"""
@@ -355,22 +450,21 @@ class SegmentProcessor:
 
         results = {}
 
-        for config in self.segment_configs:
-            result_df = self.process_segment(config)
-
-            if not result_df.empty:
-                # CSV 저장 (클라이언트 모드 지원)
-                self.forecast_dir.mkdir(parents=True, exist_ok=True)
-                output_file = self.forecast_dir / f"segment_{config['name']}.csv"
-                result_df.to_csv(output_file, index=False, encoding='utf-8')
-                results[config['name']] = result_df
-                print(f"   Saved: {output_file.name}")
+        try:
+            self._process_all_segments(results)
+        finally:
+            self.budget.close()
+            self.gate.save()
 
         print("\n[3/4] Calculating segment statistics...")
 
         # 세그먼트별 성과 통계 계산
         self.calculate_segment_stats(results)
 
+        print_profile_report()
+        self.budget.print_report()
+        self.gate.print_summary()
+
         print("\n[4/4] Segment processing complete!")
         print("\nGenerated files:")
         for name in results.keys():
@@ -378,6 +472,20 @@ class SegmentProcessor:
 
         return results
 
+    def _process_all_segments(self, results: Dict[str, pd.DataFrame]) -> None:
+        """모든 세그먼트 차원 처리 및 CSV 저장"""
+        for config in self.segment_configs:
+            result_df = self.process_segment(config)
+
+            if not result_df.empty:
+                # CSV 저장 (클라이언트 모드 지원)
+                self.forecast_dir.mkdir(parents=True, exist_ok=True)
+                output_file = self.forecast_dir / f"segment_{config['name']}.csv"
+                publish_forecast(result_df, self.store, 'segment', config['name'], key_columns=[config['name']],
+                                 legacy_path=output_file, date_column='일 구분', encoding='utf-8')
+                results[config['name']] = result_df
+                print(f"   Saved: {output_file.name}")
+
     def calculate_segment_stats(self, results: Dict[str, pd.DataFrame]) -> None:
         """세그먼트별 성과 통계 계산 (인사이트 생성용)"""
         stats = {}
@@ -0,0 +1,32 @@
+"""
+data_type 분류 - 열 수가 다른 시트 행(ragged rows) 처리 테스트
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.common.data_type import PRESENCE_COLUMNS, TYPE1, TYPE3, align_rows, classify_rows
+
+HEADER = ['일 구분'] + PRESENCE_COLUMNS + ['비용']
+
+
+def _row(campaign, adset, age, cost):
+    return ['2025-01-01', campaign, adset, age, '-', '-', '-', '-', cost]
+
+
+def test_wider_row_is_trimmed_to_header():
+    rows = [_row('캠페인A', '세트A', '-', '100') + ['추가열'], _row('-', '세트B', '25-34', '50')]
+
+    assert align_rows(HEADER, rows)[0] == _row('캠페인A', '세트A', '-', '100')
+    assert classify_rows(HEADER, rows) == [TYPE1, TYPE3]
+
+
+def test_shorter_row_is_padded_to_header():
+    rows = [_row('캠페인A', '세트A', '-', '100')[:-1], _row('-', '세트B', '25-34', '50')]
+
+    aligned = align_rows(HEADER, rows)
+    assert [len(row) for row in aligned] == [len(HEADER)] * 2
+    assert aligned[0][-1] == ''
+    assert classify_rows(HEADER, rows) == [TYPE1, TYPE3]